@@ -21,6 +21,7 @@ from ..const import (
 )
 from ..data.activity import ActivityId, DetectedActivity, detect_activity
 from ..data.analysis import start_prior_analysis
+from ..data.decay import tick_decays
 from ..data.health import HealthMonitor
 from ..utils import (
     apply_activity_boost,
@@ -338,8 +339,7 @@ class Area:
         This method should be called periodically (e.g., by the decay timer)
         to transition decay states when factors drop below threshold.
         """
-        for entity in self.entities.entities.values():
-            entity.decay.tick()
+        tick_decays(entity.decay for entity in self.entities.entities.values())
 
     def occupied(self) -> bool:
         """Return the current occupancy state (True/False) for this area.
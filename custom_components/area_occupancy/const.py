@@ -182,6 +182,9 @@ PRIOR_FLOOR_THRESHOLD_MARGIN: Final[float] = 0.01
 # Time Prior Bounds
 TIME_PRIOR_MIN_BOUND: Final[float] = 0.03
 TIME_PRIOR_MAX_BOUND: Final[float] = 0.9
+# Hour slots older than this (relative to the newest cached occupied interval)
+# are treated as settled and reused by incremental time prior updates.
+TIME_PRIOR_SETTLE_HOURS: Final = 24
 
 # Default prior probabilities
 DEFAULT_PROB_GIVEN_TRUE: Final[float] = 0.5
@@ -235,6 +238,12 @@ DEFAULT_LOOKBACK_DAYS: Final = 60  # Days of interval data to load for analysis
 DEFAULT_CACHE_TTL_SECONDS: Final = 3600  # Cache TTL for occupied intervals (1 hour)
 RETENTION_DAYS: Final = 365  # Days to retain interval data before pruning
 
+# Cross-area transitions (CrossAreaStats)
+TRANSITION_MAX_GAP_SECONDS: Final = (
+    120  # Max gap between leaving one area and entering the next
+)
+TRANSITION_MAX_LOOKBACK_SECONDS: Final = 86400  # Predecessor must start within a day
+
 # Database interval filtering
 MIN_INTERVAL_SECONDS: Final = 5  # Exclude intervals shorter than 5 seconds
 MAX_INTERVAL_SECONDS: Final = (
@@ -257,6 +266,17 @@ RETENTION_WEEKLY_NUMERIC_YEARS: Final = (
     3  # Years to keep weekly numeric aggregates for seasonal analysis
 )
 
+# Retention engine (batched deletes and free page reclamation)
+RETENTION_DELETE_BATCH_SIZE: Final = 2000  # Rows deleted per short transaction
+RETENTION_VACUUM_MAX_PAGES: Final = 4096  # Pages released per incremental vacuum
+RETENTION_VACUUM_MIN_FREE_BYTES: Final = (
+    16 * 1024 * 1024  # Free space that justifies converting to incremental vacuum
+)
+RETENTION_VACUUM_INTERVAL_DAYS: Final = 7  # Minimum days between full VACUUMs
+RETENTION_PROMOTION_GRACE_DAYS: Final = (
+    7  # Days rolled-up tiers are kept past the cutoff of the aggregation promoting them
+)
+
 # ────────────────────────────────────── Database Constants ───────────────────────────
 
 # Database filename
@@ -32,6 +32,7 @@ from .area import AllAreas, Area, AreaDeviceHandle, FloorAreas
 from .const import CONF_AREA_ID, CONF_AREAS, DEFAULT_NAME, DOMAIN, SAVE_INTERVAL
 from .data.analysis import run_full_analysis
 from .data.config import IntegrationConfig
+from .data.decay import tick_decays
 from .db import AreaOccupancyDB
 from .utils import format_area_names
 
@@ -1112,10 +1113,14 @@ class AreaOccupancyCoordinator(DataUpdateCoordinator[dict[str, Any]]):
             return
 
         # Tick decay for all areas to update state (e.g., stop decay when factor reaches zero)
-        # This must be done before refresh to ensure state transitions happen
-        for area in self.areas.values():
-            if area.config.decay.enabled:
-                area.tick_decay()
+        # This must be done before refresh to ensure state transitions happen.
+        # All areas are ticked in a single vectorized pass.
+        tick_decays(
+            entity.decay
+            for area in self.areas.values()
+            if area.config.decay.enabled
+            for entity in area.entities.entities.values()
+        )
 
         # Refresh the coordinator if decay is enabled for any area
         decay_enabled = any(area.config.decay.enabled for area in self.areas.values())
@@ -4,23 +4,33 @@ from __future__ import annotations
 
 from collections.abc import Awaitable
 from datetime import datetime, timedelta
+from functools import partial
 import logging
 import time
 from typing import TYPE_CHECKING
 
+import numpy as np
+
 from homeassistant.exceptions import HomeAssistantError
 from homeassistant.util import dt as dt_util
 
-from ..const import DEFAULT_LOOKBACK_DAYS, TIME_PRIOR_MAX_BOUND, TIME_PRIOR_MIN_BOUND
+from ..const import (
+    DEFAULT_LOOKBACK_DAYS,
+    TIME_PRIOR_MAX_BOUND,
+    TIME_PRIOR_MIN_BOUND,
+    TIME_PRIOR_SETTLE_HOURS,
+)
 from ..db.correlation import (
     CORRELATION_FAILURE_ERRORS,
     get_correlatable_entities_by_area,
 )
 from ..db.queries import (
     get_area_created_at,
+    get_occupied_interval_columns,
     get_occupied_intervals_cache_age_hours,
     is_occupied_intervals_cache_valid,
 )
+from ..db.retention import INTERVAL_AGGREGATION, NUMERIC_AGGREGATION
 from ..time_utils import ensure_timezone_aware, ensure_utc_datetime, to_local, to_utc
 from ..utils import format_area_names
 from .entity_type import InputType
@@ -39,17 +49,18 @@ async def run_full_analysis(
 
     This function orchestrates the complete analysis process:
     1. Sync states from recorder
-    2. Database health check and pruning
+    2. Database health check
     3. Sensor health check (per-entity anomalies → repair issues)
     4. Populate occupied intervals cache
     5. Run interval aggregation
     6. Run numeric aggregation
-    7. Recalculate priors for all areas
-    8. Run correlation analysis
-    9. Pipeline health check (per-area calc anomalies → repair issues)
-    10. Save data (preserve decay state before refresh)
-    11. Refresh coordinator
-    12. Save data (persist all changes)
+    7. Retention and compaction (after aggregation has promoted old rows)
+    8. Recalculate priors for all areas
+    9. Run correlation analysis
+    10. Pipeline health check (per-area calc anomalies → repair issues)
+    11. Save data (preserve decay state before refresh)
+    12. Refresh coordinator
+    13. Save data (persist all changes)
 
     Args:
         coordinator: The coordinator instance containing areas and database
@@ -63,7 +74,7 @@ async def run_full_analysis(
     analysis_start_time = time.perf_counter()
     failed_steps: list[str] = []
     cancelled = False
-    total_steps = 12
+    total_steps = 13
 
     async def _run_step(step_num: int, step_name: str, coro: Awaitable[None]) -> None:
         """Run a single analysis step with timing and error tracking."""
@@ -73,7 +84,7 @@ async def run_full_analysis(
         # to avoid a "coroutine was never awaited" warning. We don't append
         # to ``failed_steps`` because a clean cancellation isn't a failure
         # the caller should back off on, but we *do* set ``cancelled`` so
-        # the summary path can suppress the misleading "12/12 succeeded"
+        # the summary path can suppress the misleading "13/13 succeeded"
         # log line and skip writing ``_last_analysis_duration_ms`` (which
         # otherwise pollutes the slow-analysis health threshold with a
         # near-zero fast-skip duration).
@@ -104,7 +115,7 @@ async def run_full_analysis(
     async def _sync_states() -> None:
         await coordinator.db.sync_states()
 
-    async def _health_check_and_prune() -> None:
+    async def _health_check() -> None:
         health_ok = await coordinator.hass.async_add_executor_job(
             coordinator.db.periodic_health_check
         )
@@ -113,8 +124,25 @@ async def run_full_analysis(
                 "Database health check found issues for areas: %s",
                 format_area_names(coordinator),
             )
+
+    # Aggregations that completed in this run: only their tiers may be pruned
+    promoted: set[str] = set()
+
+    async def _interval_aggregation() -> None:
+        results = await run_interval_aggregation(coordinator, _now, return_results=True)
+        if results is not None:
+            promoted.add(INTERVAL_AGGREGATION)
+
+    async def _numeric_aggregation() -> None:
+        results = await run_numeric_aggregation(coordinator, _now, return_results=True)
+        if results is not None:
+            promoted.add(NUMERIC_AGGREGATION)
+
+    async def _retention() -> None:
         await coordinator.hass.async_add_executor_job(
-            coordinator.db.prune_old_intervals
+            partial(
+                coordinator.db.run_retention, now=_now, promoted=frozenset(promoted)
+            )
         )
 
     async def _sensor_health_check() -> None:
@@ -157,25 +185,22 @@ async def run_full_analysis(
 
     try:
         await _run_step(1, "sync_states", _sync_states())
-        await _run_step(2, "health_check_and_prune", _health_check_and_prune())
+        await _run_step(2, "database_health_check", _health_check())
         await _run_step(3, "sensor_health_check", _sensor_health_check())
         await _run_step(
             4,
             "populate_occupied_intervals_cache",
             ensure_occupied_intervals_cache(coordinator),
         )
-        await _run_step(
-            5, "interval_aggregation", run_interval_aggregation(coordinator, _now)
-        )
-        await _run_step(
-            6, "numeric_aggregation", run_numeric_aggregation(coordinator, _now)
-        )
-        await _run_step(7, "recalculate_priors", _recalculate_priors())
-        await _run_step(8, "correlation_analysis", _run_correlations())
-        await _run_step(9, "pipeline_health_check", _pipeline_health_check())
-        await _run_step(10, "save_data_before_refresh", _save_data())
-        await _run_step(11, "refresh_coordinator", _refresh())
-        await _run_step(12, "save_data_after_refresh", _save_data())
+        await _run_step(5, "interval_aggregation", _interval_aggregation())
+        await _run_step(6, "numeric_aggregation", _numeric_aggregation())
+        await _run_step(7, "retention_and_compaction", _retention())
+        await _run_step(8, "recalculate_priors", _recalculate_priors())
+        await _run_step(9, "correlation_analysis", _run_correlations())
+        await _run_step(10, "pipeline_health_check", _pipeline_health_check())
+        await _run_step(11, "save_data_before_refresh", _save_data())
+        await _run_step(12, "refresh_coordinator", _refresh())
+        await _run_step(13, "save_data_after_refresh", _save_data())
 
     except Exception as err:
         _LOGGER.error("Fatal error during analysis pipeline: %s", err)
@@ -316,6 +341,77 @@ async def start_prior_analysis(
         _LOGGER.error("Error during prior analysis for area %s: %s", area_name, e)
 
 
+def _local_hour_slots(
+    period_start_utc: datetime, period_end_utc: datetime
+) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Lay out the local wall-clock hour slots covering a period.
+
+    Walks the period exactly like ``PriorAnalyzer.calculate_time_priors``
+    (UTC iteration, DST fold aware) but only once per period instead of once
+    per occupied interval.
+
+    Returns:
+        ``(hour_starts, hour_ends, slot_index, iso_week)`` where the first two
+        are UTC epoch seconds, ``slot_index`` is ``day_of_week * 24 + hour``
+        and ``iso_week`` is ``iso_year * 100 + iso_week_number``.
+    """
+    hour_starts: list[float] = []
+    hour_ends: list[float] = []
+    slot_index: list[int] = []
+    iso_week: list[int] = []
+
+    current_utc = period_start_utc
+    while current_utc < period_end_utc:
+        current_local = to_local(current_utc)
+        fold = getattr(current_local, "fold", 0)
+        slot_start_local = current_local.replace(
+            minute=0, second=0, microsecond=0, fold=fold
+        )
+        slot_end_local = slot_start_local + timedelta(hours=1)
+
+        slot_start_utc = to_utc(slot_start_local)
+        slot_end_utc = to_utc(slot_end_local)
+        if slot_end_utc <= slot_start_utc:
+            break
+
+        year, week_number, _ = slot_start_local.isocalendar()
+        hour_starts.append(slot_start_utc.timestamp())
+        hour_ends.append(slot_end_utc.timestamp())
+        slot_index.append(slot_start_local.weekday() * 24 + slot_start_local.hour)
+        iso_week.append(year * 100 + week_number)
+
+        current_utc = slot_end_utc
+
+    return (
+        np.asarray(hour_starts, dtype=float),
+        np.asarray(hour_ends, dtype=float),
+        np.asarray(slot_index, dtype=np.int64),
+        np.asarray(iso_week, dtype=np.int64),
+    )
+
+
+def _covered_seconds(
+    starts: np.ndarray, ends: np.ndarray, points: np.ndarray
+) -> np.ndarray:
+    """Return the summed interval length lying before each point.
+
+    For sorted starts ``s`` and ends ``e`` the coverage before ``t`` is
+    ``sum(t - s_i for s_i <= t) - sum(t - e_j for e_j <= t)``, which two
+    ``searchsorted`` calls and prefix sums evaluate for all points at once.
+    Overlapping intervals are counted once per interval, matching the
+    per-interval loop of ``calculate_time_priors``.
+    """
+    starts = np.sort(starts)
+    ends = np.sort(ends)
+    start_sums = np.concatenate(([0.0], np.cumsum(starts)))
+    end_sums = np.concatenate(([0.0], np.cumsum(ends)))
+    n_started = np.searchsorted(starts, points, side="right")
+    n_ended = np.searchsorted(ends, points, side="right")
+    return (n_started * points - start_sums[n_started]) - (
+        n_ended * points - end_sums[n_ended]
+    )
+
+
 class PriorAnalyzer:
     """Analyzes historical data to calculate prior probabilities."""
 
@@ -604,11 +700,16 @@ class PriorAnalyzer:
 
             # 5. Calculate and save time priors
             try:
-                time_priors, data_points_per_slot = self.calculate_time_priors(
-                    occupied_intervals,
-                    first_interval_start,
-                    actual_period_end,
+                result = self.calculate_time_priors_from_cache(
+                    first_interval_start, actual_period_end
                 )
+                if result is None:
+                    result = self.calculate_time_priors(
+                        occupied_intervals,
+                        first_interval_start,
+                        actual_period_end,
+                    )
+                time_priors, data_points_per_slot = result
                 if time_priors:
                     success = self.db.save_time_priors(
                         area_name=self.area_name,
@@ -780,6 +881,163 @@ class PriorAnalyzer:
 
         return time_priors, data_points
 
+    def calculate_time_priors_from_cache(
+        self,
+        period_start: datetime,
+        period_end: datetime,
+    ) -> tuple[dict[tuple[int, int], float], dict[tuple[int, int], int]] | None:
+        """Calculate time priors from the occupied intervals cache.
+
+        Produces the same result as ``calculate_time_priors`` but reads the
+        intervals as epoch columns straight from ``OccupiedIntervalsCache``,
+        splits them across hour slots in one vectorized step and groups the
+        168 slots with ``np.bincount``. Occupied seconds of settled hours are
+        kept on the area's ``TimePriorAccumulator`` so later runs only read
+        intervals from the tail of the cache.
+
+        The period end is clamped to the cache's calculation date, since the
+        cache holds no occupancy after that point.
+
+        Returns:
+            Same tuple as ``calculate_time_priors``, or None if the cache has
+            no data for this area (callers fall back to the in-memory path).
+        """
+        accumulator = self.area.prior.time_prior_accumulator
+        accumulator.invalidate(
+            self.db.occupied_index.pop_changed(self.area_name),
+            self.db.occupied_index.generation,
+        )
+        period_start_utc = to_utc(period_start)
+        period_end_utc = to_utc(period_end)
+
+        hour_starts, hour_ends, slot_index, iso_week = _local_hour_slots(
+            period_start_utc, period_end_utc
+        )
+        if hour_starts.size == 0:
+            return None
+        start_ts = period_start_utc.timestamp()
+        end_ts = period_end_utc.timestamp()
+
+        # Settled hours form a prefix of the period (after the head hour that
+        # the period start may cut into); everything from the first unsettled
+        # hour onwards is recomputed from the tail of the cache.
+        keys = hour_starts.astype(np.int64).tolist()
+        settled_until = accumulator.settled_until
+        cached = np.array(
+            [accumulator.hours.get(key, np.nan) for key in keys], dtype=float
+        )
+        inside = (hour_starts >= start_ts) & (hour_ends <= end_ts)
+        reusable = inside & ~np.isnan(cached)
+        if settled_until is not None:
+            reusable &= hour_ends <= settled_until
+        else:
+            reusable[:] = False
+        first = 0 if inside[0] else 1
+        unsettled = np.flatnonzero(~reusable[first:])
+        first_missing = first + (
+            int(unsettled[0]) if unsettled.size else len(keys) - first
+        )
+        reuse = np.zeros(len(keys), dtype=bool)
+        reuse[first:first_missing] = True
+
+        since: datetime | None = None
+        head_end: datetime | None = None
+        if first_missing > first:
+            since_ts = (
+                hour_starts[first_missing] if first_missing < len(keys) else end_ts
+            )
+            since = datetime.fromtimestamp(since_ts, dt_util.UTC)
+            if first:
+                head_end = datetime.fromtimestamp(hour_ends[0], dt_util.UTC)
+
+        starts, ends, calculation_date = get_occupied_interval_columns(
+            self.db,
+            self.area_name,
+            period_start_utc,
+            period_end_utc,
+            since=since,
+            head_end=head_end,
+        )
+        if calculation_date is None:
+            return None
+        if calculation_date < period_end_utc:
+            end_ts = calculation_date.timestamp()
+            if end_ts <= start_ts:
+                return None
+            inside &= hour_ends <= end_ts
+            reuse &= inside
+            keep = hour_starts < end_ts
+            hour_starts, hour_ends = hour_starts[keep], hour_ends[keep]
+            slot_index, iso_week = slot_index[keep], iso_week[keep]
+            inside, reuse, cached = inside[keep], reuse[keep], cached[keep]
+            keys = keys[: int(keep.sum())]
+
+        latest_start = accumulator.last_interval_start if since is not None else None
+        if starts.size:
+            newest = float(starts.max())
+            latest_start = newest if latest_start is None else max(latest_start, newest)
+
+        # Clamp to the analysis period and shift to the period start so the
+        # prefix sums stay well inside float64 precision.
+        clipped_starts = np.maximum(starts, start_ts) - start_ts
+        clipped_ends = np.minimum(ends, end_ts) - start_ts
+        valid = clipped_starts < clipped_ends
+        clipped_starts, clipped_ends = clipped_starts[valid], clipped_ends[valid]
+
+        slot_from = np.maximum(hour_starts, start_ts) - start_ts
+        slot_to = np.minimum(hour_ends, end_ts) - start_ts
+        total_seconds = np.maximum(slot_to - slot_from, 0.0)
+        occupied_seconds = np.where(reuse, cached, 0.0)
+        compute = ~reuse & (total_seconds > 0)
+        if compute.any() and clipped_starts.size:
+            points = np.concatenate((slot_from[compute], slot_to[compute]))
+            covered = _covered_seconds(clipped_starts, clipped_ends, points)
+            split = int(compute.sum())
+            occupied_seconds[compute] = np.round(covered[split:] - covered[:split], 3)
+
+        slot_occupied = np.bincount(slot_index, weights=occupied_seconds, minlength=168)
+        slot_total = np.bincount(slot_index, weights=total_seconds, minlength=168)
+        # Distinct ISO weeks per slot, over hours that fall inside the period
+        populated = total_seconds > 0
+        slot_weeks = np.unique(slot_index[populated] * 1_000_000 + iso_week[populated])
+        weeks_per_slot = np.bincount(slot_weeks // 1_000_000, minlength=168)
+
+        time_priors: dict[tuple[int, int], float] = {}
+        data_points: dict[tuple[int, int], int] = {}
+        for slot in np.flatnonzero((slot_occupied > 0) & (slot_total > 0)).tolist():
+            slot_key = (slot // 24, slot % 24)
+            prior_value = float(slot_occupied[slot] / slot_total[slot])
+            time_priors[slot_key] = max(
+                TIME_PRIOR_MIN_BOUND, min(TIME_PRIOR_MAX_BOUND, prior_value)
+            )
+            data_points[slot_key] = int(weeks_per_slot[slot])
+
+        # Remember settled hours for the next run. Older hours drop out as the
+        # period start moves forward.
+        accumulator.hours.clear()
+        accumulator.last_interval_start = latest_start
+        if latest_start is None:
+            accumulator.settled_until = None
+        else:
+            accumulator.settled_until = min(
+                end_ts, latest_start - TIME_PRIOR_SETTLE_HOURS * 3600
+            )
+            settle = inside & (hour_ends <= accumulator.settled_until)
+            for idx in np.flatnonzero(settle).tolist():
+                accumulator.hours[keys[idx]] = float(occupied_seconds[idx])
+
+        _LOGGER.debug(
+            "Time priors calculated from cache for area %s: %d slots populated, "
+            "%d of %d hours reused, %d intervals read",
+            self.area_name,
+            len(time_priors),
+            int(reuse.sum()),
+            len(keys),
+            int(starts.size),
+        )
+
+        return time_priors, data_points
+
 
 async def ensure_occupied_intervals_cache(
     coordinator: AreaOccupancyCoordinator,
@@ -839,6 +1097,11 @@ async def ensure_occupied_intervals_cache(
                         "Failed to save OccupiedIntervalsCache for %s", area_name
                     )
 
+    # Recount cross-area transitions for the days the cache writers changed
+    await coordinator.hass.async_add_executor_job(
+        coordinator.db.update_transition_stats
+    )
+
 
 async def run_interval_aggregation(
     coordinator: AreaOccupancyCoordinator,
@@ -864,7 +1127,7 @@ async def run_interval_aggregation(
 
     try:
         results = await coordinator.hass.async_add_executor_job(
-            coordinator.db.run_interval_aggregation
+            coordinator.db.run_interval_aggregation, None, False, _now
         )
         area_names = format_area_names(coordinator)
         _LOGGER.debug(
@@ -909,7 +1172,7 @@ async def run_numeric_aggregation(
 
     try:
         results = await coordinator.hass.async_add_executor_job(
-            coordinator.db.run_numeric_aggregation
+            coordinator.db.run_numeric_aggregation, None, False, _now
         )
         area_names = format_area_names(coordinator)
         _LOGGER.debug(
@@ -2,9 +2,12 @@
 
 from __future__ import annotations
 
-from datetime import datetime
+from collections.abc import Iterable
+from datetime import datetime, time
 import logging
 
+import numpy as np
+
 from homeassistant.util import dt as dt_util
 
 from ..time_utils import to_local, to_utc
@@ -12,6 +15,16 @@ from .purpose import Purpose
 
 _LOGGER = logging.getLogger(__name__)
 
+# Decay factors below this are treated as fully decayed
+DECAY_MIN_FACTOR = 0.05
+
+
+def _parse_sleep_time(value: str | None) -> time | None:
+    """Parse an HH:MM:SS sleep boundary, returning None if unset."""
+    if not value:
+        return None
+    return datetime.strptime(value, "%H:%M:%S").time()
+
 
 class Decay:
     """Decay model for Area Occupancy Detection."""
@@ -44,8 +57,11 @@ class Decay:
         self._base_half_life = half_life
         self.is_decaying = is_decaying
         self._purpose = Purpose(purpose) if purpose is not None else None
-        self.sleep_start = sleep_start
-        self.sleep_end = sleep_end
+        self._sleep_start = sleep_start
+        self._sleep_end = sleep_end
+        # Parsed (start, end) sleep window, rebuilt only when a bound changes
+        self._sleep_window: tuple[time, time] | None = None
+        self._update_sleep_window()
 
     @property
     def purpose(self) -> Purpose | None:
@@ -53,43 +69,74 @@ class Decay:
         return self._purpose
 
     @property
-    def half_life(self) -> float:
-        """Return the effective half-life based on purpose and time of day."""
+    def sleep_start(self) -> str | None:
+        """Return the sleep start time string (HH:MM:SS)."""
+        return self._sleep_start
+
+    @sleep_start.setter
+    def sleep_start(self, value: str | None) -> None:
+        """Set the sleep start time and re-parse the sleep window."""
+        self._sleep_start = value
+        self._update_sleep_window()
+
+    @property
+    def sleep_end(self) -> str | None:
+        """Return the sleep end time string (HH:MM:SS)."""
+        return self._sleep_end
+
+    @sleep_end.setter
+    def sleep_end(self, value: str | None) -> None:
+        """Set the sleep end time and re-parse the sleep window."""
+        self._sleep_end = value
+        self._update_sleep_window()
+
+    def _update_sleep_window(self) -> None:
+        """Parse the sleep window once so half_life does no string parsing."""
+        self._sleep_window = None
+        # Sleep times only matter for purposes with a separate awake half-life
+        if self._purpose is None or self._purpose.awake_half_life is None:
+            return
+        try:
+            start_time = _parse_sleep_time(self._sleep_start)
+            end_time = _parse_sleep_time(self._sleep_end)
+        except (ValueError, TypeError):
+            _LOGGER.exception("Error parsing sleep window for sleeping purpose")
+            return
+        if start_time is not None and end_time is not None:
+            self._sleep_window = (start_time, end_time)
+
+    def half_life_at(self, current_time: time) -> float:
+        """Return the effective half-life for a local wall-clock time."""
         # If no purpose or purpose has no awake_half_life, use base half-life
         if self._purpose is None or self._purpose.awake_half_life is None:
             return self._base_half_life
 
-        # If sleep times are not configured, use base half-life
-        if not self.sleep_start or not self.sleep_end:
+        # If sleep times are not configured (or invalid), use base half-life
+        if self._sleep_window is None:
             return self._base_half_life
 
-        try:
-            # Parse sleep times
-            now = to_local(dt_util.utcnow())
-            start_time = datetime.strptime(self.sleep_start, "%H:%M:%S").time()
-            end_time = datetime.strptime(self.sleep_end, "%H:%M:%S").time()
-
-            current_time = now.time()
-
-            # Check if current time is within sleep window
-            is_sleeping = False
-            if start_time <= end_time:
-                # Same day window (e.g., 13:00 to 15:00)
-                is_sleeping = start_time <= current_time <= end_time
-            else:
-                # Overnight window (e.g., 23:00 to 07:00)
-                is_sleeping = current_time >= start_time or current_time <= end_time
-
-            if is_sleeping:
-                # Use the configured half-life (should be high for sleeping)
-                return self._base_half_life
-        except (ValueError, TypeError):
-            _LOGGER.exception("Error calculating half-life for sleeping purpose")
+        start_time, end_time = self._sleep_window
+        if start_time <= end_time:
+            # Same day window (e.g., 13:00 to 15:00)
+            is_sleeping = start_time <= current_time <= end_time
+        else:
+            # Overnight window (e.g., 23:00 to 07:00)
+            is_sleeping = current_time >= start_time or current_time <= end_time
+
+        if is_sleeping:
+            # Use the configured half-life (should be high for sleeping)
             return self._base_half_life
 
         # Outside sleep window, use the purpose's awake half-life
         return self._purpose.awake_half_life
 
+    @property
+    def half_life(self) -> float:
+        """Return the effective half-life based on purpose and time of day."""
+        if self._sleep_window is None:
+            return self._base_half_life
+        return self.half_life_at(to_local(dt_util.utcnow()).time())
+
     @property
     def decay_factor(self) -> float:
         """Freshness of last motion edge ∈[0,1].
@@ -122,7 +169,7 @@ class Decay:
 
         factor = float(0.5 ** (age / self.half_life))
         # Return 0.0 when factor drops below practical threshold
-        if factor < 0.05:
+        if factor < DECAY_MIN_FACTOR:
             return 0.0
         return factor
 
@@ -154,3 +201,56 @@ class Decay:
         """Stop decay **only if already running**."""
         if self.is_decaying:
             self.is_decaying = False
+
+
+def tick_decays(decays: Iterable[Decay], now: datetime | None = None) -> int:
+    """Tick many decay models in one vectorized pass.
+
+    Equivalent to calling ``Decay.tick()`` on each model, but the current
+    time, local wall-clock time and the factors of all decaying models are
+    computed once with numpy instead of per entity.
+
+    Args:
+        decays: Decay models to tick (non-decaying ones are skipped).
+        now: Reference time, defaults to the current UTC time.
+
+    Returns:
+        Number of models whose decay was stopped.
+    """
+    active = [decay for decay in decays if decay.is_decaying]
+    if not active:
+        return 0
+
+    now = to_utc(now) if now is not None else dt_util.utcnow()
+    current_time = to_local(now).time()
+    now_ts = now.timestamp()
+
+    ages = now_ts - np.fromiter(
+        (decay.decay_start.timestamp() for decay in active),
+        dtype=float,
+        count=len(active),
+    )
+    half_lives = np.fromiter(
+        (decay.half_life_at(current_time) for decay in active),
+        dtype=float,
+        count=len(active),
+    )
+
+    # Negative age (decay_start in future) means no decay has occurred yet
+    started = ages >= 0
+    invalid = started & (half_lives <= 0)
+    if invalid.any():
+        _LOGGER.warning(
+            "Invalid half_life values detected for %d decaying entities, "
+            "treating as immediate decay",
+            int(invalid.sum()),
+        )
+    # A negative half-life overflows; those models are already marked invalid
+    with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+        factors = np.power(0.5, np.maximum(ages, 0.0) / half_lives)
+    expired = invalid | (started & (factors < DECAY_MIN_FACTOR))
+
+    stopped = np.flatnonzero(expired)
+    for idx in stopped.tolist():
+        active[idx].is_decaying = False
+    return int(stopped.size)
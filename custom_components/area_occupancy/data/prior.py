@@ -38,6 +38,50 @@ SIGNIFICANT_CHANGE_THRESHOLD = 0.1
 DEFAULT_SLOT_MINUTES = 60
 
 
+class TimePriorAccumulator:
+    """Occupied seconds per settled local hour slot, reused across prior runs.
+
+    Keys are the UTC epoch second at which a local wall-clock hour starts.
+    Only hours fully inside an earlier analysis period and older than
+    ``settled_until`` are kept, so incremental runs only need to read
+    occupied intervals from the tail of the cache.
+
+    The settled hours are only valid while the cache rows they were read from
+    are unchanged: the accumulator is reset when the cache is rebuilt, or is
+    rewritten from before ``settled_until`` (e.g. by a history backfill).
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty accumulator."""
+        self.hours: dict[int, float] = {}
+        self.settled_until: float | None = None
+        self.last_interval_start: float | None = None
+        # OccupiedIntervalIndex.generation the settled hours were read under
+        self.cache_generation: int | None = None
+
+    def reset(self) -> None:
+        """Forget all settled hours (forces a full recalculation)."""
+        self.hours.clear()
+        self.settled_until = None
+        self.last_interval_start = None
+        self.cache_generation = None
+
+    def invalidate(self, changed_from: datetime | None, generation: int) -> None:
+        """Reset if the cache changed underneath the settled hours.
+
+        Args:
+            changed_from: Earliest changed cache start since the last run, if any
+            generation: Current ``OccupiedIntervalIndex.generation``
+        """
+        if self.cache_generation != generation or (
+            changed_from is not None
+            and self.settled_until is not None
+            and changed_from.timestamp() < self.settled_until
+        ):
+            self.reset()
+        self.cache_generation = generation
+
+
 class Prior:
     """Compute the baseline probability for an Area entity."""
 
@@ -74,6 +118,8 @@ class Prior:
         self._last_updated: datetime | None = None
         # Cache for all 168 time priors: (day_of_week, time_slot) -> prior_value
         self._cached_time_priors: dict[tuple[int, int], float] | None = None
+        # Incremental time prior state (see PriorAnalyzer.calculate_time_priors_from_cache)
+        self.time_prior_accumulator = TimePriorAccumulator()
 
     @property
     def value(self) -> float:
@@ -205,6 +251,7 @@ class Prior:
         """
         _LOGGER.debug("Clearing all caches for area: %s", self.area_name)
         self._invalidate_time_prior_cache()
+        self.time_prior_accumulator.reset()
         # Also clear global_prior and last_updated to release references
         self.global_prior = None
         self._last_updated = None
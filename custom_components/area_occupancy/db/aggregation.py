@@ -23,13 +23,12 @@ from ..const import (
     AGGREGATION_PERIOD_WEEKLY,
     RETENTION_DAILY_AGGREGATES_DAYS,
     RETENTION_HOURLY_NUMERIC_DAYS,
-    RETENTION_MONTHLY_AGGREGATES_YEARS,
     RETENTION_RAW_INTERVALS_DAYS,
     RETENTION_RAW_NUMERIC_SAMPLES_DAYS,
     RETENTION_WEEKLY_AGGREGATES_DAYS,
-    RETENTION_WEEKLY_NUMERIC_YEARS,
 )
 from ..time_utils import from_db_utc, to_db_utc, to_local
+from .retention import TIERS_BY_NAME, prune_tier
 from .utils import batched_delete_by_ids
 
 if TYPE_CHECKING:
@@ -43,13 +42,14 @@ MINUTES_PER_DAY = HOURS_PER_DAY * MINUTES_PER_HOUR
 
 
 def aggregate_raw_to_daily(
-    db: AreaOccupancyDB, area_name: str | None = None
+    db: AreaOccupancyDB, area_name: str | None = None, now: datetime | None = None
 ) -> tuple[int, list[int]]:
     """Aggregate raw intervals to daily aggregates.
 
     Args:
         db: Database instance
         area_name: Optional area name to filter by. If None, processes all areas.
+        now: Reference time for the aggregation cutoffs (defaults to utcnow)
 
     Returns:
         Tuple of (number of daily aggregates created, list of created aggregate IDs)
@@ -60,7 +60,7 @@ def aggregate_raw_to_daily(
         with db.get_session() as session:
             # Calculate cutoff date (30 days ago)
             cutoff_date = to_db_utc(
-                dt_util.utcnow() - timedelta(days=RETENTION_RAW_INTERVALS_DAYS)
+                (now or dt_util.utcnow()) - timedelta(days=RETENTION_RAW_INTERVALS_DAYS)
             )
 
             # Find raw intervals older than cutoff that haven't been aggregated yet
@@ -199,6 +199,7 @@ def aggregate_daily_to_weekly(
     db: AreaOccupancyDB,
     area_name: str | None = None,
     exclude_daily_ids: set[int] | None = None,
+    now: datetime | None = None,
 ) -> tuple[int, list[int]]:
     """Aggregate daily aggregates to weekly aggregates.
 
@@ -207,6 +208,7 @@ def aggregate_daily_to_weekly(
         area_name: Optional area name to filter by. If None, processes all areas.
         exclude_daily_ids: Optional set of daily aggregate IDs to exclude from aggregation.
                           Used to prevent cascading aggregation in the same run.
+        now: Reference time for the aggregation cutoffs (defaults to utcnow)
 
     Returns:
         Tuple of (number of weekly aggregates created, list of created aggregate IDs)
@@ -217,7 +219,8 @@ def aggregate_daily_to_weekly(
         with db.get_session() as session:
             # Calculate cutoff date (90 days ago)
             cutoff_date = to_db_utc(
-                dt_util.utcnow() - timedelta(days=RETENTION_DAILY_AGGREGATES_DAYS)
+                (now or dt_util.utcnow())
+                - timedelta(days=RETENTION_DAILY_AGGREGATES_DAYS)
             )
 
             # Find daily aggregates older than cutoff
@@ -363,6 +366,7 @@ def aggregate_weekly_to_monthly(
     db: AreaOccupancyDB,
     area_name: str | None = None,
     exclude_weekly_ids: set[int] | None = None,
+    now: datetime | None = None,
 ) -> int:
     """Aggregate weekly aggregates to monthly aggregates.
 
@@ -371,6 +375,7 @@ def aggregate_weekly_to_monthly(
         area_name: Optional area name to filter by. If None, processes all areas.
         exclude_weekly_ids: Optional set of weekly aggregate IDs to exclude from aggregation.
                           Used to prevent cascading aggregation in the same run.
+        now: Reference time for the aggregation cutoffs (defaults to utcnow)
 
     Returns:
         Number of monthly aggregates created
@@ -381,7 +386,8 @@ def aggregate_weekly_to_monthly(
         with db.get_session() as session:
             # Calculate cutoff date (365 days ago)
             cutoff_date = to_db_utc(
-                dt_util.utcnow() - timedelta(days=RETENTION_WEEKLY_AGGREGATES_DAYS)
+                (now or dt_util.utcnow())
+                - timedelta(days=RETENTION_WEEKLY_AGGREGATES_DAYS)
             )
 
             # Find weekly aggregates older than cutoff
@@ -532,7 +538,10 @@ def aggregate_weekly_to_monthly(
 
 
 def run_interval_aggregation(
-    db: AreaOccupancyDB, area_name: str | None = None, force: bool = False
+    db: AreaOccupancyDB,
+    area_name: str | None = None,
+    force: bool = False,
+    now: datetime | None = None,
 ) -> dict[str, int]:
     """Run the full tiered aggregation process for intervals.
 
@@ -540,6 +549,7 @@ def run_interval_aggregation(
         db: Database instance
         area_name: Optional area name to filter by. If None, processes all areas.
         force: If True, run aggregation even if recently run
+        now: Reference time for the aggregation cutoffs (defaults to utcnow)
 
     Returns:
         Dictionary with counts of aggregates created at each level
@@ -556,18 +566,24 @@ def run_interval_aggregation(
 
     try:
         # Step 1: Aggregate raw to daily
-        daily_count, daily_ids = aggregate_raw_to_daily(db, area_name)
+        daily_count, daily_ids = aggregate_raw_to_daily(db, area_name, now)
         results["daily"] = daily_count
 
         # Step 2: Aggregate daily to weekly (exclude daily aggregates created in step 1)
         weekly_count, weekly_ids = aggregate_daily_to_weekly(
-            db, area_name, exclude_daily_ids=set(daily_ids) if daily_ids else None
+            db,
+            area_name,
+            exclude_daily_ids=set(daily_ids) if daily_ids else None,
+            now=now,
         )
         results["weekly"] = weekly_count
 
         # Step 3: Aggregate weekly to monthly (exclude weekly aggregates created in step 2)
         results["monthly"] = aggregate_weekly_to_monthly(
-            db, area_name, exclude_weekly_ids=set(weekly_ids) if weekly_ids else None
+            db,
+            area_name,
+            exclude_weekly_ids=set(weekly_ids) if weekly_ids else None,
+            now=now,
         )
 
         _LOGGER.debug(
@@ -604,66 +620,19 @@ def prune_old_aggregates(
     """
     _LOGGER.debug("Pruning old aggregates for area: %s", area_name or "all areas")
 
-    results = {
-        "daily": 0,
-        "weekly": 0,
-        "monthly": 0,
-    }
-
     try:
-        with db.get_session() as session:
-            now = dt_util.utcnow()
-
-            # Prune daily aggregates older than retention period
-            daily_cutoff = to_db_utc(
-                now - timedelta(days=RETENTION_DAILY_AGGREGATES_DAYS)
-            )
-            daily_query = session.query(db.IntervalAggregates).filter(
-                db.IntervalAggregates.aggregation_period == AGGREGATION_PERIOD_DAILY,
-                db.IntervalAggregates.period_start < daily_cutoff,
-            )
-            if area_name:
-                daily_query = daily_query.filter(
-                    db.IntervalAggregates.area_name == area_name
-                )
-            results["daily"] = daily_query.delete(synchronize_session=False)
-
-            # Prune weekly aggregates older than retention period
-            weekly_cutoff = to_db_utc(
-                now - timedelta(days=RETENTION_WEEKLY_AGGREGATES_DAYS)
-            )
-            weekly_query = session.query(db.IntervalAggregates).filter(
-                db.IntervalAggregates.aggregation_period == AGGREGATION_PERIOD_WEEKLY,
-                db.IntervalAggregates.period_start < weekly_cutoff,
-            )
-            if area_name:
-                weekly_query = weekly_query.filter(
-                    db.IntervalAggregates.area_name == area_name
-                )
-            results["weekly"] = weekly_query.delete(synchronize_session=False)
-
-            # Prune monthly aggregates older than retention period
-            monthly_cutoff = to_db_utc(
-                now - timedelta(days=RETENTION_MONTHLY_AGGREGATES_YEARS * 365)
-            )
-            monthly_query = session.query(db.IntervalAggregates).filter(
-                db.IntervalAggregates.aggregation_period == AGGREGATION_PERIOD_MONTHLY,
-                db.IntervalAggregates.period_start < monthly_cutoff,
-            )
-            if area_name:
-                monthly_query = monthly_query.filter(
-                    db.IntervalAggregates.area_name == area_name
-                )
-            results["monthly"] = monthly_query.delete(synchronize_session=False)
-
-            session.commit()
-
-            _LOGGER.info(
-                "Pruned old aggregates: %d daily, %d weekly, %d monthly",
-                results["daily"],
-                results["weekly"],
-                results["monthly"],
-            )
+        now = dt_util.utcnow()
+        results = {
+            level: prune_tier(db, TIERS_BY_NAME[f"interval_{level}"], area_name, now)
+            for level in ("daily", "weekly", "monthly")
+        }
+
+        _LOGGER.info(
+            "Pruned old aggregates: %d daily, %d weekly, %d monthly",
+            results["daily"],
+            results["weekly"],
+            results["monthly"],
+        )
 
     except (
         SQLAlchemyError,
@@ -691,28 +660,15 @@ def prune_old_numeric_samples(db: AreaOccupancyDB, area_name: str | None = None)
     _LOGGER.debug("Pruning old numeric samples for area: %s", area_name or "all areas")
 
     try:
-        with db.get_session() as session:
-            cutoff_date = to_db_utc(
-                dt_util.utcnow() - timedelta(days=RETENTION_RAW_NUMERIC_SAMPLES_DAYS)
-            )
-
-            query = session.query(db.NumericSamples).filter(
-                db.NumericSamples.timestamp < cutoff_date
-            )
-
-            if area_name:
-                query = query.filter(db.NumericSamples.area_name == area_name)
+        deleted_count = prune_tier(db, TIERS_BY_NAME["numeric_samples"], area_name)
 
-            deleted_count = query.delete(synchronize_session=False)
-            session.commit()
-
-            _LOGGER.info(
-                "Pruned %d old numeric samples for area: %s",
-                deleted_count,
-                area_name or "all areas",
-            )
+        _LOGGER.info(
+            "Pruned %d old numeric samples for area: %s",
+            deleted_count,
+            area_name or "all areas",
+        )
 
-            return deleted_count
+        return deleted_count
 
     except (
         SQLAlchemyError,
@@ -726,13 +682,14 @@ def prune_old_numeric_samples(db: AreaOccupancyDB, area_name: str | None = None)
 
 
 def aggregate_numeric_samples_to_hourly(
-    db: AreaOccupancyDB, area_name: str | None = None
+    db: AreaOccupancyDB, area_name: str | None = None, now: datetime | None = None
 ) -> tuple[int, list[int]]:
     """Aggregate raw numeric samples to hourly aggregates.
 
     Args:
         db: Database instance
         area_name: Optional area name to filter by. If None, processes all areas.
+        now: Reference time for the aggregation cutoffs (defaults to utcnow)
 
     Returns:
         Tuple of (number of hourly aggregates created, list of created aggregate IDs)
@@ -745,7 +702,8 @@ def aggregate_numeric_samples_to_hourly(
         with db.get_session() as session:
             # Calculate cutoff date
             cutoff_date = to_db_utc(
-                dt_util.utcnow() - timedelta(days=RETENTION_RAW_NUMERIC_SAMPLES_DAYS)
+                (now or dt_util.utcnow())
+                - timedelta(days=RETENTION_RAW_NUMERIC_SAMPLES_DAYS)
             )
 
             # Find raw samples older than cutoff
@@ -875,6 +833,7 @@ def aggregate_hourly_to_weekly(
     db: AreaOccupancyDB,
     area_name: str | None = None,
     exclude_hourly_ids: set[int] | None = None,
+    now: datetime | None = None,
 ) -> tuple[int, list[int]]:
     """Aggregate hourly aggregates to weekly aggregates.
 
@@ -883,6 +842,7 @@ def aggregate_hourly_to_weekly(
         area_name: Optional area name to filter by. If None, processes all areas.
         exclude_hourly_ids: Optional set of hourly aggregate IDs to exclude from aggregation.
                           Used to prevent cascading aggregation in the same run.
+        now: Reference time for the aggregation cutoffs (defaults to utcnow)
 
     Returns:
         Tuple of (number of weekly aggregates created, list of created aggregate IDs)
@@ -893,7 +853,8 @@ def aggregate_hourly_to_weekly(
         with db.get_session() as session:
             # Calculate cutoff date
             cutoff_date = to_db_utc(
-                dt_util.utcnow() - timedelta(days=RETENTION_HOURLY_NUMERIC_DAYS)
+                (now or dt_util.utcnow())
+                - timedelta(days=RETENTION_HOURLY_NUMERIC_DAYS)
             )
 
             # Find hourly aggregates older than cutoff
@@ -1054,7 +1015,10 @@ def aggregate_hourly_to_weekly(
 
 
 def run_numeric_aggregation(
-    db: AreaOccupancyDB, area_name: str | None = None, force: bool = False
+    db: AreaOccupancyDB,
+    area_name: str | None = None,
+    force: bool = False,
+    now: datetime | None = None,
 ) -> dict[str, int]:
     """Run the full tiered aggregation process for numeric samples.
 
@@ -1062,6 +1026,7 @@ def run_numeric_aggregation(
         db: Database instance
         area_name: Optional area name to filter by. If None, processes all areas.
         force: If True, run aggregation even if recently run
+        now: Reference time for the aggregation cutoffs (defaults to utcnow)
 
     Returns:
         Dictionary with counts of aggregates created at each level
@@ -1077,12 +1042,17 @@ def run_numeric_aggregation(
 
     try:
         # Step 1: Aggregate raw samples to hourly
-        hourly_count, hourly_ids = aggregate_numeric_samples_to_hourly(db, area_name)
+        hourly_count, hourly_ids = aggregate_numeric_samples_to_hourly(
+            db, area_name, now
+        )
         results["hourly"] = hourly_count
 
         # Step 2: Aggregate hourly to weekly (exclude hourly aggregates created in step 1)
         weekly_count, _ = aggregate_hourly_to_weekly(
-            db, area_name, exclude_hourly_ids=set(hourly_ids) if hourly_ids else None
+            db,
+            area_name,
+            exclude_hourly_ids=set(hourly_ids) if hourly_ids else None,
+            now=now,
         )
         results["weekly"] = weekly_count
 
@@ -1121,50 +1091,18 @@ def prune_old_numeric_aggregates(
         "Pruning old numeric aggregates for area: %s", area_name or "all areas"
     )
 
-    results = {
-        "hourly": 0,
-        "weekly": 0,
-    }
-
     try:
-        with db.get_session() as session:
-            now = dt_util.utcnow()
-
-            # Prune hourly aggregates older than retention period
-            hourly_cutoff = to_db_utc(
-                now - timedelta(days=RETENTION_HOURLY_NUMERIC_DAYS)
-            )
-            hourly_query = session.query(db.NumericAggregates).filter(
-                db.NumericAggregates.aggregation_period == AGGREGATION_PERIOD_HOURLY,
-                db.NumericAggregates.period_start < hourly_cutoff,
-            )
-            if area_name:
-                hourly_query = hourly_query.filter(
-                    db.NumericAggregates.area_name == area_name
-                )
-            results["hourly"] = hourly_query.delete(synchronize_session=False)
-
-            # Prune weekly aggregates older than retention period
-            weekly_cutoff = to_db_utc(
-                now - timedelta(days=RETENTION_WEEKLY_NUMERIC_YEARS * 365)
-            )
-            weekly_query = session.query(db.NumericAggregates).filter(
-                db.NumericAggregates.aggregation_period == AGGREGATION_PERIOD_WEEKLY,
-                db.NumericAggregates.period_start < weekly_cutoff,
-            )
-            if area_name:
-                weekly_query = weekly_query.filter(
-                    db.NumericAggregates.area_name == area_name
-                )
-            results["weekly"] = weekly_query.delete(synchronize_session=False)
-
-            session.commit()
-
-            _LOGGER.info(
-                "Pruned old numeric aggregates: %d hourly, %d weekly",
-                results["hourly"],
-                results["weekly"],
-            )
+        now = dt_util.utcnow()
+        results = {
+            level: prune_tier(db, TIERS_BY_NAME[f"numeric_{level}"], area_name, now)
+            for level in ("hourly", "weekly")
+        }
+
+        _LOGGER.info(
+            "Pruned old numeric aggregates: %d hourly, %d weekly",
+            results["hourly"],
+            results["weekly"],
+        )
 
     except (
         SQLAlchemyError,
@@ -3,7 +3,7 @@
 from __future__ import annotations
 
 from contextlib import contextmanager
-from datetime import datetime
+from datetime import datetime, timedelta
 import inspect
 import logging
 import os
@@ -24,14 +24,17 @@ from ..const import (
     DEFAULT_ENABLE_PERIODIC_BACKUPS,
     DEFAULT_LOOKBACK_DAYS,
     DEFAULT_MAX_RECOVERY_ATTEMPTS,
+    DEFAULT_MOTION_TIMEOUT,
 )
 from . import (
     aggregation,
     correlation,
     maintenance,
+    occupied_cache,
     operations,
     queries,
     relationships,
+    retention,
     sync,
     utils,
 )
@@ -89,6 +92,9 @@ def _create_delegated_methods() -> dict[str, Any]:
         "get_global_prior": queries.get_global_prior,
         "get_occupied_intervals_cache": queries.get_occupied_intervals_cache,
         "is_occupied_intervals_cache_valid": queries.is_occupied_intervals_cache_valid,
+        # Occupied intervals cache maintenance
+        "update_occupied_intervals_cache": occupied_cache.update_occupied_intervals_cache,
+        "check_occupied_intervals_cache": occupied_cache.check_occupied_intervals_cache,
         # Sync methods
         "sync_states": sync.sync_states,
         # Aggregation methods
@@ -102,6 +108,9 @@ def _create_delegated_methods() -> dict[str, Any]:
         "prune_old_aggregates": aggregation.prune_old_aggregates,
         "prune_old_numeric_samples": aggregation.prune_old_numeric_samples,
         "prune_old_numeric_aggregates": aggregation.prune_old_numeric_aggregates,
+        # Retention methods
+        "run_retention": retention.run_retention,
+        "reclaim_free_pages": retention.reclaim_free_pages,
         # Correlation methods
         "analyze_correlation": correlation.analyze_correlation,
         "save_correlation_result": correlation.save_correlation_result,
@@ -115,6 +124,8 @@ def _create_delegated_methods() -> dict[str, Any]:
         "get_influence_weight": relationships.get_influence_weight,
         "calculate_adjacent_influence": relationships.calculate_adjacent_influence,
         "sync_adjacent_areas_from_config": relationships.sync_adjacent_areas_from_config,
+        "update_transition_stats": relationships.update_transition_stats,
+        "get_area_transitions": relationships.get_area_transitions,
     }
 
 
@@ -192,6 +203,18 @@ class AreaOccupancyDB:
         self.last_area_save_ts: float = 0.0
         self.last_entities_save_ts: float = 0.0
         self._save_debounce_seconds: float = 1.5
+        # Timing and row counts of the most recent recorder sync (diagnostics)
+        self.last_sync_stats: dict[str, Any] = {}
+        # Fingerprints of the area/entity rows last written by save_data, used
+        # to skip unchanged rows, plus the entity set seen by the last save
+        self.saved_row_hashes: dict[tuple[str, ...], int] = {}
+        self.saved_entity_keys: frozenset[tuple[str, str]] = frozenset()
+        # Timing and row counts of the most recent save_data (diagnostics)
+        self.last_save_stats: dict[str, Any] = {}
+        # Rows deleted and bytes reclaimed by the last retention run (diagnostics)
+        self.last_retention_stats: dict[str, Any] = {}
+        # Hot window of the occupied intervals cache, kept in memory
+        self.occupied_index = occupied_cache.OccupiedIntervalIndex()
 
     def _setup_delegation(self) -> None:
         """Set up delegation mapping for pure wrapper methods."""
@@ -320,20 +343,34 @@ class AreaOccupancyDB:
         self,
         area_name: str,
         start_time: datetime | None = None,
-        motion_timeout: int = 300,  # Default 5 min if not specified
+        motion_timeout: int = DEFAULT_MOTION_TIMEOUT,
     ) -> list[tuple[datetime, datetime]]:
-        """Get raw occupied intervals from motion sensors only (without using cache).
+        """Get occupied intervals from presence sensors.
 
         This delegates to queries.get_occupied_intervals but adapts arguments
-        to match what PriorAnalyzer expects. Occupied intervals are determined
-        exclusively by motion sensors. All motion sensors for the area are
-        automatically included in the query. The end time is always the current time.
+        to match what PriorAnalyzer expects. All presence sensors for the area
+        are automatically included in the query. The end time is always the
+        current time.
+
+        When the lookback lies inside the in-memory window of the incrementally
+        maintained cache (which is computed with the default motion timeout),
+        the intervals are served from memory and no union query runs.
         """
         # Determine lookback days if start_time provided
         lookback_days = DEFAULT_LOOKBACK_DAYS  # default
         if start_time:
             lookback_days = (dt_util.utcnow() - start_time).days + 1
 
+        if motion_timeout == DEFAULT_MOTION_TIMEOUT:
+            indexed = occupied_cache.get_indexed_occupied_intervals(
+                self,
+                area_name,
+                dt_util.utcnow() - timedelta(days=lookback_days),
+                overlap=False,
+            )
+            if indexed is not None:
+                return indexed
+
         return queries.get_occupied_intervals(
             self,
             self.coordinator.entry_id,
@@ -395,3 +432,7 @@ class AreaOccupancyDB:
     def update_session_maker(self) -> None:
         """Update the session maker after engine changes (e.g., recovery/restore)."""
         self._session_maker = create_sessionmaker(bind=self.engine)
+        # The database content may have changed underneath the in-memory state
+        self.saved_row_hashes.clear()
+        self.saved_entity_keys = frozenset()
+        self.occupied_index.invalidate()
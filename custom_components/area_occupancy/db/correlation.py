@@ -14,6 +14,7 @@ from typing import TYPE_CHECKING, Any
 import warnings
 
 import numpy as np
+import sqlalchemy as sa
 from sqlalchemy.exc import SQLAlchemyError
 
 from homeassistant.util import dt as dt_util
@@ -30,6 +31,7 @@ from ..data.entity_type import CorrelationType, InputType
 from ..time_utils import from_db_utc, to_db_utc, to_local, to_utc
 from ..utils import clamp_probability, map_binary_state_to_semantic
 from .utils import (
+    epoch_seconds,
     get_occupied_intervals_for_analysis,
     is_timestamp_in_prepared_intervals,
     prepare_occupied_intervals,
@@ -249,76 +251,336 @@ def convert_intervals_to_samples(
     return samples
 
 
-def convert_hourly_aggregates_to_samples(
+def load_numeric_sample_columns(
     db: AreaOccupancyDB,
     area_name: str,
-    entity_id: str,
+    entity_ids: list[str],
     period_start: datetime,
     period_end: datetime,
     session: Any,
-) -> list[SimpleSample]:
-    """Convert hourly numeric aggregates to sample objects.
-
-    For numeric sensors, creates samples from hourly aggregates using avg_value
-    as the representative value for each hour. Uses hour midpoint as timestamp.
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Load numeric samples for several entities as parallel numpy columns.
 
-    Args:
-        db: Database instance
-        area_name: Area name
-        entity_id: Entity ID
-        period_start: Analysis period start
-        period_end: Analysis period end
-        session: Database session
+    Raw ``NumericSamples`` cover the raw-retention window and hourly
+    aggregates (at their clamped midpoints, using ``avg_value``) cover the
+    older part of the period. Timestamps are converted to epoch seconds in SQL, so no ORM or
+    datetime objects are created per row.
 
     Returns:
-        List of SimpleSample objects created from hourly aggregates
+        ``(entity_index, timestamps, values)`` where ``entity_index`` indexes
+        into ``entity_ids`` and rows are sorted by (entity, timestamp).
     """
-    # Runtime comparisons use aware UTC; DB filters use naive UTC
+    entity_pos = {entity_id: idx for idx, entity_id in enumerate(entity_ids)}
     period_start_utc = to_utc(period_start)
     period_end_utc = to_utc(period_end)
-    period_start_db = to_db_utc(period_start_utc)
-    period_end_db = to_db_utc(period_end_utc)
+    retention_cutoff = period_end_utc - timedelta(
+        days=RETENTION_RAW_NUMERIC_SAMPLES_DAYS
+    )
+    recent_start = max(period_start_utc, retention_cutoff)
+
+    entity_col: list[int] = []
+    ts_col: list[float] = []
+    value_col: list[float] = []
+
+    samples = db.NumericSamples
+    rows = session.execute(
+        sa.select(
+            samples.entity_id, epoch_seconds(samples.timestamp), samples.value
+        ).where(
+            samples.entry_id == db.coordinator.entry_id,
+            samples.area_name == area_name,
+            samples.entity_id.in_(entity_ids),
+            samples.timestamp >= to_db_utc(recent_start),
+            samples.timestamp <= to_db_utc(period_end_utc),
+        )
+    ).all()
+    for entity_id, ts, value in rows:
+        entity_col.append(entity_pos[entity_id])
+        ts_col.append(ts)
+        value_col.append(value)
+
+    if period_start_utc < retention_cutoff:
+        historical_end = min(period_end_utc, retention_cutoff)
+        aggs = db.NumericAggregates
+        agg_rows = session.execute(
+            sa.select(
+                aggs.entity_id,
+                epoch_seconds(aggs.period_start),
+                epoch_seconds(aggs.period_end),
+                aggs.avg_value,
+            ).where(
+                aggs.entry_id == db.coordinator.entry_id,
+                aggs.area_name == area_name,
+                aggs.entity_id.in_(entity_ids),
+                aggs.aggregation_period == AGGREGATION_PERIOD_HOURLY,
+                aggs.period_start < to_db_utc(historical_end),
+                aggs.period_end > to_db_utc(period_start_utc),
+            )
+        ).all()
+        if agg_rows:
+            agg_entity = np.fromiter(
+                (entity_pos[row[0]] for row in agg_rows), dtype=np.int64
+            )
+            agg = np.array([row[1:] for row in agg_rows], dtype=float)
+            # Clamp each aggregate to the historical window, use its midpoint
+            lo = np.maximum(agg[:, 0], period_start_utc.timestamp())
+            hi = np.minimum(agg[:, 1], historical_end.timestamp())
+            midpoints = lo + (hi - lo) / 2
+            keep = (midpoints >= period_start_utc.timestamp()) & (
+                midpoints <= historical_end.timestamp()
+            )
+            entity_col.extend(agg_entity[keep].tolist())
+            ts_col.extend(midpoints[keep].tolist())
+            value_col.extend(agg[keep, 2].tolist())
 
-    # Query hourly aggregates for the entity that overlap with the analysis period
-    aggregates = (
-        session.query(db.NumericAggregates)
-        .filter(
-            db.NumericAggregates.entry_id == db.coordinator.entry_id,
-            db.NumericAggregates.area_name == area_name,
-            db.NumericAggregates.entity_id == entity_id,
-            db.NumericAggregates.aggregation_period == AGGREGATION_PERIOD_HOURLY,
-            # Include aggregates that overlap with the period:
-            # - period_start before aggregate period_end (aggregate starts before period ends)
-            # - period_end after aggregate period_start (aggregate ends after period starts)
-            db.NumericAggregates.period_start < period_end_db,
-            db.NumericAggregates.period_end > period_start_db,
+    entity_index = np.asarray(entity_col, dtype=np.int64)
+    timestamps = np.asarray(ts_col, dtype=float)
+    values = np.asarray(value_col, dtype=float)
+    order = np.lexsort((timestamps, entity_index))
+    return entity_index[order], timestamps[order], values[order]
+
+
+def occupancy_flags_for_timestamps(
+    timestamps: np.ndarray, intervals: list[tuple[datetime, datetime]]
+) -> np.ndarray:
+    """Vectorized ``is_timestamp_in_prepared_intervals`` over epoch-second timestamps.
+
+    Same semantics as the scalar helper: intervals are assumed
+    non-overlapping and end times are exclusive.
+    """
+    starts, ends = prepare_occupied_intervals(intervals)
+    if not starts:
+        return np.zeros(len(timestamps), dtype=bool)
+    start_arr = np.array([s.timestamp() for s in starts], dtype=float)
+    end_arr = np.array([e.timestamp() for e in ends], dtype=float)
+    idx = np.searchsorted(start_arr, timestamps, side="right") - 1
+    valid = idx >= 0
+    flags = np.zeros(len(timestamps), dtype=bool)
+    flags[valid] = timestamps[valid] < end_arr[idx[valid]]
+    return flags
+
+
+def _grouped_mean_std(
+    group: np.ndarray, values: np.ndarray, n_groups: int
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Return per-group (count, mean, population std) using two-pass bincounts."""
+    counts = np.bincount(group, minlength=n_groups).astype(float)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        means = np.bincount(group, weights=values, minlength=n_groups) / counts
+        centered = values - means[group]
+        var = (
+            np.bincount(group, weights=centered * centered, minlength=n_groups) / counts
         )
-        .order_by(db.NumericAggregates.period_start)
-        .all()
+    return counts, means, np.sqrt(var)
+
+
+def compute_correlation_matrix(
+    entity_index: np.ndarray,
+    values: np.ndarray,
+    occupied: np.ndarray,
+    n_entities: int,
+) -> dict[str, np.ndarray]:
+    """Compute Pearson correlation with occupancy for every entity at once.
+
+    All entities' samples are reduced together with ``np.bincount`` keyed on
+    the entity index, so the cost is a handful of passes over the columns
+    regardless of how many sensors the area has. Means are removed before
+    the cross products (two-pass) to stay stable for large-offset signals
+    such as pressure.
+
+    Returns:
+        Dict of per-entity arrays: ``count``, ``correlation`` (NaN where
+        undefined), and ``count/mean/std`` split by occupied/unoccupied.
+    """
+    occ = occupied.astype(float)
+    count, mean_x, _ = _grouped_mean_std(entity_index, values, n_entities)
+    _, mean_y, _ = _grouped_mean_std(entity_index, occ, n_entities)
+    dx = values - mean_x[entity_index]
+    dy = occ - mean_y[entity_index]
+    sxy = np.bincount(entity_index, weights=dx * dy, minlength=n_entities)
+    sxx = np.bincount(entity_index, weights=dx * dx, minlength=n_entities)
+    syy = np.bincount(entity_index, weights=dy * dy, minlength=n_entities)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        correlation = sxy / np.sqrt(sxx * syy)
+
+    # Occupied and unoccupied statistics share one grouped pass:
+    # group id = entity * 2 + occupied
+    split_group = entity_index * 2 + occupied.astype(np.int64)
+    split_count, split_mean, split_std = _grouped_mean_std(
+        split_group, values, n_entities * 2
     )
+    return {
+        "count": count,
+        "correlation": correlation,
+        "count_occupied": split_count[1::2],
+        "mean_occupied": split_mean[1::2],
+        "std_occupied": split_std[1::2],
+        "count_unoccupied": split_count[0::2],
+        "mean_unoccupied": split_mean[0::2],
+        "std_unoccupied": split_std[0::2],
+    }
 
-    samples = []
 
-    for aggregate in aggregates:
-        # DB stores naive UTC
-        agg_start = from_db_utc(aggregate.period_start)
-        agg_end = from_db_utc(aggregate.period_end)
+def analyze_area_numeric_correlations(
+    db: AreaOccupancyDB,
+    area_name: str,
+    entities: dict[str, InputType | None],
+    analysis_period_days: int = 30,
+) -> dict[str, dict[str, Any]]:
+    """Analyze occupancy correlation for all numeric sensors of an area at once.
 
-        # Clamp aggregate bounds to period boundaries
-        clamped_start = max(agg_start, period_start_utc)
-        clamped_end = min(agg_end, period_end_utc)
+    One query per data source loads every sensor's samples into numpy arrays,
+    the occupied-interval index is built once, and the correlation of each
+    sensor with occupancy is computed in a single grouped matrix pass.
 
-        # Calculate midpoint of clamped aggregate period
-        midpoint = clamped_start + (clamped_end - clamped_start) / 2
+    Args:
+        db: Database instance
+        area_name: Area name
+        entities: Mapping of numeric entity_id to its InputType
+        analysis_period_days: Number of days to analyze
 
-        # Ensure midpoint falls within the analysis window
-        if midpoint < period_start_utc or midpoint > period_end_utc:
+    Returns:
+        Dict mapping entity_id to its correlation result dictionary
+    """
+    entity_ids = list(entities)
+    if not entity_ids:
+        return {}
+
+    period_end = dt_util.utcnow()
+    period_start = period_end - timedelta(days=analysis_period_days)
+    calculation_date = dt_util.utcnow()
+
+    with db.get_session() as session:
+        entity_index, timestamps, values = load_numeric_sample_columns(
+            db, area_name, entity_ids, period_start, period_end, session
+        )
+
+    if db.coordinator.stop_requested:
+        raise AnalysisCancelled
+
+    n_entities = len(entity_ids)
+    counts = np.bincount(entity_index, minlength=n_entities)
+    occupied = np.zeros(len(timestamps), dtype=bool)
+    if (counts >= MIN_CORRELATION_SAMPLES).any():
+        occupied_intervals = get_occupied_intervals_for_analysis(
+            db, area_name, period_start, period_end
+        )
+        occupied = occupancy_flags_for_timestamps(timestamps, occupied_intervals)
+    stats = compute_correlation_matrix(entity_index, values, occupied, n_entities)
+
+    results: dict[str, dict[str, Any]] = {}
+    for pos, entity_id in enumerate(entity_ids):
+        input_type = entities[entity_id]
+        sample_count = int(counts[pos])
+        result: dict[str, Any] = {
+            "entry_id": db.coordinator.entry_id,
+            "area_name": area_name,
+            "entity_id": entity_id,
+            "input_type": input_type.value if input_type else InputType.UNKNOWN.value,
+            "analysis_period_start": period_start,
+            "analysis_period_end": period_end,
+            "calculation_date": to_db_utc(calculation_date),
+            "correlation_coefficient": 0.0,
+            "sample_count": sample_count,
+            "correlation_type": CorrelationType.NONE,
+            "confidence": 0.0,
+        }
+        results[entity_id] = result
+
+        if sample_count < MIN_CORRELATION_SAMPLES:
+            result["analysis_error"] = "too_few_samples"
+            continue
+        if stats["count_occupied"][pos] == 0:
+            result["analysis_error"] = "no_occupied_samples"
             continue
+        if stats["count_unoccupied"][pos] == 0:
+            result["analysis_error"] = "no_unoccupied_samples"
+            continue
+
+        correlation = float(stats["correlation"][pos])
+        if not np.isfinite(correlation):
+            correlation = 0.0
+        abs_correlation = abs(correlation)
+        analysis_error = None
+        if abs_correlation >= CORRELATION_MODERATE_THRESHOLD:
+            correlation_type = (
+                CorrelationType.STRONG_POSITIVE
+                if correlation > 0
+                else CorrelationType.STRONG_NEGATIVE
+            )
+        elif abs_correlation >= CORRELATION_WEAK_THRESHOLD:
+            correlation_type = (
+                CorrelationType.POSITIVE
+                if correlation > 0
+                else CorrelationType.NEGATIVE
+            )
+        else:
+            correlation_type = CorrelationType.NONE
+            analysis_error = "no_correlation"
+
+        mean_occupied = float(stats["mean_occupied"][pos])
+        mean_unoccupied = float(stats["mean_unoccupied"][pos])
+        std_occupied = float(stats["std_occupied"][pos])
+        std_unoccupied = float(stats["std_unoccupied"][pos])
+        result.update(
+            {
+                "correlation_coefficient": correlation,
+                "correlation_type": correlation_type,
+                "analysis_error": analysis_error,
+                "confidence": min(
+                    1.0,
+                    abs_correlation * (1.0 - (MIN_CORRELATION_SAMPLES / sample_count)),
+                ),
+                "mean_value_when_occupied": mean_occupied,
+                "mean_value_when_unoccupied": mean_unoccupied,
+                "std_dev_when_occupied": std_occupied,
+                "std_dev_when_unoccupied": std_unoccupied,
+                "threshold_active": mean_occupied + std_occupied,
+                "threshold_inactive": mean_unoccupied - std_unoccupied,
+                "calculation_date": calculation_date,
+            }
+        )
+
+    _LOGGER.debug(
+        "Columnar correlation for area %s: %d sensors, %d samples",
+        area_name,
+        n_entities,
+        len(values),
+    )
+    return results
 
-        # avg_value is guaranteed by the aggregator (always computed from raw samples)
-        samples.append(SimpleSample(midpoint, float(aggregate.avg_value)))
 
-    return samples
+def analyze_and_save_area_correlations(
+    db: AreaOccupancyDB,
+    area_name: str,
+    entities: dict[str, InputType | None],
+    analysis_period_days: int = 30,
+) -> dict[str, dict[str, Any] | None]:
+    """Analyze all numeric sensors of an area in one pass and save each result.
+
+    Returns:
+        Dict mapping entity_id to the saved correlation data (None if not saved)
+    """
+    try:
+        results = analyze_area_numeric_correlations(
+            db, area_name, entities, analysis_period_days
+        )
+    except AnalysisCancelled:
+        raise
+    except (
+        SQLAlchemyError,
+        ValueError,
+        TypeError,
+        RuntimeError,
+        OSError,
+    ) as e:
+        _LOGGER.error("Error during columnar correlation analysis: %s", e)
+        return dict.fromkeys(entities)
+
+    return {
+        entity_id: _save_correlation_data(db, correlation_data)
+        for entity_id, correlation_data in results.items()
+    }
 
 
 def analyze_binary_likelihoods(
@@ -641,6 +903,10 @@ def analyze_correlation(  # noqa: C901
 ) -> dict[str, Any] | None:
     """Analyze correlation between sensor values and occupancy.
 
+    Numeric sensors go through the columnar path of
+    ``analyze_area_numeric_correlations``; binary sensors are sampled per
+    minute of their intervals.
+
     Args:
         db: Database instance
         area_name: Area name
@@ -661,6 +927,30 @@ def analyze_correlation(  # noqa: C901
         is_binary,
     )
 
+    if not is_binary:
+        try:
+            return analyze_area_numeric_correlations(
+                db, area_name, {entity_id: input_type}, analysis_period_days
+            )[entity_id]
+        except AnalysisCancelled:
+            raise
+        except (
+            SQLAlchemyError,
+            ValueError,
+            TypeError,
+            RuntimeError,
+            OSError,
+        ) as e:
+            _LOGGER.error("Error during correlation analysis: %s", e)
+            return None
+
+    if not active_states:
+        _LOGGER.warning(
+            "Cannot analyze binary correlation for %s: no active states provided",
+            entity_id,
+        )
+        return None
+
     try:
         with db.get_session() as session:
             # Get analysis period
@@ -688,76 +978,21 @@ def analyze_correlation(  # noqa: C901
                 "confidence": 0.0,
             }
 
-            if is_binary:
-                if not active_states:
-                    _LOGGER.warning(
-                        "Cannot analyze binary correlation for %s: no active states provided",
-                        entity_id,
-                    )
-                    return None
-                samples = convert_intervals_to_samples(
-                    db,
-                    area_name,
-                    entity_id,
-                    period_start,
-                    period_end,
-                    active_states,
-                    session,
-                )
-                _LOGGER.debug(
-                    "Converted intervals to %d samples for binary sensor %s in area %s",
-                    len(samples),
-                    entity_id,
-                    area_name,
-                )
-            else:
-                # Get numeric samples from both raw samples and hourly aggregates
-                # Split period at retention cutoff to use appropriate data source
-                retention_cutoff = period_end_utc - timedelta(
-                    days=RETENTION_RAW_NUMERIC_SAMPLES_DAYS
-                )
-
-                # Recent period: Use raw NumericSamples (within retention period)
-                recent_start = max(period_start_utc, retention_cutoff)
-                recent_samples = (
-                    session.query(db.NumericSamples)
-                    .filter(
-                        db.NumericSamples.entry_id == db.coordinator.entry_id,
-                        db.NumericSamples.area_name == area_name,
-                        db.NumericSamples.entity_id == entity_id,
-                        db.NumericSamples.timestamp >= to_db_utc(recent_start),
-                        db.NumericSamples.timestamp <= period_end_db,
-                    )
-                    .order_by(db.NumericSamples.timestamp)
-                    .all()
-                )
-
-                # Historical period: Use hourly NumericAggregates (older than retention)
-                aggregate_samples: list[SimpleSample] = []
-                if period_start_utc < retention_cutoff:
-                    historical_end = min(period_end_utc, retention_cutoff)
-                    aggregate_samples = convert_hourly_aggregates_to_samples(
-                        db,
-                        area_name,
-                        entity_id,
-                        period_start_utc,
-                        historical_end,
-                        session,
-                    )
-
-                # Combine both sources
-                # Convert raw samples to SimpleSample objects for consistency
-                all_samples: list[SimpleSample] = [
-                    SimpleSample(from_db_utc(sample.timestamp), float(sample.value))
-                    for sample in recent_samples
-                ]
-                all_samples.extend(aggregate_samples)
-
-                # Sort by timestamp to ensure chronological order
-                all_samples.sort(key=lambda s: s.timestamp)
-
-                # Use combined samples for correlation analysis
-                samples = all_samples
+            samples = convert_intervals_to_samples(
+                db,
+                area_name,
+                entity_id,
+                period_start,
+                period_end,
+                active_states,
+                session,
+            )
+            _LOGGER.debug(
+                "Converted intervals to %d samples for binary sensor %s in area %s",
+                len(samples),
+                entity_id,
+                area_name,
+            )
 
             if error := validate_sample_count(samples):
                 base_result.update(error)
@@ -776,152 +1011,106 @@ def analyze_correlation(  # noqa: C901
                 occupied_intervals
             )
 
-            # Initialize diagnostic counters (used for both binary and numeric)
+            # Initialize diagnostic counters
             intervals_overlapping_occupied = 0
             intervals_overlapping_unoccupied = 0
 
-            # For binary sensors, use time-based chunking to avoid duplicate samples
-            if is_binary:
-                # Query intervals to calculate time-based chunked samples
-                binary_intervals = (
-                    session.query(db.Intervals)
-                    .filter(
-                        db.Intervals.entry_id == db.coordinator.entry_id,
-                        db.Intervals.area_name == area_name,
-                        db.Intervals.entity_id == entity_id,
-                        db.Intervals.start_time < period_end_db,
-                        db.Intervals.end_time > period_start_db,
-                    )
-                    .all()
+            # Use time-based chunking to avoid duplicate samples
+            # Query intervals to calculate time-based chunked samples
+            binary_intervals = (
+                session.query(db.Intervals)
+                .filter(
+                    db.Intervals.entry_id == db.coordinator.entry_id,
+                    db.Intervals.area_name == area_name,
+                    db.Intervals.entity_id == entity_id,
+                    db.Intervals.start_time < period_end_db,
+                    db.Intervals.end_time > period_start_db,
                 )
+                .all()
+            )
 
-                sample_values = []
-                occupancy_flags = []
-                samples_in_occupied = 0
-                samples_in_unoccupied = 0
-                active_samples_in_occupied = 0
-                active_samples_in_unoccupied = 0
-                inactive_samples_in_occupied = 0
-                inactive_samples_in_unoccupied = 0
-
-                # Time chunk granularity: 60 seconds (1 minute)
-                # This ensures proper weighting and avoids duplicate samples
-                chunk_duration_seconds = 60.0
-
-                for interval in binary_intervals:
-                    # Coarse cancellation check at the per-interval boundary.
-                    # The inner per-chunk loop is fast post-perf-fix (bisect
-                    # over a prepared index) so checking here is sufficient.
-                    if db.coordinator.stop_requested:
-                        raise AnalysisCancelled  # noqa: TRY301
-                    interval_start = from_db_utc(interval.start_time)
-                    interval_end = from_db_utc(interval.end_time)
-                    # Clamp to analysis period
-                    clamped_start = max(interval_start, period_start_utc)
-                    clamped_end = min(interval_end, period_end_utc)
-                    interval_duration = (clamped_end - clamped_start).total_seconds()
-
-                    if interval_duration <= 0:
-                        continue
-
-                    # Determine value based on state
-                    is_active = interval.state in active_states
-                    value = 1.0 if is_active else 0.0
-
-                    # Subdivide interval into time chunks
-                    # Each chunk is assigned to either occupied or unoccupied
-                    current_time = clamped_start
-                    chunks_in_occupied = 0
-                    chunks_in_unoccupied = 0
-
-                    while current_time < clamped_end:
-                        # Calculate chunk end (don't exceed interval end)
-                        chunk_end = min(
-                            current_time + timedelta(seconds=chunk_duration_seconds),
-                            clamped_end,
-                        )
-
-                        # Use chunk midpoint to determine occupancy
-                        chunk_midpoint = current_time + (chunk_end - current_time) / 2
-
-                        # Check if chunk midpoint falls within any occupied interval
-                        is_occupied = is_timestamp_in_prepared_intervals(
-                            chunk_midpoint, occupied_starts, occupied_ends
-                        )
-
-                        # Create one sample per chunk with unambiguous occupancy flag
-                        sample_values.append(value)
-                        occupancy_flags.append(1.0 if is_occupied else 0.0)
-
-                        if is_occupied:
-                            samples_in_occupied += 1
-                            chunks_in_occupied += 1
-                            if value == 1.0:
-                                active_samples_in_occupied += 1
-                            else:
-                                inactive_samples_in_occupied += 1
-                        else:
-                            samples_in_unoccupied += 1
-                            chunks_in_unoccupied += 1
-                            if value == 1.0:
-                                active_samples_in_unoccupied += 1
-                            else:
-                                inactive_samples_in_unoccupied += 1
-
-                        # Move to next chunk
-                        current_time = chunk_end
-
-                    # Track interval overlap for diagnostics
-                    if chunks_in_occupied > 0:
-                        intervals_overlapping_occupied += 1
-                    if chunks_in_unoccupied > 0:
-                        intervals_overlapping_unoccupied += 1
-            else:
-                # For numeric sensors, use existing midpoint-based approach
-                sample_values: list[float] = []
-                occupancy_flags: list[
-                    float
-                ] = []  # 1.0 for occupied, 0.0 for unoccupied
-
-                # Diagnostic counters
-                samples_in_occupied = 0
-                samples_in_unoccupied = 0
-                active_samples_in_occupied = 0
-                active_samples_in_unoccupied = 0
-                inactive_samples_in_occupied = 0
-                inactive_samples_in_unoccupied = 0
-
-                for sample_idx, sample in enumerate(samples):
-                    # Periodic cancellation check. With the bisect-based
-                    # membership test the per-sample cost is microseconds,
-                    # so checking every 1024 samples bounds shutdown
-                    # latency without measurable overhead in the steady state.
-                    if sample_idx & 1023 == 0 and db.coordinator.stop_requested:
-                        raise AnalysisCancelled  # noqa: TRY301
-                    # Check if sample timestamp falls within any occupied interval
+            sample_values = []
+            occupancy_flags = []
+            samples_in_occupied = 0
+            samples_in_unoccupied = 0
+            active_samples_in_occupied = 0
+            active_samples_in_unoccupied = 0
+            inactive_samples_in_occupied = 0
+            inactive_samples_in_unoccupied = 0
+
+            # Time chunk granularity: 60 seconds (1 minute)
+            # This ensures proper weighting and avoids duplicate samples
+            chunk_duration_seconds = 60.0
+
+            for interval in binary_intervals:
+                # Coarse cancellation check at the per-interval boundary.
+                # The inner per-chunk loop is fast post-perf-fix (bisect
+                # over a prepared index) so checking here is sufficient.
+                if db.coordinator.stop_requested:
+                    raise AnalysisCancelled  # noqa: TRY301
+                interval_start = from_db_utc(interval.start_time)
+                interval_end = from_db_utc(interval.end_time)
+                # Clamp to analysis period
+                clamped_start = max(interval_start, period_start_utc)
+                clamped_end = min(interval_end, period_end_utc)
+                interval_duration = (clamped_end - clamped_start).total_seconds()
+
+                if interval_duration <= 0:
+                    continue
+
+                # Determine value based on state
+                is_active = interval.state in active_states
+                value = 1.0 if is_active else 0.0
+
+                # Subdivide interval into time chunks
+                # Each chunk is assigned to either occupied or unoccupied
+                current_time = clamped_start
+                chunks_in_occupied = 0
+                chunks_in_unoccupied = 0
+
+                while current_time < clamped_end:
+                    # Calculate chunk end (don't exceed interval end)
+                    chunk_end = min(
+                        current_time + timedelta(seconds=chunk_duration_seconds),
+                        clamped_end,
+                    )
+
+                    # Use chunk midpoint to determine occupancy
+                    chunk_midpoint = current_time + (chunk_end - current_time) / 2
+
+                    # Check if chunk midpoint falls within any occupied interval
                     is_occupied = is_timestamp_in_prepared_intervals(
-                        sample.timestamp, occupied_starts, occupied_ends
+                        chunk_midpoint, occupied_starts, occupied_ends
                     )
 
-                    sample_value = float(sample.value)
-                    sample_values.append(sample_value)
+                    # Create one sample per chunk with unambiguous occupancy flag
+                    sample_values.append(value)
                     occupancy_flags.append(1.0 if is_occupied else 0.0)
 
                     if is_occupied:
                         samples_in_occupied += 1
-                        if (
-                            sample_value > 0.5
-                        ):  # For numeric, consider > 0.5 as "active"
+                        chunks_in_occupied += 1
+                        if value == 1.0:
                             active_samples_in_occupied += 1
                         else:
                             inactive_samples_in_occupied += 1
                     else:
                         samples_in_unoccupied += 1
-                        if sample_value > 0.5:
+                        chunks_in_unoccupied += 1
+                        if value == 1.0:
                             active_samples_in_unoccupied += 1
                         else:
                             inactive_samples_in_unoccupied += 1
 
+                    # Move to next chunk
+                    current_time = chunk_end
+
+                # Track interval overlap for diagnostics
+                if chunks_in_occupied > 0:
+                    intervals_overlapping_occupied += 1
+                if chunks_in_unoccupied > 0:
+                    intervals_overlapping_unoccupied += 1
+
             if error := validate_sample_count(
                 sample_values, error_type="too_few_samples_after_filtering"
             ):
@@ -929,25 +1118,24 @@ def analyze_correlation(  # noqa: C901
                 return base_result
 
             # Log diagnostic information for binary sensors
-            if is_binary:
-                _LOGGER.debug(
-                    "Binary sensor correlation diagnostics for %s in area %s: "
-                    "total_samples=%d, samples_in_occupied=%d, samples_in_unoccupied=%d, "
-                    "active_in_occupied=%d, active_in_unoccupied=%d, "
-                    "inactive_in_occupied=%d, inactive_in_unoccupied=%d, "
-                    "intervals_overlapping_occupied=%d, intervals_overlapping_unoccupied=%d",
-                    entity_id,
-                    area_name,
-                    len(sample_values),
-                    samples_in_occupied,
-                    samples_in_unoccupied,
-                    active_samples_in_occupied,
-                    active_samples_in_unoccupied,
-                    inactive_samples_in_occupied,
-                    inactive_samples_in_unoccupied,
-                    intervals_overlapping_occupied,
-                    intervals_overlapping_unoccupied,
-                )
+            _LOGGER.debug(
+                "Binary sensor correlation diagnostics for %s in area %s: "
+                "total_samples=%d, samples_in_occupied=%d, samples_in_unoccupied=%d, "
+                "active_in_occupied=%d, active_in_unoccupied=%d, "
+                "inactive_in_occupied=%d, inactive_in_unoccupied=%d, "
+                "intervals_overlapping_occupied=%d, intervals_overlapping_unoccupied=%d",
+                entity_id,
+                area_name,
+                len(sample_values),
+                samples_in_occupied,
+                samples_in_unoccupied,
+                active_samples_in_occupied,
+                active_samples_in_unoccupied,
+                inactive_samples_in_occupied,
+                inactive_samples_in_unoccupied,
+                intervals_overlapping_occupied,
+                intervals_overlapping_unoccupied,
+            )
 
             # Calculate correlation
             correlation, _p_value = calculate_pearson_correlation(
@@ -993,29 +1181,27 @@ def analyze_correlation(  # noqa: C901
             )
 
             # Log detailed statistics for binary sensors
-            if is_binary:
-                _LOGGER.debug(
-                    "Binary sensor correlation statistics for %s in area %s: "
-                    "correlation=%.3f, mean_occupied=%.3f, mean_unoccupied=%.3f, "
-                    "std_occupied=%.3f, std_unoccupied=%.3f, "
-                    "occupied_samples=%d, unoccupied_samples=%d",
-                    entity_id,
-                    area_name,
-                    correlation,
-                    mean_occupied or 0.0,
-                    mean_unoccupied or 0.0,
-                    std_occupied or 0.0,
-                    std_unoccupied or 0.0,
-                    len(occupied_values),
-                    len(unoccupied_values),
-                )
+            _LOGGER.debug(
+                "Binary sensor correlation statistics for %s in area %s: "
+                "correlation=%.3f, mean_occupied=%.3f, mean_unoccupied=%.3f, "
+                "std_occupied=%.3f, std_unoccupied=%.3f, "
+                "occupied_samples=%d, unoccupied_samples=%d",
+                entity_id,
+                area_name,
+                correlation,
+                mean_occupied or 0.0,
+                mean_unoccupied or 0.0,
+                std_occupied or 0.0,
+                std_unoccupied or 0.0,
+                len(occupied_values),
+                len(unoccupied_values),
+            )
 
             # Clamp std dev for binary sensors to avoid numerical issues
-            if is_binary:
-                if std_occupied is not None:
-                    std_occupied = max(0.05, min(0.95, std_occupied))
-                if std_unoccupied is not None:
-                    std_unoccupied = max(0.05, min(0.95, std_unoccupied))
+            if std_occupied is not None:
+                std_occupied = max(0.05, min(0.95, std_occupied))
+            if std_unoccupied is not None:
+                std_unoccupied = max(0.05, min(0.95, std_unoccupied))
 
             # Determine correlation type
             abs_correlation = abs(correlation)
@@ -1451,6 +1637,20 @@ def analyze_and_save_correlation(
         )
         return None
 
+    return _save_correlation_data(db, correlation_data)
+
+
+def _save_correlation_data(
+    db: AreaOccupancyDB, correlation_data: dict[str, Any]
+) -> dict[str, Any] | None:
+    """Validate and persist one correlation result.
+
+    Returns:
+        The correlation data if it was saved, None otherwise
+    """
+    entity_id = correlation_data["entity_id"]
+    area_name = correlation_data["area_name"]
+
     # Save correlation results even when they have errors, so analysis_error is preserved
     # This allows failed analyses to be restored after entity reload
     analysis_error = correlation_data.get("analysis_error")
@@ -1714,13 +1914,83 @@ async def _analyze_area_sensors(
 ) -> list[dict[str, Any]]:
     """Run correlation/likelihood analysis for one area's correlatable entities.
 
-    Per-entity loop is serial within an area to keep the existing
+    Numeric sensors are analyzed together in a single executor job via the
+    columnar path (``analyze_and_save_area_correlations``). The binary
+    per-entity loop is serial within an area to keep the existing
     per-entity error handling semantics and avoid saturating the executor
     pool when a single area has many entities. Multiple areas run
     concurrently via the ``asyncio.gather`` in ``run_correlation_analysis``.
     """
     results: list[dict[str, Any]] = []
+    numeric_entities = {
+        entity_id: entity_info.get("input_type")
+        for entity_id, entity_info in entities.items()
+        if not entity_info["is_binary"]
+    }
+    if numeric_entities and not coordinator.stop_requested:
+        try:
+            numeric_results = await coordinator.hass.async_add_executor_job(
+                analyze_and_save_area_correlations,
+                coordinator.db,
+                area_name,
+                numeric_entities,
+                30,  # analysis_period_days
+            )
+        except AnalysisCancelled:
+            _LOGGER.debug(
+                "Numeric correlation analysis cancelled for area '%s'", area_name
+            )
+            return results
+        except (
+            SQLAlchemyError,
+            ValueError,
+            TypeError,
+            RuntimeError,
+            OSError,
+        ) as err:
+            _LOGGER.exception("Numeric correlation analysis failed for %s", area_name)
+            numeric_results = {}
+            if return_results:
+                results.extend(
+                    {
+                        "area": area_name,
+                        "entity_id": entity_id,
+                        "success": False,
+                        "error": str(err),
+                    }
+                    for entity_id in numeric_entities
+                )
+
+        for entity_id, correlation_result in numeric_results.items():
+            # Apply analysis results to live entities immediately
+            if correlation_result and area_name in coordinator.areas:
+                area = coordinator.areas[area_name]
+                try:
+                    entity = area.entities.get_entity(entity_id)
+                    entity.update_correlation(correlation_result)
+                except ValueError as e:
+                    # Entity might have been removed during analysis
+                    _LOGGER.debug(
+                        "Entity %s in area %s no longer exists: %s",
+                        entity_id,
+                        area_name,
+                        e,
+                    )
+            # ``analysis_error`` marks a soft failure (e.g. ``too_few_samples``)
+            if return_results:
+                results.append(
+                    {
+                        "area": area_name,
+                        "entity_id": entity_id,
+                        "type": "correlation",
+                        "success": bool(correlation_result)
+                        and correlation_result.get("analysis_error") is None,
+                    }
+                )
+
     for entity_id, entity_info in entities.items():
+        if not entity_info["is_binary"]:
+            continue
         # Per-entity loop boundary: bail if HA is shutting down so the
         # async layer doesn't dispatch another sync block that the
         # executor will refuse to abandon. The current entity (if any)
@@ -1733,97 +2003,55 @@ async def _analyze_area_sensors(
             )
             break
         try:
-            if entity_info["is_binary"]:
-                # Binary sensors: Use duration-based likelihood analysis
-                likelihood_result = await coordinator.hass.async_add_executor_job(
-                    coordinator.db.analyze_binary_likelihoods,
-                    area_name,
-                    entity_id,
-                    30,  # analysis_period_days
-                    entity_info["active_states"],
+            # Binary sensors: Use duration-based likelihood analysis
+            likelihood_result = await coordinator.hass.async_add_executor_job(
+                coordinator.db.analyze_binary_likelihoods,
+                area_name,
+                entity_id,
+                30,  # analysis_period_days
+                entity_info["active_states"],
+            )
+
+            # Save binary likelihood results to database (including errors)
+            if likelihood_result:
+                input_type = entity_info.get("input_type")
+                await coordinator.hass.async_add_executor_job(
+                    save_binary_likelihood_result,
+                    coordinator.db,
+                    likelihood_result,
+                    input_type,
                 )
 
-                # Save binary likelihood results to database (including errors)
-                if likelihood_result:
-                    input_type = entity_info.get("input_type")
-                    await coordinator.hass.async_add_executor_job(
-                        save_binary_likelihood_result,
-                        coordinator.db,
-                        likelihood_result,
-                        input_type,
+            # Apply analysis results to live entities immediately
+            if likelihood_result and area_name in coordinator.areas:
+                area = coordinator.areas[area_name]
+                try:
+                    entity = area.entities.get_entity(entity_id)
+                    entity.update_binary_likelihoods(likelihood_result)
+                except ValueError as e:
+                    # Entity might have been removed during analysis
+                    _LOGGER.debug(
+                        "Entity %s in area %s no longer exists: %s",
+                        entity_id,
+                        area_name,
+                        e,
                     )
 
-                # Apply analysis results to live entities immediately
-                if likelihood_result and area_name in coordinator.areas:
-                    area = coordinator.areas[area_name]
-                    try:
-                        entity = area.entities.get_entity(entity_id)
-                        entity.update_binary_likelihoods(likelihood_result)
-                    except ValueError as e:
-                        # Entity might have been removed during analysis
-                        _LOGGER.debug(
-                            "Entity %s in area %s no longer exists: %s",
-                            entity_id,
-                            area_name,
-                            e,
-                        )
-
-                # Track result if requested. ``analyze_binary_likelihoods``
-                # returns a non-empty dict on *soft* failures (e.g.
-                # ``analysis_error="no_occupied_intervals"``) — ``bool(...)``
-                # alone would mark those as ``success=True``. Treat any
-                # non-None ``analysis_error`` as a failure for the summary.
-                if return_results:
-                    results.append(
-                        {
-                            "area": area_name,
-                            "entity_id": entity_id,
-                            "type": "binary_likelihood",
-                            "success": bool(likelihood_result)
-                            and likelihood_result.get("analysis_error") is None,
-                        }
-                    )
-            else:
-                # Numeric sensors: Use correlation analysis
-                correlation_result = await coordinator.hass.async_add_executor_job(
-                    coordinator.db.analyze_and_save_correlation,
-                    area_name,
-                    entity_id,
-                    30,  # analysis_period_days
-                    False,  # is_binary
-                    None,  # active_states (not used for numeric)
-                    entity_info.get("input_type"),  # Pass input_type
+            # Track result if requested. ``analyze_binary_likelihoods``
+            # returns a non-empty dict on *soft* failures (e.g.
+            # ``analysis_error="no_occupied_intervals"``) — ``bool(...)``
+            # alone would mark those as ``success=True``. Treat any
+            # non-None ``analysis_error`` as a failure for the summary.
+            if return_results:
+                results.append(
+                    {
+                        "area": area_name,
+                        "entity_id": entity_id,
+                        "type": "binary_likelihood",
+                        "success": bool(likelihood_result)
+                        and likelihood_result.get("analysis_error") is None,
+                    }
                 )
-
-                # Apply analysis results to live entities immediately
-                if correlation_result and area_name in coordinator.areas:
-                    area = coordinator.areas[area_name]
-                    try:
-                        entity = area.entities.get_entity(entity_id)
-                        entity.update_correlation(correlation_result)
-                    except ValueError as e:
-                        # Entity might have been removed during analysis
-                        _LOGGER.debug(
-                            "Entity %s in area %s no longer exists: %s",
-                            entity_id,
-                            area_name,
-                            e,
-                        )
-
-                # Track result if requested. Same soft-failure caveat as
-                # the binary path: ``analyze_and_save_correlation`` may
-                # return a populated dict with ``analysis_error`` set
-                # (e.g. ``too_few_samples``). Treat that as success=False.
-                if return_results:
-                    results.append(
-                        {
-                            "area": area_name,
-                            "entity_id": entity_id,
-                            "type": "correlation",
-                            "success": bool(correlation_result)
-                            and correlation_result.get("analysis_error") is None,
-                        }
-                    )
         except AnalysisCancelled:
             # Clean shutdown signal — break out of the per-entity loop
             # without logging or recording a failure. A cancelled run
@@ -542,6 +542,10 @@ def delete_db(db: AreaOccupancyDB) -> None:
         except SQLAlchemyError as e:
             _LOGGER.debug("Failed to dispose engine before deleting DB: %s", e)
 
+    db.saved_row_hashes.clear()
+    db.saved_entity_keys = frozenset()
+    db.occupied_index.invalidate()
+
     if db.db_path and db.db_path.exists():
         try:
             db.db_path.unlink()
@@ -617,6 +621,9 @@ def init_db(db: AreaOccupancyDB) -> None:
     """Initialize the database with WAL mode."""
     _LOGGER.debug("Starting database initialization")
     try:
+        # New databases release deleted pages incrementally (no effect on
+        # existing files; the retention engine converts those with a VACUUM)
+        _enable_incremental_vacuum(db)
         # Enable WAL mode for better concurrent writes
         _enable_wal_mode(db)
         # Create all tables with checkfirst to avoid race conditions
@@ -653,6 +660,15 @@ def _enable_wal_mode(db: AreaOccupancyDB) -> None:
         _LOGGER.debug("Failed to enable WAL mode: %s", err)
 
 
+def _enable_incremental_vacuum(db: AreaOccupancyDB) -> None:
+    """Create new databases with incremental auto-vacuum enabled."""
+    try:
+        with db.engine.connect() as conn:
+            conn.execute(sa.text("PRAGMA auto_vacuum=INCREMENTAL"))
+    except sa.exc.SQLAlchemyError as err:
+        _LOGGER.debug("Failed to enable incremental auto-vacuum: %s", err)
+
+
 def _create_tables_individually(db: AreaOccupancyDB) -> None:
     """Create tables individually to handle race conditions."""
     for table in Base.metadata.tables.values():
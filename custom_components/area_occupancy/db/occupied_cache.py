@@ -0,0 +1,414 @@
+"""Incremental maintenance of the occupied intervals cache.
+
+``OccupiedIntervalsCache`` used to be rebuilt wholesale from the union query
+in ``queries.get_occupied_intervals``. This module keeps it current as the
+recorder sync commits new raw intervals: only the tail of the cache that the
+new intervals can merge into is recomputed and replaced.
+
+An in-memory ``OccupiedIntervalIndex`` mirrors the cache for the raw-interval
+retention window, so occupied-interval queries over that window are answered
+without touching the database at all.
+"""
+
+from __future__ import annotations
+
+import bisect
+from datetime import datetime, timedelta
+import logging
+import threading
+from typing import TYPE_CHECKING, Any
+
+import sqlalchemy as sa
+from sqlalchemy.exc import SQLAlchemyError
+
+from homeassistant.util import dt as dt_util
+
+from ..const import (
+    DEFAULT_LOOKBACK_DAYS,
+    DEFAULT_MOTION_TIMEOUT,
+    RETENTION_RAW_INTERVALS_DAYS,
+)
+from ..time_utils import from_db_utc, to_db_utc, to_utc
+from . import queries, relationships
+
+if TYPE_CHECKING:
+    from .core import AreaOccupancyDB
+
+_LOGGER = logging.getLogger(__name__)
+
+# Maximum number of differing intervals listed by the consistency checker
+_MAX_REPORTED_DIFFERENCES = 10
+
+
+class OccupiedIntervalIndex:
+    """In-memory copy of the cached occupied intervals for the recent window.
+
+    Cached intervals are merged, so they are disjoint and both their starts
+    and ends are sorted. That makes two sorted lists with ``bisect`` a
+    complete interval tree for this data: overlap queries are O(log n + k)
+    and splicing in a recomputed tail is a slice assignment.
+
+    The index is shared between executor jobs, so all access is locked. It
+    also records the earliest changed cache start per area for the time
+    prior accumulators, which must forget settled hours after that point.
+    """
+
+    def __init__(self, window_days: int = RETENTION_RAW_INTERVALS_DAYS) -> None:
+        """Initialize an empty index covering the last ``window_days``."""
+        self._window = timedelta(days=window_days)
+        self._lock = threading.Lock()
+        self._starts: dict[str, list[datetime]] = {}
+        self._ends: dict[str, list[datetime]] = {}
+        self._loaded_from: dict[str, datetime] = {}
+        self._changed_from: dict[str, datetime] = {}
+        # Bumped when the whole cache may have changed (database reset or restore)
+        self.generation = 0
+
+    def window_start(self) -> datetime:
+        """Return the oldest time the index is meant to cover."""
+        return dt_util.utcnow() - self._window
+
+    def covers(self, area_name: str, start_time: datetime) -> bool:
+        """Return True if queries from ``start_time`` can be served from memory."""
+        with self._lock:
+            loaded_from = self._loaded_from.get(area_name)
+        return loaded_from is not None and to_utc(start_time) >= loaded_from
+
+    def load(
+        self,
+        area_name: str,
+        intervals: list[tuple[datetime, datetime]],
+        loaded_from: datetime,
+    ) -> None:
+        """Replace an area's intervals (sorted, disjoint) loaded from ``loaded_from``."""
+        with self._lock:
+            self._starts[area_name] = [start for start, _ in intervals]
+            self._ends[area_name] = [end for _, end in intervals]
+            self._loaded_from[area_name] = loaded_from
+
+    def splice(
+        self,
+        area_name: str,
+        cut: datetime,
+        intervals: list[tuple[datetime, datetime]],
+    ) -> None:
+        """Replace the intervals starting at or after ``cut`` with ``intervals``.
+
+        Intervals ending before the window start are dropped at the same time.
+        Does nothing for areas that are not loaded.
+        """
+        with self._lock:
+            if area_name not in self._loaded_from:
+                return
+            starts = self._starts[area_name]
+            ends = self._ends[area_name]
+            pos = bisect.bisect_left(starts, cut)
+            starts[pos:] = [start for start, _ in intervals]
+            ends[pos:] = [end for _, end in intervals]
+
+            window_start = self.window_start()
+            expired = bisect.bisect_left(ends, window_start)
+            if expired:
+                del starts[:expired]
+                del ends[:expired]
+            self._loaded_from[area_name] = max(
+                self._loaded_from[area_name], window_start
+            )
+
+    def query(
+        self,
+        area_name: str,
+        start_time: datetime,
+        end_time: datetime | None = None,
+        overlap: bool = True,
+    ) -> list[tuple[datetime, datetime]]:
+        """Return intervals of an area in a time range.
+
+        With ``overlap`` (the ``get_occupied_intervals_for_analysis``
+        semantics) intervals touching the range are returned; without it only
+        intervals starting at or after ``start_time`` are (the semantics of the
+        union query's lookback filter).
+        """
+        start_time = to_utc(start_time)
+        with self._lock:
+            starts = self._starts.get(area_name, [])
+            ends = self._ends.get(area_name, [])
+            if overlap:
+                first = bisect.bisect_left(ends, start_time)
+            else:
+                first = bisect.bisect_left(starts, start_time)
+            if end_time is None:
+                last = len(starts)
+            else:
+                last = bisect.bisect_right(starts, to_utc(end_time))
+            return list(zip(starts[first:last], ends[first:last], strict=True))
+
+    def mark_changed(self, area_name: str, since: datetime) -> None:
+        """Record that cached rows of an area starting from ``since`` changed."""
+        since = to_utc(since)
+        with self._lock:
+            previous = self._changed_from.get(area_name)
+            if previous is None or since < previous:
+                self._changed_from[area_name] = since
+
+    def pop_changed(self, area_name: str) -> datetime | None:
+        """Return and forget the earliest changed cache start of an area."""
+        with self._lock:
+            return self._changed_from.pop(area_name, None)
+
+    def invalidate(self, area_name: str | None = None) -> None:
+        """Drop one area (or all areas) so they are reloaded on next use."""
+        with self._lock:
+            if area_name is None:
+                self._starts.clear()
+                self._ends.clear()
+                self._loaded_from.clear()
+                self._changed_from.clear()
+                self.generation += 1
+                return
+            self._starts.pop(area_name, None)
+            self._ends.pop(area_name, None)
+            self._loaded_from.pop(area_name, None)
+
+
+def _load_index(db: AreaOccupancyDB, area_name: str) -> bool:
+    """Load an area's recent cached intervals into the in-memory index.
+
+    Returns False if the area has no cache yet, or a cache that has not been
+    written since incremental maintenance was introduced (no mark), since it
+    may then lag behind the raw intervals.
+    """
+    cache = db.OccupiedIntervalsCache
+    window_start = db.occupied_index.window_start()
+    with db.get_session() as session:
+        marked = session.execute(
+            sa.select(db.Metadata.key).where(
+                db.Metadata.key
+                == f"{queries.OCCUPIED_CACHE_HWM_KEY_PREFIX}{area_name}"
+            )
+        ).first()
+        if marked is None:
+            return False
+        rows = session.execute(
+            sa.select(cache.start_time, cache.end_time)
+            .where(
+                cache.area_name == area_name,
+                cache.end_time >= to_db_utc(window_start),
+            )
+            .order_by(cache.start_time)
+        ).all()
+    db.occupied_index.load(
+        area_name,
+        [(from_db_utc(start), from_db_utc(end)) for start, end in rows],
+        window_start,
+    )
+    return True
+
+
+def get_indexed_occupied_intervals(
+    db: AreaOccupancyDB,
+    area_name: str,
+    start_time: datetime,
+    end_time: datetime | None = None,
+    overlap: bool = True,
+) -> list[tuple[datetime, datetime]] | None:
+    """Serve occupied intervals from the in-memory index if it covers the range.
+
+    Returns None when the range starts before the index window or the area
+    has no cache yet; callers then fall back to their database query.
+    """
+    index = db.occupied_index
+    if to_utc(start_time) < index.window_start():
+        return None
+    try:
+        if not index.covers(area_name, start_time) and not _load_index(
+            db, area_name
+        ):
+            return None
+    except (SQLAlchemyError, ValueError, TypeError, RuntimeError, OSError) as e:
+        _LOGGER.debug("Occupied interval index unavailable for %s: %s", area_name, e)
+        return None
+    return index.query(area_name, start_time, end_time, overlap=overlap)
+
+
+def update_occupied_intervals_cache(
+    db: AreaOccupancyDB,
+    area_name: str,
+    since: datetime,
+    motion_timeout: int = DEFAULT_MOTION_TIMEOUT,
+) -> int:
+    """Merge raw intervals committed since ``since`` into the cache.
+
+    New raw intervals can only merge with cached intervals that end at or
+    after their earliest start. The cut point is the start of the first such
+    cached interval (or ``since`` itself); everything from the cut onwards is
+    recomputed with the union query restricted to raw intervals starting at
+    or after the cut, and replaces the cached rows starting there. Cached
+    rows before the cut are untouched, as are areas without a cache (the
+    next full population picks them up).
+
+    Returns:
+        Number of cache rows written, or -1 if the area has no cache yet.
+    """
+    cache = db.OccupiedIntervalsCache
+    since_db = to_db_utc(since)
+    with db.get_session() as session:
+        try:
+            calculation_date = session.execute(
+                sa.select(sa.func.max(cache.calculation_date)).where(
+                    cache.area_name == area_name
+                )
+            ).scalar()
+            if calculation_date is None:
+                return -1
+
+            first_affected = session.execute(
+                sa.select(sa.func.min(cache.start_time)).where(
+                    cache.area_name == area_name,
+                    cache.end_time >= since_db,
+                )
+            ).scalar()
+            cut_db = min(since_db, first_affected) if first_affected else since_db
+            cut = from_db_utc(cut_db)
+
+            intervals = queries.get_occupied_intervals(
+                db,
+                db.coordinator.entry_id,
+                area_name,
+                DEFAULT_LOOKBACK_DAYS,
+                motion_timeout,
+                since=cut,
+            )
+
+            session.query(cache).filter(
+                cache.area_name == area_name,
+                cache.start_time >= cut_db,
+            ).delete(synchronize_session=False)
+            now = dt_util.utcnow()
+            # Keep the full-rebuild calculation date so cache age still
+            # reflects the last wholesale repopulation.
+            rows = [
+                {
+                    "entry_id": db.coordinator.entry_id,
+                    "area_name": area_name,
+                    "start_time": to_db_utc(start),
+                    "end_time": to_db_utc(end),
+                    "duration_seconds": (end - start).total_seconds(),
+                    "calculation_date": calculation_date,
+                    "data_source": "motion_sensors",
+                    "created_at": to_db_utc(now),
+                }
+                for start, end in intervals
+                if start <= end
+            ]
+            if rows:
+                session.execute(sa.insert(cache), rows)
+            relationships.mark_transitions_dirty(db, session, cut_db)
+            session.merge(
+                db.Metadata(
+                    key=f"{queries.OCCUPIED_CACHE_HWM_KEY_PREFIX}{area_name}",
+                    value=to_db_utc(now).isoformat(),
+                )
+            )
+            session.commit()
+        except (SQLAlchemyError, ValueError, TypeError, RuntimeError, OSError) as e:
+            _LOGGER.error(
+                "Error updating occupied intervals cache for %s: %s", area_name, e
+            )
+            session.rollback()
+            db.occupied_index.invalidate(area_name)
+            return 0
+
+    db.occupied_index.splice(area_name, cut, intervals)
+    db.occupied_index.mark_changed(area_name, cut)
+    _LOGGER.debug(
+        "Occupied intervals cache for %s updated from %s: %d intervals rewritten",
+        area_name,
+        cut,
+        len(rows),
+    )
+    return len(rows)
+
+
+def check_occupied_intervals_cache(
+    db: AreaOccupancyDB,
+    area_name: str,
+    days: int = RETENTION_RAW_INTERVALS_DAYS,
+    motion_timeout: int = DEFAULT_MOTION_TIMEOUT,
+) -> dict[str, Any]:
+    """Compare the cache (and in-memory index) with a full recomputation.
+
+    Only the last ``days`` are compared: older raw intervals are removed by
+    aggregation while the cache deliberately keeps them, so a recomputation
+    cannot reproduce that part.
+
+    Returns:
+        Dictionary with ``consistent``, interval counts and up to
+        ``_MAX_REPORTED_DIFFERENCES`` intervals missing from / extra in the
+        cache (ISO strings).
+    """
+    window_start = dt_util.utcnow() - timedelta(days=days)
+    # Move the window start past any cached interval straddling it, so both
+    # sides see whole merged intervals.
+    cache = db.OccupiedIntervalsCache
+    with db.get_session() as session:
+        straddling_end = session.execute(
+            sa.select(sa.func.max(cache.end_time)).where(
+                cache.area_name == area_name,
+                cache.start_time < to_db_utc(window_start),
+                cache.end_time >= to_db_utc(window_start),
+            )
+        ).scalar()
+    if straddling_end is not None:
+        window_start = max(window_start, from_db_utc(straddling_end))
+
+    recomputed = {
+        (start, end)
+        for start, end in queries.get_occupied_intervals(
+            db,
+            db.coordinator.entry_id,
+            area_name,
+            days,
+            motion_timeout,
+            since=window_start,
+        )
+    }
+    cached = {
+        (start, end)
+        for start, end in queries.get_occupied_intervals_cache(
+            db, area_name, period_start=window_start
+        )
+    }
+    missing = sorted(recomputed - cached)
+    extra = sorted(cached - recomputed)
+
+    result: dict[str, Any] = {
+        "area_name": area_name,
+        "window_start": window_start.isoformat(),
+        "cached_intervals": len(cached),
+        "recomputed_intervals": len(recomputed),
+        "missing_from_cache": [
+            (start.isoformat(), end.isoformat())
+            for start, end in missing[:_MAX_REPORTED_DIFFERENCES]
+        ],
+        "extra_in_cache": [
+            (start.isoformat(), end.isoformat())
+            for start, end in extra[:_MAX_REPORTED_DIFFERENCES]
+        ],
+    }
+
+    indexed = get_indexed_occupied_intervals(
+        db, area_name, window_start, overlap=False
+    )
+    result["index_consistent"] = indexed is None or set(indexed) == cached
+    result["consistent"] = not missing and not extra and result["index_consistent"]
+    if not result["consistent"]:
+        _LOGGER.warning(
+            "Occupied intervals cache for %s differs from recomputation: "
+            "%d missing, %d extra, index consistent: %s",
+            area_name,
+            len(missing),
+            len(extra),
+            result["index_consistent"],
+        )
+    return result
@@ -3,7 +3,7 @@
 from __future__ import annotations
 
 from collections.abc import Iterable
-from datetime import datetime, timedelta
+from datetime import datetime
 import hashlib
 import json
 import logging
@@ -11,7 +11,7 @@ import time
 from typing import TYPE_CHECKING, Any
 
 import sqlalchemy as sa
-from sqlalchemy import func
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.exc import SQLAlchemyError
 
 from homeassistant import helpers
@@ -32,8 +32,8 @@ from ..const import (
     TIME_PRIOR_MIN_BOUND,
 )
 from ..data.entity_type import CorrelationType, InputType
-from ..time_utils import to_db_utc, to_utc
-from . import maintenance, queries
+from ..time_utils import from_db_utc, to_db_utc, to_utc
+from . import maintenance, queries, relationships, retention
 
 ar = helpers.area_registry
 
@@ -44,9 +44,164 @@ _LOGGER = logging.getLogger(__name__)
 
 
 def save_data(db: AreaOccupancyDB) -> None:
-    """Save both area and entity data to the database."""
-    save_area_data(db)
-    save_entity_data(db)
+    """Save both area and entity data to the database in one transaction.
+
+    Area and entity rows are written with a bulk UPSERT (executemany). Rows
+    whose content fingerprint matches what this process last wrote are
+    skipped, so a periodic save with little change is one short transaction.
+    Timing and row counts are kept in ``db.last_save_stats`` for diagnostics.
+    """
+    save_start = time.perf_counter()
+    area_rows: list[dict[str, Any]] = []
+    failures: list[tuple[str, str]] = []
+    for area_name in db.coordinator.get_area_names():
+        area_data = _prepare_area_payload(db, area_name)
+        validation_failures = _validate_area_data(db, area_data, area_name)
+        if validation_failures:
+            for area_name_fail, error_msg in validation_failures:
+                _LOGGER.error("%s, cannot insert area '%s'", error_msg, area_name_fail)
+            failures.extend(validation_failures)
+            continue
+        area_rows.append(area_data)
+
+    if failures:
+        failed_areas = [f"{area} ({error})" for area, error in failures]
+        _LOGGER.error(
+            "Failed to save area data for %d area(s): %s",
+            len(failures),
+            "; ".join(failed_areas),
+        )
+        raise ValueError(
+            "Area data validation failed; required fields missing or invalid"
+        )
+
+    entity_rows = [
+        payload
+        for area_name, entity in _iter_area_entities(db)
+        if (payload := _prepare_entity_payload(db, area_name, entity)) is not None
+    ]
+
+    # ``updated_at`` changes on every save, so it is not part of the area
+    # fingerprint: an area row is only rewritten when its content changed.
+    pending: dict[tuple[str, ...], int] = {}
+    changed_areas = []
+    for row in area_rows:
+        key = ("area", row["area_name"])
+        fingerprint = hash(tuple(v for k, v in row.items() if k != "updated_at"))
+        if db.saved_row_hashes.get(key) != fingerprint:
+            pending[key] = fingerprint
+            changed_areas.append(row)
+    changed_entities = []
+    for row in entity_rows:
+        key = ("entity", row["area_name"], row["entity_id"])
+        fingerprint = hash(tuple(row.values()))
+        if db.saved_row_hashes.get(key) != fingerprint:
+            pending[key] = fingerprint
+            changed_entities.append(row)
+
+    # Orphan cleanup is only needed when the configured entity set changed
+    entity_keys = frozenset(
+        (row["area_name"], row["entity_id"]) for row in entity_rows
+    )
+    cleanup_needed = entity_keys != db.saved_entity_keys
+
+    backoffs = [0.1, 0.25, 0.5, 1.0]
+    try:
+        for attempt, delay in enumerate(backoffs, start=1):
+            try:
+                if changed_areas or changed_entities:
+                    with db.get_session() as session:
+                        _bulk_upsert(session, db.Areas, changed_areas)
+                        _bulk_upsert(session, db.Entities, changed_entities)
+                        session.commit()
+                now = time.monotonic()
+                db.last_area_save_ts = now
+                db.last_entities_save_ts = now
+                break
+            except (sa.exc.OperationalError, sa.exc.TimeoutError) as err:
+                _LOGGER.warning("save_data attempt %d failed: %s", attempt, err)
+                if attempt == len(backoffs):
+                    # Ensure next call is not debounced due to a recent success
+                    db.last_area_save_ts = 0.0
+                    db.last_entities_save_ts = 0.0
+                    raise
+                time.sleep(delay)
+    except (
+        sa.exc.SQLAlchemyError,
+        ValueError,
+        TypeError,
+        RuntimeError,
+        OSError,
+    ) as err:
+        _LOGGER.error("Failed to save data: %s", err)
+        raise
+
+    db.saved_row_hashes.update(pending)
+
+    cleaned_count = 0
+    if cleanup_needed:
+        try:
+            cleaned_count = _cleanup_orphaned_entities(db)
+            if cleaned_count > 0:
+                _LOGGER.info(
+                    "Cleaned up %d orphaned entities after saving", cleaned_count
+                )
+            db.saved_entity_keys = entity_keys
+        except (
+            sa.exc.SQLAlchemyError,
+            HomeAssistantError,
+            TimeoutError,
+            OSError,
+            RuntimeError,
+        ) as cleanup_err:
+            _LOGGER.error("Failed to cleanup orphaned entities: %s", cleanup_err)
+
+    db.last_save_stats = {
+        "duration_ms": round((time.perf_counter() - save_start) * 1000, 2),
+        "areas_written": len(changed_areas),
+        "entities_written": len(changed_entities),
+        "rows_skipped": len(area_rows) + len(entity_rows) - len(pending),
+        "orphans_cleaned": cleaned_count,
+        "completed_at": dt_util.utcnow().isoformat(),
+    }
+    _LOGGER.debug("Data save finished: %s", db.last_save_stats)
+
+
+def _bulk_upsert(session: Any, model: Any, rows: list[dict[str, Any]]) -> None:
+    """INSERT ... ON CONFLICT DO UPDATE a batch of rows with one executemany.
+
+    Only the columns present in the rows are updated on conflict, so columns
+    maintained elsewhere (``created_at``, ``adjacent_areas``, ...) keep their
+    stored values.
+    """
+    if not rows:
+        return
+    table = model.__table__
+    primary_key = [column.name for column in table.primary_key.columns]
+    stmt = sqlite_insert(table)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=primary_key,
+        set_={
+            name: stmt.excluded[name] for name in rows[0] if name not in primary_key
+        },
+    )
+    session.execute(stmt, rows)
+
+
+def _prepare_area_payload(db: AreaOccupancyDB, area_name: str) -> dict[str, Any]:
+    """Build the Areas row for a configured area."""
+    # Area is guaranteed to exist when area_name comes from get_area_names()
+    # or when area_name is validated before calling this function
+    cfg = db.coordinator.get_area(area_name).config
+    # area_id is validated in config flow before areas are created
+    return {
+        "entry_id": db.coordinator.entry_id,
+        "area_name": area_name,
+        "area_id": cfg.area_id,
+        "purpose": cfg.purpose,
+        "threshold": cfg.threshold,
+        "updated_at": to_db_utc(dt_util.utcnow()),
+    }
 
 
 def _validate_area_data(
@@ -334,23 +489,10 @@ def save_area_data(db: AreaOccupancyDB, area_name: str | None = None) -> None:
             tuple[str, str]
         ] = []  # List of (area_name, error_message) tuples
         has_failures = False
-        area_objects = []  # Collect all area objects for batch merge
+        area_rows = []  # Collect all area rows for one bulk upsert
 
         for area_name_item in areas_to_save:
-            area_data_obj = db.coordinator.get_area(area_name_item)
-            # Area is guaranteed to exist when area_name comes from get_area_names()
-            # or when area_name is validated before calling this function
-            cfg = area_data_obj.config
-
-            # area_id is validated in config flow before areas are created
-            area_data = {
-                "entry_id": db.coordinator.entry_id,
-                "area_name": area_name_item,
-                "area_id": cfg.area_id,
-                "purpose": cfg.purpose,
-                "threshold": cfg.threshold,
-                "updated_at": to_db_utc(dt_util.utcnow()),
-            }
+            area_data = _prepare_area_payload(db, area_name_item)
 
             # Validate required fields using helper method
             validation_failures = _validate_area_data(db, area_data, area_name_item)
@@ -363,14 +505,9 @@ def save_area_data(db: AreaOccupancyDB, area_name: str | None = None) -> None:
                 has_failures = True
                 continue
 
-            # Collect area object for batch merge
-            area_obj = db.Areas.from_dict(area_data)
-            area_objects.append(area_obj)
+            area_rows.append(area_data)
 
-        # Perform all merges in batch (SQLite requires individual merges due to upsert limitations,
-        # but collecting first allows SQLAlchemy to optimize the batch)
-        for area_obj in area_objects:
-            session.merge(area_obj)
+        _bulk_upsert(session, db.Areas, area_rows)
 
         if has_failures:
             # Log concise summary of all failures
@@ -419,115 +556,105 @@ def save_area_data(db: AreaOccupancyDB, area_name: str | None = None) -> None:
         raise
 
 
-def save_entity_data(db: AreaOccupancyDB) -> None:
-    """Save the entity data to the database for all areas.
+def _iter_area_entities(db: AreaOccupancyDB) -> Iterable[tuple[str, Any]]:
+    """Yield (area_name, entity) tuples for all configured areas."""
+    for area_name in db.coordinator.get_area_names():
+        area_data = db.coordinator.get_area(area_name)
+        entities_container = getattr(area_data.entities, "entities", None)
+        if not entities_container:
+            continue
 
-    With single-instance architecture, no file lock is required.
-    """
+        try:
+            entities_iter = entities_container.values()
+        except AttributeError:
+            continue
+
+        for entity in entities_iter:
+            yield area_name, entity
+
+
+def _prepare_entity_payload(
+    db: AreaOccupancyDB, area_name: str, entity: Any
+) -> dict[str, Any] | None:
+    """Prepare normalized entity data for persistence."""
+    if not hasattr(entity, "type") or not entity.type:
+        _LOGGER.warning(
+            "Entity %s has no type information, skipping",
+            getattr(entity, "entity_id", "unknown"),
+        )
+        return None
 
-    def _iter_area_entities() -> Iterable[tuple[str, Any]]:
-        """Yield (area_name, entity) tuples for all configured areas."""
-        for area_name in db.coordinator.get_area_names():
-            area_data = db.coordinator.get_area(area_name)
-            entities_container = getattr(area_data.entities, "entities", None)
-            if not entities_container:
-                continue
+    entity_type = getattr(entity.type, "input_type", None)
+    if entity_type is None:
+        _LOGGER.warning("Entity %s has no input_type, skipping", entity.entity_id)
+        return None
 
-            try:
-                entities_iter = entities_container.values()
-            except AttributeError:
-                continue
+    # Normalize entity_type to plain string (handle Enum instances)
+    entity_type_value = (
+        entity_type.value if hasattr(entity_type, "value") else str(entity_type)
+    )
 
-            for entity in entities_iter:
-                yield area_name, entity
+    # Normalize values before persisting
+    try:
+        weight = float(getattr(entity.type, "weight", DEFAULT_ENTITY_WEIGHT))
+    except (TypeError, ValueError):
+        weight = DEFAULT_ENTITY_WEIGHT
+    weight = max(MIN_WEIGHT, min(MAX_WEIGHT, weight))
 
-    def _prepare_entity_payload(area_name: str, entity: Any) -> dict[str, Any] | None:
-        """Prepare normalized entity data for persistence."""
-        if not hasattr(entity, "type") or not entity.type:
-            _LOGGER.warning(
-                "Entity %s has no type information, skipping",
-                getattr(entity, "entity_id", "unknown"),
-            )
-            return None
+    try:
+        prob_true = float(entity.prob_given_true)
+    except (TypeError, ValueError):
+        prob_true = DEFAULT_ENTITY_PROB_GIVEN_TRUE
+    prob_true = max(MIN_PROBABILITY, min(MAX_PROBABILITY, prob_true))
 
-        entity_type = getattr(entity.type, "input_type", None)
-        if entity_type is None:
-            _LOGGER.warning("Entity %s has no input_type, skipping", entity.entity_id)
-            return None
+    try:
+        prob_false = float(entity.prob_given_false)
+    except (TypeError, ValueError):
+        prob_false = DEFAULT_ENTITY_PROB_GIVEN_FALSE
+    prob_false = max(MIN_PROBABILITY, min(MAX_PROBABILITY, prob_false))
 
-        # Normalize entity_type to plain string (handle Enum instances)
-        entity_type_value = (
-            entity_type.value if hasattr(entity_type, "value") else str(entity_type)
-        )
+    last_updated = to_db_utc(
+        getattr(entity, "last_updated", None) or dt_util.utcnow()
+    )
 
-        # Normalize values before persisting
-        try:
-            weight = float(getattr(entity.type, "weight", DEFAULT_ENTITY_WEIGHT))
-        except (TypeError, ValueError):
-            weight = DEFAULT_ENTITY_WEIGHT
-        weight = max(MIN_WEIGHT, min(MAX_WEIGHT, weight))
+    evidence_source = getattr(entity, "previous_evidence", None)
+    if evidence_source is None:
+        evidence_source = getattr(entity, "evidence", None)
+    evidence_val = bool(evidence_source) if evidence_source is not None else False
 
-        try:
-            prob_true = float(entity.prob_given_true)
-        except (TypeError, ValueError):
-            prob_true = DEFAULT_ENTITY_PROB_GIVEN_TRUE
-        prob_true = max(MIN_PROBABILITY, min(MAX_PROBABILITY, prob_true))
+    return {
+        "entry_id": db.coordinator.entry_id,
+        "area_name": area_name,
+        "entity_id": entity.entity_id,
+        "entity_type": entity_type_value,
+        "weight": weight,
+        "prob_given_true": prob_true,
+        "prob_given_false": prob_false,
+        "last_updated": last_updated,
+        "is_decaying": entity.decay.is_decaying,
+        "decay_start": to_db_utc(entity.decay.decay_start)
+        if entity.decay.decay_start is not None
+        else None,
+        "evidence": evidence_val,
+    }
 
-        try:
-            prob_false = float(entity.prob_given_false)
-        except (TypeError, ValueError):
-            prob_false = DEFAULT_ENTITY_PROB_GIVEN_FALSE
-        prob_false = max(MIN_PROBABILITY, min(MAX_PROBABILITY, prob_false))
 
-        last_updated = to_db_utc(
-            getattr(entity, "last_updated", None) or dt_util.utcnow()
-        )
+def save_entity_data(db: AreaOccupancyDB) -> None:
+    """Save the entity data to the database for all areas.
 
-        evidence_source = getattr(entity, "previous_evidence", None)
-        if evidence_source is None:
-            evidence_source = getattr(entity, "evidence", None)
-        evidence_val = bool(evidence_source) if evidence_source is not None else False
-
-        return {
-            "entry_id": db.coordinator.entry_id,
-            "area_name": area_name,
-            "entity_id": entity.entity_id,
-            "entity_type": entity_type_value,
-            "weight": weight,
-            "prob_given_true": prob_true,
-            "prob_given_false": prob_false,
-            "last_updated": last_updated,
-            "is_decaying": entity.decay.is_decaying,
-            "decay_start": to_db_utc(entity.decay.decay_start)
-            if entity.decay.decay_start is not None
-            else None,
-            "evidence": evidence_val,
-        }
+    With single-instance architecture, no file lock is required.
+    """
 
     def _attempt(session: Any) -> int:
-        """Attempt to save entity data with batched merges for better performance."""
-        merges_count = 0
-        # Collect all entity objects first, then merge in batches
-        # This allows SQLAlchemy to optimize the operations
-        entity_objects = []
-
-        for area_name, entity in _iter_area_entities():
-            entity_data = _prepare_entity_payload(area_name, entity)
-            if entity_data is None:
-                continue
-
-            entity_obj = db.Entities.from_dict(entity_data)
-            entity_objects.append(entity_obj)
-            merges_count += 1
-
-        # Perform all merges (SQLite requires individual merges due to upsert limitations)
-        # Collecting first allows SQLAlchemy to optimize the batch
-        for entity_obj in entity_objects:
-            session.merge(entity_obj)
-
-        # Single commit for all merges
+        """Attempt to save entity data with one bulk upsert."""
+        entity_rows = [
+            payload
+            for area_name, entity in _iter_area_entities(db)
+            if (payload := _prepare_entity_payload(db, area_name, entity)) is not None
+        ]
+        _bulk_upsert(session, db.Entities, entity_rows)
         session.commit()
-        return merges_count
+        return len(entity_rows)
 
     try:
         backoffs = [0.1, 0.25, 0.5, 1.0]
@@ -681,6 +808,9 @@ def _cleanup_orphaned_entities(db: AreaOccupancyDB) -> int:
             area_data = db.coordinator.get_area(area_name)
             result = _cleanup_area_orphans(db, area_name, area_data)
             total_cleaned += result
+        if total_cleaned:
+            # Removed rows must be rewritten if their entities come back
+            db.saved_row_hashes.clear()
 
     except (
         sa.exc.SQLAlchemyError,
@@ -750,7 +880,15 @@ def delete_area_data(db: AreaOccupancyDB, area_name: str) -> int:
                 session.query(db.GlobalPriors).filter_by(area_name=area_name).delete()
             )
 
-            # Delete occupied intervals cache for this area
+            # Delete occupied intervals cache for this area; transitions of
+            # other areas that followed it have to be recounted
+            cache_start = session.execute(
+                sa.select(sa.func.min(db.OccupiedIntervalsCache.start_time)).where(
+                    db.OccupiedIntervalsCache.area_name == area_name
+                )
+            ).scalar()
+            if cache_start is not None:
+                relationships.mark_transitions_dirty(db, session, cache_start)
             cache_deleted = (
                 session.query(db.OccupiedIntervalsCache)
                 .filter_by(area_name=area_name)
@@ -776,6 +914,21 @@ def delete_area_data(db: AreaOccupancyDB, area_name: str) -> int:
             # Delete entity statistics for this area
             session.query(db.EntityStatistics).filter_by(area_name=area_name).delete()
 
+            # Drop sync high-water marks so re-added entities re-import history
+            if entity_ids:
+                session.query(db.Metadata).filter(
+                    db.Metadata.key.in_(
+                        [f"sync_hwm:{entity_id}" for entity_id in entity_ids]
+                    )
+                ).delete(synchronize_session=False)
+            session.query(db.Metadata).filter_by(
+                key=f"{queries.OCCUPIED_CACHE_HWM_KEY_PREFIX}{area_name}"
+            ).delete(synchronize_session=False)
+            db.occupied_index.invalidate(area_name)
+            if cache_start is not None:
+                db.occupied_index.mark_changed(area_name, from_db_utc(cache_start))
+            db.saved_row_hashes.clear()
+
             # Delete area relationships involving this area
             session.query(db.AreaRelationships).filter(
                 sa.or_(
@@ -930,6 +1083,9 @@ async def ensure_area_exists(db: AreaOccupancyDB) -> None:
 def prune_old_intervals(db: AreaOccupancyDB, force: bool = False) -> int:
     """Delete intervals older than RETENTION_DAYS (coordinated across instances).
 
+    Rows are deleted in bounded batches so the write lock is never held for
+    the whole table; see ``retention.run_retention`` for the full engine.
+
     Args:
         db: Database instance
         force: If True, skip the recent-prune check
@@ -937,8 +1093,8 @@ def prune_old_intervals(db: AreaOccupancyDB, force: bool = False) -> int:
     Returns:
         Number of intervals deleted
     """
-    cutoff_date = to_db_utc(dt_util.utcnow() - timedelta(days=RETENTION_DAYS))
-    _LOGGER.debug("Pruning intervals older than %s", cutoff_date)
+    now = dt_util.utcnow()
+    _LOGGER.debug("Pruning intervals older than %d days", RETENTION_DAYS)
 
     try:
         with db.get_session() as session:
@@ -951,10 +1107,8 @@ def prune_old_intervals(db: AreaOccupancyDB, force: bool = False) -> int:
                 if result:
                     try:
                         last_prune = datetime.fromisoformat(result.value)
-                        time_since_prune = (
-                            dt_util.utcnow() - last_prune
-                        ).total_seconds()
-                        if time_since_prune < 3600:  # 1 hour
+                        time_since_prune = (now - last_prune).total_seconds()
+                        if time_since_prune < retention.RETENTION_THROTTLE_SECONDS:
                             _LOGGER.debug(
                                 "Skipping prune - last run was %d minutes ago",
                                 int(time_since_prune / 60),
@@ -965,42 +1119,31 @@ def prune_old_intervals(db: AreaOccupancyDB, force: bool = False) -> int:
                             "Failed to parse last prune time, proceeding: %s", e
                         )
 
-            # Count intervals to be deleted for logging
-            count_query = session.query(func.count(db.Intervals.id)).filter(
-                db.Intervals.start_time < cutoff_date
-            )
-            intervals_to_delete = count_query.scalar() or 0
-
-            if intervals_to_delete == 0:
-                _LOGGER.debug("No old intervals to prune")
-                # Still record the prune attempt to prevent other instances from trying
-                maintenance.set_last_prune_time(db, dt_util.utcnow(), session)
-                session.commit()
-                return 0
-
-            # Delete old intervals
-            delete_query = session.query(db.Intervals).filter(
-                db.Intervals.start_time < cutoff_date
-            )
-            deleted_count = delete_query.delete(synchronize_session=False)
-
-            # Record successful prune in the same transaction as the delete
-            maintenance.set_last_prune_time(db, dt_util.utcnow(), session)
+            # Record the prune in the transaction that passed the check, even
+            # if nothing gets deleted, so other instances don't repeat it. The
+            # batches below commit on their own and cannot share it.
+            maintenance.set_last_prune_time(db, now, session)
             session.commit()
 
+            deleted_count = retention.prune_tier(
+                db, retention.TIERS_BY_NAME["intervals"], now=now
+            )
+
+        if deleted_count:
             _LOGGER.info(
-                "Pruned %d intervals older than %d days (cutoff: %s)",
+                "Pruned %d intervals older than %d days",
                 deleted_count,
                 RETENTION_DAYS,
-                cutoff_date,
             )
-
-            return deleted_count
+        else:
+            _LOGGER.debug("No old intervals to prune")
 
     except (SQLAlchemyError, ValueError, TypeError, RuntimeError, OSError) as e:
         _LOGGER.error("Error during interval pruning: %s", e)
         return 0
 
+    return deleted_count
+
 
 def save_global_prior(
     db: AreaOccupancyDB,
@@ -1228,6 +1371,11 @@ def save_occupied_intervals_cache(
     with db.get_session() as session:
         try:
             calculation_date = to_db_utc(dt_util.utcnow())
+            previous_start = session.execute(
+                sa.select(sa.func.min(db.OccupiedIntervalsCache.start_time)).where(
+                    db.OccupiedIntervalsCache.area_name == area_name
+                )
+            ).scalar()
 
             # Delete existing cached intervals for this area
             session.query(db.OccupiedIntervalsCache).filter_by(
@@ -1270,7 +1418,23 @@ def save_occupied_intervals_cache(
                 )
                 session.add(cached_interval)
 
+            changed_starts = [start_db for start_db, _ in seen_intervals]
+            if previous_start is not None:
+                changed_starts.append(previous_start)
+            if changed_starts:
+                relationships.mark_transitions_dirty(db, session, min(changed_starts))
+            session.merge(
+                db.Metadata(
+                    key=f"{queries.OCCUPIED_CACHE_HWM_KEY_PREFIX}{area_name}",
+                    value=calculation_date.isoformat(),
+                )
+            )
             session.commit()
+            db.occupied_index.invalidate(area_name)
+            if changed_starts:
+                db.occupied_index.mark_changed(
+                    area_name, from_db_utc(min(changed_starts))
+                )
             _LOGGER.debug("Occupied intervals cache saved successfully")
 
         except (SQLAlchemyError, ValueError, TypeError, RuntimeError, OSError) as e:
@@ -6,6 +6,7 @@ from datetime import datetime, timedelta
 import logging
 from typing import TYPE_CHECKING, Any
 
+import numpy as np
 import sqlalchemy as sa
 from sqlalchemy import func
 from sqlalchemy.exc import SQLAlchemyError
@@ -16,7 +17,7 @@ from homeassistant.util import dt as dt_util
 from ..const import DEFAULT_TIME_PRIOR
 from ..data.entity_type import DEFAULT_TYPES, InputType
 from ..time_utils import from_db_utc, to_db_utc, to_utc
-from .utils import apply_motion_timeout, merge_overlapping_intervals
+from .utils import apply_motion_timeout, epoch_seconds, merge_overlapping_intervals
 
 if TYPE_CHECKING:
     from sqlalchemy.orm import Query, Session
@@ -25,6 +26,10 @@ if TYPE_CHECKING:
 
 _LOGGER = logging.getLogger(__name__)
 
+# Metadata key prefix recording how far each area's occupied intervals cache
+# has been kept current by incremental updates (ISO naive UTC)
+OCCUPIED_CACHE_HWM_KEY_PREFIX = "occupied_cache_hwm:"
+
 
 def get_area_data(db: AreaOccupancyDB, entry_id: str) -> dict[str, Any] | None:
     """Get area data for a specific entry_id (read-only, no lock)."""
@@ -177,6 +182,7 @@ def get_occupied_intervals(
     area_name: str,
     lookback_days: int,
     motion_timeout_seconds: int,
+    since: datetime | None = None,
 ) -> list[tuple[datetime, datetime]]:
     """Fetch occupied intervals from presence sensors (direct query).
 
@@ -184,10 +190,14 @@ def get_occupied_intervals(
     to provide comprehensive ground truth for prior calculations and
     correlation analysis. Motion timeout is only applied to motion intervals.
 
-    For cached version with prior-specific caching, use analysis.get_occupied_intervals_with_cache.
+    ``since``, when given, replaces the ``lookback_days`` cutoff (used
+    by the incremental cache update to recompute only the tail).
+
+    For the incrementally maintained cache, see db.occupied_cache.
     """
-    now = dt_util.utcnow()
-    lookback_date_db = to_db_utc(now - timedelta(days=lookback_days))
+    if since is None:
+        since = dt_util.utcnow() - timedelta(days=lookback_days)
+    lookback_date_db = to_db_utc(since)
     all_intervals: list[tuple[datetime, datetime]] = []
     motion_raw: list[tuple[datetime, datetime]] = []
     extended_intervals: list[tuple[datetime, datetime]] = []
@@ -487,6 +497,76 @@ def get_occupied_intervals_cache(
         return []
 
 
+def get_occupied_interval_columns(
+    db: AreaOccupancyDB,
+    area_name: str,
+    period_start: datetime,
+    period_end: datetime,
+    since: datetime | None = None,
+    head_end: datetime | None = None,
+) -> tuple[np.ndarray, np.ndarray, datetime | None]:
+    """Load cached occupied intervals as epoch-second numpy columns.
+
+    Columnar counterpart of ``get_occupied_intervals_cache`` for the time
+    prior calculation. Only intervals overlapping ``[period_start, period_end]``
+    are returned. When ``since`` is given, the result is further restricted to
+    intervals ending after ``since`` or starting before ``head_end``, so an
+    incremental caller only reads the tail of the cache (plus the head slot
+    that the moving period start cuts into).
+
+    Returns:
+        ``(starts, ends, calculation_date)`` where the arrays hold epoch
+        seconds and ``calculation_date`` is when the cache was last brought
+        up to date, by a full rebuild or an incremental update (None if the
+        area has no cached intervals).
+    """
+    cache = db.OccupiedIntervalsCache
+    empty = np.empty(0, dtype=float)
+    try:
+        with db.get_session() as session:
+            calculation_date = session.execute(
+                sa.select(func.max(cache.calculation_date)).where(
+                    cache.area_name == area_name
+                )
+            ).scalar()
+            if calculation_date is None:
+                return empty, empty, None
+            updated = session.execute(
+                sa.select(db.Metadata.value).where(
+                    db.Metadata.key == f"{OCCUPIED_CACHE_HWM_KEY_PREFIX}{area_name}"
+                )
+            ).scalar()
+            if updated is not None:
+                calculation_date = max(
+                    calculation_date, datetime.fromisoformat(updated)
+                )
+
+            conditions = [
+                cache.area_name == area_name,
+                cache.end_time > to_db_utc(period_start),
+                cache.start_time < to_db_utc(period_end),
+            ]
+            if since is not None:
+                tail = cache.end_time > to_db_utc(since)
+                if head_end is not None:
+                    tail = sa.or_(tail, cache.start_time < to_db_utc(head_end))
+                conditions.append(tail)
+
+            rows = session.execute(
+                sa.select(
+                    epoch_seconds(cache.start_time), epoch_seconds(cache.end_time)
+                ).where(*conditions)
+            ).all()
+    except (SQLAlchemyError, ValueError, TypeError, RuntimeError, OSError) as e:
+        _LOGGER.error("Error loading occupied interval columns: %s", e)
+        return empty, empty, None
+
+    if not rows:
+        return empty, empty, from_db_utc(calculation_date)
+    columns = np.asarray(rows, dtype=float)
+    return columns[:, 0], columns[:, 1], from_db_utc(calculation_date)
+
+
 def is_occupied_intervals_cache_valid(
     db: AreaOccupancyDB,
     area_name: str,
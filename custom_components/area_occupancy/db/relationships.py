@@ -3,25 +3,47 @@
 This module handles storage and retrieval of area relationships (adjacent areas,
 shared walls, etc.) and calculates influence weights for cross-area probability
 adjustments.
+
+It also maintains occupancy transition statistics between areas in
+CrossAreaStats. Transitions are derived in SQL with window functions over the
+occupied intervals cache and recomputed only from the earliest day the cache
+writers have marked dirty.
 """
 
 from __future__ import annotations
 
+from datetime import datetime, timedelta
 import logging
 from typing import TYPE_CHECKING, Any
 
+import sqlalchemy as sa
 from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
 
 from homeassistant.exceptions import HomeAssistantError
 from homeassistant.util import dt as dt_util
 
+from ..const import (
+    AGGREGATION_PERIOD_DAILY,
+    DEFAULT_LOOKBACK_DAYS,
+    TRANSITION_MAX_GAP_SECONDS,
+    TRANSITION_MAX_LOOKBACK_SECONDS,
+)
 from ..time_utils import to_db_utc
+from .utils import epoch_seconds
 
 if TYPE_CHECKING:
     from .core import AreaOccupancyDB
 
 _LOGGER = logging.getLogger(__name__)
 
+# CrossAreaStats statistic_type of daily transition counts between two areas
+TRANSITION_STATISTIC_TYPE = "area_transition"
+
+# Metadata key holding the earliest cache start_time changed since the last
+# transition statistics update (naive UTC ISO string)
+TRANSITIONS_DIRTY_KEY = "transition_stats_dirty_from"
+
 # Default influence weights by relationship type
 DEFAULT_INFLUENCE_WEIGHTS = {
     "adjacent": 0.3,  # Adjacent areas have moderate influence
@@ -272,3 +294,209 @@ def sync_adjacent_areas_from_config(db: AreaOccupancyDB, area_name: str) -> bool
     except (ValueError, TypeError, RuntimeError, AttributeError, SQLAlchemyError) as e:
         _LOGGER.error("Error syncing adjacent areas: %s", e)
         return False
+
+
+def mark_transitions_dirty(db: AreaOccupancyDB, session: Session, since: Any) -> None:
+    """Record that occupied intervals cache rows from ``since`` have changed.
+
+    Called by the cache writers inside their own transaction; the marker only
+    ever moves backwards until ``update_transition_stats`` consumes it.
+
+    Args:
+        db: Database instance
+        session: Session of the caller's cache write (not committed here)
+        since: Earliest changed cache start_time (naive UTC)
+    """
+    marker = session.get(db.Metadata, TRANSITIONS_DIRTY_KEY)
+    if marker is not None:
+        try:
+            since = min(since, datetime.fromisoformat(marker.value))
+        except (TypeError, ValueError):
+            pass
+        marker.value = since.isoformat()
+    else:
+        session.add(db.Metadata(key=TRANSITIONS_DIRTY_KEY, value=since.isoformat()))
+
+
+def _transition_counts_query(db: AreaOccupancyDB, day_start: datetime | None) -> Any:
+    """Build the windowed query counting transitions per (from, to, day).
+
+    Cached intervals of all areas are ordered by start time; LAG gives each
+    interval its immediate predecessor. An interval in another area that
+    starts within TRANSITION_MAX_GAP_SECONDS of the predecessor's end (or
+    overlaps it) is a transition from the predecessor's area. Predecessors
+    starting more than TRANSITION_MAX_LOOKBACK_SECONDS earlier are ignored,
+    which bounds how far back an incremental update has to scan.
+    """
+    cache = db.OccupiedIntervalsCache
+    start_s = epoch_seconds(cache.start_time)
+    window = {"order_by": (cache.start_time, cache.area_name, cache.end_time)}
+
+    ordered = sa.select(
+        cache.area_name.label("to_area"),
+        cache.start_time,
+        start_s.label("start_s"),
+        sa.func.lag(cache.area_name).over(**window).label("from_area"),
+        sa.func.lag(start_s).over(**window).label("prev_start_s"),
+        sa.func.lag(epoch_seconds(cache.end_time)).over(**window).label("prev_end_s"),
+    ).where(cache.entry_id == db.coordinator.entry_id)
+    if day_start is not None:
+        ordered = ordered.where(
+            cache.start_time
+            >= day_start - timedelta(seconds=TRANSITION_MAX_LOOKBACK_SECONDS)
+        )
+    ordered = ordered.subquery()
+
+    # julianday() based epoch seconds are off by a few microseconds, round them
+    # so that intervals exactly at the gap or lookback limits are counted
+    gap = sa.func.round(ordered.c.start_s - ordered.c.prev_end_s, 3)
+    since_prev_start = sa.func.round(ordered.c.start_s - ordered.c.prev_start_s, 3)
+    day = sa.func.date(ordered.c.start_time)
+    query = sa.select(
+        ordered.c.from_area,
+        ordered.c.to_area,
+        day.label("day"),
+        sa.func.count().label("transitions"),
+        sa.func.avg(gap).label("mean_gap"),
+    ).where(
+        ordered.c.from_area.is_not(None),
+        ordered.c.from_area != ordered.c.to_area,
+        gap <= TRANSITION_MAX_GAP_SECONDS,
+        since_prev_start <= TRANSITION_MAX_LOOKBACK_SECONDS,
+    )
+    if day_start is not None:
+        query = query.where(ordered.c.start_time >= day_start)
+    return query.group_by(ordered.c.from_area, ordered.c.to_area, day)
+
+
+def update_transition_stats(db: AreaOccupancyDB, full: bool = False) -> int:
+    """Recompute daily area transition counts in CrossAreaStats.
+
+    Only days from the dirty marker onwards are recomputed and replaced; the
+    predecessor of the first interval is found within the lookback bound, so
+    the result equals a full recomputation.
+
+    Args:
+        db: Database instance
+        full: If True, recompute every day regardless of the dirty marker
+
+    Returns:
+        Number of CrossAreaStats rows written
+    """
+    stats = db.CrossAreaStats
+    with db.get_session() as session:
+        try:
+            marker = session.get(db.Metadata, TRANSITIONS_DIRTY_KEY)
+            day_start: datetime | None = None
+            if not full:
+                if marker is None:
+                    return 0
+                day_start = datetime.fromisoformat(marker.value).replace(
+                    hour=0, minute=0, second=0, microsecond=0
+                )
+
+            results = session.execute(_transition_counts_query(db, day_start)).all()
+
+            delete_query = session.query(stats).filter(
+                stats.entry_id == db.coordinator.entry_id,
+                stats.statistic_type == TRANSITION_STATISTIC_TYPE,
+            )
+            if day_start is not None:
+                delete_query = delete_query.filter(stats.period_start >= day_start)
+            delete_query.delete(synchronize_session=False)
+
+            now = to_db_utc(dt_util.utcnow())
+            rows = []
+            for from_area, to_area, day, transitions, mean_gap in results:
+                period_start = datetime.fromisoformat(day)
+                rows.append(
+                    {
+                        "entry_id": db.coordinator.entry_id,
+                        "statistic_type": TRANSITION_STATISTIC_TYPE,
+                        "statistic_name": f"{from_area}->{to_area}",
+                        "involved_areas": [from_area, to_area],
+                        "aggregation_period": AGGREGATION_PERIOD_DAILY,
+                        "period_start": period_start,
+                        "period_end": period_start + timedelta(days=1),
+                        "statistic_value": float(transitions),
+                        "extra_metadata": {"mean_gap_seconds": round(mean_gap, 1)},
+                        "created_at": now,
+                    }
+                )
+            if rows:
+                session.execute(sa.insert(stats), rows)
+            if marker is not None:
+                session.delete(marker)
+            session.commit()
+        except (SQLAlchemyError, ValueError, TypeError, RuntimeError, OSError) as e:
+            _LOGGER.error("Error updating area transition statistics: %s", e)
+            session.rollback()
+            return 0
+
+    _LOGGER.debug(
+        "Area transition statistics updated from %s: %d rows written",
+        day_start or "the beginning",
+        len(rows),
+    )
+    return len(rows)
+
+
+def get_area_transitions(
+    db: AreaOccupancyDB, area_name: str, days: int = DEFAULT_LOOKBACK_DAYS
+) -> dict[str, dict[str, dict[str, float]]]:
+    """Get transition counts into and out of an area over the last ``days``.
+
+    Args:
+        db: Database instance
+        area_name: Area name
+        days: Number of days to sum over
+
+    Returns:
+        Dictionary with "incoming" (keyed by source area) and "outgoing" (keyed
+        by destination area) entries of {"count", "mean_gap_seconds"}
+    """
+    stats = db.CrossAreaStats
+    cutoff = to_db_utc(dt_util.utcnow() - timedelta(days=days))
+    result: dict[str, dict[str, dict[str, float]]] = {"incoming": {}, "outgoing": {}}
+
+    try:
+        with db.get_session() as session:
+            rows = (
+                session.query(
+                    stats.involved_areas, stats.statistic_value, stats.extra_metadata
+                )
+                .filter(
+                    stats.entry_id == db.coordinator.entry_id,
+                    stats.statistic_type == TRANSITION_STATISTIC_TYPE,
+                    stats.period_start >= cutoff,
+                    # involved_areas is stored with escaped non-ASCII characters:
+                    # compare the decoded elements, not the JSON text
+                    sa.or_(
+                        sa.func.json_extract(stats.involved_areas, "$[0]") == area_name,
+                        sa.func.json_extract(stats.involved_areas, "$[1]") == area_name,
+                    ),
+                )
+                .all()
+            )
+    except SQLAlchemyError as e:
+        _LOGGER.error("Database error getting area transitions: %s", e)
+        return result
+
+    for (from_area, to_area), count, extra in rows:
+        if to_area == area_name:
+            direction, other = "incoming", from_area
+        elif from_area == area_name:
+            direction, other = "outgoing", to_area
+        else:
+            continue
+        entry = result[direction].setdefault(
+            other, {"count": 0.0, "mean_gap_seconds": 0.0}
+        )
+        gap = (extra or {}).get("mean_gap_seconds", 0.0)
+        total = entry["count"] + count
+        entry["mean_gap_seconds"] = (
+            entry["mean_gap_seconds"] * entry["count"] + gap * count
+        ) / total
+        entry["count"] = total
+
+    return result
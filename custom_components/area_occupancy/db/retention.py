@@ -0,0 +1,391 @@
+"""Retention engine: tiered batched deletes and free page reclamation.
+
+Every table with a retention policy is described by a ``RetentionTier``. Expired
+rows are removed in bounded batches, each in its own short transaction, so the
+write lock is released between batches instead of being held for one long
+DELETE over the whole table.
+
+SQLite never returns deleted pages to the filesystem on its own. Databases
+created with ``auto_vacuum=INCREMENTAL`` have their free pages released with
+``PRAGMA incremental_vacuum`` after each run. Older databases are converted by
+a single full ``VACUUM`` once enough free space has built up, throttled to at
+most one every ``RETENTION_VACUUM_INTERVAL_DAYS``.
+
+Tiers whose rows are rolled up by an aggregation are only pruned in a run where
+that aggregation completed with the same reference time, and are kept
+``RETENTION_PROMOTION_GRACE_DAYS`` past the aggregation cutoff. Retention can
+then never delete rows that have not been promoted yet.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Collection
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+import logging
+import time
+from typing import TYPE_CHECKING, Any
+
+import sqlalchemy as sa
+from sqlalchemy.exc import SQLAlchemyError
+
+from homeassistant.util import dt as dt_util
+
+from ..const import (
+    AGGREGATION_PERIOD_DAILY,
+    AGGREGATION_PERIOD_HOURLY,
+    AGGREGATION_PERIOD_MONTHLY,
+    AGGREGATION_PERIOD_WEEKLY,
+    RETENTION_DAILY_AGGREGATES_DAYS,
+    RETENTION_DAYS,
+    RETENTION_DELETE_BATCH_SIZE,
+    RETENTION_HOURLY_NUMERIC_DAYS,
+    RETENTION_MONTHLY_AGGREGATES_YEARS,
+    RETENTION_PROMOTION_GRACE_DAYS,
+    RETENTION_RAW_NUMERIC_SAMPLES_DAYS,
+    RETENTION_VACUUM_INTERVAL_DAYS,
+    RETENTION_VACUUM_MAX_PAGES,
+    RETENTION_VACUUM_MIN_FREE_BYTES,
+    RETENTION_WEEKLY_AGGREGATES_DAYS,
+    RETENTION_WEEKLY_NUMERIC_YEARS,
+)
+from ..time_utils import to_db_utc
+from . import maintenance
+
+if TYPE_CHECKING:
+    from .core import AreaOccupancyDB
+
+_LOGGER = logging.getLogger(__name__)
+
+# Minimum seconds between two retention runs (shared with prune_old_intervals)
+RETENTION_THROTTLE_SECONDS = 3600
+
+LAST_VACUUM_KEY = "last_vacuum_time"
+
+# Aggregation runs promoting the rows of a tier (see RetentionTier.promoted_by)
+INTERVAL_AGGREGATION = "interval_aggregation"
+NUMERIC_AGGREGATION = "numeric_aggregation"
+
+# Values of PRAGMA auto_vacuum
+_AUTO_VACUUM_NONE = 0
+_AUTO_VACUUM_INCREMENTAL = 2
+
+
+@dataclass(frozen=True)
+class RetentionTier:
+    """Retention policy for one table, or one aggregation period of a table.
+
+    ``promoted_by`` names the aggregation that rolls the rows of the tier up
+    into the next one, None for terminal tiers.
+    """
+
+    name: str
+    model: str
+    time_column: str
+    max_age: timedelta
+    period: str | None = None
+    promoted_by: str | None = None
+
+    @property
+    def retained_for(self) -> timedelta:
+        """Age after which rows are deleted, including the promotion grace."""
+        if self.promoted_by is None:
+            return self.max_age
+        return self.max_age + timedelta(days=RETENTION_PROMOTION_GRACE_DAYS)
+
+
+RETENTION_TIERS: tuple[RetentionTier, ...] = (
+    RetentionTier(
+        "intervals", "Intervals", "start_time", timedelta(days=RETENTION_DAYS)
+    ),
+    RetentionTier(
+        "interval_daily",
+        "IntervalAggregates",
+        "period_start",
+        timedelta(days=RETENTION_DAILY_AGGREGATES_DAYS),
+        AGGREGATION_PERIOD_DAILY,
+        INTERVAL_AGGREGATION,
+    ),
+    RetentionTier(
+        "interval_weekly",
+        "IntervalAggregates",
+        "period_start",
+        timedelta(days=RETENTION_WEEKLY_AGGREGATES_DAYS),
+        AGGREGATION_PERIOD_WEEKLY,
+        INTERVAL_AGGREGATION,
+    ),
+    RetentionTier(
+        "interval_monthly",
+        "IntervalAggregates",
+        "period_start",
+        timedelta(days=RETENTION_MONTHLY_AGGREGATES_YEARS * 365),
+        AGGREGATION_PERIOD_MONTHLY,
+    ),
+    RetentionTier(
+        "cross_area_daily",
+        "CrossAreaStats",
+        "period_start",
+        timedelta(days=RETENTION_DAYS),
+        AGGREGATION_PERIOD_DAILY,
+    ),
+    RetentionTier(
+        "numeric_samples",
+        "NumericSamples",
+        "timestamp",
+        timedelta(days=RETENTION_RAW_NUMERIC_SAMPLES_DAYS),
+        promoted_by=NUMERIC_AGGREGATION,
+    ),
+    RetentionTier(
+        "numeric_hourly",
+        "NumericAggregates",
+        "period_start",
+        timedelta(days=RETENTION_HOURLY_NUMERIC_DAYS),
+        AGGREGATION_PERIOD_HOURLY,
+        NUMERIC_AGGREGATION,
+    ),
+    RetentionTier(
+        "numeric_weekly",
+        "NumericAggregates",
+        "period_start",
+        timedelta(days=RETENTION_WEEKLY_NUMERIC_YEARS * 365),
+        AGGREGATION_PERIOD_WEEKLY,
+    ),
+)
+
+TIERS_BY_NAME: dict[str, RetentionTier] = {tier.name: tier for tier in RETENTION_TIERS}
+
+
+def delete_in_batches(
+    db: AreaOccupancyDB,
+    model: Any,
+    *criteria: Any,
+    batch_size: int = RETENTION_DELETE_BATCH_SIZE,
+) -> int:
+    """Delete rows matching ``criteria`` in bounded batches.
+
+    Each batch is ``DELETE ... WHERE id IN (SELECT id ... LIMIT n)`` committed
+    on its own, so concurrent writers wait at most one batch for the lock.
+
+    Args:
+        db: Database instance
+        model: SQLAlchemy model class (must have an 'id' attribute)
+        *criteria: Filter expressions selecting the rows to delete
+        batch_size: Maximum rows deleted per transaction
+
+    Returns:
+        Total number of rows deleted
+    """
+    batch_ids = sa.select(model.id).where(*criteria).limit(batch_size)
+    statement = (
+        sa.delete(model)
+        .where(model.id.in_(batch_ids))
+        .execution_options(synchronize_session=False)
+    )
+
+    total_deleted = 0
+    while True:
+        with db.get_session() as session:
+            deleted = session.execute(statement).rowcount or 0
+            session.commit()
+        total_deleted += deleted
+        if deleted < batch_size:
+            return total_deleted
+
+
+def prune_tier(
+    db: AreaOccupancyDB,
+    tier: RetentionTier,
+    area_name: str | None = None,
+    now: datetime | None = None,
+    batch_size: int = RETENTION_DELETE_BATCH_SIZE,
+) -> int:
+    """Delete the rows of one tier that are older than its retention period.
+
+    The retention period of a promoted tier includes the promotion grace.
+
+    Args:
+        db: Database instance
+        tier: Retention tier to prune
+        area_name: Optional area name to filter by. If None, processes all areas.
+        now: Reference time for the cutoff (defaults to utcnow)
+        batch_size: Maximum rows deleted per transaction
+
+    Returns:
+        Number of rows deleted
+    """
+    model = getattr(db, tier.model)
+    cutoff = to_db_utc((now or dt_util.utcnow()) - tier.retained_for)
+
+    criteria = [getattr(model, tier.time_column) < cutoff]
+    if tier.period is not None:
+        criteria.append(model.aggregation_period == tier.period)
+    if area_name:
+        criteria.append(model.area_name == area_name)
+
+    return delete_in_batches(db, model, *criteria, batch_size=batch_size)
+
+
+def _storage_stats(conn: Any) -> dict[str, int]:
+    """Return page size, page count and free page count of the database."""
+    return {
+        key: int(conn.execute(sa.text(f"PRAGMA {key}")).scalar() or 0)
+        for key in ("page_size", "page_count", "freelist_count")
+    }
+
+
+def _vacuum_due(db: AreaOccupancyDB, now: datetime) -> bool:
+    """Check whether the full-VACUUM throttle has expired."""
+    with db.get_session() as session:
+        entry = session.query(db.Metadata).filter_by(key=LAST_VACUUM_KEY).first()
+    if entry is None:
+        return True
+    try:
+        last_vacuum = datetime.fromisoformat(entry.value)
+    except (TypeError, ValueError):
+        return True
+    return now - last_vacuum >= timedelta(days=RETENTION_VACUUM_INTERVAL_DAYS)
+
+
+def reclaim_free_pages(
+    db: AreaOccupancyDB,
+    max_pages: int = RETENTION_VACUUM_MAX_PAGES,
+    allow_vacuum: bool = True,
+) -> dict[str, Any]:
+    """Return free database pages to the filesystem.
+
+    Args:
+        db: Database instance
+        max_pages: Maximum pages released by one incremental vacuum
+        allow_vacuum: If False, never fall back to a full VACUUM
+
+    Returns:
+        Dictionary with the action taken, page counts and reclaimed bytes
+    """
+    now = dt_util.utcnow()
+    action = "none"
+
+    with db.engine.connect() as conn:
+        conn = conn.execution_options(isolation_level="AUTOCOMMIT")
+        before = _storage_stats(conn)
+        mode = int(conn.execute(sa.text("PRAGMA auto_vacuum")).scalar() or 0)
+        free_bytes = before["freelist_count"] * before["page_size"]
+
+        if mode == _AUTO_VACUUM_INCREMENTAL and before["freelist_count"]:
+            # The sqlite3 module steps a statement only once when it returns no
+            # rows, which would release a single page; executescript runs the
+            # pragma to completion.
+            conn.connection.driver_connection.executescript(
+                f"PRAGMA incremental_vacuum({int(max_pages)});"
+            )
+            action = "incremental_vacuum"
+        elif (
+            mode == _AUTO_VACUUM_NONE
+            and allow_vacuum
+            and free_bytes >= RETENTION_VACUUM_MIN_FREE_BYTES
+            and _vacuum_due(db, now)
+        ):
+            # Switching the mode only takes effect through a full VACUUM; after
+            # this one, free pages are released incrementally.
+            conn.execute(sa.text("PRAGMA auto_vacuum=INCREMENTAL"))
+            conn.execute(sa.text("VACUUM"))
+            action = "vacuum"
+
+        if action != "none":
+            # In WAL mode the main file only shrinks once the log is checkpointed
+            conn.execute(sa.text("PRAGMA wal_checkpoint(TRUNCATE)"))
+        after = _storage_stats(conn)
+
+    if action == "vacuum":
+        with db.get_session() as session:
+            session.merge(db.Metadata(key=LAST_VACUUM_KEY, value=now.isoformat()))
+            session.commit()
+
+    reclaimed_pages = max(0, before["page_count"] - after["page_count"])
+    return {
+        "action": action,
+        "page_size": after["page_size"],
+        "page_count": after["page_count"],
+        "free_pages": after["freelist_count"],
+        "reclaimed_pages": reclaimed_pages,
+        "reclaimed_bytes": reclaimed_pages * before["page_size"],
+    }
+
+
+def run_retention(
+    db: AreaOccupancyDB,
+    force: bool = False,
+    batch_size: int = RETENTION_DELETE_BATCH_SIZE,
+    now: datetime | None = None,
+    promoted: Collection[str] = (),
+) -> dict[str, Any]:
+    """Prune every retention tier and reclaim the freed space.
+
+    Runs at most once per ``RETENTION_THROTTLE_SECONDS`` across instances
+    (recorded as ``last_prune_time``) unless ``force`` is set. A promoted tier
+    is skipped unless its aggregation is in ``promoted``, i.e. it completed in
+    the same run with the same ``now``.
+
+    Args:
+        db: Database instance
+        force: If True, skip the recent-run check
+        batch_size: Maximum rows deleted per transaction
+        now: Reference time shared with the aggregation run (defaults to utcnow)
+        promoted: Aggregations that completed before this run
+
+    Returns:
+        Dictionary with rows deleted per tier and storage reclamation results,
+        or an empty dictionary if the run was throttled
+    """
+    now = now or dt_util.utcnow()
+    if not force:
+        last_prune = maintenance.get_last_prune_time(db)
+        if last_prune and (now - last_prune).total_seconds() < (
+            RETENTION_THROTTLE_SECONDS
+        ):
+            _LOGGER.debug("Skipping retention run - last run was %s", last_prune)
+            return {}
+
+    start = time.perf_counter()
+    deleted: dict[str, int] = {}
+    skipped: list[str] = []
+    try:
+        for tier in RETENTION_TIERS:
+            if tier.promoted_by is not None and tier.promoted_by not in promoted:
+                skipped.append(tier.name)
+                continue
+            deleted[tier.name] = prune_tier(db, tier, now=now, batch_size=batch_size)
+        if skipped:
+            _LOGGER.debug(
+                "Retention skipped tiers %s: their aggregation did not complete",
+                ", ".join(skipped),
+            )
+        maintenance.set_last_prune_time(db, now)
+    except (SQLAlchemyError, ValueError, TypeError, RuntimeError, OSError) as err:
+        _LOGGER.error("Error during retention run: %s", err)
+        return {}
+
+    try:
+        storage = reclaim_free_pages(db)
+    except (SQLAlchemyError, OSError) as err:
+        # Typically a VACUUM that could not get an exclusive lock; the deletes
+        # are committed and the free pages are reused by later writes anyway.
+        _LOGGER.warning("Failed to reclaim free database pages: %s", err)
+        storage = {"action": "failed", "reclaimed_pages": 0, "reclaimed_bytes": 0}
+
+    stats: dict[str, Any] = {
+        "duration_ms": round((time.perf_counter() - start) * 1000, 2),
+        "deleted": deleted,
+        "skipped_tiers": skipped,
+        "rows_deleted": sum(deleted.values()),
+        **storage,
+        "completed_at": now.isoformat(),
+    }
+    db.last_retention_stats = stats
+    _LOGGER.info(
+        "Retention run deleted %d rows and reclaimed %d bytes (%s) in %.2f ms",
+        stats["rows_deleted"],
+        stats["reclaimed_bytes"],
+        stats["action"],
+        stats["duration_ms"],
+    )
+    return stats
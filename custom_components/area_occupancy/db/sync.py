@@ -4,6 +4,7 @@ from __future__ import annotations
 
 from datetime import datetime, timedelta
 import logging
+import time
 from typing import TYPE_CHECKING, Any
 
 import sqlalchemy as sa
@@ -14,10 +15,15 @@ from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers.recorder import get_instance
 from homeassistant.util import dt as dt_util
 
-from ..const import MAX_INTERVAL_SECONDS, MIN_INTERVAL_SECONDS, RETENTION_DAYS
+from ..const import (
+    AGGREGATION_LEVEL_RAW,
+    MAX_INTERVAL_SECONDS,
+    MIN_INTERVAL_SECONDS,
+    RETENTION_DAYS,
+)
 from ..data.entity_type import InputType
-from ..time_utils import to_db_utc, to_utc
-from . import queries
+from ..time_utils import from_db_utc, to_db_utc, to_utc
+from . import occupied_cache, queries
 from .utils import chunked, is_valid_state
 
 if TYPE_CHECKING:
@@ -26,6 +32,12 @@ if TYPE_CHECKING:
 _LOGGER = logging.getLogger(__name__)
 _INTERVAL_LOOKUP_BATCH = 250
 _NUMERIC_SAMPLE_LOOKUP_BATCH = 250
+# Entities fetched from the recorder per query (bounds memory per round trip)
+_SYNC_ENTITY_CHUNK = 50
+# Metadata key prefix for per-entity sync high-water marks
+_HWM_KEY_PREFIX = "sync_hwm:"
+# Input types whose intervals make up the occupied intervals cache
+_OCCUPANCY_INPUT_TYPES = (InputType.MOTION, InputType.MEDIA, InputType.SLEEP)
 _NUMERIC_INPUT_TYPES = {
     InputType.TEMPERATURE,
     InputType.HUMIDITY,
@@ -222,14 +234,57 @@ def _states_to_intervals(
     return intervals
 
 
-def _commit_intervals(db: AreaOccupancyDB, intervals: list[dict[str, Any]]) -> None:
-    """Commit interval data to the database (runs in executor)."""
+def _delete_superseded_intervals(
+    session: sa.orm.Session,
+    db: AreaOccupancyDB,
+    superseded: set[tuple[str, datetime]],
+) -> int:
+    """Delete raw intervals re-emitted with a later end by this sync.
+
+    The last state of each entity is stored as an interval ending at the sync
+    time. When the next sync re-reads that state from its high-water mark, the
+    interval is regenerated with its real end, so the provisional row is
+    replaced rather than kept alongside it.
+    """
+    deleted = 0
+    start_tuple = sa.tuple_(db.Intervals.entity_id, db.Intervals.start_time)
+    for chunk in chunked(list(superseded), _INTERVAL_LOOKUP_BATCH):
+        deleted += (
+            session.query(db.Intervals)
+            .filter(
+                start_tuple.in_(chunk),
+                db.Intervals.aggregation_level == AGGREGATION_LEVEL_RAW,
+            )
+            .delete(synchronize_session=False)
+        )
+    return deleted
+
+
+def _commit_intervals(
+    db: AreaOccupancyDB,
+    intervals: list[dict[str, Any]],
+    superseded: set[tuple[str, datetime]] | None = None,
+) -> int:
+    """Commit interval data to the database (runs in executor).
+
+    Args:
+        db: Database instance
+        intervals: Interval rows (with area_name pre-computed by caller)
+        superseded: (entity_id, start_time) keys of provisional intervals that
+            this batch regenerates and which should be replaced
+
+    Returns:
+        Number of intervals inserted
+    """
     # Filter to only intervals that have an area_name (pre-computed by caller)
     mapped_intervals = [i for i in intervals if "area_name" in i]
     if not mapped_intervals:
-        return
+        return 0
 
     with db.get_session() as session:
+        if superseded:
+            _delete_superseded_intervals(session, db, superseded)
+
         interval_keys = {
             (
                 interval_data["entity_id"],
@@ -256,16 +311,21 @@ def _commit_intervals(db: AreaOccupancyDB, intervals: list[dict[str, Any]]) -> N
             seen_keys.add(key)
             new_intervals.append(interval_data)
 
-        if new_intervals:
+        if new_intervals or superseded:
             session.bulk_insert_mappings(db.Intervals, new_intervals)
             session.commit()
             _LOGGER.debug("Synced %d new intervals from recorder", len(new_intervals))
+        return len(new_intervals)
 
 
 def _commit_numeric_samples(
     db: AreaOccupancyDB, numeric_samples: list[dict[str, Any]]
-) -> None:
-    """Commit numeric sample data to the database (runs in executor)."""
+) -> int:
+    """Commit numeric sample data to the database (runs in executor).
+
+    Returns:
+        Number of samples inserted
+    """
     with db.get_session() as session:
         sample_keys = {
             (
@@ -296,13 +356,89 @@ def _commit_numeric_samples(
             session.bulk_insert_mappings(db.NumericSamples, new_samples)
             session.commit()
             _LOGGER.debug("Synced %d numeric samples from recorder", len(new_samples))
+        return len(new_samples)
+
+
+def _load_high_water_marks(
+    db: AreaOccupancyDB, entity_ids: list[str]
+) -> dict[str, datetime]:
+    """Return the per-entity sync high-water marks stored in metadata (UTC-aware)."""
+    marks: dict[str, datetime] = {}
+    keys = [f"{_HWM_KEY_PREFIX}{entity_id}" for entity_id in entity_ids]
+    with db.get_session() as session:
+        for chunk in chunked(keys, _INTERVAL_LOOKUP_BATCH):
+            rows = session.query(db.Metadata).filter(db.Metadata.key.in_(chunk)).all()
+            for row in rows:
+                try:
+                    marks[row.key[len(_HWM_KEY_PREFIX) :]] = from_db_utc(
+                        datetime.fromisoformat(row.value)
+                    )
+                except (TypeError, ValueError):
+                    continue
+    return marks
+
+
+def _save_high_water_marks(db: AreaOccupancyDB, marks: dict[str, datetime]) -> None:
+    """Persist per-entity sync high-water marks to metadata (runs in executor)."""
+    if not marks:
+        return
+    with db.get_session() as session:
+        for entity_id, mark in marks.items():
+            session.merge(
+                db.Metadata(
+                    key=f"{_HWM_KEY_PREFIX}{entity_id}",
+                    value=to_db_utc(mark).isoformat(),
+                )
+            )
+        session.commit()
+
+
+def _plan_sync_chunks(
+    entity_ids: list[str],
+    marks: dict[str, datetime],
+    default_start: datetime,
+) -> list[tuple[datetime, list[str]]]:
+    """Group entities into recorder queries of similar start time.
+
+    Entities are ordered by their high-water mark before chunking so each
+    query's start (the oldest mark in the chunk) is close to every member's
+    own mark, keeping re-read history to a minimum.
+    """
+    ordered = sorted(entity_ids, key=lambda eid: marks.get(eid, default_start))
+    return [
+        (min(marks.get(eid, default_start) for eid in chunk), chunk)
+        for chunk in chunked(ordered, _SYNC_ENTITY_CHUNK)
+    ]
+
+
+def _drop_already_synced(
+    states: dict[str, list[State]], marks: dict[str, datetime]
+) -> dict[str, list[State]]:
+    """Drop states older than each entity's own high-water mark."""
+    filtered: dict[str, list[State]] = {}
+    for entity_id, state_list in states.items():
+        mark = marks.get(entity_id)
+        if mark is None:
+            filtered[entity_id] = state_list
+            continue
+        filtered[entity_id] = [
+            state for state in state_list if to_utc(state.last_changed) >= mark
+        ]
+    return filtered
 
 
 async def sync_states(db: AreaOccupancyDB) -> None:
-    """Fetch states history from recorder and commit to Intervals table for all areas."""
+    """Fetch new states from the recorder and commit them as intervals for all areas.
+
+    Each entity keeps a high-water mark (the start of its last, still-open
+    state) in the metadata table, so a sync only pulls history newer than
+    what was already imported. Entities without a mark start from the latest
+    stored interval. Recorder queries are issued in entity chunks to bound
+    memory; timing and row counts of the sync are kept in ``db.last_sync_stats``.
+    """
     hass = db.coordinator.hass
     recorder = get_instance(hass)
-    start_time = queries.get_latest_interval(db)
+    sync_start = time.perf_counter()
     end_time = dt_util.utcnow()
 
     # Collect all entity IDs from all areas
@@ -317,43 +453,111 @@ async def sync_states(db: AreaOccupancyDB) -> None:
         _LOGGER.debug("No entity IDs to sync, skipping recorder query")
         return
 
+    # Pre-compute entity->area map once to avoid O(n*m) lookups
+    entry_id = db.coordinator.entry_id
+    entity_area_map: dict[str, str] = {}
+    for area_name, area in db.coordinator.areas.items():
+        for eid in area.entities.entity_ids:
+            entity_area_map[eid] = area_name
+
+    # Presence entities feed the occupied intervals cache; track the earliest
+    # new interval per area so the cache can be updated incrementally.
+    presence_entities: dict[str, str] = {}
+    for area_name, area in db.coordinator.areas.items():
+        for input_type in _OCCUPANCY_INPUT_TYPES:
+            for eid in area.entities.get_entities_by_input_type(input_type):
+                presence_entities[eid] = area_name
+    cache_dirty_since: dict[str, datetime] = {}
+
+    stats: dict[str, Any] = {
+        "entities": len(entity_ids),
+        "chunks": 0,
+        "states_fetched": 0,
+        "intervals_written": 0,
+        "numeric_samples_written": 0,
+        "occupied_cache_rows_written": 0,
+    }
+
     try:
-        states = await recorder.async_add_executor_job(
-            lambda: get_significant_states(
-                hass,
-                to_utc(start_time),
-                to_utc(end_time),
-                entity_ids,
-                minimal_response=False,
-            )
+        default_start = await hass.async_add_executor_job(
+            queries.get_latest_interval, db
         )
+        marks = await hass.async_add_executor_job(
+            _load_high_water_marks, db, entity_ids
+        )
+
+        for chunk_start, chunk_ids in _plan_sync_chunks(
+            entity_ids, marks, to_utc(default_start)
+        ):
+            if db.coordinator.stop_requested:
+                break
+            stats["chunks"] += 1
+            states = await recorder.async_add_executor_job(
+                lambda start=chunk_start, ids=chunk_ids: get_significant_states(
+                    hass,
+                    start,
+                    to_utc(end_time),
+                    ids,
+                    minimal_response=False,
+                )
+            )
+            if not states:
+                continue
+
+            states = _drop_already_synced(states, marks)
+            stats["states_fetched"] += sum(len(v) for v in states.values())
+
+            # Convert states to proper intervals with correct duration calculation
+            intervals = _states_to_intervals(db, states, to_utc(end_time))
+            if intervals:
+                superseded: set[tuple[str, datetime]] = set()
+                for interval_data in intervals:
+                    entity_id = interval_data["entity_id"]
+                    area_name = entity_area_map.get(entity_id)
+                    if area_name:
+                        interval_data["entry_id"] = entry_id
+                        interval_data["area_name"] = area_name
+                    mark = marks.get(entity_id)
+                    if mark is not None and interval_data["start_time"] == to_db_utc(
+                        mark
+                    ):
+                        superseded.add((entity_id, interval_data["start_time"]))
+                    cache_area = presence_entities.get(entity_id)
+                    if cache_area is not None:
+                        start = from_db_utc(interval_data["start_time"])
+                        previous = cache_dirty_since.get(cache_area)
+                        if previous is None or start < previous:
+                            cache_dirty_since[cache_area] = start
+
+                stats["intervals_written"] += await hass.async_add_executor_job(
+                    _commit_intervals, db, intervals, superseded
+                )
+
+            numeric_samples = _states_to_numeric_samples(db, states)
+            if numeric_samples:
+                stats["numeric_samples_written"] += await hass.async_add_executor_job(
+                    _commit_numeric_samples, db, numeric_samples
+                )
+
+            # Advance marks only after the chunk is committed
+            new_marks = {
+                entity_id: max(to_utc(s.last_changed) for s in state_list)
+                for entity_id, state_list in states.items()
+                if state_list
+            }
+            if new_marks:
+                await hass.async_add_executor_job(
+                    _save_high_water_marks, db, new_marks
+                )
+                marks.update(new_marks)
 
-        if not states:
-            return
-
-        # Convert states to proper intervals with correct duration calculation
-        intervals = _states_to_intervals(db, states, to_utc(end_time))
-        if intervals:
-            # Pre-compute entity->area map once to avoid O(n*m) lookups
-            entry_id = db.coordinator.entry_id
-            entity_area_map: dict[str, str] = {}
-            for area_name, area in db.coordinator.areas.items():
-                for eid in area.entities.entity_ids:
-                    entity_area_map[eid] = area_name
-
-            for interval_data in intervals:
-                area_name = entity_area_map.get(interval_data["entity_id"])
-                if area_name:
-                    interval_data["entry_id"] = entry_id
-                    interval_data["area_name"] = area_name
-
-            await hass.async_add_executor_job(_commit_intervals, db, intervals)
-
-        numeric_samples = _states_to_numeric_samples(db, states)
-        if numeric_samples:
-            await hass.async_add_executor_job(
-                _commit_numeric_samples, db, numeric_samples
+        for area_name, since in cache_dirty_since.items():
+            if db.coordinator.stop_requested:
+                break
+            written = await hass.async_add_executor_job(
+                occupied_cache.update_occupied_intervals_cache, db, area_name, since
             )
+            stats["occupied_cache_rows_written"] += max(written, 0)
 
     except (
         sa.exc.SQLAlchemyError,
@@ -364,3 +568,8 @@ async def sync_states(db: AreaOccupancyDB) -> None:
     ) as err:
         _LOGGER.error("Failed to sync states: %s", err)
         raise HomeAssistantError(f"Sync states failed: {err}") from err
+    finally:
+        stats["duration_ms"] = round((time.perf_counter() - sync_start) * 1000, 2)
+        stats["completed_at"] = end_time.isoformat()
+        db.last_sync_stats = stats
+        _LOGGER.debug("State sync finished: %s", stats)
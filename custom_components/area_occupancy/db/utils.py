@@ -24,6 +24,9 @@ _LOGGER = logging.getLogger(__name__)
 # Use a conservative batch size to avoid "too many SQL variables" errors.
 SQLITE_BATCH_SIZE = 500
 
+# Julian day number of 1970-01-01T00:00:00 UTC (SQLite julianday() epoch offset)
+_JULIAN_UNIX_EPOCH = 2440587.5
+
 T = TypeVar("T")
 
 
@@ -47,6 +50,16 @@ def chunked(items: Iterable[T], size: int) -> Iterator[list[T]]:
         yield chunk
 
 
+def epoch_seconds(column: Any) -> Any:
+    """Return a SQL expression converting a naive-UTC DateTime column to epoch seconds.
+
+    SQLite keeps julian days to the millisecond but the float arithmetic leaves
+    a few microseconds of error, so the result is rounded back to milliseconds
+    to keep timestamps on an interval boundary on the right side of it.
+    """
+    return sa.func.round((sa.func.julianday(column) - _JULIAN_UNIX_EPOCH) * 86400.0, 3)
+
+
 def batched_delete_by_ids(
     session: Session,
     model: Any,
@@ -228,6 +241,12 @@ def get_occupied_intervals_for_analysis(
     Returns:
         List of (start, end) tuples of occupied intervals (timezone-aware UTC)
     """
+    from .occupied_cache import get_indexed_occupied_intervals  # noqa: PLC0415
+
+    indexed = get_indexed_occupied_intervals(db, area_name, start_time, end_time)
+    if indexed is not None:
+        return indexed
+
     try:
         # DB stores naive UTC; always bind naive UTC for SQL queries
         start_time_db = to_db_utc(start_time)
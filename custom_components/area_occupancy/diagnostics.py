@@ -20,7 +20,7 @@ from sqlalchemy.exc import SQLAlchemyError
 from homeassistant.core import HomeAssistant
 
 from .const import CONF_VERSION, CONF_VERSION_MINOR, DEVICE_SW_VERSION
-from .db import queries
+from .db import occupied_cache, queries, relationships
 
 if TYPE_CHECKING:
     from homeassistant.config_entries import ConfigEntry
@@ -265,7 +265,7 @@ def _area_snapshot(
 
 
 def _collect_db_stats(coordinator: AreaOccupancyCoordinator) -> dict[str, Any]:
-    """Collect database row counts and per-area cache freshness.
+    """Collect database row counts, per-area cache freshness and transitions.
 
     Runs on the executor pool — caller must wrap with async_add_executor_job.
     """
@@ -290,6 +290,9 @@ def _collect_db_stats(coordinator: AreaOccupancyCoordinator) -> dict[str, Any]:
         try:
             cache_status[area_name] = {
                 "valid": queries.is_occupied_intervals_cache_valid(db, area_name),
+                "consistency": occupied_cache.check_occupied_intervals_cache(
+                    db, area_name
+                ),
             }
         except _DB_EXCEPTIONS as err:
             _LOGGER.warning(
@@ -301,6 +304,12 @@ def _collect_db_stats(coordinator: AreaOccupancyCoordinator) -> dict[str, Any]:
             cache_status[area_name] = {"error": repr(err)}
     stats["occupied_intervals_cache"] = cache_status
 
+    # Transitions counted from the occupied intervals cache (CrossAreaStats)
+    stats["area_transitions"] = {
+        area_name: relationships.get_area_transitions(db, area_name)
+        for area_name in coordinator.areas
+    }
+
     return stats
 
 
@@ -353,6 +362,10 @@ async def async_get_config_entry_diagnostics(
         )
         database_section = {"error": repr(err)}
 
+    database_section["last_sync"] = dict(coordinator.db.last_sync_stats)
+    database_section["last_save"] = dict(coordinator.db.last_save_stats)
+    database_section["last_retention"] = dict(coordinator.db.last_retention_stats)
+
     return {
         "integration": integration_section,
         "areas": areas_section,
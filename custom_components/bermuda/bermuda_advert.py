@@ -28,6 +28,7 @@ from .const import (
     DISTANCE_INFINITE,
     DISTANCE_TIMEOUT,
     HIST_KEEP_COUNT,
+    HIST_KEEP_COUNT_COMPACT,
 )
 
 # from .const import _LOGGER_SPAM_LESS
@@ -103,6 +104,9 @@ class BermudaAdvert(dict):
         self.manufacturer_data: list[dict[int, bytes]] = []
         self.service_data: list[dict[str, bytes]] = []
         self.service_uuids: list[str] = []
+        self.hist_keep_count = HIST_KEEP_COUNT
+        if parent_device.compact:
+            self.set_compact(True)
 
         # Just pass the rest on to update...
         self.update_advertisement(advertisementdata, self.scanner_device)
@@ -117,6 +121,28 @@ class BermudaAdvert(dict):
         # Only remote scanners log timestamps, local usb adaptors do not.
         self.scanner_sends_stamps = scanner_device.is_remote_scanner
 
+    def set_compact(self, compact: bool):
+        """Keep only minimal history (for devices we merely count), or go back to full history."""
+        if compact:
+            self.hist_keep_count = HIST_KEEP_COUNT_COMPACT
+            self.conf_smoothing_samples = min(self.options.get(CONF_SMOOTHING_SAMPLES), HIST_KEEP_COUNT_COMPACT)
+            del self.hist_distance_by_interval[self.conf_smoothing_samples :]
+            for hist in (
+                self.hist_distance,
+                self.hist_interval,
+                self.hist_rssi,
+                self.hist_stamp,
+                self.hist_velocity,
+                self.local_name,
+                self.manufacturer_data,
+                self.service_data,
+                self.service_uuids,
+            ):
+                del hist[HIST_KEEP_COUNT_COMPACT:]
+        else:
+            self.hist_keep_count = HIST_KEEP_COUNT
+            self.conf_smoothing_samples = self.options.get(CONF_SMOOTHING_SAMPLES)
+
     def update_advertisement(self, advertisementdata: AdvertisementData, scanner_device: BermudaDevice):
         """
         Update gets called every time we see a new packet or
@@ -229,7 +255,7 @@ class BermudaAdvert(dict):
             nametuplet = (clean_charbuf(advertisementdata.local_name), advertisementdata.local_name.encode())
             if len(self.local_name) == 0 or self.local_name[0] != nametuplet:
                 self.local_name.insert(0, nametuplet)
-                del self.local_name[HIST_KEEP_COUNT:]
+                del self.local_name[self.hist_keep_count :]
                 # Lets see if we should pass the new name up to the parent device.
                 if self._device.name_bt_local_name is None or len(self._device.name_bt_local_name) < len(nametuplet[0]):
                     self._device.name_bt_local_name = nametuplet[0]
@@ -242,19 +268,19 @@ class BermudaAdvert(dict):
             # sent details, in which case we need to re-match them.
             self._device.process_manufacturer_data(self)
             _want_name_update = True
-            del self.manufacturer_data[HIST_KEEP_COUNT:]
+            del self.manufacturer_data[self.hist_keep_count :]
 
         if len(self.service_data) == 0 or self.service_data[0] != advertisementdata.service_data:
             self.service_data.insert(0, advertisementdata.service_data)
             if advertisementdata.service_data not in self.manufacturer_data[1:]:
                 _want_name_update = True
-            del self.service_data[HIST_KEEP_COUNT:]
+            del self.service_data[self.hist_keep_count :]
 
         for service_uuid in advertisementdata.service_uuids:
             if service_uuid not in self.service_uuids:
                 self.service_uuids.insert(0, service_uuid)
                 _want_name_update = True
-                del self.service_uuids[HIST_KEEP_COUNT:]
+                del self.service_uuids[self.hist_keep_count :]
 
         if _want_name_update:
             self._device.make_name()
@@ -486,11 +512,11 @@ class BermudaAdvert(dict):
                 self.rssi_distance = self.rssi_distance_raw
 
         # Trim our history lists
-        del self.hist_distance[HIST_KEEP_COUNT:]
-        del self.hist_interval[HIST_KEEP_COUNT:]
-        del self.hist_rssi[HIST_KEEP_COUNT:]
-        del self.hist_stamp[HIST_KEEP_COUNT:]
-        del self.hist_velocity[HIST_KEEP_COUNT:]
+        del self.hist_distance[self.hist_keep_count :]
+        del self.hist_interval[self.hist_keep_count :]
+        del self.hist_rssi[self.hist_keep_count :]
+        del self.hist_stamp[self.hist_keep_count :]
+        del self.hist_velocity[self.hist_keep_count :]
 
     def to_dict(self):
         """Convert class to serialisable dict for dump_devices."""
@@ -109,6 +109,8 @@ class BermudaDevice(dict):
         self.area_distance: float | None = None  # how far this dev is from that area
         self.area_rssi: float | None = None  # rssi from closest scanner
         self.area_advert: BermudaAdvert | None = None  # currently closest BermudaScanner
+        self.position: tuple[float, float] | None = None  # x/y in metres, if scanners are placed
+        self.position_error: float | None = None  # rms distance residual of that estimate
 
         self.floor: fr.FloorEntry | None = None
         self.floor_id: str | None = None
@@ -139,6 +141,7 @@ class BermudaDevice(dict):
         self.create_all_done: bool = False  # All platform entities are done and ready.
         self.last_seen: float = 0  # stamp from most recent scanner spotting. monotonic_time_coarse
         self.diag_area_switch: str | None = None  # saves output of AreaTests
+        self.compact: bool = False  # Only counted, so adverts keep minimal history. See set_compact()
         self.adverts: dict[
             tuple[str, str], BermudaAdvert
         ] = {}  # str will be a scanner address OR a deviceaddress__scanneraddress
@@ -617,10 +620,27 @@ class BermudaDevice(dict):
             # gets applied.
             # if nearest_scanner is not None:
             self.apply_scanner_selection(nearest_scanner)
+            # That may have given us an area outside the normal contest, so have the
+            # next update cycle look after it (and time it out).
+            self._coordinator.mark_area_dirty(self)
             # Update the stamp so that the BermudaEntity can clear the cache and show the
             # new measurement(s) immediately.
             self.ref_power_changed = monotonic_time_coarse()
 
+    def set_compact(self, compact: bool):
+        """
+        Switch this device's adverts between full and compact history storage.
+
+        Devices that are neither tracked nor a scanner or metadevice source are only
+        counted, so nothing reads their rssi/distance histories. On a busy street those
+        make up most of the device table, so the coordinator puts them in compact mode
+        when pruning, and switches them back if they turn out to be a metadevice source.
+        """
+        if compact != self.compact:
+            self.compact = compact
+            for advert in self.adverts.values():
+                advert.set_compact(compact)
+
     def apply_scanner_selection(self, bermuda_advert: BermudaAdvert | None):
         """
         Given a BermudaAdvert entry, apply the distance and area attributes
@@ -744,6 +764,10 @@ class BermudaDevice(dict):
         if device_advert.stamp is not None and self.last_seen < device_advert.stamp:
             self.last_seen = device_advert.stamp
 
+        if device_advert.new_stamp is not None:
+            # A fresh reading can change the area contest, make sure it gets re-run.
+            self._coordinator.mark_area_dirty(self, device_advert.stamp)
+
     def process_manufacturer_data(self, advert: BermudaAdvert):
         """Parse manufacturer data for maker name and iBeacon etc."""
         # Only override existing manufacturer name if it's "better"
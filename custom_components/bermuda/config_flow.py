@@ -27,17 +27,20 @@ from .const import (
     CONF_ATTENUATION,
     CONF_DEVICES,
     CONF_DEVTRACK_TIMEOUT,
+    CONF_MAX_DEVICES,
     CONF_MAX_RADIUS,
     CONF_MAX_VELOCITY,
     CONF_REF_POWER,
     CONF_RSSI_OFFSETS,
     CONF_SAVE_AND_CLOSE,
     CONF_SCANNER_INFO,
+    CONF_SCANNER_POSITIONS,
     CONF_SCANNERS,
     CONF_SMOOTHING_SAMPLES,
     CONF_UPDATE_INTERVAL,
     DEFAULT_ATTENUATION,
     DEFAULT_DEVTRACK_TIMEOUT,
+    DEFAULT_MAX_DEVICES,
     DEFAULT_MAX_RADIUS,
     DEFAULT_MAX_VELOCITY,
     DEFAULT_REF_POWER,
@@ -190,6 +193,7 @@ class BermudaOptionsFlowHandler(OptionsFlowWithConfigEntry):
                 "selectdevices": "Select Devices",
                 "calibration1_global": "Calibration 1: Global",
                 "calibration2_scanners": "Calibration 2: Scanner RSSI Offsets",
+                "scanner_positions": "Scanner Positions (optional)",
             },
             description_placeholders=messages,
         )
@@ -221,6 +225,10 @@ class BermudaOptionsFlowHandler(OptionsFlowWithConfigEntry):
                 CONF_SMOOTHING_SAMPLES,
                 default=self.options.get(CONF_SMOOTHING_SAMPLES, DEFAULT_SMOOTHING_SAMPLES),
             ): vol.Coerce(int),
+            vol.Required(
+                CONF_MAX_DEVICES,
+                default=self.options.get(CONF_MAX_DEVICES, DEFAULT_MAX_DEVICES),
+            ): vol.All(vol.Coerce(int), vol.Range(min=100)),
             vol.Required(
                 CONF_ATTENUATION,
                 default=self.options.get(CONF_ATTENUATION, DEFAULT_ATTENUATION),
@@ -557,6 +565,47 @@ class BermudaOptionsFlowHandler(OptionsFlowWithConfigEntry):
             description_placeholders={"suffix": results_str},
         )
 
+    async def async_step_scanner_positions(self, user_input=None):
+        """
+        Place scanners on an x/y grid for the optional position engine.
+
+        Positions are entered per scanner name as [x, y] in metres from any fixed
+        origin, and saved by scanner address. Scanners left empty are not used.
+        """
+        errors = {}
+        if user_input is not None:
+            positions_by_address = {}
+            for address in self.coordinator.scanner_list:
+                position = user_input[CONF_SCANNER_INFO].get(self.coordinator.devices[address].name)
+                if position in (None, "", []):
+                    continue
+                try:
+                    pos_x, pos_y = (float(val) for val in position)
+                except (TypeError, ValueError):
+                    errors[CONF_SCANNER_INFO] = "invalid_position"
+                    break
+                positions_by_address[address] = [pos_x, pos_y]
+            if not errors:
+                self.options.update({CONF_SCANNER_POSITIONS: positions_by_address})
+                return await self._update_options()
+
+        saved_positions = self.options.get(CONF_SCANNER_POSITIONS, {})
+        positions_by_name = {}
+        for scanner in self.coordinator.scanner_list:
+            scanner_name = self.coordinator.devices[scanner].name
+            positions_by_name[scanner_name] = saved_positions.get(scanner)
+        data_schema = {
+            vol.Required(
+                CONF_SCANNER_INFO,
+                default=user_input[CONF_SCANNER_INFO] if user_input is not None else positions_by_name,
+            ): ObjectSelector(),
+        }
+        return self.async_show_form(
+            step_id="scanner_positions",
+            data_schema=vol.Schema(data_schema),
+            errors=errors,
+        )
+
     def _get_bermuda_device_from_registry(self, registry_id: str) -> BermudaDevice | None:
         """
         Given a device registry device id, return the associated MAC address.
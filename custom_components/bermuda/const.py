@@ -129,8 +129,9 @@ class IrkTypes(Enum):
 # Accoring to the backend comments, BlueZ times out adverts at 180 seconds, and HA
 # expires adverts at 195 seconds to avoid churning.
 #
-PRUNE_MAX_COUNT = 1000  # How many device entries to allow at maximum
+PRUNE_MAX_COUNT = 1000  # How many device entries to allow at maximum (default for CONF_MAX_DEVICES)
 PRUNE_TIME_INTERVAL = 180  # Every 3m, prune stale devices
+PRUNE_OVER_QUOTA_MARGIN = 50  # Prune immediately (not waiting for the interval) once this far over quota
 # ### Note about timeouts: Bluez and HABT cache for 180 or 195 seconds. Setting
 # timeouts below that may result in prune/create/prune churn, but as long as
 # we only re-create *fresh* devices the risk is low.
@@ -147,6 +148,9 @@ DOCS = {}
 
 
 HIST_KEEP_COUNT = 10  # How many old timestamps, rssi, etc to keep for each device/scanner pairing.
+# Devices we only count (not tracked, not a scanner or metadevice source) keep just enough
+# history for the velocity check, since nothing else reads it.
+HIST_KEEP_COUNT_COMPACT = 2
 
 # Config entry DATA entries
 
@@ -194,6 +198,21 @@ DOCS[CONF_SMOOTHING_SAMPLES] = (
     " make for slower distance increases. 10 or 20 seems good."
 )
 
+CONF_SCANNER_POSITIONS = "scanner_positions"
+DOCS[CONF_SCANNER_POSITIONS] = (
+    "Optional x/y position (in metres) of each scanner. With three or more placed, tracked"
+    " devices also get an estimated position."
+)
+POSITION_MIN_SCANNERS = 3  # Fewest placed scanners hearing a device to estimate its position
+POSITION_MIN_DISTANCE = 0.5  # Floor (metres) for the 1/d^2 weights, so one very close reading can't dominate
+POSITION_CPU_BUDGET = 0.020  # Seconds per update cycle the position engine may spend
+
+CONF_MAX_DEVICES, DEFAULT_MAX_DEVICES = "max_devices", PRUNE_MAX_COUNT
+DOCS[CONF_MAX_DEVICES] = (
+    "Maximum number of bluetooth devices to keep in memory. When exceeded, the least"
+    " recently seen untracked devices are dropped first."
+)
+
 # Defaults
 DEFAULT_NAME = DOMAIN
 
@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import re
+import time
 from collections.abc import Callable
 from dataclasses import dataclass
 from datetime import datetime, timedelta
@@ -64,14 +65,17 @@ from .const import (
     CONF_ATTENUATION,
     CONF_DEVICES,
     CONF_DEVTRACK_TIMEOUT,
+    CONF_MAX_DEVICES,
     CONF_MAX_RADIUS,
     CONF_MAX_VELOCITY,
     CONF_REF_POWER,
     CONF_RSSI_OFFSETS,
+    CONF_SCANNER_POSITIONS,
     CONF_SMOOTHING_SAMPLES,
     CONF_UPDATE_INTERVAL,
     DEFAULT_ATTENUATION,
     DEFAULT_DEVTRACK_TIMEOUT,
+    DEFAULT_MAX_DEVICES,
     DEFAULT_MAX_RADIUS,
     DEFAULT_MAX_VELOCITY,
     DEFAULT_REF_POWER,
@@ -82,7 +86,7 @@ from .const import (
     METADEVICE_IBEACON_DEVICE,
     METADEVICE_TYPE_IBEACON_SOURCE,
     METADEVICE_TYPE_PRIVATE_BLE_SOURCE,
-    PRUNE_MAX_COUNT,
+    PRUNE_OVER_QUOTA_MARGIN,
     PRUNE_TIME_DEFAULT,
     PRUNE_TIME_INTERVAL,
     PRUNE_TIME_KNOWN_IRK,
@@ -94,7 +98,8 @@ from .const import (
     SIGNAL_SCANNERS_CHANGED,
     UPDATE_INTERVAL,
 )
-from .util import mac_explode_formats, mac_norm
+from .trilateration import BermudaPositionEngine
+from .util import approx_sizeof, mac_explode_formats, mac_norm
 
 if TYPE_CHECKING:
     from habluetooth import BluetoothServiceInfoBleak
@@ -167,6 +172,16 @@ class BermudaDataUpdateCoordinator(DataUpdateCoordinator):
         self.stamp_last_update: float = 0  # Last time we ran an update, from monotonic_time_coarse()
         self.stamp_last_update_started: float = 0
         self.stamp_last_prune: float = 0  # When we last pruned device list
+        self.device_count_after_prune: int = 0  # So we can prune early if the device list balloons
+        self.evicted_device_count: int = 0  # Devices dropped only to stay within CONF_MAX_DEVICES
+        self.memory_stats: dict[str, int] = {}
+
+        # Incremental area assignment. Devices that got a new advert this cycle are
+        # flagged dirty, and stay "watched" until none of their adverts can win an area
+        # contest any more and they hold no area. Everything else is skipped.
+        self._area_dirty: dict[str, float] = {}  # address: newest advert stamp since the last area refresh
+        self._area_watch: dict[str, float] = {}  # address: stamp until which adverts may still compete
+        self.area_refresh_stats: dict[str, float | int] = {}
 
         self.member_uuids = {}
         self.company_uuids = {}
@@ -241,6 +256,7 @@ class BermudaDataUpdateCoordinator(DataUpdateCoordinator):
         # entries yet, so some users might not have this defined after an update.
         self.options[CONF_ATTENUATION] = DEFAULT_ATTENUATION
         self.options[CONF_DEVTRACK_TIMEOUT] = DEFAULT_DEVTRACK_TIMEOUT
+        self.options[CONF_MAX_DEVICES] = DEFAULT_MAX_DEVICES
         self.options[CONF_MAX_RADIUS] = DEFAULT_MAX_RADIUS
         self.options[CONF_MAX_VELOCITY] = DEFAULT_MAX_VELOCITY
         self.options[CONF_REF_POWER] = DEFAULT_REF_POWER
@@ -258,14 +274,26 @@ class BermudaDataUpdateCoordinator(DataUpdateCoordinator):
                     CONF_ATTENUATION,
                     CONF_DEVICES,
                     CONF_DEVTRACK_TIMEOUT,
+                    CONF_MAX_DEVICES,
                     CONF_MAX_RADIUS,
                     CONF_MAX_VELOCITY,
                     CONF_REF_POWER,
                     CONF_SMOOTHING_SAMPLES,
                     CONF_RSSI_OFFSETS,
+                    CONF_SCANNER_POSITIONS,
                 ):
                     self.options[key] = val
 
+        # Optional position engine, only if enough scanners have been placed.
+        self.position_engine: BermudaPositionEngine | None = None
+        _scanner_positions = {
+            address: (float(pos[0]), float(pos[1]))
+            for address, pos in self.options.get(CONF_SCANNER_POSITIONS, {}).items()
+            if pos is not None
+        }
+        if (_engine := BermudaPositionEngine(_scanner_positions)).usable:
+            self.position_engine = _engine
+
         self.devices: dict[str, BermudaDevice] = {}
         # self.updaters: dict[str, BermudaPBDUCoordinator] = {}
 
@@ -614,6 +642,13 @@ class BermudaDataUpdateCoordinator(DataUpdateCoordinator):
             self.devices[mac] = device = BermudaDevice(mac, self)
             return device
 
+    def mark_area_dirty(self, device: BermudaDevice, stamp: float | None = None):
+        """Flag a device for area re-evaluation, given the stamp of the advert that changed."""
+        if stamp is None:
+            stamp = monotonic_time_coarse()
+        if self._area_dirty.get(device.address, 0) < stamp:
+            self._area_dirty[device.address] = stamp
+
     async def _async_update_data(self):
         """Implementation of DataUpdateCoordinator update_data function."""
         # return False
@@ -661,6 +696,9 @@ class BermudaDataUpdateCoordinator(DataUpdateCoordinator):
 
             self._refresh_areas_by_min_distance()
 
+            if self.position_engine is not None:
+                self.position_engine.update([device for device in self.devices.values() if device.create_sensor])
+
             # We might need to freshen deliberately on first start if no new scanners
             # were discovered in the first scan update. This is likely if nothing has changed
             # since the last time we booted.
@@ -743,11 +781,7 @@ class BermudaDataUpdateCoordinator(DataUpdateCoordinator):
             scanner_device.async_as_scanner_update(ha_scanner)
 
             # Now go through the scanner's adverts and send them to our device objects.
-            for bledevice, advertisementdata in ha_scanner.discovered_devices_and_advertisement_data.values():
-                if adstamp := scanner_device.async_as_scanner_get_stamp(bledevice.address):
-                    if adstamp < self.stamp_last_update_started - 3:
-                        # skip older adverts that should already have been processed
-                        continue
+            for bledevice, advertisementdata in self._iter_new_adverts(ha_scanner, scanner_device):
                 if advertisementdata.rssi == -127:
                     # BlueZ is pushing bogus adverts for paired but absent devices.
                     continue
@@ -758,14 +792,55 @@ class BermudaDataUpdateCoordinator(DataUpdateCoordinator):
         # end of for ha_scanner loop
         return True
 
+    def _iter_new_adverts(self, ha_scanner: BaseHaScanner, scanner_device: BermudaDevice):
+        """
+        Yield (BLEDevice, AdvertisementData) for the adverts a scanner received since the last cycle.
+
+        Remote scanners give us a stamp per address (refreshed into scanner_device.stamps by
+        async_as_scanner_update). Only the addresses stamped since the last cycle have their
+        advertisement fetched, instead of having the backend build the whole
+        discovered_devices_and_advertisement_data dict on each access.
+
+        This is not a change-feed: the stamps dict is still walked in full, so a cycle costs
+        O(addresses) float comparisons per remote scanner, plus O(new adverts) lookups. The walk
+        is cheaper than the dict it replaces but grows with the number of addresses each proxy
+        has seen (see tests/bermuda/bench_gather.py). Local adaptors don't stamp, so they still
+        get the full walk and update_advertisement sorts out what's new by rssi.
+        """
+        _stamp_cutoff = self.stamp_last_update_started - 3  # older adverts should already have been processed
+
+        if not (scanner_device.is_remote_scanner and scanner_device.stamps):
+            for bledevice, advertisementdata in ha_scanner.discovered_devices_and_advertisement_data.values():
+                if adstamp := scanner_device.async_as_scanner_get_stamp(bledevice.address):
+                    if adstamp < _stamp_cutoff:
+                        continue
+                yield bledevice, advertisementdata
+            return
+
+        for address, adstamp in scanner_device.stamps.items():
+            if adstamp < _stamp_cutoff:
+                continue
+            if (discovered := ha_scanner.get_discovered_device_advertisement_data(address)) is not None:
+                yield discovered
+
     def prune_devices(self, force_pruning=False):
         """
         Scan through all collected devices, and remove those that meet Pruning criteria.
 
         By default no pruning will be done if it has been performed within the last
-        PRUNE_TIME_INTERVAL, unless the force_pruning flag is set to True.
+        PRUNE_TIME_INTERVAL, unless the force_pruning flag is set to True, or the device
+        list has grown PRUNE_OVER_QUOTA_MARGIN past CONF_MAX_DEVICES since the last run.
+
+        Untracked devices that are only being counted are switched to compact advert
+        storage here, see BermudaDevice.set_compact.
         """
-        if self.stamp_last_prune > monotonic_time_coarse() - PRUNE_TIME_INTERVAL and not force_pruning:
+        max_devices = self.options.get(CONF_MAX_DEVICES, DEFAULT_MAX_DEVICES)
+        if (
+            self.stamp_last_prune > monotonic_time_coarse() - PRUNE_TIME_INTERVAL
+            and not force_pruning
+            # If the last run couldn't get under quota, don't re-run every cycle.
+            and len(self.devices) < max(max_devices, self.device_count_after_prune) + PRUNE_OVER_QUOTA_MARGIN
+        ):
             # We ran recently enough, bail out.
             return
         # stamp the run.
@@ -824,6 +899,11 @@ class BermudaDataUpdateCoordinator(DataUpdateCoordinator):
                 and (not device.is_scanner)  # redundant, but whatevs.
                 and device.address_type != BDADDR_TYPE_NOT_MAC48
             ):
+                if METADEVICE_TYPE_IBEACON_SOURCE not in device.metadevice_type:
+                    # Nothing reads this device's history, we just count it. update_metadevices
+                    # restores full storage if it turns out to be a source after all.
+                    device.set_compact(True)
+
                 if device.address_type == BDADDR_TYPE_RANDOM_RESOLVABLE:
                     # This is an *UNKNOWN* IRK source address, or a known one which is
                     # well and truly stale (ie, not in keepers).
@@ -862,13 +942,14 @@ class BermudaDataUpdateCoordinator(DataUpdateCoordinator):
 
             # Do nothing else at this level without excluding the keepers first.
 
-        prune_quota_shortfall = len(self.devices) - len(prune_list) - PRUNE_MAX_COUNT
+        prune_quota_shortfall = len(self.devices) - len(prune_list) - max_devices
         if prune_quota_shortfall > 0:
             # We need to find more addresses to prune. Perhaps we live
             # in a busy train station, or are under some sort of BLE-MAC
             # DOS-attack.
             if len(prunable_stamps) > 0:
-                # Sort the prunables by timestamp ascending
+                # Sort the prunables by timestamp ascending, so the least recently
+                # seen go first.
                 sorted_addresses = sorted([(v, k) for k, v in prunable_stamps.items()])
                 cutoff_index = min(len(sorted_addresses), prune_quota_shortfall)
 
@@ -876,11 +957,12 @@ class BermudaDataUpdateCoordinator(DataUpdateCoordinator):
                     "Prune quota short by %d. Pruning %d extra devices (down to age %0.2f seconds)",
                     prune_quota_shortfall,
                     cutoff_index,
-                    nowstamp - sorted_addresses[prune_quota_shortfall - 1][0],
+                    nowstamp - sorted_addresses[cutoff_index - 1][0],
                 )
                 # pylint: disable-next=unused-variable
-                for _stamp, address in sorted_addresses[: prune_quota_shortfall - 1]:
+                for _stamp, address in sorted_addresses[:cutoff_index]:
                     prune_list.append(address)
+                self.evicted_device_count += cutoff_index
             else:
                 _LOGGER.warning(
                     "Need to prune another %s devices to make quota, but no extra prunables available",
@@ -899,6 +981,7 @@ class BermudaDataUpdateCoordinator(DataUpdateCoordinator):
         for device_address in prune_list:
             _LOGGER.debug("Acting on prune list for %s", device_address)
             del self.devices[device_address]
+        prune_set = set(prune_list)  # the list can run to hundreds when over quota
 
         # Clean out the scanners dicts in metadevices and scanners
         # (scanners will have entries if they are also beacons, although
@@ -914,13 +997,14 @@ class BermudaDataUpdateCoordinator(DataUpdateCoordinator):
             #     or METADEVICE_IBEACON_DEVICE in device.metadevice_type
             # ):
             # clean out the metadevice_sources field
-            for address in prune_list:
-                if address in device.metadevice_sources:
-                    device.metadevice_sources.remove(address)
+            if not prune_set.isdisjoint(device.metadevice_sources):
+                device.metadevice_sources[:] = [
+                    address for address in device.metadevice_sources if address not in prune_set
+                ]
 
             # clean out the device/scanner advert pairs
             for advert_tuple in list(device.adverts.keys()):
-                if device.adverts[advert_tuple].device_address in prune_list:
+                if device.adverts[advert_tuple].device_address in prune_set:
                     _LOGGER.debug(
                         "Pruning metadevice advert %s aged %ds",
                         advert_tuple,
@@ -928,6 +1012,33 @@ class BermudaDataUpdateCoordinator(DataUpdateCoordinator):
                     )
                     del device.adverts[advert_tuple]
 
+        self.device_count_after_prune = len(self.devices)
+        self.update_memory_stats()
+
+    def update_memory_stats(self):
+        """
+        Estimate how much memory the device table is holding, for the diagnostic sensor.
+
+        Walks every device and advert, so is only called from prune_devices.
+        """
+        adverts: dict[int, BermudaAdvert] = {}  # by id(), as metadevices share their sources' adverts
+        device_bytes = 0
+        compact = 0
+        for device in self.devices.values():
+            device_bytes += approx_sizeof(device, skip=("_coordinator", "options", "adverts", "ar", "fr"))
+            adverts.update((id(advert), advert) for advert in device.adverts.values())
+            compact += device.compact
+        advert_bytes = sum(
+            approx_sizeof(advert, skip=("_device", "scanner_device", "options")) for advert in adverts.values()
+        )
+        self.memory_stats = {
+            "devices": len(self.devices),
+            "compact_devices": compact,
+            "adverts": len(adverts),
+            "evicted_devices": self.evicted_device_count,
+            "bytes": device_bytes + advert_bytes,
+        }
+
     def discover_private_ble_metadevices(self):
         """
         Access the Private BLE Device integration to find metadevices to track.
@@ -1146,8 +1257,18 @@ class BermudaDataUpdateCoordinator(DataUpdateCoordinator):
                     continue  # to next metadevice_source
 
                 # Copy every ADVERT_TUPLE into our metadevice
-                for advert_tuple in source_device.adverts:
-                    metadevice.adverts[advert_tuple] = source_device.adverts[advert_tuple]
+                if source_device.compact:
+                    # It was only being counted until now, give it full history again.
+                    source_device.set_compact(False)
+
+                _dirty_stamp = self._area_dirty.get(source_device.address)
+                for advert_tuple, advert in source_device.adverts.items():
+                    if advert_tuple not in metadevice.adverts and (_dirty_stamp or 0) < advert.stamp:
+                        _dirty_stamp = advert.stamp
+                    metadevice.adverts[advert_tuple] = advert
+                if _dirty_stamp is not None:
+                    # The shared adverts are new to the metadevice, so its area needs a re-run too.
+                    self.mark_area_dirty(metadevice, _dirty_stamp)
 
                 # Update last_seen if the source is newer.
                 if metadevice.last_seen < source_device.last_seen:
@@ -1230,14 +1351,48 @@ class BermudaDataUpdateCoordinator(DataUpdateCoordinator):
         return None
 
     def _refresh_areas_by_min_distance(self):
-        """Set area for ALL devices based on closest beacon."""
-        for device in self.devices.values():
+        """
+        Set area for tracked devices based on closest beacon.
+
+        Only devices that need it are re-run: those with a new advert this cycle, and those
+        still inside AREA_MAX_AD_AGE of their last one or still holding an area advert (whose
+        distance keeps being refreshed until it times out). Outside of that every advert is
+        too old to challenge and there is no incumbent, so the contest could only confirm
+        "no area" again and the device is left alone until it is next heard.
+        """
+        _started = time.perf_counter()
+        nowstamp = monotonic_time_coarse()
+
+        for address, stamp in self._area_dirty.items():
+            # Adverts stop competing once older than AREA_MAX_AD_AGE, see _refresh_area_by_min_distance
+            if self._area_watch.get(address, 0) < stamp + AREA_MAX_AD_AGE:
+                self._area_watch[address] = stamp + AREA_MAX_AD_AGE
+        self._area_dirty.clear()
+
+        evaluated = 0
+        for address, until in list(self._area_watch.items()):
+            device = self.devices.get(address)
             if (
-                # device.is_scanner is not True  # exclude scanners.
-                device.create_sensor  # include any devices we are tracking
-                # or device.metadevice_type in METADEVICE_SOURCETYPES  # and any source devices for PBLE, ibeacon etc
+                device is None  # pruned
+                or not device.create_sensor  # we only need areas for devices we are tracking
             ):
-                self._refresh_area_by_min_distance(device)
+                del self._area_watch[address]
+                continue
+            self._refresh_area_by_min_distance(device)
+            evaluated += 1
+            if until < nowstamp and device.area_advert is None:
+                del self._area_watch[address]
+
+        _elapsed_ms = (time.perf_counter() - _started) * 1000
+        _avg_ms = self.area_refresh_stats.get("avg_ms", _elapsed_ms)
+        self.area_refresh_stats = {
+            "devices": len(self.devices),
+            "evaluated": evaluated,
+            "watched": len(self._area_watch),
+            "last_ms": round(_elapsed_ms, 3),
+            "avg_ms": round(_avg_ms + (_elapsed_ms - _avg_ms) / 20, 3),  # roughly the last 20 cycles
+            "max_ms": round(max(self.area_refresh_stats.get("max_ms", 0), _elapsed_ms), 3),
+        }
 
     @dataclass
     class AreaTests:
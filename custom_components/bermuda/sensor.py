@@ -10,6 +10,7 @@ from homeassistant.const import (
     SIGNAL_STRENGTH_DECIBELS_MILLIWATT,
     STATE_UNAVAILABLE,
     EntityCategory,
+    UnitOfInformation,
     UnitOfLength,
 )
 from homeassistant.core import HomeAssistant, callback
@@ -78,6 +79,9 @@ async def async_setup_entry(
             entities.append(BermudaSensorRssi(coordinator, entry, address))
             entities.append(BermudaSensorAreaLastSeen(coordinator, entry, address))
             entities.append(BermudaSensorAreaSwitchReason(coordinator, entry, address))
+            if coordinator.position_engine is not None:
+                entities.append(BermudaSensorPositionX(coordinator, entry, address))
+                entities.append(BermudaSensorPositionY(coordinator, entry, address))
 
             # _LOGGER.debug("Sensor received new_device signal for %s", address)
             # We set update before add to False because we are being
@@ -142,6 +146,7 @@ async def async_setup_entry(
             BermudaActiveProxyCount(coordinator, entry),
             BermudaTotalDeviceCount(coordinator, entry),
             BermudaVisibleDeviceCount(coordinator, entry),
+            BermudaDeviceMemory(coordinator, entry),
         )
     )
 
@@ -344,6 +349,61 @@ class BermudaSensorRange(BermudaSensor):
         return SensorStateClass.MEASUREMENT
 
 
+class BermudaSensorPositionX(BermudaSensorRange):
+    """Estimated x coordinate, from the position engine. Only created if scanners are placed."""
+
+    _axis = 0
+
+    @property
+    def unique_id(self):
+        """
+        "Uniquely identify this sensor so that it gets stored in the entity_registry,
+        and can be maintained / renamed etc by the user.
+        """
+        return f"{self._device.unique_id}_position_x"
+
+    @property
+    def name(self):
+        return "Position X"
+
+    @property
+    def native_value(self):
+        """Return the native value of the sensor."""
+        if self._device.position is not None:
+            return self._cached_ratelimit(round(self._device.position[self._axis], 1), fast_falling=False)
+        return None
+
+    @property
+    def device_class(self):
+        # A coordinate, not a distance, so it can go negative.
+        return None
+
+    @property
+    def extra_state_attributes(self) -> Mapping[str, Any] | None:
+        """How well the estimate fits the measured distances."""
+        if self._device.position_error is None:
+            return None
+        return {"position_error": round(self._device.position_error, 2)}
+
+
+class BermudaSensorPositionY(BermudaSensorPositionX):
+    """Estimated y coordinate, from the position engine."""
+
+    _axis = 1
+
+    @property
+    def unique_id(self):
+        """
+        "Uniquely identify this sensor so that it gets stored in the entity_registry,
+        and can be maintained / renamed etc by the user.
+        """
+        return f"{self._device.unique_id}_position_y"
+
+    @property
+    def name(self):
+        return "Position Y"
+
+
 class BermudaSensorScannerRange(BermudaSensorRange):
     """Create sensors for range to each scanner. Extends closest-range class."""
 
@@ -589,3 +649,41 @@ class BermudaVisibleDeviceCount(BermudaGlobalSensor):
     def name(self):
         """Gets the name of the sensor."""
         return "Visible device count"
+
+
+class BermudaDeviceMemory(BermudaGlobalSensor):
+    """Estimated memory held by the device table."""
+
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _attr_native_unit_of_measurement = UnitOfInformation.KIBIBYTES
+
+    @property
+    def unique_id(self):
+        """
+        "Uniquely identify this sensor so that it gets stored in the entity_registry,
+        and can be maintained / renamed etc by the user.
+        """
+        return "BERMUDA_GLOBAL_DEVICE_MEMORY"
+
+    @property
+    def device_class(self):
+        """Return the device class of the sensor."""
+        return SensorDeviceClass.DATA_SIZE
+
+    @property
+    def native_value(self) -> int | None:
+        """Gets the estimated memory use, refreshed each time the device list is pruned."""
+        if "bytes" not in self.coordinator.memory_stats:
+            return None
+        return round(self.coordinator.memory_stats["bytes"] / 1024)
+
+    @property
+    def extra_state_attributes(self) -> Mapping[str, Any]:
+        """Break down what the memory is being used by."""
+        return {key: val for key, val in self.coordinator.memory_stats.items() if key != "bytes"}
+
+    @property
+    def name(self):
+        """Gets the name of the sensor."""
+        return "Device memory"
@@ -0,0 +1,153 @@
+"""
+Position estimates for tracked devices from their distances to placed scanners.
+
+Each scanner the user has given an x/y position for contributes one circle
+(x - xi)^2 + (y - yi)^2 = ri^2. Taking z = x^2 + y^2 as a third unknown makes
+those linear:
+
+    -2 xi x - 2 yi y + z = ri^2 - xi^2 - yi^2
+
+so with three or more scanners the position is a weighted least squares solve.
+Readings are weighted by 1/d^2, as rssi-derived distances get noisier the further
+away they are. The scanner side of the system is the same for every device, so
+the normal equations for all devices are built and solved as one batch.
+
+This is only an estimate of where a device is. Area assignment stays with the
+closest-scanner contest, and devices without enough placed scanners in range (or
+not reached within the per-cycle CPU budget) simply keep their previous estimate
+or none at all.
+"""
+
+from __future__ import annotations
+
+import time
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from .const import (
+    _LOGGER,
+    POSITION_CPU_BUDGET,
+    POSITION_MIN_DISTANCE,
+    POSITION_MIN_SCANNERS,
+)
+
+if TYPE_CHECKING:
+    from .bermuda_device import BermudaDevice
+
+# Systems worse conditioned than this come from (nearly) collinear scanners
+# and give meaningless fixes.
+MAX_CONDITION_NUMBER = 1e10
+
+
+class BermudaPositionEngine:
+    """Batch weighted-least-squares trilateration over a fixed set of placed scanners."""
+
+    def __init__(self, scanner_positions: dict[str, tuple[float, float]], budget: float = POSITION_CPU_BUDGET) -> None:
+        self.scanner_index: dict[str, int] = {address: idx for idx, address in enumerate(scanner_positions)}
+        self.positions = np.array(list(scanner_positions.values()), dtype=float).reshape(-1, 2)
+        # The design matrix rows -2xi, -2yi, 1 are per scanner, shared by every device.
+        self._design = np.column_stack((-2 * self.positions, np.ones(len(self.positions))))
+        self._pos_sq = np.einsum("si,si->s", self.positions, self.positions)
+        self.budget = budget
+        self._cursor = 0  # Where to resume next cycle if we ran out of budget
+        self.stats: dict[str, float | int] = {}
+
+    @property
+    def usable(self) -> bool:
+        """True if enough scanners are placed to ever produce a position."""
+        return len(self.scanner_index) >= POSITION_MIN_SCANNERS
+
+    def _distance_row(self, device: BermudaDevice) -> np.ndarray:
+        """Current smoothed distance from device to each placed scanner, nan if unknown."""
+        row = np.full(len(self.scanner_index), np.nan)
+        stamps = [0.0] * len(self.scanner_index)
+        for advert in device.adverts.values():
+            idx = self.scanner_index.get(advert.scanner_address)
+            # Metadevices can hold several adverts per scanner (one per source MAC), use the freshest.
+            if idx is not None and advert.rssi_distance is not None and advert.stamp > stamps[idx]:
+                row[idx] = advert.rssi_distance
+                stamps[idx] = advert.stamp
+        return row
+
+    def solve(self, distances: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Estimate positions for a batch of devices.
+
+        distances is (devices, scanners) with nan where a scanner has no reading. Returns
+        an (devices, 2) array of x/y and an (devices,) array of weighted rms residual in
+        metres, both nan for devices that could not be placed.
+        """
+        valid = ~np.isnan(distances)
+        ranges = np.where(valid, distances, 0.0)
+        weights = np.where(valid, 1 / np.maximum(ranges, POSITION_MIN_DISTANCE) ** 2, 0.0)
+        rhs = np.where(valid, ranges**2 - self._pos_sq, 0.0)
+
+        # Normal equations per device: (A' W A) theta = A' W b
+        ata = np.einsum("si,ds,sj->dij", self._design, weights, self._design)
+        atb = np.einsum("si,ds->di", self._design, weights * rhs)
+
+        xy = np.full((len(distances), 2), np.nan)
+        error = np.full(len(distances), np.nan)
+
+        solvable = valid.sum(axis=1) >= POSITION_MIN_SCANNERS
+        if solvable.any():
+            solvable[solvable] = np.linalg.cond(ata[solvable]) < MAX_CONDITION_NUMBER
+        if not solvable.any():
+            return xy, error
+
+        theta = np.linalg.solve(ata[solvable], atb[solvable][..., None])[..., 0]
+        xy[solvable] = theta[:, :2]
+
+        fitted = np.linalg.norm(xy[solvable][:, None, :] - self.positions[None, :, :], axis=2)
+        residual = np.where(valid[solvable], fitted - ranges[solvable], 0.0)
+        error[solvable] = np.sqrt(
+            np.einsum("ds,ds->d", weights[solvable], residual**2) / weights[solvable].sum(axis=1)
+        )
+        return xy, error
+
+    def update(self, devices: list[BermudaDevice]) -> None:
+        """
+        Refresh position and position_error on the given devices.
+
+        Gathering distances is the Python-heavy part, so it stops once the CPU budget
+        is spent, and the next cycle picks up from that device. The solve itself is
+        one batch for all the devices gathered.
+        """
+        started = time.perf_counter()
+        count = len(devices)
+        if count == 0 or not self.usable:
+            return
+
+        start = self._cursor % count
+        batch: list[BermudaDevice] = []
+        rows: list[np.ndarray] = []
+        for offset in range(count):
+            device = devices[(start + offset) % count]
+            batch.append(device)
+            rows.append(self._distance_row(device))
+            if time.perf_counter() - started > self.budget:
+                _LOGGER.debug("Position engine ran out of budget after %d of %d devices", len(batch), count)
+                break
+        self._cursor = start + len(batch)
+
+        xy, error = self.solve(np.vstack(rows))
+        placed = 0
+        for device, (pos_x, pos_y), pos_error in zip(batch, xy.tolist(), error.tolist(), strict=True):
+            if np.isnan(pos_x):
+                device.position = None
+                device.position_error = None
+            else:
+                device.position = (pos_x, pos_y)
+                device.position_error = pos_error
+                placed += 1
+
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        self.stats = {
+            "scanners": len(self.scanner_index),
+            "devices": count,
+            "evaluated": len(batch),
+            "placed": placed,
+            "last_ms": round(elapsed_ms, 3),
+            "max_ms": round(max(self.stats.get("max_ms", 0), elapsed_ms), 3),
+        }
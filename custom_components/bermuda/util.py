@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import sys
 from functools import lru_cache
 
 
@@ -123,3 +124,26 @@ def clean_charbuf(instring: str | None) -> str:
     if instring is not None:
         return instring.strip(" \t\r\n\x00").split("\0")[0]
     return ""
+
+
+def approx_sizeof(obj, skip: tuple[str, ...] = ()) -> int:
+    """
+    Estimate the memory held by an object and its instance attributes.
+
+    Containers are counted one level deep (the container plus each item), which
+    covers the history lists and dicts on devices and adverts. Attributes named in
+    skip (shared references like the coordinator or options) are left out. This is
+    an estimate for diagnostics, not an exact accounting.
+    """
+    size = sys.getsizeof(obj) + sys.getsizeof(vars(obj))
+    for var, val in vars(obj).items():
+        if var in skip:
+            continue
+        size += sys.getsizeof(val)
+        if isinstance(val, dict):
+            for key, item in val.items():
+                size += sys.getsizeof(key) + sys.getsizeof(item)
+        elif isinstance(val, list | tuple | set):
+            for item in val:
+                size += sys.getsizeof(item)
+    return size
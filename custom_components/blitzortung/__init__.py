@@ -2,7 +2,6 @@
 
 import asyncio
 import logging
-import math
 import time
 from collections.abc import Callable
 from typing import TYPE_CHECKING, Any
@@ -37,6 +36,7 @@ from .const import (
     ATTR_LIGHTNING_AZIMUTH,
     ATTR_LIGHTNING_DISTANCE,
     BLITZORTUNG_CONFIG,
+    CONF_CLUSTER_STRIKES,
     CONF_CONFIG_TYPE,
     CONF_IDLE_RESET_TIMEOUT,
     CONF_LOCATION_ENTITY,
@@ -44,6 +44,7 @@ from .const import (
     CONF_RADIUS,
     CONF_TIME_WINDOW,
     CONFIG_TYPE_COORDINATES,
+    DEFAULT_CLUSTER_STRIKES,
     DEFAULT_IDLE_RESET_TIMEOUT,
     DEFAULT_MAX_TRACKED_LIGHTNINGS,
     DEFAULT_RADIUS,
@@ -52,11 +53,13 @@ from .const import (
     DOMAIN,
     MIN_LOCATION_CHANGE_MULTIPLIER,
     PLATFORMS,
+    POLAR_FAST_MAX_RADIUS,
     SERVER_STATS,
 )
 from .entity import BlitzortungEntity
 from .geohash_utils import geohash_overlap
 from .mqtt import MQTT, MQTT_CONNECTED, MQTT_DISCONNECTED, Message
+from .polar import PolarProjector
 from .utils import get_coordinates_from_entity
 from .version import __version__
 
@@ -95,8 +98,12 @@ async def async_setup_entry(
     radius = config_entry.options[CONF_RADIUS]
     max_tracked_lightnings = config_entry.options[CONF_MAX_TRACKED_LIGHTNINGS]
     time_window_seconds = config_entry.options[CONF_TIME_WINDOW] * 60
+    cluster_strikes = config_entry.options.get(
+        CONF_CLUSTER_STRIKES, DEFAULT_CLUSTER_STRIKES
+    )
 
-    if max_tracked_lightnings >= 500:  # noqa: PLR2004
+    # Clustered strikes create at most one entity per geohash cell
+    if max_tracked_lightnings >= 500 and not cluster_strikes:  # noqa: PLR2004
         _LOGGER.warning(
             "Large number of tracked lightnings: %s, it may lead to"
             "bigger memory usage / unstable frontend",
@@ -134,6 +141,7 @@ async def async_setup_entry(
         radius=radius,
         max_tracked_lightnings=max_tracked_lightnings,
         time_window_seconds=time_window_seconds,
+        cluster_strikes=cluster_strikes,
         server_stats=config.get(SERVER_STATS),
     )
 
@@ -260,6 +268,7 @@ class BlitzortungCoordinator:
         radius: int,
         max_tracked_lightnings: int,
         time_window_seconds: int,
+        cluster_strikes: bool = False,
         server_stats: bool = False,
     ) -> None:
         """Initialize."""
@@ -271,11 +280,13 @@ class BlitzortungCoordinator:
         self.min_location_change = radius * MIN_LOCATION_CHANGE_MULTIPLIER * 1000
         self.max_tracked_lightnings = max_tracked_lightnings
         self.time_window_seconds = time_window_seconds
+        self.cluster_strikes = cluster_strikes
         self.server_stats = server_stats
         self.last_time = 0
         self.sensors = []
         self.callbacks = []
         self.lightning_callbacks = []
+        self.location_callbacks = []
         self.on_tick_callbacks = []
 
         self._disconnect_callbacks = []
@@ -284,6 +295,7 @@ class BlitzortungCoordinator:
         self._geohash_unsubscribers: list[Callable[[], None]] = []
         self._location_unsubscribe: Callable[[], None] | None = None
         self._pending_refresh_task: asyncio.Task[None] | None = None
+        self._projector: PolarProjector | None = None
 
         if self.location_entity is None:
             if TYPE_CHECKING:
@@ -358,6 +370,8 @@ class BlitzortungCoordinator:
             self._pending_refresh_task = self.hass.async_create_task(
                 self._async_refresh_geohash_subscriptions()
             )
+            for cb in self.location_callbacks:
+                cb(self.latitude, self.longitude, self.radius)
             for sensor in self.sensors:
                 sensor.async_write_ha_state()
 
@@ -440,18 +454,22 @@ class BlitzortungCoordinator:
 
     def compute_polar_coords(self, lightning: dict[str, Any]) -> None:
         """Compute polar coordinates for the lightning strike."""
-        dy = (lightning["lat"] - self.latitude) * math.pi / 180
-        dx = (
-            (lightning["lon"] - self.longitude)
-            * math.pi
-            / 180
-            * math.cos(self.latitude * math.pi / 180)
-        )
-        distance = round(math.sqrt(dx * dx + dy * dy) * 6371, 1)
-        azimuth = round(math.atan2(dx, dy) * 180 / math.pi) % 360
+        projector = self._projector
+        if (
+            projector is None
+            or projector.latitude != self.latitude
+            or projector.longitude != self.longitude
+        ):
+            # The reference point follows the location entity
+            projector = self._projector = PolarProjector(
+                self.latitude,
+                self.longitude,
+                accurate=self.radius > POLAR_FAST_MAX_RADIUS,
+            )
+        distance, azimuth = projector(lightning["lat"], lightning["lon"])
 
-        lightning[ATTR_LIGHTNING_DISTANCE] = distance
-        lightning[ATTR_LIGHTNING_AZIMUTH] = azimuth
+        lightning[ATTR_LIGHTNING_DISTANCE] = round(distance, 1)
+        lightning[ATTR_LIGHTNING_AZIMUTH] = round(azimuth) % 360
 
     async def connect(self) -> None:
         """Connect to MQTT broker."""
@@ -550,6 +568,10 @@ class BlitzortungCoordinator:
         """Register a callback to be called on each lightning strike."""
         self.lightning_callbacks.append(lightning_cb)
 
+    def register_location_receiver(self, location_cb: Callable) -> None:
+        """Register a callback to be called when the location entity moves."""
+        self.location_callbacks.append(location_cb)
+
     def register_on_tick(self, on_tick_cb: Callable) -> None:
         """Register a callback to be called on each tick."""
         self.on_tick_callbacks.append(on_tick_cb)
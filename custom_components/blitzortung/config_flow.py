@@ -27,6 +27,7 @@ from homeassistant.helpers import selector
 from homeassistant.util.unit_system import IMPERIAL_SYSTEM
 
 from .const import (
+    CONF_CLUSTER_STRIKES,
     CONF_CONFIG_TYPE,
     CONF_LOCATION_ENTITY,
     CONF_MAX_TRACKED_LIGHTNINGS,
@@ -34,6 +35,7 @@ from .const import (
     CONF_TIME_WINDOW,
     CONFIG_TYPE_COORDINATES,
     CONFIG_TYPE_ENTITY,
+    DEFAULT_CLUSTER_STRIKES,
     DEFAULT_MAX_TRACKED_LIGHTNINGS,
     DEFAULT_RADIUS,
     DEFAULT_TIME_WINDOW,
@@ -343,6 +345,13 @@ class BlitzortungOptionsFlowHandler(OptionsFlow):
                         min=MAX_TRACKED_LIGHTNINGS_MIN, max=MAX_TRACKED_LIGHTNINGS_MAX
                     ),
                 ),
+                vol.Optional(
+                    CONF_CLUSTER_STRIKES,
+                    default=self.config_entry.options.get(
+                        CONF_CLUSTER_STRIKES,
+                        DEFAULT_CLUSTER_STRIKES,
+                    ),
+                ): selector.BooleanSelector(),
             }
         )
 
@@ -368,6 +377,9 @@ class BlitzortungOptionsFlowHandler(OptionsFlow):
                 MAX_TRACKED_LIGHTNINGS_MIN,
                 MAX_TRACKED_LIGHTNINGS_MAX,
             ),
+            CONF_CLUSTER_STRIKES: opts.get(
+                CONF_CLUSTER_STRIKES, DEFAULT_CLUSTER_STRIKES
+            ),
         }
 
         return self.async_show_form(
@@ -32,6 +32,7 @@ CONF_RADIUS = "radius"
 CONF_IDLE_RESET_TIMEOUT = "idle_reset_timeout"
 CONF_TIME_WINDOW = "time_window"
 CONF_MAX_TRACKED_LIGHTNINGS = "max_tracked_lightnings"
+CONF_CLUSTER_STRIKES = "cluster_strikes"
 
 CONF_LOCATION_ENTITY = "location_entity"
 CONF_CONFIG_TYPE = "config_type"
@@ -42,6 +43,7 @@ DEFAULT_IDLE_RESET_TIMEOUT = 120
 DEFAULT_RADIUS = 100
 DEFAULT_MAX_TRACKED_LIGHTNINGS = 100
 DEFAULT_TIME_WINDOW = 120
+DEFAULT_CLUSTER_STRIKES = False
 DEFAULT_UPDATE_INTERVAL = datetime.timedelta(seconds=60)
 
 # Options bounds. Enforced by the options-flow schema so users can't accidentally
@@ -61,11 +63,26 @@ MAX_TRACKED_LIGHTNINGS_MAX = 1000
 
 MIN_LOCATION_CHANGE_MULTIPLIER = 0.25
 
+# Radius (km) up to which strike distances use the equirectangular
+# approximation; larger radii use the haversine formula.
+POLAR_FAST_MAX_RADIUS = 300
+
+# Strike storage grid. Strikes are bucketed per minute of publication date, so
+# a whole bucket expires at once, and per geohash cell inside each bucket. A
+# precision 4 cell is roughly 39 x 20 km, which is also the area merged into
+# one entity when strike clustering is enabled.
+GRID_BUCKET_SECONDS = 60
+GRID_GEOHASH_PRECISION = 4
+# Above this radius (km) a region query covers so many cells that scanning
+# every occupied cell is cheaper than enumerating the covering tiles.
+GRID_QUERY_MAX_RADIUS = 250
+
 ATTR_LAT = "lat"
 ATTR_LON = "lon"
 ATTRIBUTION = "Data provided by blitzortung.org"
 ATTR_EXTERNAL_ID = "external_id"
 ATTR_PUBLICATION_DATE = "publication_date"
+ATTR_GEOHASH = "geohash"
 
 BLIZORTUNG_URL = "https://map.blitzortung.org/#10/{lat}/{lon}"
 
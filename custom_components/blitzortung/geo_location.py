@@ -4,6 +4,7 @@ import bisect
 import logging
 import time
 import uuid
+from operator import itemgetter
 from typing import Any
 
 from homeassistant.components.geo_location import DOMAIN as GEO_LOCATION_PLATFORM
@@ -19,8 +20,21 @@ from homeassistant.helpers.entity_platform import AddConfigEntryEntitiesCallback
 from homeassistant.util.dt import utc_from_timestamp
 from homeassistant.util.unit_system import IMPERIAL_SYSTEM
 
-from . import BlitzortungConfigEntry
-from .const import ATTR_EXTERNAL_ID, ATTR_PUBLICATION_DATE, ATTRIBUTION, DOMAIN
+from . import BlitzortungConfigEntry, geohash
+from .const import (
+    ATTR_EXTERNAL_ID,
+    ATTR_GEOHASH,
+    ATTR_LIGHTNING_COUNTER,
+    ATTR_PUBLICATION_DATE,
+    ATTRIBUTION,
+    DOMAIN,
+    GRID_BUCKET_SECONDS,
+    GRID_GEOHASH_PRECISION,
+    GRID_QUERY_MAX_RADIUS,
+    POLAR_FAST_MAX_RADIUS,
+)
+from .geohash_utils import compute_geohash_tiles
+from .polar import PolarProjector
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -51,9 +65,11 @@ async def async_setup_entry(
         async_add_entities,
         coordinator.max_tracked_lightnings,
         coordinator.time_window_seconds,
+        coordinator.cluster_strikes,
     )
 
     coordinator.register_lightning_receiver(manager.lightning_cb)
+    coordinator.register_location_receiver(manager.location_changed)
     coordinator.register_on_tick(manager.tick)
 
 
@@ -108,49 +124,195 @@ class BlitzortungEvent(GeolocationEvent):
         )
 
 
-class Strikes(list):
-    """Define a list of lightning strikes, keeping it sorted by publication date."""
+class BlitzortungClusterEvent(BlitzortungEvent):
+    """Define an aggregate of the lightning strikes in one geohash cell."""
+
+    _attr_icon = "mdi:flash-alert"
+    _attr_name = "Lightning Cluster"
+
+    def __init__(self, cell: str, unit: str, lightning: dict[str, Any]) -> None:
+        """Initialize entity from the first strike in the cell."""
+        super().__init__(
+            lightning["distance"],
+            lightning["lat"],
+            lightning["lon"],
+            unit,
+            lightning["time"],
+            lightning["status"],
+            lightning["region"],
+        )
+        self.entity_id = f"geo_location.lightning_cluster_{self._strike_id}"
+        self._attr_extra_state_attributes[ATTR_GEOHASH] = cell
+        self._attr_extra_state_attributes[ATTR_LIGHTNING_COUNTER] = 1
+
+    @callback
+    def update_cluster(self, count: int, lightning: dict[str, Any] | None) -> None:
+        """Update the strike count, moving to the given strike if it is newer."""
+        if lightning is not None and lightning["time"] / 1e9 >= self._publication_date:
+            self._time = lightning["time"]
+            self._status = lightning["status"]
+            self._region = lightning["region"]
+            self._publication_date = self._time / 1e9
+            self._attr_distance = lightning["distance"]
+            self._attr_latitude = lightning["lat"]
+            self._attr_longitude = lightning["lon"]
+            self._attr_extra_state_attributes[ATTR_PUBLICATION_DATE] = (
+                utc_from_timestamp(self._publication_date)
+            )
+        self._attr_extra_state_attributes[ATTR_LIGHTNING_COUNTER] = count
+        if self.hass is not None:
+            self.async_write_ha_state()
+
+
+class StrikeGrid:
+    """Define a store of lightning strikes indexed by time and location.
+
+    Strikes are kept in minute buckets of publication date, and inside each
+    bucket per geohash cell. Expiring a time window drops whole buckets instead
+    of shifting one sorted list, capacity eviction only searches the oldest
+    bucket, and region queries only visit the cells covering the region.
+    """
 
     def __init__(self, capacity: int) -> None:
         """Initialize."""
-        self._keys = []
-        self._key_fn = lambda strike: strike._publication_date  # noqa: SLF001
-        self._max_key = 0
         self._capacity = capacity
-        super().__init__()
-
-    def insort(self, item: BlitzortungEvent) -> tuple[BlitzortungEvent]:
-        """Insert item into the list, keeping it sorted by key."""
-        k = self._key_fn(item)
-        if k > self._max_key:
-            self._max_key = k
-            self._keys.append(k)
-            self.append(item)
+        self._buckets: dict[int, dict[str, list[tuple[float, Any]]]] = {}
+        self._bucket_keys: list[int] = []
+        self._cell_counts: dict[str, int] = {}
+        self._count = 0
+
+    def __len__(self) -> int:
+        """Return the number of stored strikes."""
+        return self._count
+
+    def cell_count(self, cell: str) -> int:
+        """Return the number of stored strikes in a geohash cell."""
+        return self._cell_counts.get(cell, 0)
+
+    def insert(self, key: float, cell: str, item: Any) -> list[tuple[str, Any]]:
+        """Store item under its publication date and cell.
+
+        Returns the (cell, item) pairs evicted to stay within capacity.
+        """
+        minute = int(key // GRID_BUCKET_SECONDS)
+        bucket = self._buckets.get(minute)
+        if bucket is None:
+            bucket = self._buckets[minute] = {}
+            bisect.insort(self._bucket_keys, minute)
+        entries = bucket.setdefault(cell, [])
+        if not entries or entries[-1][0] <= key:
+            entries.append((key, item))
         else:
-            i = bisect.bisect_right(self._keys, k)
-            self._keys.insert(i, k)
-            self.insert(i, item)
-        n = len(self) - self._capacity
-        if n > 0:
-            del self._keys[0:n]
-            to_delete = self[0:n]
-            self[0:n] = []
-            return to_delete
-        return ()
-
-    def cleanup(self, k: float) -> tuple[BlitzortungEvent]:
-        """Remove all strikes older than k."""
-        if not self._keys or self._keys[0] > k:
-            return ()
-
-        i = bisect.bisect_right(self._keys, k)
-        if not i:
-            return ()
-
-        del self._keys[0:i]
-        to_delete = self[0:i]
-        self[0:i] = []
-        return to_delete
+            bisect.insort(entries, (key, item), key=itemgetter(0))
+        self._cell_counts[cell] = self._cell_counts.get(cell, 0) + 1
+        self._count += 1
+
+        evicted = []
+        while self._count > self._capacity:
+            evicted.append(self._pop_oldest())
+        return evicted
+
+    def _pop_oldest(self) -> tuple[str, Any]:
+        """Remove the strike with the oldest publication date."""
+        minute = self._bucket_keys[0]
+        bucket = self._buckets[minute]
+        cell = min(bucket, key=lambda c: bucket[c][0][0])
+        entries = bucket[cell]
+        _, item = entries.pop(0)
+        if not entries:
+            del bucket[cell]
+            if not bucket:
+                del self._buckets[minute]
+                del self._bucket_keys[0]
+        self._discount(cell, 1)
+        return cell, item
+
+    def _discount(self, cell: str, n: int) -> None:
+        """Forget n strikes of a cell."""
+        self._count -= n
+        remaining = self._cell_counts[cell] - n
+        if remaining:
+            self._cell_counts[cell] = remaining
+        else:
+            del self._cell_counts[cell]
+
+    def cleanup(self, k: float) -> list[tuple[str, Any]]:
+        """Remove all strikes older than k, returning the removed (cell, item) pairs."""
+        removed = []
+        while self._bucket_keys:
+            minute = self._bucket_keys[0]
+            if minute * GRID_BUCKET_SECONDS > k:
+                break
+            bucket = self._buckets[minute]
+            if (minute + 1) * GRID_BUCKET_SECONDS <= k:
+                # Every strike in the bucket is older than k
+                for cell, entries in bucket.items():
+                    removed.extend((cell, item) for _, item in entries)
+                    self._discount(cell, len(entries))
+                del self._buckets[minute]
+                del self._bucket_keys[0]
+                continue
+
+            # k falls inside this bucket, later buckets are all newer
+            for cell in list(bucket):
+                entries = bucket[cell]
+                i = bisect.bisect_right(entries, k, key=itemgetter(0))
+                if not i:
+                    continue
+                removed.extend((cell, item) for _, item in entries[:i])
+                self._discount(cell, i)
+                if i == len(entries):
+                    del bucket[cell]
+                else:
+                    del entries[:i]
+            if not bucket:
+                del self._buckets[minute]
+                del self._bucket_keys[0]
+            break
+        return removed
+
+    def query(self, latitude: float, longitude: float, radius: float) -> list[Any]:
+        """Return the strikes stored in the cells covering a circle.
+
+        The cells overlap the circle's bounding box, so callers needing an exact
+        radius still have to check the distance of the returned strikes.
+        """
+        cells = None
+        if radius <= GRID_QUERY_MAX_RADIUS:
+            cells = compute_geohash_tiles(
+                latitude, longitude, radius, GRID_GEOHASH_PRECISION
+            )
+        result = []
+        for minute in self._bucket_keys:
+            bucket = self._buckets[minute]
+            wanted = bucket.keys() if cells is None else bucket.keys() & cells
+            for cell in wanted:
+                result.extend(item for _, item in bucket[cell])
+        return result
+
+    def retain(self, items: list[Any]) -> list[tuple[str, Any]]:
+        """Remove every strike but items, returning the removed (cell, item) pairs."""
+        keep = {id(item) for item in items}
+        removed = []
+        for minute in list(self._bucket_keys):
+            bucket = self._buckets[minute]
+            for cell in list(bucket):
+                entries = bucket[cell]
+                kept = [entry for entry in entries if id(entry[1]) in keep]
+                if len(kept) == len(entries):
+                    continue
+                removed.extend(
+                    (cell, item) for _, item in entries if id(item) not in keep
+                )
+                self._discount(cell, len(entries) - len(kept))
+                if kept:
+                    bucket[cell] = kept
+                else:
+                    del bucket[cell]
+            if not bucket:
+                del self._buckets[minute]
+                self._bucket_keys.remove(minute)
+        return removed
 
 
 class BlitzortungEventManager:
@@ -162,12 +324,17 @@ class BlitzortungEventManager:
         async_add_entities: AddConfigEntryEntitiesCallback,
         max_tracked_lightnings: int,
         window_seconds: int,
+        cluster_strikes: bool = False,
     ) -> None:
         """Initialize."""
         self._async_add_entities = async_add_entities
         self._hass = hass
-        self._strikes = Strikes(max_tracked_lightnings)
+        self._strikes = StrikeGrid(max_tracked_lightnings)
         self._window_seconds = window_seconds
+        # With clustering there is one entity per occupied geohash cell instead
+        # of one per strike, which bounds the entity count during big storms.
+        self._cluster_strikes = cluster_strikes
+        self._clusters: dict[str, BlitzortungClusterEvent] = {}
 
         if hass.config.units == IMPERIAL_SYSTEM:
             self._unit = UnitOfLength.MILES
@@ -177,6 +344,26 @@ class BlitzortungEventManager:
     async def lightning_cb(self, lightning: dict[str, Any]) -> None:
         """Handle incoming lightning strike data."""
         _LOGGER.debug("geo_location lightning: %s", lightning)
+        cell = geohash.encode(
+            lightning["lat"], lightning["lon"], GRID_GEOHASH_PRECISION
+        )
+        if self._cluster_strikes:
+            to_delete = self._strikes.insert(lightning["time"] / 1e9, cell, lightning)
+            if cluster := self._clusters.get(cell):
+                cluster.update_cluster(self._strikes.cell_count(cell), lightning)
+            else:
+                cluster = BlitzortungClusterEvent(cell, self._unit, lightning)
+                self._clusters[cell] = cluster
+                self._async_add_entities([cluster])
+            if to_delete:
+                self._update_clusters(to_delete)
+            _LOGGER.debug(
+                "tracked lightnings: %s in %s clusters",
+                len(self._strikes),
+                len(self._clusters),
+            )
+            return
+
         event = BlitzortungEvent(
             lightning["distance"],
             lightning["lat"],
@@ -186,14 +373,14 @@ class BlitzortungEventManager:
             lightning["status"],
             lightning["region"],
         )
-        to_delete = self._strikes.insort(event)
+        to_delete = self._strikes.insert(event._publication_date, cell, event)  # noqa: SLF001
         self._async_add_entities([event])
         if to_delete:
-            self._remove_events(to_delete)
+            self._remove_events([event for _, event in to_delete])
         _LOGGER.debug("tracked lightnings: %s", len(self._strikes))
 
     @callback
-    def _remove_events(self, events: tuple[BlitzortungEvent]) -> None:
+    def _remove_events(self, events: list[BlitzortungEvent]) -> None:
         """Remove old geo location events."""
         _LOGGER.debug("Going to remove %s", events)
         for event in events:
@@ -202,8 +389,49 @@ class BlitzortungEventManager:
                 SIGNAL_DELETE_ENTITY.format(event._strike_id),  # noqa: SLF001
             )
 
+    @callback
+    def _update_clusters(self, removed: list[tuple[str, Any]]) -> None:
+        """Refresh or remove the clusters which lost strikes."""
+        emptied = []
+        for cell in {cell for cell, _ in removed}:
+            if (count := self._strikes.cell_count(cell)) and cell in self._clusters:
+                self._clusters[cell].update_cluster(count, None)
+            elif cluster := self._clusters.pop(cell, None):
+                emptied.append(cluster)
+        if emptied:
+            self._remove_events(emptied)
+
+    @callback
+    def location_changed(
+        self, latitude: float, longitude: float, radius: float
+    ) -> None:
+        """Remove the strikes left outside the radius of a new location."""
+        projector = PolarProjector(
+            latitude, longitude, accurate=radius > POLAR_FAST_MAX_RADIUS
+        )
+        inside = []
+        for item in self._strikes.query(latitude, longitude, radius):
+            if self._cluster_strikes:
+                position = item["lat"], item["lon"]
+            else:
+                position = item.latitude, item.longitude
+            if projector(*position)[0] < radius:
+                inside.append(item)
+        to_delete = self._strikes.retain(inside)
+        if not to_delete:
+            return
+        _LOGGER.debug("%s lightnings out of the new radius", len(to_delete))
+        if self._cluster_strikes:
+            self._update_clusters(to_delete)
+        else:
+            self._remove_events([event for _, event in to_delete])
+
     def tick(self) -> None:
         """Handle tick."""
         to_delete = self._strikes.cleanup(time.time() - self._window_seconds)
-        if to_delete:
-            self._remove_events(to_delete)
+        if not to_delete:
+            return
+        if self._cluster_strikes:
+            self._update_clusters(to_delete)
+        else:
+            self._remove_events([event for _, event in to_delete])
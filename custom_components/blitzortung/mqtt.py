@@ -27,6 +27,11 @@ MQTT_DISCONNECTED = "blitzortung_mqtt_disconnected"
 
 MAX_RECONNECT_WAIT = 300  # seconds
 
+# Received messages waiting for dispatch. When the event loop falls this far
+# behind, the oldest queued messages are dropped: a fresh strike is worth more
+# than a stale one.
+MESSAGE_QUEUE_SIZE = 1000
+
 
 def _raise_on_error(result_code: int) -> None:
     """Raise error if error result."""
@@ -36,18 +41,6 @@ def _raise_on_error(result_code: int) -> None:
         )
 
 
-def _match_topic(subscription: str, topic: str) -> bool:
-    """Test if topic matches subscription."""
-    matcher = MQTTMatcher()
-    matcher[subscription] = True
-    try:
-        next(matcher.iter_match(topic))
-    except StopIteration:
-        return False
-    else:
-        return True
-
-
 PublishPayloadType = str | bytes | int | float | None
 
 
@@ -98,6 +91,19 @@ class MQTT:
         self.connected = False
         self._mqttc: mqtt.Client
         self._paho_lock = asyncio.Lock()
+        # Topic trie of subscription filters, each holding its subscriptions
+        self._matcher = MQTTMatcher()
+        self._queue: asyncio.Queue[mqtt.MQTTMessage] = asyncio.Queue(
+            maxsize=MESSAGE_QUEUE_SIZE
+        )
+        self._consumer: asyncio.Task[None] | None = None
+        self._overloaded = False
+        self.stats = {
+            "received": 0,
+            "dispatched": 0,
+            "dropped": 0,
+            "queue_high_water": 0,
+        }
 
         self.init_client()
 
@@ -136,6 +142,11 @@ class MQTT:
 
         self._mqttc.loop_start()
 
+        if self._consumer is None:
+            self._consumer = self.hass.async_create_background_task(
+                self._async_consume(), "blitzortung mqtt message consumer"
+            )
+
     async def async_disconnect(self) -> None:
         """Stop the MQTT client."""
 
@@ -146,6 +157,12 @@ class MQTT:
 
         await self.hass.async_add_executor_job(stop)
 
+        if self._consumer is not None:
+            self._consumer.cancel()
+            self._consumer = None
+        while not self._queue.empty():
+            self._queue.get_nowait()
+
     async def async_subscribe(
         self,
         topic: str,
@@ -162,6 +179,10 @@ class MQTT:
 
         subscription = Subscription(topic, msg_callback, qos, encoding)
         self.subscriptions.append(subscription)
+        try:
+            self._matcher[topic].append(subscription)
+        except KeyError:
+            self._matcher[topic] = [subscription]
 
         # Only subscribe if currently connected.
         if self.connected:
@@ -174,9 +195,12 @@ class MQTT:
                 raise HomeAssistantError("Can't remove subscription twice")
             self.subscriptions.remove(subscription)
 
-            if any(other.topic == topic for other in self.subscriptions):
+            topic_subscriptions = self._matcher[topic]
+            topic_subscriptions.remove(subscription)
+            if topic_subscriptions:
                 # Other subscriptions on topic remaining - don't unsubscribe.
                 return
+            del self._matcher[topic]
 
             # Only unsubscribe if currently connected.
             if self.connected:
@@ -241,10 +265,41 @@ class MQTT:
 
     def _mqtt_on_message(self, _mqttc, _userdata, msg: Message) -> None:  # noqa: ANN001
         """Message received callback."""
-        self.hass.add_job(self._mqtt_handle_message, msg)
+        self.hass.loop.call_soon_threadsafe(self._mqtt_enqueue_message, msg)
 
     @callback
-    def _mqtt_handle_message(self, msg: Message) -> None:
+    def _mqtt_enqueue_message(self, msg: mqtt.MQTTMessage) -> None:
+        """Queue a received message, dropping the oldest one when full."""
+        self.stats["received"] += 1
+        if self._queue.full():
+            self._queue.get_nowait()
+            self.stats["dropped"] += 1
+            if not self._overloaded:
+                self._overloaded = True
+                _LOGGER.warning(
+                    "MQTT message queue is full, dropping the oldest messages"
+                )
+        self._queue.put_nowait(msg)
+        self.stats["queue_high_water"] = max(
+            self.stats["queue_high_water"], self._queue.qsize()
+        )
+
+    async def _async_consume(self) -> None:
+        """Dispatch queued messages one at a time, in arrival order."""
+        while True:
+            msg = await self._queue.get()
+            try:
+                await self._async_handle_message(msg)
+            except Exception:
+                _LOGGER.exception("Error handling message on %s", msg.topic)
+            if self._overloaded and self._queue.empty():
+                self._overloaded = False
+                _LOGGER.info(
+                    "MQTT message queue drained, %s messages dropped so far",
+                    self.stats["dropped"],
+                )
+
+    async def _async_handle_message(self, msg: mqtt.MQTTMessage) -> None:
         _LOGGER.debug(
             "Received message on %s%s: %s",
             msg.topic,
@@ -253,26 +308,27 @@ class MQTT:
         )
         timestamp = dt_util.utcnow()
 
-        for subscription in self.subscriptions:
-            if not _match_topic(subscription.topic, msg.topic):
-                continue
-
-            payload: SubscribePayloadType = msg.payload
-            if subscription.encoding is not None:
-                try:
-                    payload = msg.payload.decode(subscription.encoding)
-                except (AttributeError, UnicodeDecodeError):
-                    _LOGGER.warning(
-                        "Can't decode payload %s on %s with encoding %s (for %s)",
-                        msg.payload,
-                        msg.topic,
-                        subscription.encoding,
-                        subscription.callback,
-                    )
+        for topic_subscriptions in self._matcher.iter_match(msg.topic):
+            # A callback may unsubscribe, so don't iterate the live list
+            for subscription in tuple(topic_subscriptions):
+                if subscription not in topic_subscriptions:
+                    # Removed by an earlier callback for this message
                     continue
-
-            self.hass.async_create_task(
-                subscription.callback(
+                payload: SubscribePayloadType = msg.payload
+                if subscription.encoding is not None:
+                    try:
+                        payload = msg.payload.decode(subscription.encoding)
+                    except (AttributeError, UnicodeDecodeError):
+                        _LOGGER.warning(
+                            "Can't decode payload %s on %s with encoding %s (for %s)",
+                            msg.payload,
+                            msg.topic,
+                            subscription.encoding,
+                            subscription.callback,
+                        )
+                        continue
+
+                result = subscription.callback(
                     Message(
                         msg.topic,
                         payload,
@@ -282,7 +338,9 @@ class MQTT:
                         timestamp,
                     )
                 )
-            )
+                if asyncio.iscoroutine(result):
+                    await result
+                self.stats["dispatched"] += 1
 
     def _mqtt_on_disconnect(self, _mqttc, _userdata, result_code: int) -> None:  # noqa: ANN001
         """Disconnected callback."""
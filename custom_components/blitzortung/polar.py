@@ -0,0 +1,51 @@
+"""Distance and azimuth of lightning strikes relative to a reference point."""
+
+import math
+
+# Mean Earth radius in km
+EARTH_RADIUS = 6371
+
+
+class PolarProjector:
+    """Compute distance (km) and azimuth (degrees) from a fixed reference point.
+
+    The trigonometry of the reference point is computed once. The fast mode is
+    the equirectangular approximation, which is well within the rounding of the
+    reported distance for small radii but drifts by several percent towards the
+    edge of a large one, especially at high latitudes. The accurate mode uses
+    the haversine distance and the initial great-circle bearing.
+    """
+
+    def __init__(self, latitude: float, longitude: float, accurate: bool) -> None:
+        """Initialize."""
+        self.latitude = latitude
+        self.longitude = longitude
+        self.accurate = accurate
+        self._lat = math.radians(latitude)
+        self._lon = math.radians(longitude)
+        self._sin_lat = math.sin(self._lat)
+        self._cos_lat = math.cos(self._lat)
+
+    def __call__(self, latitude: float, longitude: float) -> tuple[float, float]:
+        """Return distance and azimuth of a point."""
+        lat = math.radians(latitude)
+        dlon = math.radians(longitude) - self._lon
+        if not self.accurate:
+            dy = lat - self._lat
+            dx = dlon * self._cos_lat
+            return (
+                math.sqrt(dx * dx + dy * dy) * EARTH_RADIUS,
+                math.degrees(math.atan2(dx, dy)) % 360,
+            )
+
+        cos_lat = math.cos(lat)
+        sin_lat = math.sin(lat)
+        sin_dlat = math.sin((lat - self._lat) / 2)
+        sin_dlon = math.sin(dlon / 2)
+        a = sin_dlat * sin_dlat + self._cos_lat * cos_lat * sin_dlon * sin_dlon
+        distance = 2 * EARTH_RADIUS * math.asin(min(1.0, math.sqrt(a)))
+        azimuth = math.atan2(
+            math.sin(dlon) * cos_lat,
+            self._cos_lat * sin_lat - self._sin_lat * cos_lat * math.cos(dlon),
+        )
+        return distance, math.degrees(azimuth) % 360
@@ -787,6 +787,22 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
 
         hass.services.async_register(DOMAIN, "resume_cycle", handle_resume_cycle)
 
+    if not hass.services.has_service(DOMAIN, "cancel_reprocess"):
+        async def handle_cancel_reprocess(call: ServiceCall) -> None:
+            device_id = _require_str(call.data.get("device_id"), "device_id")
+            registry = dr.async_get(hass)
+            device = registry.async_get(device_id)
+            if not device:
+                raise ValueError("Device not found")
+            entry_id = next(iter(device.config_entries), None)
+            if not entry_id or entry_id not in hass.data[DOMAIN]:
+                raise ValueError("Integration not loaded")
+
+            manager = hass.data[DOMAIN][entry_id]
+            await manager.profile_store.async_cancel_reprocess()
+
+        hass.services.async_register(DOMAIN, "cancel_reprocess", handle_cancel_reprocess)
+
     return True
 
 
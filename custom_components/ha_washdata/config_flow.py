@@ -60,6 +60,7 @@ from .const import (
     CONF_PROFILE_MATCH_MIN_DURATION_RATIO,
     CONF_PROFILE_MATCH_MAX_DURATION_RATIO,
     CONF_AUTO_MAINTENANCE,
+    CONF_REPROCESS_CHUNK_BUDGET_MS,
     CONF_WATCHDOG_INTERVAL,
     CONF_COMPLETION_MIN_SECONDS,
     CONF_NOTIFY_BEFORE_END_MINUTES,
@@ -96,6 +97,7 @@ from .const import (
     DEFAULT_DURATION_TOLERANCE,
     DEFAULT_PROFILE_MATCH_INTERVAL,
     DEFAULT_AUTO_MAINTENANCE,
+    DEFAULT_REPROCESS_CHUNK_BUDGET_MS,
     DEFAULT_WATCHDOG_INTERVAL,
     DEFAULT_COMPLETION_MIN_SECONDS,
     DEFAULT_NOTIFY_BEFORE_END_MINUTES,
@@ -1383,6 +1385,20 @@ class OptionsFlowHandler(config_entries.OptionsFlow):
                 CONF_AUTO_MAINTENANCE,
                 default=get_val(CONF_AUTO_MAINTENANCE, DEFAULT_AUTO_MAINTENANCE),
             ): selector.BooleanSelector(),
+            vol.Optional(
+                CONF_REPROCESS_CHUNK_BUDGET_MS,
+                default=get_val(
+                    CONF_REPROCESS_CHUNK_BUDGET_MS, DEFAULT_REPROCESS_CHUNK_BUDGET_MS
+                ),
+            ): selector.NumberSelector(
+                selector.NumberSelectorConfig(
+                    min=10,
+                    max=5000,
+                    step=10,
+                    unit_of_measurement="ms",
+                    mode=selector.NumberSelectorMode.BOX,
+                )
+            ),
             vol.Optional(
                 CONF_EXPOSE_DEBUG_ENTITIES,
                 default=get_val(CONF_EXPOSE_DEBUG_ENTITIES, False),
@@ -2201,11 +2217,14 @@ class OptionsFlowHandler(config_entries.OptionsFlow):
         manager = self.hass.data[DOMAIN][self.config_entry.entry_id]
 
         if user_input is not None:
-            # Execute
-            count = await manager.profile_store.async_reprocess_all_data()
+            # Runs as a chunked background job; progress is reported by the
+            # reprocess progress sensor and the ha_washdata_reprocess_progress event.
+            if not manager.profile_store.start_reprocess_job():
+                return self.async_abort(reason="reprocess_already_running")
+            progress = manager.profile_store.get_reprocess_progress()
             return self.async_abort(
-                reason="reprocess_success",
-                description_placeholders={"count": str(count)},
+                reason="reprocess_started",
+                description_placeholders={"count": str(progress.get("total", 0))},
             )
 
         return self.async_show_form(
@@ -440,6 +440,11 @@ STORAGE_KEY = "ha_washdata"
 # Notification events
 EVENT_CYCLE_STARTED = "ha_washdata_cycle_started"
 EVENT_CYCLE_ENDED = "ha_washdata_cycle_ended"
+EVENT_REPROCESS_PROGRESS = "ha_washdata_reprocess_progress"  # Fired after each background reprocess chunk
+
+# Background history reprocessing
+CONF_REPROCESS_CHUNK_BUDGET_MS = "reprocess_chunk_budget_ms"
+DEFAULT_REPROCESS_CHUNK_BUDGET_MS = 250  # CPU time per chunk before yielding to the event loop
 
 # Signals
 SIGNAL_WASHER_UPDATE = "ha_washdata_update_{}"
@@ -60,6 +60,7 @@ from .const import (
     CONF_MAX_PAST_CYCLES,
     CONF_MAX_FULL_TRACES_PER_PROFILE,
     CONF_MAX_FULL_TRACES_UNLABELED,
+    CONF_REPROCESS_CHUNK_BUDGET_MS,
     CONF_WATCHDOG_INTERVAL,
     CONF_AUTO_TUNE_NOISE_EVENTS_THRESHOLD,
     CONF_COMPLETION_MIN_SECONDS,
@@ -170,6 +171,7 @@ from .const import (
     DEFAULT_NOTIFY_FINISH_CHANNEL,
 
     DEFAULT_MAX_FULL_TRACES_UNLABELED,
+    DEFAULT_REPROCESS_CHUNK_BUDGET_MS,
     DEFAULT_DTW_BANDWIDTH,
     DEFAULT_WATCHDOG_INTERVAL,
     CONF_MATCH_PERSISTENCE,
@@ -1289,6 +1291,11 @@ class WashDataManager:
                     )
                 ),
             )
+            self.profile_store.set_reprocess_budget(
+                self.config_entry.options.get(
+                    CONF_REPROCESS_CHUNK_BUDGET_MS, DEFAULT_REPROCESS_CHUNK_BUDGET_MS
+                )
+            )
         except Exception:
             pass
 
@@ -1355,6 +1362,10 @@ class WashDataManager:
             self.profile_store.async_backfill_match_confidence()
         )
 
+        # Resume an interrupted background reprocess job from its checkpoint
+        if self.profile_store.has_pending_reprocess:
+            self.profile_store.start_reprocess_job()
+
         # Subscribe to external cycle end trigger (if enabled)
         await self._setup_external_end_trigger()
 
@@ -1674,6 +1685,11 @@ class WashDataManager:
                 CONF_PROFILE_DURATION_TOLERANCE, DEFAULT_PROFILE_DURATION_TOLERANCE
             )
         )
+        self.profile_store.set_reprocess_budget(
+            config_entry.options.get(
+                CONF_REPROCESS_CHUNK_BUDGET_MS, DEFAULT_REPROCESS_CHUNK_BUDGET_MS
+            )
+        )
 
 
         # Update notification settings
@@ -1797,6 +1813,9 @@ class WashDataManager:
         if self._remove_maintenance_scheduler:
             self._remove_maintenance_scheduler()
 
+        # Keep the reprocess checkpoint so the job resumes after restart
+        await self.profile_store.async_suspend_reprocess()
+
         self.diag_buffer.uninstall()
 
         # Dismiss any active live/progress notification so it doesn't linger on
@@ -2,12 +2,14 @@
 
 from __future__ import annotations
 
+import asyncio
 import dataclasses
 import hashlib
 import html
 import logging
 import os
 import re
+import time
 import uuid
 from datetime import datetime, timedelta
 from typing import Any, TypeAlias, cast
@@ -16,6 +18,7 @@ import json
 import numpy as np
 
 from homeassistant.core import HomeAssistant
+from homeassistant.helpers.dispatcher import async_dispatcher_send
 from homeassistant.helpers.storage import Store
 from homeassistant.util import dt as dt_util
 
@@ -26,6 +29,9 @@ from .const import (
     DEFAULT_MAX_FULL_TRACES_PER_PROFILE,
     DEFAULT_MAX_FULL_TRACES_UNLABELED,
     DEFAULT_DTW_BANDWIDTH,
+    DEFAULT_REPROCESS_CHUNK_BUDGET_MS,
+    EVENT_REPROCESS_PROGRESS,
+    SIGNAL_WASHER_UPDATE,
 )
 from .features import compute_signature
 from .signal_processing import resample_uniform, resample_adaptive, Segment
@@ -48,6 +54,14 @@ _LOGGER = logging.getLogger(__name__)
 JSONDict: TypeAlias = dict[str, Any]
 CycleDict: TypeAlias = dict[str, Any]
 
+# Seconds of reprocessing between two checkpoint writes. A checkpoint rewrites
+# the whole store, other saves (e.g. of the active cycle) also persist it.
+REPROCESS_CHECKPOINT_INTERVAL = 300.0
+# Max cycles copied to the executor for one reprocess chunk
+REPROCESS_CHUNK_MAX_CYCLES = 200
+# Cycle keys that _reprocess_cycle may replace
+REPROCESSED_CYCLE_KEYS = ("start_time", "power_data", "duration", "signature")
+
 
 def _empty_ranking() -> list[dict[str, Any]]:
     """Typed default factory for ranking entries."""
@@ -670,6 +684,11 @@ class ProfileStore:
             "pending_feedback": {},  # Persisted pending feedback requests
             "custom_phases": [],  # Shared custom phase catalog
         }
+        # Background reprocess job (checkpoint lives in self._data["reprocess_job"])
+        self._reprocess_task: asyncio.Task[None] | None = None
+        self._reprocess_budget_s = DEFAULT_REPROCESS_CHUNK_BUDGET_MS / 1000.0
+        self._reprocess_state = "idle"
+        self._last_reprocess_count = 0
 
 
 
@@ -1062,6 +1081,13 @@ class ProfileStore:
         except (TypeError, ValueError):
             pass
 
+    def set_reprocess_budget(self, budget_ms: float) -> None:
+        """Set the CPU time budget (ms) for each background reprocess chunk."""
+        try:
+            self._reprocess_budget_s = max(0.01, float(budget_ms) / 1000.0)
+        except (TypeError, ValueError):
+            pass
+
     def get_duration_ratio_limits(self) -> tuple[float, float]:
         """Return (min_duration_ratio, max_duration_ratio) used for duration matching."""
         return (float(self._min_duration_ratio), float(self._max_duration_ratio))
@@ -1550,133 +1576,275 @@ class ProfileStore:
 
         return stats
 
-    def _reprocess_all_data_sync(self) -> int:
-        """Synchronous implementation of reprocessing logic (run in executor)."""
-        cycles_raw = self._data.get("past_cycles", [])
-        cycles = cast(list[CycleDict], cycles_raw) if isinstance(cycles_raw, list) else []
-        if not cycles:
-            return 0
+    def _reprocess_cycle(self, cycle: CycleDict) -> int:
+        """Trim and re-sign a single stored cycle in place.
 
+        Idempotent: running it twice over the same cycle is a no-op the second
+        time, which is what makes the chunked job safe to resume.
+        Returns the number of updates applied to the cycle.
+        """
         processed_count = 0
 
-        # 1. Update Signatures & Optimize Data
-        for cycle in cycles:
-            # Data Optimization: Trim leading/trailing zeros (0W)
-            # Only apply to compressed data to avoid breaking legacy format
-            p_data = cycle.get("power_data")
-            if (
-                p_data
-                and isinstance(p_data, list)
-                and p_data
-                and isinstance(p_data[0], (list, tuple))
-            ):
-                first_point = cast(list[Any] | tuple[Any, ...], p_data[0])
-                # Only trim offset-format data (numeric offsets). Legacy ISO-format
-                # cycles skip trimming but still reach the signature block below.
-                if len(first_point) == 2 and isinstance(first_point[0], (int, float)):
-                    p_data_list = cast(list[list[float]], p_data)
-                    # Apply trim helper
-                    original_len = len(p_data_list)
-
-                    # Logic: For completed cycles, only trim leading zeros.
-                    # For others, trim both ends.
-                    if cycle.get("status") in ("completed", "force_stopped"):
-                        # Only trim leading
-                        start_idx = 0
-                        for i, point in enumerate(p_data_list):
-                            if point[1] > 1.0: # Match threshold below
-                                start_idx = i
-                                break
-                        trimmed: list[list[float]] = p_data_list[start_idx:]
-                    else:
-                        trimmed = trim_zero_power_data(p_data_list, threshold=1.0) # Conservative 1W threshold
+        # Data Optimization: Trim leading/trailing zeros (0W)
+        # Only apply to compressed data to avoid breaking legacy format
+        p_data = cycle.get("power_data")
+        if (
+            p_data
+            and isinstance(p_data, list)
+            and p_data
+            and isinstance(p_data[0], (list, tuple))
+        ):
+            first_point = cast(list[Any] | tuple[Any, ...], p_data[0])
+            # Only trim offset-format data (numeric offsets). Legacy ISO-format
+            # cycles skip trimming but still reach the signature block below.
+            if len(first_point) == 2 and isinstance(first_point[0], (int, float)):
+                p_data_list = cast(list[list[float]], p_data)
+                # Apply trim helper
+                original_len = len(p_data_list)
+
+                # Logic: For completed cycles, only trim leading zeros.
+                # For others, trim both ends.
+                if cycle.get("status") in ("completed", "force_stopped"):
+                    # Only trim leading
+                    start_idx = 0
+                    for i, point in enumerate(p_data_list):
+                        if point[1] > 1.0: # Match threshold below
+                            start_idx = i
+                            break
+                    trimmed: list[list[float]] = p_data_list[start_idx:]
+                else:
+                    trimmed = trim_zero_power_data(p_data_list, threshold=1.0) # Conservative 1W threshold
 
-                    if trimmed and len(trimmed) < original_len:
-                        # Data was trimmed - check for start time shift
-                        first_offset = trimmed[0][0]
+                if trimmed and len(trimmed) < original_len:
+                    # Data was trimmed - check for start time shift
+                    first_offset = trimmed[0][0]
 
-                        if first_offset > 0:
-                            # Leading zeros removed - Must shift start_time forward
-                            try:
-                                start_dt = datetime.fromisoformat(cycle["start_time"])
-                                new_start = start_dt + timedelta(seconds=first_offset)
-                                cycle["start_time"] = new_start.isoformat()
-
-                                # Re-normalize offsets to 0
-                                shifted_data: list[list[float]] = []
-                                for row in trimmed:
-                                    # row is [offset, power]
-                                    shifted_data.append([round(row[0] - first_offset, 1), row[1]])
-                                cycle["power_data"] = shifted_data
-                                processed_count += 1
-                            except (ValueError, TypeError) as e:
-                                self._logger.warning("Failed to shift start_time for trimmed cycle: %s", e)
-                        else:
-                            # Only trailing trimmed or no shift needed
-                            cycle["power_data"] = trimmed
+                    if first_offset > 0:
+                        # Leading zeros removed - Must shift start_time forward
+                        try:
+                            start_dt = datetime.fromisoformat(cycle["start_time"])
+                            new_start = start_dt + timedelta(seconds=first_offset)
+                            cycle["start_time"] = new_start.isoformat()
+
+                            # Re-normalize offsets to 0
+                            shifted_data: list[list[float]] = []
+                            for row in trimmed:
+                                # row is [offset, power]
+                                shifted_data.append([round(row[0] - first_offset, 1), row[1]])
+                            cycle["power_data"] = shifted_data
                             processed_count += 1
-
-                        # Update duration to match new data length
-                        # If we only trimmed the head, the new duration is old_duration - first_offset
-                        # This preserves trailing silence.
-                        if cycle.get("power_data"):
-                            old_dur = float(cycle.get("duration", 0.0) or 0.0)
-                            # If we shifted (first_offset > 0), new duration is old_dur - first_offset
-                            # Otherwise if we only trimmed tail, we might want to snap,
-                            # but for completed cycles we don't trim tail in this loop.
-                            if first_offset > 0:
-                                cycle["duration"] = max(0.0, old_dur - first_offset)
-                            else:
-                                # Only trailing was trimmed (not expected for completed cycles here)
-                                # or no trim happened.
-                                # If trailing was trimmed, we SHOULD snap.
-                                if len(trimmed) < original_len:
-                                    cycle["duration"] = cycle["power_data"][-1][0]
-
-            if cycle.get("power_data"):
-                try:
-                    tuples = decompress_power_data(cycle)
-                    if tuples and len(tuples) > 10:
-                        ts_arr: list[float] = []
-                        p_arr: list[float] = []
-                        for offset_sec, p in tuples:
-                            ts_arr.append(float(offset_sec))
-                            p_arr.append(float(p))
-
-                        sig = compute_signature(np.array(ts_arr, dtype=float), np.array(p_arr, dtype=float))
-                        cycle["signature"] = dataclasses.asdict(sig)
+                        except (ValueError, TypeError) as e:
+                            self._logger.warning("Failed to shift start_time for trimmed cycle: %s", e)
+                    else:
+                        # Only trailing trimmed or no shift needed
+                        cycle["power_data"] = trimmed
                         processed_count += 1
-                except Exception as e: # pylint: disable=broad-exception-caught
-                    self._logger.warning("Failed to reprocess signature: %s", e)
 
-        # 2. Rebuild Envelopes
+                    # Update duration to match new data length
+                    # If we only trimmed the head, the new duration is old_duration - first_offset
+                    # This preserves trailing silence.
+                    if cycle.get("power_data"):
+                        old_dur = float(cycle.get("duration", 0.0) or 0.0)
+                        # If we shifted (first_offset > 0), new duration is old_dur - first_offset
+                        # Otherwise if we only trimmed tail, we might want to snap,
+                        # but for completed cycles we don't trim tail in this loop.
+                        if first_offset > 0:
+                            cycle["duration"] = max(0.0, old_dur - first_offset)
+                        else:
+                            # Only trailing was trimmed (not expected for completed cycles here)
+                            # or no trim happened.
+                            # If trailing was trimmed, we SHOULD snap.
+                            if len(trimmed) < original_len:
+                                cycle["duration"] = cycle["power_data"][-1][0]
 
+        if cycle.get("power_data"):
+            try:
+                tuples = decompress_power_data(cycle)
+                if tuples and len(tuples) > 10:
+                    ts_arr: list[float] = []
+                    p_arr: list[float] = []
+                    for offset_sec, p in tuples:
+                        ts_arr.append(float(offset_sec))
+                        p_arr.append(float(p))
+
+                    sig = compute_signature(np.array(ts_arr, dtype=float), np.array(p_arr, dtype=float))
+                    cycle["signature"] = dataclasses.asdict(sig)
+                    processed_count += 1
+            except Exception as e: # pylint: disable=broad-exception-caught
+                self._logger.warning("Failed to reprocess signature: %s", e)
 
         return processed_count
 
-    async def async_reprocess_all_data(self) -> int:
-        """Reprocess all historical data to update signatures and rebuild envelopes.
+    def _reprocess_chunk_sync(
+        self, cycles: list[CycleDict], budget_s: float
+    ) -> tuple[list[CycleDict], int]:
+        """Reprocess copies of cycles, from the head of ``cycles``, until the CPU budget is spent.
 
-        This is a non-destructive operation for raw cycle data. It:
-        1. Recalculates signatures for ALL past cycles using current logic.
-        2. Rebuilds all profile envelopes from scratch.
-        3. Updates global stats.
+        The cycles are shallow copies made on the event loop: _reprocess_cycle
+        only replaces keys, so the stored cycles are never touched from the
+        executor. At least one cycle is always reprocessed so the job makes
+        progress even with a tiny budget.
 
-        Returns total number of cycles processed.
+        Returns (reprocessed_copies, processed_count).
         """
-        self._logger.info("Starting reprocessing (offloaded)...")
+        deadline = time.thread_time() + budget_s
+        done: list[CycleDict] = []
+        processed = 0
+        for cycle in cycles:
+            processed += self._reprocess_cycle(cycle)
+            done.append(cycle)
+            if time.thread_time() >= deadline:
+                break
+        return done, processed
+
+    def _apply_reprocessed_cycles(self, results: list[CycleDict]) -> None:
+        """Copy the reprocessed keys back into the stored cycles (on the event loop).
 
-        # Offload heavy synchronous work
-        processed_count = await self.hass.async_add_executor_job(
-            self._reprocess_all_data_sync
+        Cycles deleted while their copy was reprocessed are skipped.
+        """
+        by_id: dict[str, CycleDict] = {
+            c["id"]: c for c in self._data.get("past_cycles", []) if c.get("id")
+        }
+        for result in results:
+            cycle = by_id.get(result["id"])
+            if cycle is None:
+                continue
+            for key in REPROCESSED_CYCLE_KEYS:
+                if key in result:
+                    cycle[key] = result[key]
+
+    @property
+    def has_pending_reprocess(self) -> bool:
+        """Return True if a checkpointed reprocess job is waiting to be resumed."""
+        return bool(self._data.get("reprocess_job"))
+
+    @property
+    def is_reprocessing(self) -> bool:
+        """Return True while the background reprocess task is running."""
+        return self._reprocess_task is not None and not self._reprocess_task.done()
+
+    def get_reprocess_progress(self) -> JSONDict:
+        """Return progress of the current (or checkpointed) reprocess job."""
+        job = self._data.get("reprocess_job")
+        if not isinstance(job, dict):
+            return {"state": self._reprocess_state, "done": 0, "total": 0, "percent": None}
+        total = int(job.get("total", 0) or 0)
+        done = int(job.get("done", 0) or 0)
+        return {
+            "state": "running" if self.is_reprocessing else "paused",
+            "done": done,
+            "total": total,
+            "processed": int(job.get("processed", 0) or 0),
+            "started": job.get("started"),
+            "percent": round(100.0 * done / total, 1) if total else 100.0,
+        }
+
+    def _notify_reprocess_progress(self) -> None:
+        """Publish reprocess progress to entities and the event bus."""
+        progress = self.get_reprocess_progress()
+        self.hass.bus.async_fire(
+            EVENT_REPROCESS_PROGRESS, {"entry_id": self.entry_id, **progress}
         )
+        async_dispatcher_send(self.hass, SIGNAL_WASHER_UPDATE.format(self.entry_id))
+
+    def start_reprocess_job(self) -> bool:
+        """Start the background reprocess job, resuming a checkpoint if present.
+
+        Returns False if a job is already running.
+        """
+        if self.is_reprocessing:
+            return False
+        if not self.has_pending_reprocess:
+            cycle_ids = [
+                c["id"] for c in self._data.get("past_cycles", []) if c.get("id")
+            ]
+            self._data["reprocess_job"] = {
+                "pending": cycle_ids,
+                "total": len(cycle_ids),
+                "done": 0,
+                "processed": 0,
+                "started": dt_util.now().isoformat(),
+            }
+            self._logger.info("Starting background reprocessing of %d cycles", len(cycle_ids))
+        else:
+            self._logger.info("Resuming background reprocessing from checkpoint")
+        self._reprocess_state = "running"
+        self._reprocess_task = self.hass.async_create_background_task(
+            self._async_run_reprocess_job(), f"ha_washdata_reprocess_{self.entry_id}"
+        )
+        return True
+
+    async def _async_run_reprocess_job(self) -> None:
+        """Drive the checkpointed reprocess job chunk by chunk."""
+        job: JSONDict = self._data["reprocess_job"]
+        pending: list[str] = job.setdefault("pending", [])
+        self._last_reprocess_count = int(job.get("processed", 0))
+        last_checkpoint = time.monotonic()
+        while pending:
+            by_id: dict[str, CycleDict] = {
+                c["id"]: c for c in self._data.get("past_cycles", []) if c.get("id")
+            }
+            head = pending[:REPROCESS_CHUNK_MAX_CYCLES]
+            copies = [dict(by_id[cycle_id]) for cycle_id in head if cycle_id in by_id]
+            results: list[CycleDict] = []
+            processed = 0
+            if copies:
+                results, processed = await self.hass.async_add_executor_job(
+                    self._reprocess_chunk_sync, copies, self._reprocess_budget_s
+                )
+                self._apply_reprocessed_cycles(results)
+            # Ids of cycles deleted since the job started are simply skipped
+            consumed = head.index(results[-1]["id"]) + 1 if results else len(head)
+            del pending[:consumed]
+            job["done"] = int(job.get("done", 0)) + consumed
+            job["processed"] = int(job.get("processed", 0)) + processed
+            self._last_reprocess_count = int(job["processed"])
+            # Checkpoint now and then only: it rewrites the whole store. The
+            # checkpoint is also written on stop by async_suspend_reprocess.
+            if time.monotonic() - last_checkpoint >= REPROCESS_CHECKPOINT_INTERVAL:
+                last_checkpoint = time.monotonic()
+                self._store.async_delay_save(lambda: self._data, 0)
+            self._notify_reprocess_progress()
+            # Let matching and state updates run between chunks
+            await asyncio.sleep(0)
 
-        # 2. Rebuild Envelopes (Using new async infrastructure)
         await self.async_rebuild_all_envelopes()
+        self._last_reprocess_count = int(job.get("processed", 0))
+        self._data.pop("reprocess_job", None)
+        self._reprocess_state = "completed"
+        await self.async_save()
+        self._logger.info(
+            "Background reprocessing finished: %d updates", self._last_reprocess_count
+        )
+        self._notify_reprocess_progress()
 
+    async def async_suspend_reprocess(self) -> None:
+        """Stop the running job but keep its checkpoint so it resumes on next start."""
+        task = self._reprocess_task
+        if task is None or task.done():
+            return
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
         await self.async_save()
 
-        return processed_count
+    async def async_cancel_reprocess(self) -> bool:
+        """Cancel the reprocess job and discard its checkpoint.
+
+        Cycles already reprocessed keep their updated data. Returns True if
+        there was a job to cancel.
+        """
+        had_job = self.is_reprocessing or self.has_pending_reprocess
+        await self.async_suspend_reprocess()
+        if self._data.pop("reprocess_job", None) is not None:
+            await self.async_save()
+        if had_job:
+            self._reprocess_state = "cancelled"
+            self._logger.info("Background reprocessing cancelled")
+            self._notify_reprocess_progress()
+        return had_job
 
     async def get_storage_stats(self) -> dict[str, Any]:
         """Get storage usage stats."""
@@ -161,6 +161,7 @@ async def async_setup_entry(
         WasherDebugSensor(manager, entry),
         WasherSuggestionsSensor(manager, entry),
         WasherCycleCountSensor(manager, entry),
+        WasherReprocessProgressSensor(manager, entry),
     ]
 
     # Add pump-specific sensors
@@ -861,4 +862,32 @@ class WasherCycleCountSensor(WasherBaseSensor):
 
     @property
     def native_value(self) -> int:  # type: ignore[override]
-        return self._manager.cycle_count
\ No newline at end of file
+        return self._manager.cycle_count
+
+
+class WasherReprocessProgressSensor(WasherBaseSensor):
+    """Sensor reporting progress of the background history reprocess job."""
+
+    def __init__(self, manager: WashDataManager, entry: ConfigEntry) -> None:
+        self.entity_description = SensorEntityDescription(
+            key="reprocess_progress",
+            translation_key="reprocess_progress",
+            icon="mdi:database-sync",
+            native_unit_of_measurement="%",
+            entity_category=EntityCategory.DIAGNOSTIC,
+        )
+        super().__init__(manager, entry)
+
+    @property
+    def native_value(self):  # type: ignore[override]
+        return self._manager.profile_store.get_reprocess_progress().get("percent")
+
+    @property
+    def extra_state_attributes(self):  # type: ignore[override]
+        progress = self._manager.profile_store.get_reprocess_progress()
+        return {
+            "state": progress.get("state"),
+            "done": progress.get("done"),
+            "total": progress.get("total"),
+            "started": progress.get("started"),
+        }
@@ -7,6 +7,7 @@ from collections.abc import Awaitable, Callable
 from dataclasses import asdict, dataclass, field
 from datetime import timedelta
 import gzip
+import hashlib
 import math
 import os
 import pathlib
@@ -23,6 +24,7 @@ from aiogithubapi import (
     GitHubRatelimitException,
 )
 from aiogithubapi.objects.repository import AIOGitHubAPIRepository
+from aiohttp import hdrs
 from aiohttp.client import ClientSession, ClientTimeout
 from awesomeversion import AwesomeVersion
 from homeassistant.components.persistent_notification import (
@@ -37,7 +39,13 @@ from homeassistant.helpers.issue_registry import IssueSeverity, async_create_iss
 from homeassistant.loader import Integration
 from homeassistant.util import dt
 
-from .const import DOMAIN, TV, URL_BASE
+from .const import (
+    DOMAIN,
+    DOWNLOAD_CHUNK_SIZE,
+    DOWNLOAD_WRITE_BUFFER_SIZE,
+    TV,
+    URL_BASE,
+)
 from .coordinator import HacsUpdateCoordinator
 from .data_client import HacsDataClient
 from .enums import (
@@ -734,6 +742,112 @@ class HacsBase:
 
             return None
 
+    async def async_download_file_to_path(
+        self,
+        url: str,
+        file_path: str,
+        *,
+        headers: dict | None = None,
+        keep_url: bool = False,
+        nolog: bool = False,
+        sha256: str | None = None,
+    ) -> str | None:
+        """Stream a download to file_path, and return its sha256 digest.
+
+        Unlike async_download_file the content is never held in memory as a
+        whole, at most DOWNLOAD_WRITE_BUFFER_SIZE is buffered before it is
+        written. The download fails if it is shorter than the announced
+        Content-Length or if its digest does not match sha256. On failure
+        the partial file is removed and None is returned.
+        """
+        if url is None:
+            return None
+
+        if not keep_url and "tags/" in url:
+            url = url.replace("tags/", "")
+
+        self.log.debug("Trying to download %s to %s", url, file_path)
+        timeouts = 0
+
+        while timeouts < 5:
+            digest = hashlib.sha256()
+            file_handler = None
+            try:
+                async with self.session.get(
+                    url=url,
+                    # The total time depends on the size, only stalled reads time out
+                    timeout=ClientTimeout(total=None, sock_connect=60, sock_read=60),
+                    headers=headers,
+                ) as request:
+                    # Make sure that we got a valid result
+                    if request.status != 200:
+                        raise HacsException(
+                            f"Got status code {request.status} when trying to download {url}"
+                        )
+
+                    file_handler = await self.hass.async_add_executor_job(open, file_path, "wb")
+
+                    def _write(data: bytes, file_handler=file_handler, digest=digest) -> None:
+                        file_handler.write(data)
+                        digest.update(data)
+
+                    size = 0
+                    buffer = bytearray()
+                    async for chunk in request.content.iter_chunked(DOWNLOAD_CHUNK_SIZE):
+                        buffer.extend(chunk)
+                        size += len(chunk)
+                        if len(buffer) >= DOWNLOAD_WRITE_BUFFER_SIZE:
+                            await self.hass.async_add_executor_job(_write, bytes(buffer))
+                            buffer.clear()
+                    if buffer:
+                        await self.hass.async_add_executor_job(_write, bytes(buffer))
+                    await self.hass.async_add_executor_job(file_handler.close)
+
+                    # Content-Length is the size of the encoded body, the content is decoded
+                    if (
+                        request.content_length is not None
+                        and hdrs.CONTENT_ENCODING not in request.headers
+                        and size != request.content_length
+                    ):
+                        raise HacsException(
+                            f"Download of {url} is incomplete, "
+                            f"got {size} of {request.content_length} bytes"
+                        )
+                if sha256 is not None and digest.hexdigest() != sha256.lower():
+                    raise HacsException(f"Checksum mismatch for {url}")
+
+                self.log.debug(
+                    "Downloaded %s bytes from %s (sha256 %s)", size, url, digest.hexdigest()
+                )
+                return digest.hexdigest()
+
+            except TimeoutError:
+                self.log.warning(
+                    "A timeout of 60! seconds was encountered while downloading %s, "
+                    "Retrying up to 5 times. Tries left %s",
+                    url,
+                    (4 - timeouts),
+                )
+                timeouts += 1
+                await asyncio.sleep(1)
+                continue
+
+            except (
+                # lgtm [py/catch-base-exception] pylint: disable=broad-except
+                BaseException
+            ) as exception:
+                if not nolog:
+                    self.log.exception("Download failed - %s", exception)
+                break
+
+            finally:
+                if file_handler is not None and not file_handler.closed:
+                    await self.hass.async_add_executor_job(file_handler.close)
+
+        if await async_exists(self.hass, file_path):
+            await self.hass.async_add_executor_job(os.remove, file_path)
+        return None
+
     async def async_recreate_entities(self) -> None:
         """Recreate entities."""
         platforms = [Platform.UPDATE]
@@ -18,6 +18,11 @@ PACKAGE_NAME = "custom_components.hacs"
 DEFAULT_CONCURRENT_TASKS = 15
 DEFAULT_CONCURRENT_BACKOFF_TIME = 1
 
+# Streamed downloads are read in chunks of this size and written to disk
+# once this much is buffered, this bounds the memory used by a download.
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+DOWNLOAD_WRITE_BUFFER_SIZE = 1024 * 1024
+
 HACS_REPOSITORY_ID = "172733314"
 
 HACS_ACTION_GITHUB_API_HEADERS = {
@@ -584,39 +584,41 @@ class HacsRepository:
         validate: Validate,
     ) -> None:
         """Download ZIP archive from repository release."""
+        temp_dir = None
         try:
-            filecontent = await self.hacs.async_download_file(content["url"])
-
-            if filecontent is None:
-                validate.errors.append(f"Failed to download {content['url']}")
-                return
-
             temp_dir = await self.hacs.hass.async_add_executor_job(tempfile.mkdtemp)
             temp_file = f"{temp_dir}/{self.repository_manifest.filename}"
 
-            result = await self.hacs.async_save_file(temp_file, filecontent)
+            # The archive is streamed to the temporary file, never held in memory
+            if (
+                await self.hacs.async_download_file_to_path(
+                    content["url"], temp_file, sha256=content.get("sha256")
+                )
+                is None
+            ):
+                validate.errors.append(f"Failed to download {content['url']}")
+                return
 
             def _extract_zip_file():
+                # Members are extracted one by one and their CRC is checked
                 with zipfile.ZipFile(temp_file, "r") as zip_file:
                     zip_file.extractall(self.content.path.local)
 
             await self.hacs.hass.async_add_executor_job(_extract_zip_file)
 
-            def cleanup_temp_dir():
-                """Cleanup temp_dir."""
-                if os.path.exists(temp_dir):
-                    self.logger.debug("%s Cleaning up %s", self.string, temp_dir)
-                    shutil.rmtree(temp_dir)
-
-            if result:
-                self.logger.info("%s Download of %s completed", self.string, content["name"])
-                await self.hacs.hass.async_add_executor_job(cleanup_temp_dir)
-                return
-
-            validate.errors.append(f"[{content['name']}] was not downloaded")
+            self.logger.info("%s Download of %s completed", self.string, content["name"])
         # lgtm [py/catch-base-exception] pylint: disable=broad-except
         except BaseException:
             validate.errors.append("Download was not completed")
+        finally:
+            if temp_dir is not None:
+                await self.hacs.hass.async_add_executor_job(self._cleanup_temp_dir, temp_dir)
+
+    def _cleanup_temp_dir(self, temp_dir: str) -> None:
+        """Cleanup temp_dir."""
+        if os.path.exists(temp_dir):
+            self.logger.debug("%s Cleaning up %s", self.string, temp_dir)
+            shutil.rmtree(temp_dir)
 
     async def download_content(self, version: string | None = None) -> None:
         """Download the content of a directory."""
@@ -662,26 +664,34 @@ class HacsRepository:
         if not ref:
             raise HacsException("Missing required elements.")
 
-        filecontent = await self.hacs.async_download_file(
-            github_archive(repository=self.data.full_name, version=ref, variant="tags"),
-            keep_url=True,
-            nolog=True,
-        )
+        temp_dir = await self.hacs.hass.async_add_executor_job(tempfile.mkdtemp)
+        try:
+            await self._async_download_and_extract_repository_zip(ref, temp_dir)
+        finally:
+            await self.hacs.hass.async_add_executor_job(self._cleanup_temp_dir, temp_dir)
+        self.logger.info("%s Content was extracted to %s", self.string, self.content.path.local)
 
-        if filecontent is None:
-            filecontent = await self.hacs.async_download_file(
+    async def _async_download_and_extract_repository_zip(self, ref: str, temp_dir: str) -> None:
+        """Stream the zip archive of the repository to temp_dir and extract it."""
+        temp_file = f"{temp_dir}/{self.repository_manifest.filename}"
+
+        if (
+            await self.hacs.async_download_file_to_path(
+                github_archive(repository=self.data.full_name, version=ref, variant="tags"),
+                temp_file,
+                keep_url=True,
+                nolog=True,
+            )
+            is None
+            and await self.hacs.async_download_file_to_path(
                 github_archive(repository=self.data.full_name, version=ref, variant="heads"),
+                temp_file,
                 keep_url=True,
             )
-        if filecontent is None:
+            is None
+        ):
             raise HacsException(f"[{self}] Failed to download zipball")
 
-        temp_dir = await self.hacs.hass.async_add_executor_job(tempfile.mkdtemp)
-        temp_file = f"{temp_dir}/{self.repository_manifest.filename}"
-        result = await self.hacs.async_save_file(temp_file, filecontent)
-        if not result:
-            raise HacsException("Could not save ZIP file")
-
         def _extract_zip_file():
             with zipfile.ZipFile(temp_file, "r") as zip_file:
                 extractable = []
@@ -703,15 +713,6 @@ class HacsRepository:
 
         await self.hacs.hass.async_add_executor_job(_extract_zip_file)
 
-        def cleanup_temp_dir():
-            """Cleanup temp_dir."""
-            if os.path.exists(temp_dir):
-                self.logger.debug("%s Cleaning up %s", self.string, temp_dir)
-                shutil.rmtree(temp_dir)
-
-        await self.hacs.hass.async_add_executor_job(cleanup_temp_dir)
-        self.logger.info("%s Content was extracted to %s", self.string, self.content.path.local)
-
     async def async_get_hacs_json(self, ref: str = None) -> dict[str, Any] | None:
         """Get the content of the hacs.json file."""
         try:
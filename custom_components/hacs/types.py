@@ -1,6 +1,6 @@
 """Custom HACS types."""
 
-from typing import TypedDict
+from typing import NotRequired, TypedDict
 
 
 class DownloadableContent(TypedDict):
@@ -8,3 +8,4 @@ class DownloadableContent(TypedDict):
 
     url: str
     name: str
+    sha256: NotRequired[str]
@@ -2,11 +2,13 @@
 
 from __future__ import annotations
 
+import errno
 import os
 import shutil
 import tempfile
-from time import sleep
+from time import monotonic
 from typing import TYPE_CHECKING
+from uuid import uuid4
 
 from .path import is_safe
 
@@ -17,6 +19,49 @@ if TYPE_CHECKING:
 
 DEFAULT_BACKUP_PATH = f"{tempfile.gettempdir()}/hacs_backup/"
 
+# Backups are moved here instead of the temp dir when the temp dir is on
+# another filesystem than the config dir, so they can be renamed.
+SAME_DEVICE_BACKUP_DIR = ".hacs_backup"
+
+
+def _remove(path: str) -> None:
+    """Remove a file or a directory.
+
+    A directory is first renamed to a hidden sibling, so its name is free as
+    soon as this returns, even on filesystems where deleting the content is
+    not immediately visible.
+    """
+    if os.path.isfile(path) or os.path.islink(path):
+        os.remove(path)
+        return
+    head, tail = os.path.split(path.rstrip("/"))
+    tombstone = os.path.join(head, f".{tail}.{uuid4().hex}.removed")
+    try:
+        os.rename(path, tombstone)
+    except OSError:
+        tombstone = path
+    shutil.rmtree(tombstone)
+
+
+def _move(source: str, destination: str) -> bool:
+    """Move source to destination, which must not exist.
+
+    Return True if it was an atomic rename, False if it was copied because
+    they are on different filesystems.
+    """
+    try:
+        os.rename(source, destination)
+        return True
+    except OSError as exception:
+        if exception.errno != errno.EXDEV:
+            raise
+    if os.path.isfile(source):
+        shutil.copyfile(source, destination)
+    else:
+        shutil.copytree(source, destination)
+    _remove(source)
+    return False
+
 
 class Backup:
     """Backup."""
@@ -41,39 +86,47 @@ class Backup:
             )
         self.backup_path_full = f"{self.backup_path}{self.local_path.split('/')[-1]}"
 
+    def _use_same_device_backup_path(self) -> None:
+        """Move the backup path next to the config dir if the temp dir is on another filesystem."""
+        temp_dir = tempfile.gettempdir()
+        config_path = self.hacs.core.config_path
+        if config_path is None or not self.backup_path.startswith(temp_dir):
+            return
+        parent = os.path.dirname(self.local_path.rstrip("/"))
+        if os.stat(parent).st_dev == os.stat(temp_dir).st_dev:
+            return
+        if os.stat(parent).st_dev != os.stat(config_path).st_dev:
+            return
+        same_device_path = os.path.join(config_path, SAME_DEVICE_BACKUP_DIR)
+        self.backup_path = same_device_path + self.backup_path[len(temp_dir) :]
+        self.backup_path_full = same_device_path + self.backup_path_full[len(temp_dir) :]
+
     def _init_backup_dir(self) -> bool:
         """Init backup dir."""
         if not os.path.exists(self.local_path):
             return False
         if not is_safe(self.hacs, self.local_path):
             return False
+        self._use_same_device_backup_path()
         if os.path.exists(self.backup_path):
-            shutil.rmtree(self.backup_path)
-
-            # Wait for the folder to be removed
-            while os.path.exists(self.backup_path):
-                sleep(0.1)
+            _remove(self.backup_path)
         os.makedirs(self.backup_path, exist_ok=True)
         return True
 
     def create(self) -> None:
-        """Create a backup in /tmp"""
+        """Create a backup by moving the content out of the way"""
         if not self._init_backup_dir():
             return
 
         try:
-            if os.path.isfile(self.local_path):
-                shutil.copyfile(self.local_path, self.backup_path_full)
-                os.remove(self.local_path)
-            else:
-                shutil.copytree(self.local_path, self.backup_path_full)
-                shutil.rmtree(self.local_path)
-                while os.path.exists(self.local_path):
-                    sleep(0.1)
+            start = monotonic()
+            renamed = _move(self.local_path, self.backup_path_full)
             self.hacs.log.debug(
-                "Backup for %s, created in %s",
+                "Backup for %s, created in %s (%s in %.3fs)",
                 self.local_path,
                 self.backup_path_full,
+                "renamed" if renamed else "copied",
+                monotonic() - start,
             )
         except (
             BaseException  # lgtm [py/catch-base-exception] pylint: disable=broad-except
@@ -85,26 +138,23 @@ class Backup:
         if not os.path.exists(self.backup_path_full):
             return
 
-        if os.path.isfile(self.backup_path_full):
-            if os.path.exists(self.local_path):
-                os.remove(self.local_path)
-            shutil.copyfile(self.backup_path_full, self.local_path)
-        else:
-            if os.path.exists(self.local_path):
-                shutil.rmtree(self.local_path)
-                while os.path.exists(self.local_path):
-                    sleep(0.1)
-            shutil.copytree(self.backup_path_full, self.local_path)
-        self.hacs.log.debug("Restored %s, from backup %s", self.local_path, self.backup_path_full)
+        start = monotonic()
+        if os.path.exists(self.local_path):
+            _remove(self.local_path)
+        os.makedirs(os.path.dirname(self.local_path.rstrip("/")), exist_ok=True)
+        renamed = _move(self.backup_path_full, self.local_path)
+        self.hacs.log.debug(
+            "Restored %s, from backup %s (%s in %.3fs)",
+            self.local_path,
+            self.backup_path_full,
+            "renamed" if renamed else "copied",
+            monotonic() - start,
+        )
 
     def cleanup(self) -> None:
         """Cleanup backup files."""
         if not os.path.exists(self.backup_path):
             return
 
-        shutil.rmtree(self.backup_path)
-
-        # Wait for the folder to be removed
-        while os.path.exists(self.backup_path):
-            sleep(0.1)
+        _remove(self.backup_path)
         self.hacs.log.debug("Backup dir %s cleared", self.backup_path)
@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import asyncio
+from copy import deepcopy
 from datetime import UTC, datetime
 from typing import Any
 
@@ -15,7 +16,19 @@ from ..enums import HacsDisabledReason, HacsDispatchEvent
 from ..repositories.base import TOPIC_FILTER, HacsManifest, HacsRepository
 from .logger import LOGGER
 from .path import is_safe
-from .store import async_load_from_store, async_save_to_store
+from .store import (
+    async_load_from_store,
+    async_save_to_store,
+    get_store_for_key,
+)
+
+# Repositories changed since the last full write are saved to this journal
+# store, which is replayed over the "repositories" store when restoring.
+JOURNAL_STORE_KEY = "repositories.journal"
+# The journal is compacted into the full stores once it holds this many
+# entries, or this share of all repositories if that is larger.
+JOURNAL_COMPACT_MIN_ENTRIES = 100
+JOURNAL_COMPACT_RATIO = 0.1
 
 EXPORTED_BASE_DATA = (
     ("new", False),
@@ -63,6 +76,14 @@ class HacsData:
         self.logger = LOGGER
         self.hacs = hacs
         self.content = {}
+        # Repository data as it is on disk (full store + journal),
+        # None until a full write or a restore has been done.
+        self._persisted: dict[str, dict] | None = None
+        # Entries written to the journal since the last compaction,
+        # None marks a removed repository.
+        self._journal: dict[str, dict | None] = {}
+        self._write_lock = asyncio.Lock()
+        self._compact_task: asyncio.Task | None = None
 
     async def async_force_write(self, _=None):
         """Force write."""
@@ -85,34 +106,98 @@ class HacsData:
                 "ignored_repositories": self.hacs.common.ignored_repositories,
             },
         )
-        await self._async_store_experimental_content_and_repos()
-        await self._async_store_content_and_repos()
+        await self._async_store_content_and_repos(compact=force)
+
+    async def _async_store_content_and_repos(self, _=None, compact: bool = False):  # bb: ignore
+        """Store the repositories that changed since the last write.
+
+        Changed and removed repositories are appended to the journal store, the
+        full stores are only rewritten when the journal is compacted.
+        """
+        async with self._write_lock:
+            # Built under the lock into a local dict, a compaction running
+            # between two writes must not change what is diffed.
+            content: dict[str, dict] = {}
+            for repository in self.hacs.repositories.list_all:
+                if repository.data.category in self.hacs.common.categories:
+                    self.async_store_repository_data(repository, content)
+            self.content = content
+
+            if not self._persisted:
+                compact = True
+            else:
+                changes: dict[str, dict | None] = {
+                    entry: deepcopy(data)
+                    for entry, data in content.items()
+                    if self._persisted.get(entry) != data
+                }
+                changes.update({entry: None for entry in self._persisted if entry not in content})
+                if changes:
+                    self.logger.debug(
+                        "<HacsData async_write> Journaling %s changed repositories", len(changes)
+                    )
+                    for entry, data in changes.items():
+                        if data is None:
+                            self._persisted.pop(entry, None)
+                        else:
+                            self._persisted[entry] = data
+                    self._journal.update(changes)
+                    await get_store_for_key(self.hacs.hass, JOURNAL_STORE_KEY).async_save(
+                        dict(self._journal)
+                    )
 
-    async def _async_store_content_and_repos(self, _=None):  # bb: ignore
-        """Store the main repos file and each repo that is out of date."""
-        # Repositories
-        self.content = {}
-        for repository in self.hacs.repositories.list_all:
-            if repository.data.category in self.hacs.common.categories:
-                self.async_store_repository_data(repository)
+            if compact:
+                if not self._persisted:
+                    self._persisted = deepcopy(content)
+                await self._async_compact()
+            elif len(self._journal) >= max(
+                JOURNAL_COMPACT_MIN_ENTRIES, len(self._persisted) * JOURNAL_COMPACT_RATIO
+            ) and (self._compact_task is None or self._compact_task.done()):
+                self._compact_task = self.hacs.hass.async_create_background_task(
+                    self._async_compact_locked(), "hacs_data_compact"
+                )
 
-        await async_save_to_store(self.hacs.hass, "repositories", self.content)
         for event in (HacsDispatchEvent.REPOSITORY, HacsDispatchEvent.CONFIG):
             self.hacs.async_dispatch(event, {})
 
+    async def _async_compact_locked(self) -> None:
+        """Compact the journal in the background."""
+        async with self._write_lock:
+            await self._async_compact()
+
+    async def _async_compact(self) -> None:
+        """Rewrite the full stores from the persisted data and drop the journal.
+
+        Must be called with the write lock held. The journal is only removed
+        once the full store is written, so an interrupted compaction replays
+        entries that are already in the full store, which is harmless.
+        """
+        self.logger.debug(
+            "<HacsData async_write> Compacting %s journal entries into %s repositories",
+            len(self._journal),
+            len(self._persisted),
+        )
+        await get_store_for_key(self.hacs.hass, "repositories").async_save(dict(self._persisted))
+        await self._async_store_experimental_content_and_repos()
+        if self._journal:
+            self._journal = {}
+            await get_store_for_key(self.hacs.hass, JOURNAL_STORE_KEY).async_remove()
+
     async def _async_store_experimental_content_and_repos(self, _=None):
         """Store the main repos file and each repo that is out of date."""
         # Repositories
-        self.content = {}
+        content: dict[str, list[dict]] = {}
         for repository in self.hacs.repositories.list_all:
             if repository.data.category in self.hacs.common.categories:
-                self.async_store_experimental_repository_data(repository)
+                self.async_store_experimental_repository_data(repository, content)
 
-        await async_save_to_store(self.hacs.hass, "data", {"repositories": self.content})
+        await async_save_to_store(self.hacs.hass, "data", {"repositories": content})
 
     @callback
-    def async_store_repository_data(self, repository: HacsRepository) -> dict:
-        """Store the repository data."""
+    def async_store_repository_data(
+        self, repository: HacsRepository, content: dict[str, dict] | None = None
+    ) -> dict:
+        """Store the repository data, in self.content unless content is given."""
         data = {"repository_manifest": repository.repository_manifest.manifest}
 
         for key, default in (
@@ -128,13 +213,22 @@ class HacsData:
         if repository.data.last_fetched:
             data["last_fetched"] = repository.data.last_fetched.timestamp()
 
-        self.content[str(repository.data.id)] = data
+        if content is None:
+            content = self.content
+        content[str(repository.data.id)] = data
 
     @callback
-    def async_store_experimental_repository_data(self, repository: HacsRepository) -> None:
-        """Store the experimental repository data for non downloaded repositories."""
+    def async_store_experimental_repository_data(
+        self, repository: HacsRepository, content: dict[str, list[dict]] | None = None
+    ) -> None:
+        """Store the experimental repository data for non downloaded repositories.
+
+        The data is stored in self.content unless content is given.
+        """
+        if content is None:
+            content = self.content
         data = {}
-        self.content.setdefault(repository.data.category, [])
+        content.setdefault(repository.data.category, [])
 
         if repository.data.installed:
             data["repository_manifest"] = repository.repository_manifest.manifest
@@ -151,7 +245,7 @@ class HacsData:
                 if (value := getattr(repository.data, key, default)) != default:
                     data[key] = value
 
-        self.content[repository.data.category].append({"id": str(repository.data.id), **data})
+        content[repository.data.category].append({"id": str(repository.data.id), **data})
 
     async def restore(self):
         """Restore saved data."""
@@ -165,11 +259,22 @@ class HacsData:
             pass
 
         try:
-            repositories = await async_load_from_store(self.hacs.hass, "repositories")
+            repositories, journal = await asyncio.gather(
+                async_load_from_store(self.hacs.hass, "repositories"),
+                async_load_from_store(self.hacs.hass, JOURNAL_STORE_KEY),
+            )
             if not repositories and (data := await async_load_from_store(self.hacs.hass, "data")):
                 for category, entries in data.get("repositories", {}).items():
                     for repository in entries:
                         repositories[repository["id"]] = {"category": category, **repository}
+            for entry, repo_data in journal.items():
+                if repo_data is None:
+                    repositories.pop(entry, None)
+                else:
+                    repositories[entry] = repo_data
+            # Restored repositories keep references to parts of the loaded data
+            self._persisted = deepcopy(repositories)
+            self._journal = journal
 
         except HomeAssistantError as exception:
             self.hacs.log.error(
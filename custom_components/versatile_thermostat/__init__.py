@@ -41,6 +41,11 @@ EMA_PARAM_SCHEMA = {
     vol.Required("precision"): cv.positive_int,
 }
 
+STATE_PUBLISH_PARAM_SCHEMA = {
+    vol.Optional("precision", default=2): cv.positive_int,
+    vol.Optional("coalesce_sec", default=30): vol.All(vol.Coerce(float), vol.Range(min=0)),
+}
+
 SAFETY_MODE_PARAM_SCHEMA = {
     vol.Required("check_outdoor_sensor"): bool,
 }
@@ -54,6 +59,8 @@ CONFIG_SCHEMA = vol.Schema(
                 CONF_SAFETY_MODE: vol.Schema(SAFETY_MODE_PARAM_SCHEMA),
                 vol.Optional(CONF_MAX_ON_PERCENT): vol.Coerce(float),
                 vol.Optional(CONF_LOG_BUFFER_MAX_AGE_HOURS, default=DEFAULT_MAX_AGE_HOURS): cv.positive_int,
+                vol.Optional(CONF_SHARED_CYCLE_CLOCK, default=False): cv.boolean,
+                vol.Optional(CONF_STATE_PUBLISH_PARAMS): vol.Schema(STATE_PUBLISH_PARAM_SCHEMA),
             }
         ),
     },
@@ -6,6 +6,7 @@ import json
 import os
 import math
 import statistics
+import time
 from datetime import datetime, timedelta
 from typing import Optional
 from homeassistant.util.unit_conversion import TemperatureConverter
@@ -32,11 +33,18 @@ from .const import (
     CONF_AUTO_TPI_COOLING_POWER,
 )
 from .vtherm_central_api import VersatileThermostatAPI
+from .capacity_estimator import CapacityEstimator, CAPACITY_ESTIMATOR_MIN_POWER
 
 _LOGGER = get_vtherm_logger(__name__)
 
 STORAGE_VERSION = 8
+# Legacy: one store per thermostat, migrated into the shared store on load
 STORAGE_KEY_PREFIX = "versatile_thermostat.auto_tpi"
+# One store holding the learning state of every thermostat, by unique_id
+SHARED_STORAGE_VERSION = 1
+SHARED_STORAGE_KEY = "versatile_thermostat.auto_tpi_states"
+SHARED_STORE_DATA_KEY = "versatile_thermostat_auto_tpi_store"
+SHARED_STORE_SAVE_DELAY = 30  # seconds. Learning steps in this delay are written once
 
 # Configurable constants for learning algorithm behavior
 MIN_KINT = 0.01  # Minimum Kint threshold to maintain temperature responsiveness
@@ -153,6 +161,87 @@ class AutoTpiState:
         return instance
 
 
+class AutoTpiStore:
+    """Shared store for the Auto TPI learning state of all thermostats.
+
+    The whole file is loaded once at startup for every thermostat. Saves only mark
+    the thermostat as dirty and schedule one delayed write: the states of the dirty
+    thermostats are serialized when the file is written, the other ones are reused.
+    """
+
+    def __init__(self, hass: HomeAssistant):
+        self._store = Store(hass, SHARED_STORAGE_VERSION, SHARED_STORAGE_KEY)
+        self._data: dict[str, dict] | None = None
+        self._dirty: dict[str, Callable[[], dict]] = {}
+        self._load_lock = asyncio.Lock()
+        self.stats = {"load_ms": 0.0, "thermostats": 0, "save_requests": 0, "writes": 0, "states_written": 0}
+
+    @classmethod
+    def get(cls, hass: HomeAssistant) -> "AutoTpiStore":
+        """Get the store shared by all thermostats of this hass instance"""
+        # Not in hass.data[DOMAIN] which is dropped with the last entry, while a write can still be pending
+        store = hass.data.get(SHARED_STORE_DATA_KEY)
+        if store is None:
+            store = hass.data[SHARED_STORE_DATA_KEY] = cls(hass)
+        return store
+
+    async def _async_ensure_loaded(self) -> dict[str, dict]:
+        """Load every learning state at first use"""
+        async with self._load_lock:
+            if self._data is None:
+                start = time.perf_counter()
+                self._data = await self._store.async_load() or {}
+                self.stats["load_ms"] = round((time.perf_counter() - start) * 1000, 1)
+                self.stats["thermostats"] = len(self._data)
+                _LOGGER.info("Auto TPI: loaded the learning states of %d thermostats in %.1f ms", len(self._data), self.stats["load_ms"])
+        return self._data
+
+    async def async_load(self, unique_id: str) -> dict | None:
+        """Get the persisted learning state of a thermostat"""
+        data = await self._async_ensure_loaded()
+        # A pending state (of the previous manager of a reloaded thermostat) is newer than the persisted one
+        state_func = self._dirty.pop(unique_id, None)
+        if state_func is not None:
+            data[unique_id] = state_func()
+        return data.get(unique_id)
+
+    async def async_delay_save(self, unique_id: str, state_func: Callable[[], dict]):
+        """Schedule the save of a thermostat state. state_func is called at write time"""
+        await self._async_ensure_loaded()
+        self._dirty[unique_id] = state_func
+        self.stats["save_requests"] += 1
+        self._store.async_delay_save(self._data_to_save, SHARED_STORE_SAVE_DELAY)
+
+    @callback
+    def async_set_state(self, unique_id: str, state: dict):
+        """Replace the state of a thermostat and schedule the write. Used when its manager is torn down,
+        so that the store no longer calls back into the old manager"""
+        if self._data is None:
+            return
+        self._dirty.pop(unique_id, None)
+        self._data[unique_id] = state
+        self.stats["save_requests"] += 1
+        self._store.async_delay_save(self._data_to_save, SHARED_STORE_SAVE_DELAY)
+
+    async def async_save_now(self, unique_id: str, state: dict):
+        """Save a thermostat state immediately. Used by the migration, before the old store is removed"""
+        data = await self._async_ensure_loaded()
+        self._dirty.pop(unique_id, None)
+        data[unique_id] = state
+        await self._store.async_save(self._data_to_save())
+
+    @callback
+    def _data_to_save(self) -> dict[str, dict]:
+        """Serialize the dirty states and return the whole data"""
+        for unique_id, state_func in self._dirty.items():
+            self._data[unique_id] = state_func()
+        self.stats["writes"] += 1
+        self.stats["states_written"] += len(self._dirty)
+        _LOGGER.debug("Auto TPI: writing learning states, %d changed of %d", len(self._dirty), len(self._data))
+        self._dirty.clear()
+        return self._data
+
+
 class AutoTpiManager:
     """Auto TPI Manager implementing TPI algorithm."""
 
@@ -216,8 +305,7 @@ class AutoTpiManager:
         self._last_notified_coef_int: Optional[float] = None
         self._last_notified_coef_ext: Optional[float] = None
 
-        storage_key = f"{STORAGE_KEY_PREFIX}.{unique_id.replace('.', '_')}"
-        self._store = Store(hass, STORAGE_VERSION, storage_key)
+        self._store = AutoTpiStore.get(hass)
         # Convert config coefficients (User Unit) to Internal (Celsius)
         # K_C = K_F * 1.8
         self._default_coef_int = (coef_int if coef_int is not None else 0.6) * self._unit_factor
@@ -247,6 +335,9 @@ class AutoTpiManager:
         # Shutdown safety check
         self._is_vtherm_stopping_callback: Callable[[], bool] | None = None
 
+        # Live (slope, power) samples for an instant capacity calibration
+        self._capacity_estimator = CapacityEstimator(name)
+
     def get_filtered_state(self) -> dict:
         """Get the AutoTpiState as a dict, but filtered for public exposure."""
         data = self.state.to_dict()
@@ -478,12 +569,29 @@ class AutoTpiManager:
         }
 
     async def async_save_data(self):
-        """Save data."""
-        await self._store.async_save(self.state.to_dict())
+        """Save data. The write is delayed and shared with the other thermostats"""
+        await self._store.async_delay_save(self._unique_id, lambda: self.state.to_dict())
+
+    @callback
+    def async_flush_data(self):
+        """Store the current state at once (the write is still delayed). Called when the thermostat is removed"""
+        self._store.async_set_state(self._unique_id, self.state.to_dict())
 
     async def async_load_data(self):
         """Load data."""
-        data = await self._store.async_load()
+        data = await self._store.async_load(self._unique_id)
+
+        if not data:
+            # Try to migrate from the per-thermostat store
+            legacy_store = Store(self._hass, STORAGE_VERSION, f"{STORAGE_KEY_PREFIX}.{self._unique_id.replace('.', '_')}")
+            try:
+                data = await legacy_store.async_load()
+                if data:
+                    _LOGGER.debug("%s - Auto TPI: Migrating from per-thermostat storage", self._name)
+                    await self._store.async_save_now(self._unique_id, data)
+                    await legacy_store.async_remove()
+            except Exception as e:
+                _LOGGER.error("%s - Auto TPI: Migration error: %s", self._name, e)
 
         if not data:
             # Try to migrate from old JSON file
@@ -496,7 +604,7 @@ class AutoTpiManager:
                         old_json = json.load(f)
                     # Extract state from old format
                     data = old_json.get("state", old_json)
-                    await self._store.async_save(data)  # Save to new format
+                    await self._store.async_save_now(self._unique_id, data)  # Save to new format
                     os.remove(old_path)  # Clean up old file
                 except Exception as e:
                     _LOGGER.error("%s - Auto TPI: Migration error: %s", self._name, e)
@@ -650,6 +758,18 @@ class AutoTpiManager:
 
         return self.calculate_power(self._current_target_temp, self._current_temp_in, self._current_temp_out, calc_state_str)
 
+    def record_capacity_sample(self, temperature_slope: float | None, power_percent: float | None):
+        """Record the current temperature slope and power percent for the capacity calibration.
+
+        This method is called at each control_heating cycle, after update().
+        The values are the ones published by the temperature_slope and power_percent sensors.
+        """
+        delta_t = None
+        if self._current_hvac_mode == "heat":
+            # Back to the user unit, like the slope
+            delta_t = (self._current_temp_in - self._current_temp_out) * self._unit_factor
+        self._capacity_estimator.add_sample(dt_util.utcnow(), temperature_slope, power_percent, delta_t)
+
     async def calculate(self) -> Optional[dict]:
         """Calculate TPI parameters, using aggressive coefficients during bootstrap."""
 
@@ -2122,6 +2242,7 @@ class AutoTpiManager:
         kext_coeff: float = 0.0,
         current_indoor_temp: Optional[float] = None,
         current_outdoor_temp: Optional[float] = None,
+        matched_samples: Optional[list] = None,
     ) -> dict:
         """
         Calculate ADIABATIC capacity using temperature_slope and power_percent sensor histories.
@@ -2140,6 +2261,8 @@ class AutoTpiManager:
             kext_coeff: Current Kext coefficient for adiabatic correction
             current_indoor_temp: Current indoor temperature for delta_T estimation
             current_outdoor_temp: Current outdoor temperature for delta_T estimation
+            matched_samples: If given, receives the (datetime, slope, power) heating samples
+                             usable by the capacity estimator, whatever the threshold
 
         Returns:
             Dictionary with adiabatic capacity result and metrics
@@ -2191,6 +2314,9 @@ class AutoTpiManager:
                     rejected_invalid += 1
                     continue
 
+                if matched_samples is not None and slope_value > 0 and power >= CAPACITY_ESTIMATOR_MIN_POWER:
+                    matched_samples.append((slope_dt, slope_value, power))
+
                 # Check power threshold
                 if power < power_threshold_percent:
                     rejected_low_power += 1
@@ -2225,9 +2351,47 @@ class AutoTpiManager:
                 "rejection_stats": {"low_power": rejected_low_power, "wrong_direction": rejected_wrong_direction, "invalid": rejected_invalid},
             }
 
-        # Remove outliers
-        filtered_slopes = self._remove_outliers_iqr(raw_slopes)
-        outliers_removed = len(raw_slopes) - len(filtered_slopes)
+        # Period calculation (in days)
+        period_days = 0.0
+        if slope_history:
+            try:
+                timestamps = [s.last_changed for s in slope_history]
+                if timestamps:
+                    start_date = min(timestamps)
+                    end_date = max(timestamps)
+                    period_days = (end_date - start_date).total_seconds() / 86400.0
+            except (AttributeError, TypeError):
+                pass
+
+        return self._calculate_capacity_from_slopes(
+            sorted(raw_slopes),
+            period_days,
+            min_power_threshold=min_power_threshold,
+            kext_coeff=kext_coeff,
+            current_indoor_temp=current_indoor_temp,
+            current_outdoor_temp=current_outdoor_temp,
+        )
+
+    def _calculate_capacity_from_slopes(
+        self,
+        sorted_slopes: list[float],
+        period_days: float,
+        min_power_threshold: float,
+        kext_coeff: float = 0.0,
+        current_indoor_temp: Optional[float] = None,
+        current_outdoor_temp: Optional[float] = None,
+    ) -> dict:
+        """
+        Calculate ADIABATIC capacity from the matched heating slopes, sorted ascending.
+
+        Shared by the history calibration and the capacity estimator. Removes the IQR outliers,
+        takes the 75th percentile and adds the Kext compensation.
+        """
+        raw_count = len(sorted_slopes)
+
+        # Remove outliers. The input is sorted so the kept slopes are sorted too
+        filtered_slopes = self._remove_outliers_iqr(sorted_slopes)
+        outliers_removed = raw_count - len(filtered_slopes)
 
         _LOGGER.debug("%s - Capacity Calibration: Removed %d outliers, %d samples remaining", self._name, outliers_removed, len(filtered_slopes))
 
@@ -2236,17 +2400,16 @@ class AutoTpiManager:
                 "success": False,
                 "error": f"Not enough samples after outlier removal ({len(filtered_slopes)} remaining)",
                 "samples_used": len(filtered_slopes),
-                "samples_before_filter": len(raw_slopes),
+                "samples_before_filter": raw_count,
             }
 
         # Calculate 75th percentile (biases toward adiabatic - higher values)
         # Higher slopes = less heat loss = closer to adiabatic
-        sorted_slopes = sorted(filtered_slopes)
-        n = len(sorted_slopes)
+        n = len(filtered_slopes)
 
         # 75th percentile index
         p75_idx = int(0.75 * (n - 1))
-        observed_capacity = sorted_slopes[p75_idx]
+        observed_capacity = filtered_slopes[p75_idx]
 
         # Estimate average delta_T for Kext compensation
         # When power is at 100%, we typically have a significant delta_T
@@ -2288,18 +2451,6 @@ class AutoTpiManager:
         variance_factor = max(0.0, 1.0 - (cv / 2.0))  # Lower if high variance
         reliability = 100.0 * sample_factor * variance_factor
 
-        # Period calculation (in days)
-        period_days = 0.0
-        if slope_history:
-            try:
-                timestamps = [s.last_changed for s in slope_history]
-                if timestamps:
-                    start_date = min(timestamps)
-                    end_date = max(timestamps)
-                    period_days = (end_date - start_date).total_seconds() / 86400.0
-            except (AttributeError, TypeError):
-                pass
-
         _LOGGER.info(
             "%s - Capacity Calibration: Adiabatic Capacity=%.3f °C/h (observed=%.3f + Kext×ΔT=%.3f), Reliability=%.1f%%, Samples=%d",
             self._name,
@@ -2317,13 +2468,91 @@ class AutoTpiManager:
             "kext_compensation": round(kext_compensation, 3),
             "avg_delta_t": round(avg_delta_t, 1),
             "samples_used": len(filtered_slopes),
-            "samples_before_filter": len(raw_slopes),
+            "samples_before_filter": raw_count,
             "outliers_removed": outliers_removed,
             "reliability": round(reliability, 1),
             "min_power_threshold": min_power_threshold,
             "period": round(period_days, 1),
         }
 
+    async def _calibrate_capacity_from_history(
+        self,
+        slope_sensor_id: str,
+        power_sensor_id: str,
+        start_time: datetime,
+        end_time: datetime,
+        min_power_threshold: float,
+        kext_coeff: float,
+        current_indoor_temp: Optional[float],
+        current_outdoor_temp: Optional[float],
+        seed_estimator: bool,
+    ) -> dict:
+        """
+        Fetch the temperature_slope and power_percent histories and calculate the capacity from them.
+
+        If seed_estimator is set and the whole history could be fetched, the matched samples
+        seed the capacity estimator, so the next calibrations do not need the history anymore.
+        """
+        # Fetch sensor histories in chunks to avoid timeouts and cope with gaps
+        entity_ids = [slope_sensor_id, power_sensor_id]
+        slope_history = []
+        power_history = []
+        fetch_failed = False
+
+        # We use 2-day chunks for robustness
+        chunk_delta = timedelta(days=2)
+        current_start = start_time
+
+        while current_start < end_time:
+            current_end = min(current_start + chunk_delta, end_time)
+            _LOGGER.debug("%s - Fetching history chunk from %s to %s", self._name, current_start, current_end)
+
+            try:
+                chunk_states = await get_instance(self._hass).async_add_executor_job(
+                    partial(
+                        history.get_significant_states,
+                        self._hass,
+                        current_start,
+                        end_time=current_end,
+                        entity_ids=entity_ids,
+                        significant_changes_only=False,
+                    )
+                )
+
+                if chunk_states:
+                    slope_history.extend(chunk_states.get(slope_sensor_id, []))
+                    power_history.extend(chunk_states.get(power_sensor_id, []))
+
+            except Exception as e:
+                _LOGGER.warning("%s - Error fetching history chunk %s to %s: %s", self._name, current_start, current_end, e)
+                fetch_failed = True
+
+            current_start = current_end
+
+        _LOGGER.debug("%s - Fetched %d slope sensor states and %d power sensor states for capacity calibration.", self._name, len(slope_history), len(power_history))
+
+        # Check if sensors exist
+        if not slope_history:
+            _LOGGER.warning("%s - No history found for slope sensor '%s'. " "Make sure the sensor exists and has history enabled in recorder.", self._name, slope_sensor_id)
+        if not power_history:
+            _LOGGER.warning("%s - No history found for power sensor '%s'. " "Make sure the sensor exists and has history enabled in recorder.", self._name, power_sensor_id)
+
+        matched_samples = [] if seed_estimator else None
+        result = await self.calculate_capacity_from_slope_sensor(
+            slope_history,
+            power_history,
+            min_power_threshold=min_power_threshold,
+            kext_coeff=kext_coeff,
+            current_indoor_temp=current_indoor_temp,
+            current_outdoor_temp=current_outdoor_temp,
+            matched_samples=matched_samples,
+        )
+
+        if seed_estimator and not fetch_failed:
+            self._capacity_estimator.seed(matched_samples, start_time, end_time)
+
+        return result
+
     async def service_calibrate_capacity(
         self,
         thermostat_entity_id: str,
@@ -2339,7 +2568,8 @@ class AutoTpiManager:
 
         NEW ALGORITHM:
         1. Derives slope and power sensor entity IDs from thermostat entity ID
-        2. Fetches history for both sensors
+        2. Fetches history for both sensors, unless the capacity estimator already
+           holds the samples of the requested (default) period
         3. Matches points where power >= threshold and slope direction is correct
         4. Removes outliers and calculates median as Capacity
 
@@ -2387,49 +2617,7 @@ class AutoTpiManager:
             _LOGGER.debug("%s - Converting min_power_threshold from %.1f to %.2f", self._name, min_power_threshold, min_power_threshold / 100.0)
             min_power_threshold = min_power_threshold / 100.0
 
-        # 4. Fetch sensor histories in chunks to avoid timeouts and cope with gaps
-        entity_ids = [slope_sensor_id, power_sensor_id]
-        slope_history = []
-        power_history = []
-
-        # We use 2-day chunks for robustness
-        chunk_delta = timedelta(days=2)
-        current_start = start_time
-
-        while current_start < end_time:
-            current_end = min(current_start + chunk_delta, end_time)
-            _LOGGER.debug("%s - Fetching history chunk from %s to %s", self._name, current_start, current_end)
-
-            try:
-                chunk_states = await get_instance(self._hass).async_add_executor_job(
-                    partial(
-                        history.get_significant_states,
-                        self._hass,
-                        current_start,
-                        end_time=current_end,
-                        entity_ids=entity_ids,
-                        significant_changes_only=False,
-                    )
-                )
-
-                if chunk_states:
-                    slope_history.extend(chunk_states.get(slope_sensor_id, []))
-                    power_history.extend(chunk_states.get(power_sensor_id, []))
-
-            except Exception as e:
-                _LOGGER.warning("%s - Error fetching history chunk %s to %s: %s", self._name, current_start, current_end, e)
-
-            current_start = current_end
-
-        _LOGGER.debug("%s - Fetched %d slope sensor states and %d power sensor states for capacity calibration.", self._name, len(slope_history), len(power_history))
-
-        # Check if sensors exist
-        if not slope_history:
-            _LOGGER.warning("%s - No history found for slope sensor '%s'. " "Make sure the sensor exists and has history enabled in recorder.", self._name, slope_sensor_id)
-        if not power_history:
-            _LOGGER.warning("%s - No history found for power sensor '%s'. " "Make sure the sensor exists and has history enabled in recorder.", self._name, power_sensor_id)
-
-        # 5. Get Kext from HA config (not learned value) for adiabatic correction
+        # 4. Get Kext from HA config (not learned value) for adiabatic correction
         kext_coeff = self._default_coef_ext
 
         # Get current temperatures from thermostat for delta_T estimation
@@ -2461,15 +2649,37 @@ class AutoTpiManager:
             current_outdoor_temp if current_outdoor_temp else 0,
         )
 
-        # 6. Call calculation method with adiabatic correction
-        result = await self.calculate_capacity_from_slope_sensor(
-            slope_history,
-            power_history,
-            min_power_threshold=min_power_threshold,
-            kext_coeff=kext_coeff,
-            current_indoor_temp=current_indoor_temp,
-            current_outdoor_temp=current_outdoor_temp,
-        )
+        # 5. Without an explicit period, the capacity estimator holds the matched samples of the last 30 days
+        use_estimator = start_date is None and end_date is None
+        slopes = self._capacity_estimator.get_slopes(min_power_threshold * 100.0, start_time) if use_estimator else None
+        if slopes is not None and len(slopes) >= 2:
+            _LOGGER.debug("%s - Calibrating capacity from %d samples of the capacity estimator", self._name, len(slopes))
+            result = self._calculate_capacity_from_slopes(
+                slopes,
+                self._capacity_estimator.period_days,
+                min_power_threshold=min_power_threshold,
+                kext_coeff=kext_coeff,
+                current_indoor_temp=current_indoor_temp,
+                current_outdoor_temp=current_outdoor_temp,
+            )
+        else:
+            result = await self._calibrate_capacity_from_history(
+                slope_sensor_id,
+                power_sensor_id,
+                start_time,
+                end_time,
+                min_power_threshold=min_power_threshold,
+                kext_coeff=kext_coeff,
+                current_indoor_temp=current_indoor_temp,
+                current_outdoor_temp=current_outdoor_temp,
+                seed_estimator=use_estimator,
+            )
+
+        if result.get("success") and (regression := self._capacity_estimator.get_regression()):
+            # Informative only: the regression has no history seed, only the live samples
+            result["regression_capacity"] = round(regression["capacity"], 3)
+            result["regression_kext"] = round(regression["kext"], 4)
+            result["regression_samples"] = regression["samples"]
 
         _LOGGER.info("%s - Capacity calibration result: %s", self._name, result)
 
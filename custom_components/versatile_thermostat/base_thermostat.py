@@ -30,6 +30,7 @@ from homeassistant.helpers.device_registry import DeviceInfo
 
 from homeassistant.helpers.event import (
     async_track_state_change_event,
+    async_call_later,
 )
 
 
@@ -70,6 +71,7 @@ from .feature_timed_preset_manager import FeatureTimedPresetManager
 from .feature_heating_failure_detection_manager import FeatureHeatingFailureDetectionManager
 from .feature_repair_incorrect_state_manager import FeatureRepairIncorrectStateManager
 from .state_manager import StateManager
+from .state_publisher import StatePublisher
 from .vtherm_state import VThermState
 from .vtherm_preset import VThermPreset, HIDDEN_PRESETS, PRESET_AC_SUFFIX
 from .vtherm_hvac_mode import VThermHvacMode, VThermHvacMode_OFF, to_legacy_ha_hvac_mode
@@ -122,6 +124,7 @@ class BaseThermostat(ClimateEntity, RestoreEntity, Generic[T]):
         self._is_ready: bool = False
 
         self._cycle_scheduler = None
+        self._state_publisher: StatePublisher | None = None
 
         # Callbacks for TPI cycle events
         self._on_cycle_start_callbacks: list[Callable] = []
@@ -225,6 +228,12 @@ class BaseThermostat(ClimateEntity, RestoreEntity, Generic[T]):
 
         self._cancel_recalculate_later: Callable[[], None] | None = None
 
+        # Coalescing of the reactions to the underlying state changes
+        self._cancel_underlying_refresh: Callable[[], None] | None = None
+        self._underlying_refresh_update_states = False
+        self._nb_underlying_events = 0
+        self._nb_coalesced_underlying_events = 0
+
         self.post_init(entry_infos)
 
     def register_manager(self, manager: BaseFeatureManager):
@@ -380,6 +389,17 @@ class BaseThermostat(ClimateEntity, RestoreEntity, Generic[T]):
 
         self._max_on_percent = api.max_on_percent
 
+        # Filter the state writes if state_publish_params is set in configuration.yaml
+        if self._state_publisher:
+            self._state_publisher.cancel()
+        self._state_publisher = StatePublisher(
+            self._hass,
+            self.name,
+            self._state_snapshot,
+            self._async_write_ha_state_now,
+            api.state_publish_params,
+        )
+
         _LOGGER.debug(
             "%s - Creation of a new VersatileThermostat entity: unique_id=%s",
             self,
@@ -426,6 +446,8 @@ class BaseThermostat(ClimateEntity, RestoreEntity, Generic[T]):
     async def async_will_remove_from_hass(self):
         """Try to force backup of entity"""
         self._is_removed = True
+        if self._state_publisher:
+            self._state_publisher.cancel()
         _LOGGER.debug(
             "%s - force write before remove. Energy is %s", self, self.total_energy
         )
@@ -437,6 +459,10 @@ class BaseThermostat(ClimateEntity, RestoreEntity, Generic[T]):
         _LOGGER.info("%s - Removing thermostat", self)
 
         self.stop_recalculate_later()
+        self.stop_underlying_refresh()
+
+        if self._state_publisher:
+            self._state_publisher.cancel()
 
         # Cancel scheduler timers so leftover async_call_later handles cannot fire
         # after the entity has been unloaded (e.g. on cycle duration config change).
@@ -473,6 +499,49 @@ class BaseThermostat(ClimateEntity, RestoreEntity, Generic[T]):
             self._cancel_recalculate_later()  # pylint: disable=not-callable
             self._cancel_recalculate_later = None
 
+    def request_underlying_refresh(self, update_states: bool = False):
+        """Called on each underlying state change. The reactions (hvac_action, central boiler count
+        and update_states if requested) to a burst of changes are done once at the end of a small window"""
+        self._nb_underlying_events += 1
+        self._underlying_refresh_update_states = self._underlying_refresh_update_states or update_states
+        if self._cancel_underlying_refresh:
+            self._nb_coalesced_underlying_events += 1
+            return
+        self._cancel_underlying_refresh = async_call_later(self._hass, UNDERLYING_CHANGE_COALESCE_SEC, self._async_underlying_refresh)
+
+    def stop_underlying_refresh(self):
+        """Stop the pending underlying refresh if any."""
+        if self._cancel_underlying_refresh:
+            self._cancel_underlying_refresh()  # pylint: disable=not-callable
+            self._cancel_underlying_refresh = None
+        self._underlying_refresh_update_states = False
+
+    async def _async_underlying_refresh(self, _now=None):
+        """React once to all the underlying state changes received in the window"""
+        self._cancel_underlying_refresh = None
+        update_states = self._underlying_refresh_update_states
+        self._underlying_refresh_update_states = False
+        if self._is_removed:
+            return
+
+        if update_states:
+            self.requested_state.force_changed()
+            # update_states recalculates the hvac_action and writes the state
+            await self.update_states()
+        elif self.hvac_action != self.calculate_hvac_action():
+            self.update_custom_attributes()
+            self.async_write_ha_state()
+
+        # update the sensor which count the number of active devices is vtherm is used by central boiler
+        api: VersatileThermostatAPI = VersatileThermostatAPI.get_vtherm_api(self._hass)
+        if self.is_used_by_central_boiler and api.central_boiler_manager is not None and api.central_boiler_manager.nb_device_active_for_boiler_entity is not None:
+            await api.central_boiler_manager.nb_device_active_for_boiler_entity.calculate_nb_active_devices(None)
+
+    @property
+    def nb_coalesced_underlying_events(self) -> int:
+        """The number of underlying state changes merged into an already pending refresh"""
+        return self._nb_coalesced_underlying_events
+
     async def async_startup(self, central_configuration):
         """Triggered on startup, used to get old state and set internal states
          accordingly. This is triggered by VTherm API"""
@@ -1781,6 +1850,28 @@ class BaseThermostat(ClimateEntity, RestoreEntity, Generic[T]):
             action = HVACAction.HEATING
         self._attr_hvac_action = action
 
+    @callback
+    def async_write_ha_state(self) -> None:
+        """Write the state through the StatePublisher which skips or delays the writes without visible change"""
+        if self._state_publisher is None or self.hass is None:
+            super().async_write_ha_state()
+        else:
+            self._state_publisher.publish()
+
+    @callback
+    def _async_write_ha_state_now(self) -> None:
+        """Write the state to Home Assistant without filtering"""
+        super().async_write_ha_state()
+
+    def _state_snapshot(self) -> dict[str, Any]:
+        """The user visible values of the entity, compared by the StatePublisher"""
+        return {
+            "state": self.state,
+            **(self.capability_attributes or {}),
+            **(self.state_attributes or {}),
+            **(self.extra_state_attributes or {}),
+        }
+
     def update_custom_attributes(self):
         """Update the custom extra attributes for the entity"""
 
@@ -1830,8 +1921,11 @@ class BaseThermostat(ClimateEntity, RestoreEntity, Generic[T]):
                 "is_sleeping": self.is_sleeping,
                 "is_locked": self.lock_manager.is_locked,
                 "is_recalculate_scheduled": self.is_recalculate_scheduled,
+                "nb_underlying_events": self._nb_underlying_events,
+                "nb_coalesced_underlying_events": self._nb_coalesced_underlying_events,
                 "not_initialized_entities": not_initialized_entities,
                 "messages": messages,
+                "state_publisher": self._state_publisher.stats if self._state_publisher else None,
             },
             "configuration": {
                 "ac_mode": self._ac_mode,
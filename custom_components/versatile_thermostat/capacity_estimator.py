@@ -0,0 +1,169 @@
+# pylint: disable=line-too-long
+"""Rolling estimator of the heating capacity used by the Auto TPI calibration.
+
+It keeps the (slope, power) samples the capacity calibration would otherwise
+rebuild from the recorder history, already sorted by slope, so a calibration
+only has to read quantiles from a sorted list. It also maintains an online
+least square regression of the slope against the indoor/outdoor delta, whose
+intercept is the adiabatic capacity and whose opposite slope is Kext."""
+
+import bisect
+from collections import deque
+from datetime import datetime, timedelta
+
+from vtherm_api.log_collector import get_vtherm_logger
+
+_LOGGER = get_vtherm_logger(__name__)
+
+# Period covered by the estimator. Same as the default calibration history
+CAPACITY_ESTIMATOR_WINDOW = timedelta(days=30)
+# Samples below this power (in %) are never kept. A calibration asking for a lower threshold uses the history
+CAPACITY_ESTIMATOR_MIN_POWER = 50.0
+# Hard limit on the kept samples (about one slope change per minute for 30 days)
+CAPACITY_ESTIMATOR_MAX_SAMPLES = 45000
+# Slopes are compared with the precision of the temperature slope sensor to keep one sample per sensor state
+SLOPE_PRECISION = 3
+# Minimal power (in %) for a sample to enter the regression. Below the heater is not at full power.
+REGRESSION_MIN_POWER = 95.0
+REGRESSION_MIN_SAMPLES = 10
+REGRESSION_MIN_DELTA_T_VARIANCE = 1.0
+
+
+class CapacityEstimator:
+    """Keep the heating slope samples of the last 30 days ready for calibration"""
+
+    def __init__(self, name: str, window: timedelta = CAPACITY_ESTIMATOR_WINDOW):
+        self._name = name
+        self._window = window
+        # Time ordered samples (timestamp, slope, power, delta_t) for expiry
+        self._samples: deque[tuple[float, float, float, float | None]] = deque()
+        # The same samples as (slope, power, timestamp) sorted by slope
+        self._sorted: list[tuple[float, float, float]] = []
+        self._last_slope: float | None = None
+        # Running sums of the regression slope = capacity - kext * delta_t
+        self._reg_n = 0
+        self._reg_sx = 0.0
+        self._reg_sy = 0.0
+        self._reg_sxx = 0.0
+        self._reg_sxy = 0.0
+        # Start of the period for which the estimator holds every sample
+        self._covered_since: float | None = None
+
+    def __str__(self) -> str:
+        return f"CapacityEstimator-{self._name}"
+
+    @property
+    def sample_count(self) -> int:
+        """The number of kept samples"""
+        return len(self._samples)
+
+    @property
+    def period_days(self) -> float:
+        """The period between the oldest and the newest kept samples in days"""
+        if not self._samples:
+            return 0.0
+        return (self._samples[-1][0] - self._samples[0][0]) / 86400.0
+
+    def add_sample(self, timestamp: datetime, slope: float | None, power: float | None, delta_t: float | None = None):
+        """Add a live sample. Only one sample is kept per slope change, like the slope sensor history"""
+        if slope is None or power is None:
+            return
+        rounded_slope = round(slope, SLOPE_PRECISION)
+        if rounded_slope == self._last_slope:
+            return
+        self._last_slope = rounded_slope
+        self._insert(timestamp.timestamp(), rounded_slope, float(power), delta_t)
+        self._expire(timestamp.timestamp())
+
+    def seed(self, samples: list[tuple[datetime, float, float]], start: datetime, end: datetime):
+        """Replace the samples older than end with the (timestamp, slope, power) samples matched from the history"""
+        end_ts = end.timestamp()
+        live = [sample for sample in self._samples if sample[0] > end_ts]
+        self._clear()
+        for timestamp, slope, power in samples:
+            self._insert(timestamp.timestamp(), slope, power, None)
+        for sample in live:
+            self._insert(*sample)
+        self._covered_since = start.timestamp()
+        self._expire(max(end_ts, live[-1][0] if live else end_ts))
+        _LOGGER.debug("%s - seeded with %d history samples, %d live samples kept", self, len(samples), len(live))
+
+    def get_slopes(self, min_power: float, start: datetime | None = None) -> list[float] | None:
+        """Return the slopes sampled with at least min_power (in %) since start, sorted.
+        None if the estimator cannot answer and the history must be used"""
+        if min_power < CAPACITY_ESTIMATOR_MIN_POWER or self._covered_since is None:
+            return None
+        start_ts = start.timestamp() if start is not None else self._covered_since
+        if start_ts < self._covered_since:
+            return None
+        return [slope for slope, power, timestamp in self._sorted if power >= min_power and timestamp >= start_ts]
+
+    def get_regression(self) -> dict | None:
+        """Return the capacity and Kext of the online regression or None if it is not significant yet"""
+        n = self._reg_n
+        if n < REGRESSION_MIN_SAMPLES:
+            return None
+        var_x = self._reg_sxx / n - (self._reg_sx / n) ** 2
+        if var_x < REGRESSION_MIN_DELTA_T_VARIANCE:
+            return None
+        cov_xy = self._reg_sxy / n - (self._reg_sx / n) * (self._reg_sy / n)
+        coef = cov_xy / var_x
+        return {
+            "capacity": self._reg_sy / n - coef * self._reg_sx / n,
+            "kext": -coef,
+            "samples": n,
+        }
+
+    def _clear(self):
+        """Forget every sample"""
+        self._samples.clear()
+        self._sorted.clear()
+        self._reg_n = 0
+        self._reg_sx = self._reg_sy = self._reg_sxx = self._reg_sxy = 0.0
+
+    def _insert(self, timestamp: float, slope: float, power: float, delta_t: float | None):
+        """Insert a sample. Only heating samples with enough power are relevant for the calibration"""
+        if slope <= 0 or power < CAPACITY_ESTIMATOR_MIN_POWER:
+            return
+        sample = (timestamp, slope, power, delta_t)
+        if self._samples and self._samples[-1][0] > timestamp:
+            # Out of order sample (history seed). Rare, so a plain sorted insert is fine
+            samples = list(self._samples)
+            bisect.insort(samples, sample, key=lambda s: s[0])
+            self._samples = deque(samples)
+        else:
+            self._samples.append(sample)
+        bisect.insort(self._sorted, (slope, power, timestamp))
+        self._update_regression(sample, 1)
+        if len(self._samples) > CAPACITY_ESTIMATOR_MAX_SAMPLES:
+            self._remove_oldest()
+
+    def _expire(self, now: float):
+        """Remove the samples older than the window"""
+        limit = now - self._window.total_seconds()
+        while self._samples and self._samples[0][0] < limit:
+            self._remove_oldest()
+        if self._covered_since is not None and self._covered_since < limit:
+            self._covered_since = limit
+
+    def _remove_oldest(self):
+        """Remove the oldest sample"""
+        sample = self._samples.popleft()
+        timestamp, slope, power, _ = sample
+        index = bisect.bisect_left(self._sorted, (slope, power, timestamp))
+        del self._sorted[index]
+        self._update_regression(sample, -1)
+        if self._covered_since is not None and self._covered_since < timestamp:
+            # The oldest samples were dropped for the size limit: the period before is not covered anymore
+            self._covered_since = timestamp
+
+    def _update_regression(self, sample: tuple[float, float, float, float | None], sign: int):
+        """Add (sign=1) or remove (sign=-1) a sample from the regression sums"""
+        _, slope, power, delta_t = sample
+        if delta_t is None or power < REGRESSION_MIN_POWER:
+            return
+        self._reg_n += sign
+        self._reg_sx += sign * delta_t
+        self._reg_sy += sign * slope
+        self._reg_sxx += sign * delta_t * delta_t
+        self._reg_sxy += sign * delta_t * slope
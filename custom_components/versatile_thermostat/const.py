@@ -200,6 +200,8 @@ CONF_SHORT_EMA_PARAMS = "short_ema_params"
 CONF_SAFETY_MODE = "safety_mode"
 CONF_MAX_ON_PERCENT = "max_on_percent"
 CONF_LOG_BUFFER_MAX_AGE_HOURS = "log_buffer_max_age_hours"
+CONF_SHARED_CYCLE_CLOCK = "shared_cycle_clock"
+CONF_STATE_PUBLISH_PARAMS = "state_publish_params"
 
 CONF_USE_MAIN_CENTRAL_CONFIG = "use_main_central_config"
 CONF_USE_TPI_CENTRAL_CONFIG = "use_tpi_central_config"
@@ -255,6 +257,9 @@ HVAC_OFF_REASONS = Literal[  # pylint: disable=invalid-name
     HVAC_OFF_REASON_MANUAL, HVAC_OFF_REASON_AUTO_START_STOP, HVAC_OFF_REASON_WINDOW_DETECTION, HVAC_OFF_REASON_SLEEP_MODE, HVAC_OFF_REASON_SAFETY
 ]
 
+# Window (in sec) in which the reactions to a burst of underlying state changes are merged
+UNDERLYING_CHANGE_COALESCE_SEC = 0.5
+
 DEFAULT_SHORT_EMA_PARAMS = {
     "max_alpha": 0.5,
     # In sec
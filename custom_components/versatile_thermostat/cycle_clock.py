@@ -0,0 +1,185 @@
+# pylint: disable=line-too-long
+"""CycleClock: one timing wheel shared by the CycleScheduler of every VTherm.
+
+Without it each CycleScheduler arms its own async_call_later timers, so a
+house with many thermostats wakes the event loop at unaligned moments and all
+the cycles started together switch their heaters on together.
+
+The clock quantizes every deadline to a slot of CYCLE_CLOCK_RESOLUTION_SEC and
+keeps a single Home Assistant timer armed on the earliest slot. All the
+callbacks due in a slot are run concurrently in one wakeup, so the underlying
+commands of several thermostats are sent as a batch. It also gives each
+registered switch scheduler a phase so that the ON periods of thermostats
+sharing the same cycle duration are spread over the cycle instead of
+overlapping.
+
+It is enabled with `shared_cycle_clock: true` in the configuration.yaml
+global configuration.
+"""
+
+import asyncio
+import heapq
+import inspect
+import itertools
+import math
+import time
+from typing import Any, Callable
+
+from vtherm_api.log_collector import get_vtherm_logger
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant
+from homeassistant.helpers.event import async_call_later
+from homeassistant.util import dt as dt_util
+
+_LOGGER = get_vtherm_logger(__name__)
+
+# Width of a slot of the timing wheel. Deadlines are rounded up to the next slot
+CYCLE_CLOCK_RESOLUTION_SEC = 1.0
+
+
+class CycleClock:
+    """A timing wheel shared by all the CycleScheduler"""
+
+    def __init__(self, hass: HomeAssistant, resolution: float = CYCLE_CLOCK_RESOLUTION_SEC):
+        self._hass = hass
+        self._resolution = resolution
+        # Reference time of the phases. Thermostats with the same phase start their ON period together
+        self._epoch = time.time()
+        # slot -> {callback id -> callback}
+        self._slots: dict[int, dict[int, Callable]] = {}
+        # Slots ordered by time. Cancelled slots are removed lazily
+        self._heap: list[int] = []
+        self._ids = itertools.count()
+        self._timer_unsub: CALLBACK_TYPE | None = None
+        self._timer_slot: int | None = None
+        # cycle duration -> registered schedulers, in registration order
+        self._members: dict[float, list[Any]] = {}
+        self._stats = {
+            "scheduled": 0,
+            "cancelled": 0,
+            "wakeups": 0,
+            "callbacks": 0,
+            "max_batch": 0,
+        }
+
+    def __str__(self) -> str:
+        return "CycleClock"
+
+    @property
+    def stats(self) -> dict:
+        """The clock counters. callbacks / wakeups is the average batch size"""
+        return dict(self._stats, pending=sum(len(entries) for entries in self._slots.values()), members=sum(len(members) for members in self._members.values()))
+
+    def register(self, member: Any, cycle_duration_sec: float):
+        """Register a switch scheduler to get a phase within its cycle"""
+        self.unregister(member)
+        self._members.setdefault(cycle_duration_sec, []).append(member)
+
+    def unregister(self, member: Any):
+        """Forget a scheduler. The phases of the others are updated at their next cycle start"""
+        for duration, members in list(self._members.items()):
+            if member in members:
+                members.remove(member)
+                if not members:
+                    del self._members[duration]
+
+    def phase_offset(self, member: Any, cycle_duration_sec: float, cycle_start_time: float) -> float:
+        """Return the offset (in sec from cycle_start_time) at which the member should start its ON period.
+
+        The members with the same cycle duration are evenly spread over the cycle. The offset is
+        computed against a common epoch so that it does not depend on when each cycle was started.
+        """
+        members = self._members.get(cycle_duration_sec)
+        if not members or member not in members or cycle_duration_sec <= 0:
+            return 0.0
+        phase = cycle_duration_sec * members.index(member) / len(members)
+        return round((self._epoch + phase - cycle_start_time) % cycle_duration_sec, 1)
+
+    def call_later(self, delay: float, action: Callable) -> CALLBACK_TYPE:
+        """Run action(now) in delay seconds (rounded up to the clock resolution).
+        Same contract as async_call_later: the returned callable cancels the call"""
+        slot = math.ceil((time.time() + max(0.0, delay)) / self._resolution)
+        entries = self._slots.get(slot)
+        if entries is None:
+            entries = self._slots[slot] = {}
+            heapq.heappush(self._heap, slot)
+        entry_id = next(self._ids)
+        entries[entry_id] = action
+        self._stats["scheduled"] += 1
+        self._arm()
+
+        def cancel():
+            slot_entries = self._slots.get(slot)
+            if slot_entries is not None and slot_entries.pop(entry_id, None) is not None:
+                self._stats["cancelled"] += 1
+                if not slot_entries:
+                    del self._slots[slot]
+                    self._arm()
+
+        return cancel
+
+    def _arm(self):
+        """Arm the Home Assistant timer on the earliest pending slot"""
+        while self._heap and self._heap[0] not in self._slots:
+            heapq.heappop(self._heap)
+
+        if not self._heap:
+            self._cancel_timer()
+            return
+
+        slot = self._heap[0]
+        if slot == self._timer_slot:
+            return
+        self._cancel_timer()
+        self._timer_slot = slot
+        self._timer_unsub = async_call_later(self._hass, max(0.0, slot * self._resolution - time.time()), self._async_wakeup)
+
+    def _cancel_timer(self):
+        """Cancel the armed Home Assistant timer"""
+        if self._timer_unsub:
+            self._timer_unsub()
+        self._timer_unsub = None
+        self._timer_slot = None
+
+    async def _async_wakeup(self, _now):
+        """Run every callback due and re-arm the timer on the next slot"""
+        fired_slot = self._timer_slot if self._timer_slot is not None else 0
+        self._timer_unsub = None
+        self._timer_slot = None
+
+        # The timer may fire a bit before the slot boundary: the armed slot is always due
+        due_slot = max(fired_slot, math.floor(time.time() / self._resolution))
+        actions: list[Callable] = []
+        while self._heap and self._heap[0] <= due_slot:
+            entries = self._slots.pop(heapq.heappop(self._heap), None)
+            if entries:
+                actions.extend(entries.values())
+
+        # Re-arm before running the callbacks: they schedule their next calls and may take long
+        self._arm()
+
+        if not actions:
+            return
+
+        self._stats["wakeups"] += 1
+        self._stats["callbacks"] += len(actions)
+        self._stats["max_batch"] = max(self._stats["max_batch"], len(actions))
+
+        now = dt_util.utcnow()
+        await asyncio.gather(*(self._async_run(action, now) for action in actions))
+
+    async def _async_run(self, action: Callable, now):
+        """Run one callback so that a failure does not prevent the others of the batch"""
+        try:
+            result = action(now)
+            if inspect.isawaitable(result):
+                await result
+        except Exception as err:  # pylint: disable=broad-exception-caught
+            _LOGGER.error("%s - error in callback %s: %s", self, action, err)
+
+    def shutdown(self):
+        """Cancel every pending call"""
+        self._cancel_timer()
+        self._slots.clear()
+        self._heap.clear()
+        self._members.clear()
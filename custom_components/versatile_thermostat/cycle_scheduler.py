@@ -25,6 +25,8 @@ from .cycle_tick_logic import (
     evaluate_need_off,
     compute_e_eff,
 )
+from .cycle_clock import CycleClock
+
 _LOGGER = get_vtherm_logger(__name__)
 
 
@@ -127,6 +129,8 @@ class CycleScheduler:
         self._is_starting: bool = False
         # Detect valve mode from underlying types
         self._is_valve_mode: bool = self._detect_valve_mode()
+        # Optional timing wheel shared by all the VTherms (see cycle_clock.py)
+        self._cycle_clock: CycleClock | None = None
 
     @property
     def is_cycle_running(self) -> bool:
@@ -158,6 +162,22 @@ class CycleScheduler:
             UnderlyingEntityType.VALVE_REGULATION,
         )
 
+    def attach_cycle_clock(self, cycle_clock: CycleClock | None):
+        """Use the shared cycle clock instead of private timers.
+
+        Switch schedulers are registered to get a phase, so that the ON periods of
+        thermostats with the same cycle duration are spread over the cycle.
+        """
+        self._cycle_clock = cycle_clock
+        if cycle_clock and not self._is_valve_mode:
+            cycle_clock.register(self, self._cycle_duration_sec)
+
+    def _call_later(self, delay: float, action: Callable) -> CALLBACK_TYPE:
+        """Schedule action on the shared cycle clock if any, or on a private timer"""
+        if self._cycle_clock:
+            return self._cycle_clock.call_later(delay, action)
+        return async_call_later(self._hass, delay, action)
+
     def register_cycle_start_callback(self, callback: Callable):
         """Register a callback to be called at the start of each master cycle.
 
@@ -426,8 +446,7 @@ class CycleScheduler:
             self._current_off_time_sec,
         )
         self._reset_valve_cycle_trace(self._current_on_percent)
-        self._cycle_end_unsub = async_call_later(
-            self._hass,
+        self._cycle_end_unsub = self._call_later(
             self._cycle_duration_sec,
             self._on_master_cycle_end,
         )
@@ -456,7 +475,7 @@ class CycleScheduler:
             # reports a full elapsed_ratio instead of looking interrupted with 0 s elapsed.
             self._cycle_start_time = time.time()
             # Schedule next cycle evaluation
-            self._cycle_end_unsub = async_call_later(self._hass, self._cycle_duration_sec, self._on_master_cycle_end)
+            self._cycle_end_unsub = self._call_later(self._cycle_duration_sec, self._on_master_cycle_end)
             return
 
         if on_time_sec >= self._cycle_duration_sec:
@@ -467,7 +486,7 @@ class CycleScheduler:
             # Keep a real master-cycle start time for the same reason as 0% cycles.
             self._cycle_start_time = time.time()
             # Schedule next cycle evaluation
-            self._cycle_end_unsub = async_call_later(self._hass, self._cycle_duration_sec, self._on_master_cycle_end)
+            self._cycle_end_unsub = self._call_later(self._cycle_duration_sec, self._on_master_cycle_end)
             return
 
         self._init_cycle(on_percent)
@@ -476,7 +495,7 @@ class CycleScheduler:
         await self._tick(_is_initial=True)
 
         # Also ensure master cycle end is scheduled independently to wrap up the cycle
-        self._cycle_end_unsub = async_call_later(self._hass, self._cycle_duration_sec, self._on_master_cycle_end)
+        self._cycle_end_unsub = self._call_later(self._cycle_duration_sec, self._on_master_cycle_end)
 
     def _init_cycle(self, on_percent: float):
         """Initialize states and penalty for the new cycle.
@@ -490,6 +509,10 @@ class CycleScheduler:
         n = len(self._underlyings)
         on_time = self._cycle_duration_sec * on_percent
         offsets = compute_circular_offsets(self._cycle_duration_sec, n)
+        if self._cycle_clock:
+            # Shift the whole pattern to the phase given by the shared clock
+            phase = self._cycle_clock.phase_offset(self, self._cycle_duration_sec, self._cycle_start_time)
+            offsets = [round((offset + phase) % self._cycle_duration_sec, 1) for offset in offsets]
 
         self._states = []
         for i, under in enumerate(self._underlyings):
@@ -612,7 +635,7 @@ class CycleScheduler:
         next_global_tick = max(0.1, next_global_tick)
 
         # Schedule next tick
-        self._tick_unsub = async_call_later(self._hass, next_global_tick, self._tick)
+        self._tick_unsub = self._call_later(next_global_tick, self._tick)
 
     async def _on_master_cycle_end(self, _now):
         """Called at the end of the master cycle. Restart with the same parameters.
@@ -642,6 +665,8 @@ class CycleScheduler:
         that leftover async_call_later handles cannot fire after the new entity
         (potentially with a different cycle duration) has already started.
         """
+        if self._cycle_clock:
+            self._cycle_clock.unregister(self)
         if self._tick_unsub:
             self._tick_unsub()
             self._tick_unsub = None
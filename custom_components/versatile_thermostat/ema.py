@@ -38,6 +38,9 @@ class ExponentialMovingAverage:
         self._name = vterm_name
         self._precision = precision
         self._max_alpha = max_alpha
+        # Sensors are often sampled at a fixed period: keep the last alpha to avoid the exp calculation
+        self._last_time_decay: float | None = None
+        self._last_alpha: float = 0
 
     def __str__(self) -> str:
         return f"EMA-{self._name}"
@@ -73,9 +76,19 @@ class ExponentialMovingAverage:
             )
             return self._current_ema
 
-        alpha = 1 - math.exp(math.log(0.5) * time_decay / self._halflife)
-        # capping alpha to avoid gap if last measurement was long time ago
-        alpha = min(alpha, self._max_alpha)
+        if measurement == self._current_ema:
+            # Fast path: the same value again does not move the EMA whatever alpha is
+            self._last_timestamp = timestamp
+            return round(self._current_ema, self._precision)
+
+        if time_decay == self._last_time_decay:
+            alpha = self._last_alpha
+        else:
+            alpha = 1 - math.exp(math.log(0.5) * time_decay / self._halflife)
+            # capping alpha to avoid gap if last measurement was long time ago
+            alpha = min(alpha, self._max_alpha)
+            self._last_time_decay = time_decay
+            self._last_alpha = alpha
         new_ema = alpha * measurement + (1 - alpha) * self._current_ema
 
         self._last_timestamp = timestamp
@@ -64,15 +64,22 @@ class WindowOpenDetectionAlgorithm:
             self._nb_point = self._nb_point + 1
             return None
 
+        lspe = self._last_slope
+
+        delta_t_sec = float((datetime_measure - self._last_datetime).total_seconds())
+        if delta_t_sec > MIN_DELTA_T_SEC and temperature == self._last_temperature and lspe == 0:
+            # Fast path: a flat curve stays flat. Same result as below without the calculation
+            if store_date:
+                self._last_datetime = datetime_measure
+            self._nb_point = self._nb_point + 1
+            return lspe
+
         _LOGGER.debug(
             "%s - We are already initialized slope=%s last_temp=%0.2f",
             self,
             self._last_slope,
             self._last_temperature,
         )
-        lspe = self._last_slope
-
-        delta_t_sec = float((datetime_measure - self._last_datetime).total_seconds())
         delta_t = delta_t_sec / 60.0
         if delta_t_sec <= MIN_DELTA_T_SEC:
             _LOGGER.debug(
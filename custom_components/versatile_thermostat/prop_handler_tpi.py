@@ -218,9 +218,8 @@ class TPIHandler:
 
     def remove(self):
         """Cleanup on removal."""
-        t = self._thermostat
         if self._auto_tpi_manager:
-            t.hass.async_create_task(self._auto_tpi_manager.async_save_data())
+            self._auto_tpi_manager.async_flush_data()
 
     def on_scheduler_ready(self, scheduler) -> None:
         """Register AutoTPI learning callbacks on the cycle scheduler."""
@@ -316,6 +315,7 @@ class TPIHandler:
                 is_central_boiler_off=self._is_central_boiler_off(),
                 is_heating_failure=t.heating_failure_detection_manager.is_failure_detected,
             )
+            self._auto_tpi_manager.record_capacity_sample(t.last_temperature_slope, t.power_percent)
 
             # 2. Synchronize parameters if learning is active
             new_params = await self._auto_tpi_manager.calculate()
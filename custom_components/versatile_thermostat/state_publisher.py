@@ -0,0 +1,174 @@
+# pylint: disable=line-too-long
+"""StatePublisher: debounce and diff the state writes of a VTherm.
+
+A VTherm writes its state (with its large set of custom attributes) on every
+temperature, underlying or cycle event and the recorder stores every write,
+even when nothing visible has changed. When enabled the publisher compares a
+normalized snapshot of the state and attributes with the last written one:
+
+- the write is skipped when no value changed (floats are equal when they differ
+  by less than one unit of the configured precision from the last written value,
+  and the volatile timestamps are ignored),
+- the write is done at once when a main value changed (hvac mode, preset,
+  hvac action, target temperature),
+- other changes are coalesced: at most one write per coalescing window, done
+  at the end of the window with the latest values.
+
+It always counts the requested and the done writes, so the per hour rates
+before and after the filtering are available in the attributes.
+"""
+
+import time
+from typing import Any, Callable
+
+from vtherm_api.log_collector import get_vtherm_logger
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
+
+_LOGGER = get_vtherm_logger(__name__)
+
+# Attributes which change on every write and that are not worth a write on their own
+VOLATILE_ATTRIBUTES = {
+    "last_update_datetime",
+    "last_temperature_datetime",
+    "last_ext_temperature_datetime",
+    "state_publisher",
+}
+
+# A change of one of these values is written immediately
+IMMEDIATE_ATTRIBUTES = (
+    "state",
+    "hvac_action",
+    "preset_mode",
+    "temperature",
+    "target_temp_high",
+    "target_temp_low",
+)
+
+
+# Float differences of exactly one unit of precision must count despite the representation error (0.3 - 0.2 < 0.1)
+FLOAT_TOLERANCE_MARGIN = 1e-9
+
+
+def normalize(value: Any) -> Any:
+    """Return a comparable copy of value: volatile attributes removed, tuples as lists"""
+    if isinstance(value, dict):
+        return {key: normalize(val) for key, val in value.items() if key not in VOLATILE_ATTRIBUTES}
+    if isinstance(value, (list, tuple)):
+        return [normalize(val) for val in value]
+    return value
+
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def differs(value: Any, last: Any, tolerance: float) -> bool:
+    """Return True if value changed from last. Floats change when they move by at least tolerance:
+    rounding both sides would see 0.0049 and 0.0051 as different at a precision of 2"""
+    if (isinstance(value, float) or isinstance(last, float)) and _is_number(value) and _is_number(last):
+        return abs(value - last) >= tolerance * (1 - FLOAT_TOLERANCE_MARGIN)
+    if isinstance(value, dict) and isinstance(last, dict):
+        return value.keys() != last.keys() or any(differs(val, last[key], tolerance) for key, val in value.items())
+    if isinstance(value, list) and isinstance(last, list):
+        return len(value) != len(last) or any(differs(val, last_val, tolerance) for val, last_val in zip(value, last, strict=True))
+    return value != last
+
+
+class StatePublisher:
+    """Decide whether a state write of a VTherm is done now, later or not at all"""
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        name: str,
+        snapshot_func: Callable[[], dict[str, Any]],
+        write_func: Callable[[], None],
+        params: dict | None = None,
+    ):
+        """params is the state_publish_params of configuration.yaml. None to write every state as before"""
+        self._hass = hass
+        self._name = name
+        self._snapshot_func = snapshot_func
+        self._write_func = write_func
+        self._enabled = params is not None
+        self._precision: int = params.get("precision") if params else 2
+        self._tolerance: float = 10**-self._precision
+        self._coalesce_sec: float = params.get("coalesce_sec") if params else 0
+        self._last_snapshot: dict[str, Any] | None = None
+        self._last_write_time: float = 0.0
+        self._pending_unsub: CALLBACK_TYPE | None = None
+        self._start_time = time.monotonic()
+        self._requested = 0
+        self._written = 0
+        self._skipped = 0
+        self._coalesced = 0
+
+    def __str__(self) -> str:
+        return f"StatePublisher-{self._name}"
+
+    @property
+    def stats(self) -> dict[str, Any]:
+        """The write counters and the write rates per hour before and after the filtering"""
+        hours = max(time.monotonic() - self._start_time, 60.0) / 3600.0
+        return {
+            "enabled": self._enabled,
+            "requested_writes": self._requested,
+            "written": self._written,
+            "skipped": self._skipped,
+            "coalesced": self._coalesced,
+            "requested_writes_per_hour": round(self._requested / hours, 1),
+            "writes_per_hour": round(self._written / hours, 1),
+        }
+
+    @callback
+    def publish(self):
+        """Called instead of each state write"""
+        self._requested += 1
+        if not self._enabled:
+            self._write()
+            return
+
+        snapshot = normalize(self._snapshot_func())
+        last = self._last_snapshot
+        if last is not None and not differs(snapshot, last, self._tolerance):
+            self._skipped += 1
+            return
+
+        if last is None or any(differs(snapshot.get(key), last.get(key), self._tolerance) for key in IMMEDIATE_ATTRIBUTES):
+            self._write(snapshot)
+            return
+
+        remaining = self._last_write_time + self._coalesce_sec - time.monotonic()
+        if remaining <= 0:
+            self._write(snapshot)
+            return
+
+        self._coalesced += 1
+        if self._pending_unsub is None:
+            _LOGGER.debug("%s - coalescing state write for %.1f sec", self, remaining)
+            self._pending_unsub = async_call_later(self._hass, remaining, self._flush)
+
+    @callback
+    def _flush(self, _now=None):
+        """End of the coalescing window: write the latest state"""
+        self._pending_unsub = None
+        snapshot = normalize(self._snapshot_func())
+        if not differs(snapshot, self._last_snapshot, self._tolerance):
+            return
+        self._write(snapshot)
+
+    def _write(self, snapshot: dict[str, Any] | None = None):
+        """Do the state write"""
+        self.cancel()
+        self._last_snapshot = snapshot
+        self._last_write_time = time.monotonic()
+        self._written += 1
+        self._write_func()
+
+    def cancel(self):
+        """Cancel a pending coalesced write"""
+        if self._pending_unsub:
+            self._pending_unsub()
+            self._pending_unsub = None
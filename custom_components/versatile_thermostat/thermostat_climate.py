@@ -699,8 +699,8 @@ class ThermostatOverClimate(BaseThermostat[UnderlyingClimate]):
         async def end_climate_changed(changes: bool):
             """To end the event management"""
             if changes:
-                self.requested_state.force_changed()
-                await self.update_states()
+                # Merged with the changes of the other underlyings received in the same window
+                self.request_underlying_refresh(update_states=True)
 
         changes = False
 
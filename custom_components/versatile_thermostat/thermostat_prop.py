@@ -8,6 +8,7 @@ from homeassistant.core import HomeAssistant
 from homeassistant.exceptions import ServiceValidationError
 
 from .base_thermostat import BaseThermostat, ConfigData
+from .vtherm_central_api import VersatileThermostatAPI
 from .underlyings import T
 from .vtherm_hvac_mode import VThermHvacMode_OFF
 from .const import CONF_PROP_FUNCTION, PROPORTIONAL_FUNCTION_TPI
@@ -340,5 +341,6 @@ class ThermostatProp(BaseThermostat[T], Generic[T]):
         need to know the details.
         """
         self._cycle_scheduler = scheduler
+        scheduler.attach_cycle_clock(VersatileThermostatAPI.get_vtherm_api(self._hass).cycle_clock)
         if self._algo_handler:
             self._algo_handler.on_scheduler_ready(scheduler)
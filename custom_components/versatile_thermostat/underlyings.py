@@ -144,18 +144,8 @@ class UnderlyingEntity:
             else:
                 _LOGGER.debug("%s - Underlying state still not yet initialized", self)
         # Otherwise, the manager holds the latest state
-        # Update the hvac_action of the parent which could have changed
-        if self._thermostat.hvac_action != self._thermostat.calculate_hvac_action():
-            self._thermostat.update_custom_attributes()
-            self._thermostat.async_write_ha_state()
-
-        # update the sensor which count the number of active devices is vtherm is used by central boiler
-        if (
-            self._thermostat.is_used_by_central_boiler
-            and self._api.central_boiler_manager is not None
-            and self._api.central_boiler_manager.nb_device_active_for_boiler_entity is not None
-        ):
-            await self._api.central_boiler_manager.nb_device_active_for_boiler_entity.calculate_nb_active_devices(None)
+        # The parent updates its hvac_action and the central boiler count once per burst of changes
+        self._thermostat.request_underlying_refresh()
 
     async def set_hvac_mode(self, hvac_mode: VThermHvacMode):
         """Set the HVACmode"""
@@ -18,10 +18,13 @@ from .const import (
     CONF_THERMOSTAT_TYPE,
     CONF_THERMOSTAT_CENTRAL_CONFIG,
     CONF_MAX_ON_PERCENT,
+    CONF_SHARED_CYCLE_CLOCK,
+    CONF_STATE_PUBLISH_PARAMS,
 )
 
 from .feature_central_power_manager import FeatureCentralPowerManager
 from .feature_central_boiler_manager import FeatureCentralBoilerManager
+from .cycle_clock import CycleClock
 
 _LOGGER = get_vtherm_logger(__name__)
 
@@ -43,8 +46,11 @@ class VersatileThermostatAPI(VThermAPI):
         # A dict that will store all Number entities which holds the temperature
         self._number_temperatures = dict()
         self._max_on_percent = None
+        self._state_publish_params = None
         self._central_power_manager = FeatureCentralPowerManager(hass, self)
         self._central_boiler_manager = FeatureCentralBoilerManager(hass, self)
+        # The shared cycle clock. None if each VTherm uses its own timers
+        self._cycle_clock: CycleClock | None = None
 
         # the current time (for testing purpose)
         self._now = None
@@ -99,6 +105,15 @@ class VersatileThermostatAPI(VThermAPI):
                 "We have found max_on_percent setting %s", self._max_on_percent
             )
 
+        self._state_publish_params = config.get(CONF_STATE_PUBLISH_PARAMS)
+        if self._state_publish_params:
+            _LOGGER.debug("We have found state_publish_params %s", self._state_publish_params)
+
+        if config.get(CONF_SHARED_CYCLE_CLOCK):
+            if not self._cycle_clock:
+                self._cycle_clock = CycleClock(self.hass)
+            _LOGGER.debug("We have found shared_cycle_clock setting. All VTherm cycles will share one clock")
+
     def register_temperature_number(
         self,
         config_id: str,
@@ -199,6 +214,8 @@ class VersatileThermostatAPI(VThermAPI):
         # If not more entries are preset, remove the API
         if len([val for val in self.hass.data[DOMAIN].values() if isinstance(val, ConfigEntry)]) == 0:
             _LOGGER.debug("No more entries-> Remove the API from DOMAIN")
+            if self._cycle_clock:
+                self._cycle_clock.shutdown()
             if DOMAIN in self.hass.data:
                 self.hass.data.pop(DOMAIN)
 
@@ -222,6 +239,16 @@ class VersatileThermostatAPI(VThermAPI):
         """Get the max_open_percent params"""
         return self._max_on_percent
 
+    @property
+    def state_publish_params(self) -> dict | None:
+        """Get the state publish params or None to write every state"""
+        return self._state_publish_params
+
+    @property
+    def cycle_clock(self) -> CycleClock | None:
+        """Get the shared cycle clock or None if it is not enabled"""
+        return self._cycle_clock
+
     @property
     def central_mode(self) -> str | None:
         """Get the current central mode or None"""
@@ -0,0 +1 @@
+"""Tests for the Area Occupancy Detection integration."""
@@ -0,0 +1,103 @@
+"""Benchmark of the numeric correlation analysis of one area.
+
+Not collected by pytest. Run it from the repository root with:
+
+    python -m tests.area_occupancy.bench_correlation [sensors] [step_seconds]
+
+It generates a database with 30 days of data for each sensor: raw samples every
+step_seconds over the raw retention window, hourly aggregates before that. It
+prints the time of the former per-entity analysis, run once per sensor, and of
+the columnar analysis of the whole area, with the largest difference between
+their correlation coefficients.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+from pathlib import Path
+import sys
+import tempfile
+import time
+from types import SimpleNamespace
+
+import sqlalchemy as sa
+
+from custom_components.area_occupancy.db.core import AreaOccupancyDB
+from custom_components.area_occupancy.db.correlation import (
+    analyze_area_numeric_correlations,
+)
+from custom_components.area_occupancy.db.schema import Base
+from homeassistant.util import dt as dt_util
+
+from .conftest import TEST_ENTRY_ID
+from .correlation_data import (
+    ANALYSIS_DAYS,
+    AREA,
+    generate_occupancy,
+    generate_sensors,
+    insert_rows,
+    reference_correlation,
+)
+
+NOW = datetime(2026, 6, 15, 12, 0, tzinfo=dt_util.UTC)
+
+
+def main() -> None:
+    """Print the benchmark results."""
+    nb_sensors = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    step_seconds = int(sys.argv[2]) if len(sys.argv) > 2 else 120
+    dt_util.utcnow = lambda: NOW
+
+    with tempfile.TemporaryDirectory() as config_dir:
+        coordinator = SimpleNamespace(
+            entry_id=TEST_ENTRY_ID,
+            config_entry=SimpleNamespace(data={}),
+            hass=SimpleNamespace(config=SimpleNamespace(config_dir=config_dir)),
+            stop_requested=False,
+        )
+        (Path(config_dir) / ".storage").mkdir()
+        db = AreaOccupancyDB(coordinator)
+        Base.metadata.create_all(db.engine)
+
+        occupancy = generate_occupancy(NOW, seed=0)
+        sensors, samples, aggregates = generate_sensors(
+            nb_sensors, NOW, occupancy, seed=1, step_seconds=step_seconds
+        )
+        insert_rows(db, samples, aggregates, occupancy)
+        with db.get_session() as session:
+            session.execute(sa.text("ANALYZE"))
+        print(
+            f"{nb_sensors} sensors, {len(samples)} raw samples, "
+            f"{len(aggregates)} hourly aggregates"
+        )
+
+        period_start = NOW - timedelta(days=ANALYSIS_DAYS)
+        start = time.perf_counter()
+        former = {
+            entity_id: reference_correlation(
+                db, entity_id, input_type, period_start, NOW
+            )
+            for entity_id, input_type in sensors.items()
+        }
+        former_s = time.perf_counter() - start
+
+        start = time.perf_counter()
+        columnar = analyze_area_numeric_correlations(db, AREA, sensors, ANALYSIS_DAYS)
+        columnar_s = time.perf_counter() - start
+        db.engine.dispose()
+
+    difference = max(
+        abs(
+            former[entity_id]["correlation_coefficient"]
+            - columnar[entity_id]["correlation_coefficient"]
+        )
+        for entity_id in sensors
+    )
+    print(f"    per entity: {former_s * 1000:8.1f} ms")
+    print(f"      columnar: {columnar_s * 1000:8.1f} ms")
+    print(f"       speedup: {former_s / columnar_s:8.1f}x")
+    print(f"max coefficient difference: {difference:.2e}")
+
+
+if __name__ == "__main__":
+    main()
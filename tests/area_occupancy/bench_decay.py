@@ -0,0 +1,73 @@
+"""Micro-benchmark of one decay timer tick.
+
+Not collected by pytest. Run it from the repository root with:
+
+    python -m tests.area_occupancy.bench_decay [entities]
+
+It prints the time of one tick of all decaying entities, calling Decay.tick()
+on each of them and with tick_decays(). None of the models expires during the
+run, so every repetition does the same work.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+from datetime import timedelta
+import random
+import sys
+import time
+
+from custom_components.area_occupancy.data.decay import Decay, tick_decays
+from custom_components.area_occupancy.data.purpose import AreaPurpose
+from homeassistant.util import dt as dt_util
+
+from .test_decay import SLEEP_WINDOWS
+
+
+def bench(tick: Callable[[list[Decay]], object], decays: list[Decay]) -> float:
+    """Return the best time of one tick over the decays, in microseconds."""
+    best = float("inf")
+    for _ in range(200):
+        start = time.perf_counter()
+        tick(decays)
+        best = min(best, time.perf_counter() - start)
+    return best * 1e6
+
+
+def per_entity(decays: list[Decay]) -> None:
+    """Tick each model, as the decay timer did."""
+    for decay in decays:
+        decay.tick()
+
+
+def main() -> None:
+    """Print the benchmark results."""
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    rng = random.Random(0)
+    now = dt_util.utcnow()
+    purposes = list(AreaPurpose)
+    decays = []
+    for _ in range(count):
+        sleep_start, sleep_end = rng.choice(SLEEP_WINDOWS)
+        decays.append(
+            Decay(
+                half_life=rng.uniform(900.0, 3600.0),
+                is_decaying=True,
+                decay_start=now - timedelta(seconds=rng.uniform(0.0, 60.0)),
+                purpose=rng.choice(purposes).value,
+                sleep_start=sleep_start,
+                sleep_end=sleep_end,
+            )
+        )
+
+    per_entity_us = bench(per_entity, decays)
+    vectorized_us = bench(tick_decays, decays)
+    assert all(decay.is_decaying for decay in decays)
+    print(f"{count} decaying entities")
+    print(f"  Decay.tick(): {per_entity_us:8.1f} us")
+    print(f" tick_decays(): {vectorized_us:8.1f} us")
+    print(f"       speedup: {per_entity_us / vectorized_us:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
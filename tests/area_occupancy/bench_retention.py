@@ -0,0 +1,195 @@
+"""Benchmark of a retention run on a large synthetic database.
+
+Not collected by pytest. Run it from the repository root with:
+
+    python -m tests.area_occupancy.bench_retention [size_mb]
+
+It builds a database of raw numeric samples spread over 28 days, half of them
+past the retention of their tier, 500 MB by default. On two copies of it, it
+prints the time and the longest write transaction of the single DELETE the
+retention used to run, and of run_retention with its batched deletes and the
+page reclamation, with the database file size before and after.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+import os
+from pathlib import Path
+import random
+import shutil
+import sys
+import tempfile
+import time
+from types import SimpleNamespace
+from typing import Any
+
+import sqlalchemy as sa
+
+from custom_components.area_occupancy.const import DB_NAME
+from custom_components.area_occupancy.db.core import AreaOccupancyDB
+from custom_components.area_occupancy.db.retention import (
+    INTERVAL_AGGREGATION,
+    NUMERIC_AGGREGATION,
+    TIERS_BY_NAME,
+    run_retention,
+)
+from custom_components.area_occupancy.db.schema import Base
+from custom_components.area_occupancy.time_utils import to_db_utc
+from homeassistant.util import dt as dt_util
+
+from .conftest import TEST_ENTRY_ID
+
+NOW = datetime(2026, 6, 15, 12, 0, tzinfo=dt_util.UTC)
+NB_SENSORS = 50
+CHUNK_ROWS = 50_000
+
+
+def open_db(config_dir: str) -> AreaOccupancyDB:
+    """Return a database stored in config_dir."""
+    return AreaOccupancyDB(
+        SimpleNamespace(
+            entry_id=TEST_ENTRY_ID,
+            config_entry=SimpleNamespace(data={}),
+            hass=SimpleNamespace(config=SimpleNamespace(config_dir=config_dir)),
+            stop_requested=False,
+        )
+    )
+
+
+def build(config_dir: str, size_mb: int) -> int:
+    """Fill a new database with numeric samples up to size_mb, return the rows."""
+    db = open_db(config_dir)
+    Base.metadata.create_all(db.engine)
+    rng = random.Random(0)
+    span = timedelta(days=28).total_seconds()
+    fmt = "%Y-%m-%d %H:%M:%S.%f"
+    created = to_db_utc(NOW).strftime(fmt)
+    insert = (
+        "INSERT INTO numeric_samples (entry_id, area_name, entity_id, timestamp, "
+        "value, unit_of_measurement, state, created_at) "
+        "VALUES (?, ?, ?, ?, ?, ?, ?, ?)"
+    )
+    nb_rows = 0
+    conn = db.engine.raw_connection()
+    try:
+        while os.path.getsize(db.db_path) < size_mb * 1024 * 1024:
+            rows = []
+            for i in range(nb_rows, nb_rows + CHUNK_ROWS):
+                value = round(rng.gauss(21.0, 2.0), 2)
+                timestamp = to_db_utc(NOW - timedelta(seconds=rng.uniform(0, span)))
+                rows.append(
+                    (
+                        TEST_ENTRY_ID,
+                        f"Area {i % 10}",
+                        f"sensor.temperature_{i % NB_SENSORS}",
+                        timestamp.strftime(fmt),
+                        value,
+                        "°C",
+                        str(value),
+                        created,
+                    )
+                )
+            conn.cursor().executemany(insert, rows)
+            conn.commit()
+            nb_rows += CHUNK_ROWS
+    finally:
+        conn.close()
+    db.engine.dispose()
+    return nb_rows
+
+
+@contextmanager
+def transaction_times(db: AreaOccupancyDB) -> Iterator[list[float]]:
+    """Record the duration of each write transaction, in seconds."""
+    durations: list[float] = []
+    started: dict[int, float] = {}
+
+    def begin(conn: Any) -> None:
+        started[id(conn)] = time.perf_counter()
+
+    def commit(conn: Any) -> None:
+        if (start := started.pop(id(conn), None)) is not None:
+            durations.append(time.perf_counter() - start)
+
+    sa.event.listen(db.engine, "begin", begin)
+    sa.event.listen(db.engine, "commit", commit)
+    try:
+        yield durations
+    finally:
+        sa.event.remove(db.engine, "begin", begin)
+        sa.event.remove(db.engine, "commit", commit)
+
+
+def single_delete(db: AreaOccupancyDB) -> int:
+    """Delete the expired samples in one transaction, as before batching."""
+    tier = TIERS_BY_NAME["numeric_samples"]
+    cutoff = to_db_utc(NOW - tier.retained_for)
+    with db.get_session() as session:
+        deleted = session.execute(
+            sa.delete(db.NumericSamples).where(db.NumericSamples.timestamp < cutoff)
+        ).rowcount
+        session.commit()
+    return deleted
+
+
+def batched_retention(db: AreaOccupancyDB) -> int:
+    """Run the retention engine over every tier."""
+    stats = run_retention(
+        db,
+        force=True,
+        now=NOW,
+        promoted={INTERVAL_AGGREGATION, NUMERIC_AGGREGATION},
+    )
+    print(
+        f"    reclaim: {stats['action']}, "
+        f"{stats['reclaimed_bytes'] / 1024 / 1024:.1f} MB reported"
+    )
+    return stats["rows_deleted"]
+
+
+def bench(template: Path, name: str, prune: Callable[[AreaOccupancyDB], int]) -> None:
+    """Run prune on a copy of the template database and print the results."""
+    with tempfile.TemporaryDirectory() as config_dir:
+        (Path(config_dir) / ".storage").mkdir()
+        path = Path(config_dir) / ".storage" / DB_NAME
+        shutil.copyfile(template, path)
+        db = open_db(config_dir)
+        size_before = os.path.getsize(path)
+        print(f"{name}:")
+        with transaction_times(db) as durations:
+            start = time.perf_counter()
+            deleted = prune(db)
+            elapsed = time.perf_counter() - start
+        db.engine.dispose()
+        print(f"    {deleted} rows deleted in {elapsed:.2f} s")
+        print(
+            f"    {len(durations)} write transactions, "
+            f"longest {max(durations) * 1000:.0f} ms"
+        )
+        print(
+            f"    file: {size_before / 1024 / 1024:.1f} MB -> "
+            f"{os.path.getsize(path) / 1024 / 1024:.1f} MB"
+        )
+
+
+def main() -> None:
+    """Print the benchmark results."""
+    size_mb = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    with tempfile.TemporaryDirectory() as config_dir:
+        start = time.perf_counter()
+        nb_rows = build(config_dir, size_mb)
+        template = Path(config_dir) / ".storage" / DB_NAME
+        print(
+            f"{nb_rows} numeric samples, "
+            f"{os.path.getsize(template) / 1024 / 1024:.1f} MB, "
+            f"built in {time.perf_counter() - start:.1f} s"
+        )
+        bench(template, "single DELETE", single_delete)
+        bench(template, "run_retention", batched_retention)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,28 @@
+"""Fixtures for the Area Occupancy Detection tests."""
+
+from __future__ import annotations
+
+from collections.abc import Iterator
+from types import SimpleNamespace
+
+import pytest
+
+from custom_components.area_occupancy.db.core import AreaOccupancyDB
+from custom_components.area_occupancy.db.schema import Base
+
+TEST_ENTRY_ID = "test_entry"
+
+
+@pytest.fixture
+def db(tmp_path) -> Iterator[AreaOccupancyDB]:
+    """Return a database on a fresh SQLite file, with every table created."""
+    coordinator = SimpleNamespace(
+        entry_id=TEST_ENTRY_ID,
+        config_entry=SimpleNamespace(data={}),
+        hass=SimpleNamespace(config=SimpleNamespace(config_dir=str(tmp_path))),
+        stop_requested=False,
+    )
+    database = AreaOccupancyDB(coordinator)
+    Base.metadata.create_all(database.engine)
+    yield database
+    database.engine.dispose()
@@ -0,0 +1,325 @@
+"""Generated numeric sensor data and the per-entity correlation it replaced.
+
+Shared by the correlation tests and the correlation benchmark.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+import math
+import random
+from typing import Any
+
+import numpy as np
+import sqlalchemy as sa
+
+from custom_components.area_occupancy.const import (
+    AGGREGATION_PERIOD_HOURLY,
+    CORRELATION_MODERATE_THRESHOLD,
+    CORRELATION_WEAK_THRESHOLD,
+    MIN_CORRELATION_SAMPLES,
+    RETENTION_RAW_NUMERIC_SAMPLES_DAYS,
+)
+from custom_components.area_occupancy.data.entity_type import (
+    CorrelationType,
+    InputType,
+)
+from custom_components.area_occupancy.db.core import AreaOccupancyDB
+from custom_components.area_occupancy.db.correlation import (
+    SimpleSample,
+    calculate_pearson_correlation,
+)
+from custom_components.area_occupancy.db.utils import (
+    get_occupied_intervals_for_analysis,
+    is_timestamp_in_prepared_intervals,
+    prepare_occupied_intervals,
+)
+from custom_components.area_occupancy.time_utils import (
+    from_db_utc,
+    to_db_utc,
+    to_utc,
+)
+
+from .conftest import TEST_ENTRY_ID
+
+AREA = "Office"
+ANALYSIS_DAYS = 30
+# A day without any occupancy, inside the raw sample retention window
+QUIET_DAY_OFFSET = 3
+
+Interval = tuple[datetime, datetime]
+
+# How the value of each kind of sensor follows occupancy: (base, occupied
+# offset, noise). A sensor with a zero offset does not correlate.
+SENSOR_KINDS: dict[InputType, tuple[float, float, float]] = {
+    InputType.CO2: (420.0, 350.0, 60.0),
+    InputType.TEMPERATURE: (19.5, 1.2, 0.6),
+    InputType.HUMIDITY: (45.0, 4.0, 3.0),
+    InputType.ILLUMINANCE: (300.0, -120.0, 80.0),
+    InputType.PRESSURE: (1013.0, 0.0, 2.0),
+    InputType.SOUND_PRESSURE: (35.0, 8.0, 4.0),
+}
+
+
+def generate_occupancy(end: datetime, seed: int) -> list[Interval]:
+    """Return occupied intervals over the analysis period, none on the quiet day."""
+    rng = random.Random(seed)
+    quiet_start = end - timedelta(days=QUIET_DAY_OFFSET)
+    quiet_end = quiet_start + timedelta(days=1)
+    current = end - timedelta(days=ANALYSIS_DAYS + 1)
+    intervals: list[Interval] = []
+    while current < end:
+        duration = timedelta(minutes=rng.randint(10, 240))
+        if not (current < quiet_end and current + duration > quiet_start):
+            intervals.append((current, min(current + duration, end)))
+        current += duration + timedelta(minutes=rng.randint(10, 600))
+    return intervals
+
+
+def generate_sensors(
+    nb: int, end: datetime, occupancy: list[Interval], seed: int, step_seconds: int
+) -> tuple[dict[str, InputType], list[dict[str, Any]], list[dict[str, Any]]]:
+    """Return nb sensors and their raw sample and hourly aggregate rows.
+
+    The values follow occupancy. Raw samples are taken every step_seconds over
+    the raw retention window, hourly aggregates cover the rest of the analysis
+    period.
+    """
+    rng = random.Random(seed)
+    kinds = list(SENSOR_KINDS)
+    sensors = {
+        f"sensor.{kinds[i % len(kinds)].value}_{i}": kinds[i % len(kinds)]
+        for i in range(nb)
+    }
+    starts, ends = prepare_occupied_intervals(occupancy)
+    raw_start = end - timedelta(days=RETENTION_RAW_NUMERIC_SAMPLES_DAYS)
+    first_hour = (end - timedelta(days=ANALYSIS_DAYS + 1)).replace(
+        minute=0, second=0, microsecond=0
+    )
+
+    def value(kind: InputType, timestamp: datetime) -> float:
+        base, offset, noise = SENSOR_KINDS[kind]
+        occupied = is_timestamp_in_prepared_intervals(timestamp, starts, ends)
+        return base + (offset if occupied else 0.0) + rng.gauss(0.0, noise)
+
+    samples: list[dict[str, Any]] = []
+    aggregates: list[dict[str, Any]] = []
+    created = to_db_utc(end)
+    for entity_id, kind in sensors.items():
+        timestamp = raw_start + timedelta(seconds=rng.randint(0, step_seconds))
+        while timestamp <= end:
+            samples.append(
+                {
+                    "entry_id": TEST_ENTRY_ID,
+                    "area_name": AREA,
+                    "entity_id": entity_id,
+                    "timestamp": to_db_utc(timestamp),
+                    "value": value(kind, timestamp),
+                    "created_at": created,
+                }
+            )
+            timestamp += timedelta(seconds=step_seconds)
+        hour = first_hour
+        while hour < raw_start:
+            values = [value(kind, hour + timedelta(minutes=m)) for m in (10, 30, 50)]
+            aggregates.append(
+                {
+                    "entry_id": TEST_ENTRY_ID,
+                    "area_name": AREA,
+                    "entity_id": entity_id,
+                    "aggregation_period": AGGREGATION_PERIOD_HOURLY,
+                    "period_start": to_db_utc(hour),
+                    "period_end": to_db_utc(hour + timedelta(hours=1)),
+                    "avg_value": sum(values) / len(values),
+                    "min_value": min(values),
+                    "max_value": max(values),
+                    "sample_count": len(values),
+                    "created_at": created,
+                }
+            )
+            hour += timedelta(hours=1)
+    return sensors, samples, aggregates
+
+
+def insert_rows(
+    db: AreaOccupancyDB,
+    samples: list[dict[str, Any]],
+    aggregates: list[dict[str, Any]],
+    occupancy: list[Interval],
+) -> None:
+    """Store generated sensor rows and the occupancy cache."""
+    with db.get_session() as session:
+        if samples:
+            session.execute(sa.insert(db.NumericSamples), samples)
+        if aggregates:
+            session.execute(sa.insert(db.NumericAggregates), aggregates)
+        session.commit()
+    db.save_occupied_intervals_cache(AREA, occupancy)
+
+
+def insert_samples(
+    db: AreaOccupancyDB, entity_id: str, timestamps: list[datetime], value: float
+) -> None:
+    """Store raw samples of one sensor."""
+    with db.get_session() as session:
+        session.execute(
+            sa.insert(db.NumericSamples),
+            [
+                {
+                    "entry_id": TEST_ENTRY_ID,
+                    "area_name": AREA,
+                    "entity_id": entity_id,
+                    "timestamp": to_db_utc(timestamp),
+                    "value": value + i % 7,
+                    "created_at": to_db_utc(timestamp),
+                }
+                for i, timestamp in enumerate(timestamps)
+            ],
+        )
+        session.commit()
+
+
+def reference_correlation(
+    db: AreaOccupancyDB,
+    entity_id: str,
+    input_type: InputType | None,
+    period_start: datetime,
+    period_end: datetime,
+) -> dict[str, Any]:
+    """Analyze one numeric sensor the way the per-entity path did.
+
+    One ORM object and one sample object per row, a membership check per
+    sample and the statistics over Python lists.
+    """
+    period_start_utc = to_utc(period_start)
+    period_end_utc = to_utc(period_end)
+    result: dict[str, Any] = {
+        "entity_id": entity_id,
+        "input_type": input_type.value if input_type else InputType.UNKNOWN.value,
+        "correlation_coefficient": 0.0,
+        "sample_count": 0,
+        "correlation_type": CorrelationType.NONE,
+        "confidence": 0.0,
+    }
+    retention_cutoff = period_end_utc - timedelta(
+        days=RETENTION_RAW_NUMERIC_SAMPLES_DAYS
+    )
+    recent_start = max(period_start_utc, retention_cutoff)
+    with db.get_session() as session:
+        recent = (
+            session.query(db.NumericSamples)
+            .filter(
+                db.NumericSamples.entry_id == TEST_ENTRY_ID,
+                db.NumericSamples.area_name == AREA,
+                db.NumericSamples.entity_id == entity_id,
+                db.NumericSamples.timestamp >= to_db_utc(recent_start),
+                db.NumericSamples.timestamp <= to_db_utc(period_end_utc),
+            )
+            .order_by(db.NumericSamples.timestamp)
+            .all()
+        )
+        samples = [
+            SimpleSample(from_db_utc(row.timestamp), float(row.value)) for row in recent
+        ]
+        if period_start_utc < retention_cutoff:
+            historical_end = min(period_end_utc, retention_cutoff)
+            aggregates = (
+                session.query(db.NumericAggregates)
+                .filter(
+                    db.NumericAggregates.entry_id == TEST_ENTRY_ID,
+                    db.NumericAggregates.area_name == AREA,
+                    db.NumericAggregates.entity_id == entity_id,
+                    db.NumericAggregates.aggregation_period
+                    == AGGREGATION_PERIOD_HOURLY,
+                    db.NumericAggregates.period_start < to_db_utc(historical_end),
+                    db.NumericAggregates.period_end > to_db_utc(period_start_utc),
+                )
+                .order_by(db.NumericAggregates.period_start)
+                .all()
+            )
+            for aggregate in aggregates:
+                start = max(from_db_utc(aggregate.period_start), period_start_utc)
+                end = min(from_db_utc(aggregate.period_end), historical_end)
+                midpoint = start + (end - start) / 2
+                if period_start_utc <= midpoint <= historical_end:
+                    samples.append(SimpleSample(midpoint, float(aggregate.avg_value)))
+    samples.sort(key=lambda sample: sample.timestamp)
+
+    if len(samples) < MIN_CORRELATION_SAMPLES:
+        result.update(sample_count=len(samples), analysis_error="too_few_samples")
+        return result
+
+    starts, ends = prepare_occupied_intervals(
+        get_occupied_intervals_for_analysis(db, AREA, period_start, period_end)
+    )
+    values = [sample.value for sample in samples]
+    flags = [
+        1.0
+        if is_timestamp_in_prepared_intervals(sample.timestamp, starts, ends)
+        else 0.0
+        for sample in samples
+    ]
+    correlation, _ = calculate_pearson_correlation(values, flags)
+    occupied = [v for v, flag in zip(values, flags, strict=True) if flag == 1.0]
+    unoccupied = [v for v, flag in zip(values, flags, strict=True) if flag == 0.0]
+    result["sample_count"] = len(values)
+    if not occupied:
+        result["analysis_error"] = "no_occupied_samples"
+        return result
+    if not unoccupied:
+        result["analysis_error"] = "no_unoccupied_samples"
+        return result
+
+    abs_correlation = abs(correlation)
+    analysis_error = None
+    if abs_correlation >= CORRELATION_MODERATE_THRESHOLD:
+        correlation_type = (
+            CorrelationType.STRONG_POSITIVE
+            if correlation > 0
+            else CorrelationType.STRONG_NEGATIVE
+        )
+    elif abs_correlation >= CORRELATION_WEAK_THRESHOLD:
+        correlation_type = (
+            CorrelationType.POSITIVE if correlation > 0 else CorrelationType.NEGATIVE
+        )
+    else:
+        correlation_type = CorrelationType.NONE
+        analysis_error = "no_correlation"
+    mean_occupied = float(np.mean(occupied))
+    mean_unoccupied = float(np.mean(unoccupied))
+    std_occupied = float(np.std(occupied))
+    std_unoccupied = float(np.std(unoccupied))
+    result.update(
+        {
+            "correlation_coefficient": correlation,
+            "correlation_type": correlation_type,
+            "analysis_error": analysis_error,
+            "confidence": min(
+                1.0, abs_correlation * (1.0 - MIN_CORRELATION_SAMPLES / len(values))
+            ),
+            "mean_value_when_occupied": mean_occupied,
+            "mean_value_when_unoccupied": mean_unoccupied,
+            "std_dev_when_occupied": std_occupied,
+            "std_dev_when_unoccupied": std_unoccupied,
+            "threshold_active": mean_occupied + std_occupied,
+            "threshold_inactive": mean_unoccupied - std_unoccupied,
+        }
+    )
+    return result
+
+
+def comparable(result: dict[str, Any]) -> dict[str, Any]:
+    """Return the analysis fields of a result, without the period and dates."""
+    return {
+        key: value
+        for key, value in result.items()
+        if key
+        not in (
+            "entry_id",
+            "area_name",
+            "analysis_period_start",
+            "analysis_period_end",
+            "calculation_date",
+        )
+        and not (isinstance(value, float) and math.isnan(value))
+    }
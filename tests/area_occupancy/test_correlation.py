@@ -0,0 +1,137 @@
+"""Columnar numeric correlation against the per-entity path it replaced."""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+
+import pytest
+
+from custom_components.area_occupancy.const import (
+    RETENTION_RAW_NUMERIC_SAMPLES_DAYS,
+)
+from custom_components.area_occupancy.data.entity_type import InputType
+from custom_components.area_occupancy.db.core import AreaOccupancyDB
+from custom_components.area_occupancy.db.correlation import (
+    analyze_area_numeric_correlations,
+    analyze_correlation,
+)
+from homeassistant.util import dt as dt_util
+
+from .correlation_data import (
+    ANALYSIS_DAYS,
+    AREA,
+    QUIET_DAY_OFFSET,
+    comparable,
+    generate_occupancy,
+    generate_sensors,
+    insert_rows,
+    insert_samples,
+    reference_correlation,
+)
+
+NOW = datetime(2026, 6, 15, 12, 0, tzinfo=dt_util.UTC)
+NB_SENSORS = 12
+# A few hundred raw samples per sensor over the raw retention window
+STEP_SECONDS = 1800
+TOO_FEW = "sensor.too_few"
+QUIET_ONLY = "sensor.quiet_day_only"
+BOUNDARIES = "sensor.on_boundaries"
+
+
+@pytest.fixture(autouse=True)
+def fixed_now(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Analyze the same period as the generated data."""
+    monkeypatch.setattr(dt_util, "utcnow", lambda: NOW)
+
+
+@pytest.fixture
+def sensors(db: AreaOccupancyDB) -> dict[str, InputType]:
+    """Store generated sensors, plus edge cases."""
+    occupancy = generate_occupancy(NOW, seed=3)
+    sensors, samples, aggregates = generate_sensors(
+        NB_SENSORS, NOW, occupancy, seed=4, step_seconds=STEP_SECONDS
+    )
+    insert_rows(db, samples, aggregates, occupancy)
+
+    insert_samples(db, TOO_FEW, [NOW - timedelta(hours=i) for i in range(1, 21)], 10.0)
+    quiet_start = NOW - timedelta(days=QUIET_DAY_OFFSET)
+    insert_samples(
+        db,
+        QUIET_ONLY,
+        [quiet_start + timedelta(minutes=5 * i) for i in range(1, 200)],
+        50.0,
+    )
+    # Samples on the start and the end of each occupied interval, and a
+    # minute around them
+    raw_start = NOW - timedelta(days=RETENTION_RAW_NUMERIC_SAMPLES_DAYS)
+    insert_samples(
+        db,
+        BOUNDARIES,
+        [
+            edge + timedelta(minutes=shift)
+            for interval in occupancy
+            for edge in interval
+            for shift in (-1, 0, 1)
+            if raw_start < edge < NOW
+        ],
+        100.0,
+    )
+    return {
+        **sensors,
+        TOO_FEW: InputType.CO2,
+        QUIET_ONLY: InputType.HUMIDITY,
+        BOUNDARIES: InputType.SOUND_PRESSURE,
+    }
+
+
+def assert_same_result(actual: dict, expected: dict) -> None:
+    """Compare two results, the statistics up to float rounding."""
+    actual, expected = comparable(actual), comparable(expected)
+    assert actual.keys() == expected.keys()
+    for key, value in expected.items():
+        if isinstance(value, float):
+            assert actual[key] == pytest.approx(value, rel=1e-9, abs=1e-9), key
+        else:
+            assert actual[key] == value, key
+
+
+def test_matches_per_entity_path(
+    db: AreaOccupancyDB, sensors: dict[str, InputType]
+) -> None:
+    """Every sensor of the area gets the result of the per-entity analysis."""
+    results = analyze_area_numeric_correlations(db, AREA, sensors, ANALYSIS_DAYS)
+
+    assert results.keys() == sensors.keys()
+    period_start = NOW - timedelta(days=ANALYSIS_DAYS)
+    for entity_id, input_type in sensors.items():
+        expected = reference_correlation(db, entity_id, input_type, period_start, NOW)
+        assert_same_result(results[entity_id], expected)
+
+    assert results[TOO_FEW]["analysis_error"] == "too_few_samples"
+    assert results[QUIET_ONLY]["analysis_error"] == "no_occupied_samples"
+    correlated = [
+        entity_id
+        for entity_id, input_type in sensors.items()
+        if input_type is not InputType.PRESSURE
+        and entity_id not in (TOO_FEW, QUIET_ONLY, BOUNDARIES)
+    ]
+    assert all(results[entity_id]["analysis_error"] is None for entity_id in correlated)
+    assert all(
+        results[entity_id]["correlation_coefficient"] < 0
+        for entity_id in correlated
+        if sensors[entity_id] is InputType.ILLUMINANCE
+    )
+
+
+def test_analyze_correlation_uses_area_path(
+    db: AreaOccupancyDB, sensors: dict[str, InputType]
+) -> None:
+    """The per-entity entry point returns the area result for numeric sensors."""
+    results = analyze_area_numeric_correlations(db, AREA, sensors, ANALYSIS_DAYS)
+
+    for entity_id, input_type in sensors.items():
+        result = analyze_correlation(
+            db, AREA, entity_id, ANALYSIS_DAYS, input_type=input_type
+        )
+        assert result is not None
+        assert_same_result(result, results[entity_id])
@@ -0,0 +1,129 @@
+"""Vectorized decay tick against the per-entity Decay model."""
+
+from __future__ import annotations
+
+from collections.abc import Iterator
+import copy
+from datetime import datetime, timedelta
+import random
+
+import pytest
+
+from custom_components.area_occupancy.data.decay import Decay, tick_decays
+from custom_components.area_occupancy.data.purpose import AreaPurpose
+from custom_components.area_occupancy.time_utils import to_local
+from homeassistant.util import dt as dt_util
+
+NB_DECAYS = 500
+SLEEP_WINDOWS = (
+    ("23:00:00", "07:00:00"),
+    ("13:00:00", "15:00:00"),
+    (None, None),
+    ("23:00:00", None),
+)
+PARIS = dt_util.get_time_zone("Europe/Paris")
+# Local times around both sleep windows' bounds, and the spring DST change
+LOCAL_NOWS = (
+    datetime(2026, 6, 15, 3, 0, tzinfo=PARIS),
+    datetime(2026, 6, 15, 6, 59, 59, tzinfo=PARIS),
+    datetime(2026, 6, 15, 7, 0, 0, tzinfo=PARIS),
+    datetime(2026, 6, 15, 7, 0, 1, tzinfo=PARIS),
+    datetime(2026, 6, 15, 13, 0, 0, tzinfo=PARIS),
+    datetime(2026, 6, 15, 15, 0, 1, tzinfo=PARIS),
+    datetime(2026, 6, 15, 22, 59, 59, tzinfo=PARIS),
+    datetime(2026, 6, 15, 23, 0, 0, tzinfo=PARIS),
+    datetime(2026, 3, 29, 3, 30, tzinfo=PARIS),
+)
+
+
+@pytest.fixture(autouse=True)
+def paris_time_zone() -> Iterator[None]:
+    """Evaluate the sleep windows in a local time zone with DST."""
+    previous = dt_util.get_default_time_zone()
+    dt_util.set_default_time_zone(PARIS)
+    yield
+    dt_util.set_default_time_zone(previous)
+
+
+def generate_decays(nb: int, now: datetime, seed: int) -> list[Decay]:
+    """Return decay models of every purpose, half-life, sleep window and age.
+
+    Some started in the future, some have an invalid half-life and some are
+    not decaying.
+    """
+    rng = random.Random(seed)
+    purposes = [None, *AreaPurpose, AreaPurpose.SLEEPING, AreaPurpose.SLEEPING]
+    decays = []
+    for _ in range(nb):
+        purpose = rng.choice(purposes)
+        sleep_start, sleep_end = rng.choice(SLEEP_WINDOWS)
+        if rng.random() < 0.95:
+            half_life = rng.uniform(5.0, 1800.0)
+        else:
+            half_life = rng.choice((0.0, -5.0))
+        decays.append(
+            Decay(
+                half_life=half_life,
+                is_decaying=rng.random() < 0.8,
+                decay_start=now - timedelta(seconds=rng.uniform(-120.0, 6000.0)),
+                purpose=purpose.value if purpose is not None else None,
+                sleep_start=sleep_start,
+                sleep_end=sleep_end,
+            )
+        )
+    return decays
+
+
+@pytest.mark.parametrize("local_now", LOCAL_NOWS, ids=lambda now: now.isoformat())
+def test_matches_per_entity_tick(
+    monkeypatch: pytest.MonkeyPatch, local_now: datetime
+) -> None:
+    """tick_decays stops the models whose decay_factor reached zero."""
+    now = dt_util.as_utc(local_now)
+    monkeypatch.setattr(dt_util, "utcnow", lambda: now)
+    decays = generate_decays(NB_DECAYS, now, seed=local_now.hour)
+    expected = copy.deepcopy(decays)
+
+    current_time = to_local(now).time()
+    expired = [decay.is_decaying and decay.decay_factor == 0.0 for decay in expected]
+    for decay in expected:
+        assert decay.half_life_at(current_time) == decay.half_life
+        decay.tick()
+
+    stopped = tick_decays(decays, now)
+
+    assert [decay.is_decaying for decay in decays] == [
+        decay.is_decaying for decay in expected
+    ]
+    assert stopped == sum(expired)
+    assert stopped > 0
+    assert any(decay.is_decaying for decay in decays)
+
+
+def test_sleep_window_half_life(monkeypatch: pytest.MonkeyPatch) -> None:
+    """A sleeping area decays with its awake half-life outside the window."""
+    decay = Decay(
+        half_life=3600.0,
+        purpose=AreaPurpose.SLEEPING.value,
+        sleep_start="23:00:00",
+        sleep_end="07:00:00",
+    )
+    awake = decay.purpose.awake_half_life
+    assert awake is not None
+
+    for local_now, half_life in (
+        (datetime(2026, 6, 15, 6, 59, 59, tzinfo=PARIS), 3600.0),
+        (datetime(2026, 6, 15, 7, 0, 1, tzinfo=PARIS), awake),
+        (datetime(2026, 6, 15, 23, 0, 0, tzinfo=PARIS), 3600.0),
+    ):
+        now = dt_util.as_utc(local_now)
+        monkeypatch.setattr(dt_util, "utcnow", lambda now=now: now)
+        decay.is_decaying = True
+        # Past the 5% cut-off with the awake half-life only
+        decay.decay_start = now - timedelta(seconds=awake * 4.4)
+        assert decay.half_life == half_life
+        assert tick_decays([decay], now) == (half_life == awake)
+        assert decay.is_decaying == (half_life != awake)
+
+    decay.sleep_end = None
+    assert decay.half_life == 3600.0
@@ -0,0 +1,291 @@
+"""Retention engine: batched deletes, promoted tiers and page reclamation."""
+
+from __future__ import annotations
+
+from collections.abc import Iterator
+from datetime import datetime, timedelta
+import os
+from typing import Any
+
+import pytest
+import sqlalchemy as sa
+
+from custom_components.area_occupancy.db import retention
+from custom_components.area_occupancy.db.core import AreaOccupancyDB
+from custom_components.area_occupancy.db.retention import (
+    INTERVAL_AGGREGATION,
+    NUMERIC_AGGREGATION,
+    RETENTION_TIERS,
+    RetentionTier,
+    delete_in_batches,
+    reclaim_free_pages,
+    run_retention,
+)
+from custom_components.area_occupancy.time_utils import to_db_utc
+from homeassistant.util import dt as dt_util
+
+from .conftest import TEST_ENTRY_ID
+
+NOW = datetime(2026, 6, 15, 12, 0, tzinfo=dt_util.UTC)
+AREA = "Kitchen"
+BATCH = 50
+PROMOTED_TIERS = [tier.name for tier in RETENTION_TIERS if tier.promoted_by]
+
+
+def tier_row(tier: RetentionTier, timestamp: datetime, index: int) -> dict[str, Any]:
+    """Return a row of the tier's table, dated by its retention time column."""
+    when = to_db_utc(timestamp)
+    row: dict[str, Any] = {
+        "entry_id": TEST_ENTRY_ID,
+        "area_name": AREA,
+        "created_at": when,
+        tier.time_column: when,
+    }
+    if tier.period is not None:
+        row["aggregation_period"] = tier.period
+    if tier.model == "Intervals":
+        row.update(
+            entity_id=f"binary_sensor.motion_{index}",
+            state="on",
+            end_time=to_db_utc(timestamp + timedelta(minutes=5)),
+            duration_seconds=300.0,
+        )
+    elif tier.model == "IntervalAggregates":
+        row.update(
+            entity_id=f"binary_sensor.motion_{index}",
+            period_end=to_db_utc(timestamp + timedelta(days=1)),
+            state="on",
+            interval_count=1,
+            total_duration_seconds=300.0,
+        )
+    elif tier.model == "CrossAreaStats":
+        row.pop("area_name")
+        row.update(
+            statistic_type="transition_count",
+            statistic_name=f"{AREA} -> Area {index}",
+            period_end=to_db_utc(timestamp + timedelta(days=1)),
+            statistic_value=1.0,
+        )
+    elif tier.model == "NumericSamples":
+        row.update(entity_id=f"sensor.temperature_{index}", value=20.0)
+    else:
+        row.update(
+            entity_id=f"sensor.temperature_{index}",
+            period_end=to_db_utc(timestamp + timedelta(hours=1)),
+            sample_count=1,
+        )
+    return row
+
+
+def insert_tier_rows(
+    db: AreaOccupancyDB, tier: RetentionTier, timestamps: list[datetime]
+) -> None:
+    """Store one row of the tier's table per timestamp."""
+    with db.get_session() as session:
+        session.execute(
+            sa.insert(getattr(db, tier.model)),
+            [tier_row(tier, ts, i) for i, ts in enumerate(timestamps)],
+        )
+        session.commit()
+
+
+def tier_count(db: AreaOccupancyDB, tier: RetentionTier) -> int:
+    """Return the number of rows of the tier's table and period."""
+    model = getattr(db, tier.model)
+    query = sa.select(sa.func.count()).select_from(model)
+    if tier.period is not None:
+        query = query.where(model.aggregation_period == tier.period)
+    with db.get_session() as session:
+        return session.execute(query).scalar_one()
+
+
+@pytest.fixture
+def delete_statements(db: AreaOccupancyDB) -> Iterator[list[str]]:
+    """Record the DELETE statements sent to the database."""
+    statements: list[str] = []
+
+    def record(conn, cursor, statement, parameters, context, executemany) -> None:
+        if statement.lstrip().upper().startswith("DELETE"):
+            statements.append(statement)
+
+    sa.event.listen(db.engine, "before_cursor_execute", record)
+    yield statements
+    sa.event.remove(db.engine, "before_cursor_execute", record)
+
+
+@pytest.mark.parametrize(
+    "nb_expired", [0, 1, BATCH - 1, BATCH, BATCH + 1, 3 * BATCH, 3 * BATCH + 7]
+)
+def test_delete_in_batches_boundaries(
+    db: AreaOccupancyDB, delete_statements: list[str], nb_expired: int
+) -> None:
+    """Every expired row is deleted, one short transaction per batch."""
+    tier = retention.TIERS_BY_NAME["numeric_samples"]
+    cutoff = NOW - timedelta(days=1)
+    insert_tier_rows(
+        db,
+        tier,
+        [cutoff - timedelta(minutes=i + 1) for i in range(nb_expired)]
+        + [cutoff + timedelta(minutes=i) for i in range(20)],
+    )
+
+    deleted = delete_in_batches(
+        db,
+        db.NumericSamples,
+        db.NumericSamples.timestamp < to_db_utc(cutoff),
+        batch_size=BATCH,
+    )
+
+    assert deleted == nb_expired
+    # A batch smaller than the batch size ends the loop, an empty one too
+    assert len(delete_statements) == nb_expired // BATCH + 1
+    assert tier_count(db, tier) == 20
+
+
+def test_promoted_tiers_skipped_until_promoted(db: AreaOccupancyDB) -> None:
+    """Promoted tiers are only pruned once their aggregation completed."""
+    for tier in RETENTION_TIERS:
+        insert_tier_rows(
+            db,
+            tier,
+            [
+                # Expired, including the promotion grace
+                NOW - tier.retained_for - timedelta(days=1),
+                # Past the aggregation cutoff but within the grace, expired
+                # for terminal tiers
+                NOW - tier.max_age - timedelta(hours=1),
+                NOW - timedelta(hours=1),
+            ],
+        )
+    # Rows of another period of a promoted tier's table are left alone
+    other = RetentionTier(
+        "other", "NumericAggregates", "period_start", timedelta(), "yearly"
+    )
+    insert_tier_rows(db, other, [NOW - timedelta(days=10 * 365)])
+
+    stats = run_retention(db, force=True, now=NOW, promoted=())
+    assert stats["skipped_tiers"] == PROMOTED_TIERS
+    assert stats["deleted"] == {
+        tier.name: 2 for tier in RETENTION_TIERS if tier.promoted_by is None
+    }
+    for tier in RETENTION_TIERS:
+        assert tier_count(db, tier) == (3 if tier.promoted_by else 1), tier.name
+
+    stats = run_retention(db, force=True, now=NOW, promoted={INTERVAL_AGGREGATION})
+    assert stats["skipped_tiers"] == ["numeric_samples", "numeric_hourly"]
+    assert stats["deleted"]["interval_daily"] == 1
+    assert stats["deleted"]["interval_weekly"] == 1
+
+    stats = run_retention(
+        db, force=True, now=NOW, promoted={INTERVAL_AGGREGATION, NUMERIC_AGGREGATION}
+    )
+    assert stats["skipped_tiers"] == []
+    assert stats["deleted"]["numeric_samples"] == 1
+    assert stats["deleted"]["numeric_hourly"] == 1
+    for tier in RETENTION_TIERS:
+        assert tier_count(db, tier) == (2 if tier.promoted_by else 1), tier.name
+    assert tier_count(db, other) == 1
+
+
+def test_throttle(db: AreaOccupancyDB, monkeypatch: pytest.MonkeyPatch) -> None:
+    """A second run within the throttle does nothing unless forced.
+
+    Retention runs and interval prunes share the throttle.
+    """
+    tier = retention.TIERS_BY_NAME["intervals"]
+    assert run_retention(db, now=NOW)["rows_deleted"] == 0
+
+    insert_tier_rows(db, tier, [NOW - tier.retained_for - timedelta(days=1)] * 2)
+    later = NOW + timedelta(seconds=retention.RETENTION_THROTTLE_SECONDS - 1)
+    monkeypatch.setattr(dt_util, "utcnow", lambda: later)
+    assert run_retention(db, now=later) == {}
+    assert db.prune_old_intervals() == 0
+    assert db.prune_old_intervals(force=True) == 2
+
+    insert_tier_rows(db, tier, [NOW - tier.retained_for - timedelta(days=1)])
+    assert db.prune_old_intervals() == 0
+    assert run_retention(db, now=later) == {}
+    assert run_retention(db, force=True, now=later)["rows_deleted"] == 1
+
+
+def file_size(db: AreaOccupancyDB) -> int:
+    """Return the size of the database file, with the WAL checkpointed."""
+    with db.engine.connect() as conn:
+        conn.execute(sa.text("PRAGMA wal_checkpoint(TRUNCATE)"))
+    return os.path.getsize(db.db_path)
+
+
+def fill_and_delete(db: AreaOccupancyDB, nb: int) -> None:
+    """Store nb numeric samples with a large payload, then delete them."""
+    tier = retention.TIERS_BY_NAME["numeric_samples"]
+    rows = [
+        tier_row(tier, NOW - timedelta(days=30, seconds=i), i) | {"state": "x" * 200}
+        for i in range(nb)
+    ]
+    with db.get_session() as session:
+        session.execute(sa.insert(db.NumericSamples), rows)
+        session.commit()
+    delete_in_batches(db, db.NumericSamples, sa.true(), batch_size=5000)
+
+
+def test_reclaimed_bytes(db: AreaOccupancyDB, monkeypatch: pytest.MonkeyPatch) -> None:
+    """The reported reclaimed bytes are what the database file shrank by."""
+    monkeypatch.setattr(retention, "RETENTION_VACUUM_MIN_FREE_BYTES", 1024 * 1024)
+
+    # Nothing to release
+    before = file_size(db)
+    result = reclaim_free_pages(db)
+    assert result["action"] == "none"
+    assert result["reclaimed_bytes"] == 0
+    assert file_size(db) == before
+
+    # A database without auto_vacuum is converted by one full VACUUM
+    fill_and_delete(db, 10_000)
+    before = file_size(db)
+    result = reclaim_free_pages(db)
+    assert result["action"] == "vacuum"
+    assert result["reclaimed_bytes"] > 1024 * 1024
+    assert result["reclaimed_bytes"] == before - file_size(db)
+    assert result["free_pages"] == 0
+    with db.engine.connect() as conn:
+        assert conn.execute(sa.text("PRAGMA auto_vacuum")).scalar() == 2
+
+    # After which free pages are released incrementally, a bounded number
+    # per run
+    fill_and_delete(db, 10_000)
+    before = file_size(db)
+    result = reclaim_free_pages(db, max_pages=100)
+    assert result["action"] == "incremental_vacuum"
+    # Plus the pointer map pages that went with them
+    assert 100 <= result["reclaimed_pages"] <= 101
+    assert result["reclaimed_bytes"] == (
+        result["reclaimed_pages"] * result["page_size"]
+    )
+    assert result["reclaimed_bytes"] == before - file_size(db)
+    assert result["free_pages"] > 0
+
+    before = file_size(db)
+    result = reclaim_free_pages(db)
+    assert result["reclaimed_bytes"] == before - file_size(db)
+    assert result["free_pages"] == 0
+
+
+def test_full_vacuum_throttled(
+    db: AreaOccupancyDB, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """A database that stays without auto_vacuum is not vacuumed every run."""
+    monkeypatch.setattr(retention, "RETENTION_VACUUM_MIN_FREE_BYTES", 1024 * 1024)
+    with db.get_session() as session:
+        session.add(
+            db.Metadata(
+                key=retention.LAST_VACUUM_KEY, value=dt_util.utcnow().isoformat()
+            )
+        )
+        session.commit()
+
+    fill_and_delete(db, 10_000)
+    result = reclaim_free_pages(db)
+    assert result["action"] == "none"
+    assert result["reclaimed_bytes"] == 0
+    assert result["free_pages"] > 0
+    assert reclaim_free_pages(db, allow_vacuum=False)["action"] == "none"
@@ -0,0 +1,182 @@
+"""Time priors from the occupied intervals cache against calculate_time_priors."""
+
+from __future__ import annotations
+
+from collections.abc import Iterator
+from datetime import datetime, timedelta
+import random
+from types import SimpleNamespace
+
+import pytest
+
+from custom_components.area_occupancy.data import analysis
+from custom_components.area_occupancy.data.analysis import PriorAnalyzer
+from custom_components.area_occupancy.data.prior import TimePriorAccumulator
+from custom_components.area_occupancy.db.core import AreaOccupancyDB
+from custom_components.area_occupancy.time_utils import to_db_utc
+from homeassistant.util import dt as dt_util
+
+from .conftest import TEST_ENTRY_ID
+
+AREA = "Bedroom"
+# Five weeks around the 2026 spring DST change in Europe/Paris (March 29th)
+PERIOD_START = datetime(2026, 3, 1, tzinfo=dt_util.UTC)
+PERIOD_END = datetime(2026, 4, 5, tzinfo=dt_util.UTC)
+
+Interval = tuple[datetime, datetime]
+
+
+@pytest.fixture(autouse=True)
+def paris_time_zone() -> Iterator[None]:
+    """Bucket by a local time zone with DST."""
+    previous = dt_util.get_default_time_zone()
+    dt_util.set_default_time_zone(dt_util.get_time_zone("Europe/Paris"))
+    yield
+    dt_util.set_default_time_zone(previous)
+
+
+@pytest.fixture
+def analyzer(db: AreaOccupancyDB) -> PriorAnalyzer:
+    """Return an analyzer for one area with an empty time prior accumulator."""
+    area = SimpleNamespace(
+        config=SimpleNamespace(),
+        prior=SimpleNamespace(time_prior_accumulator=TimePriorAccumulator()),
+    )
+    coordinator = SimpleNamespace(hass=None, db=db, areas={AREA: area})
+    return PriorAnalyzer(coordinator, AREA)
+
+
+@pytest.fixture
+def reads(monkeypatch: pytest.MonkeyPatch) -> list[datetime | None]:
+    """Record the ``since`` of every cache read (None for a full read)."""
+    calls: list[datetime | None] = []
+    load = analysis.get_occupied_interval_columns
+
+    def _recording(*args, **kwargs):
+        calls.append(kwargs.get("since"))
+        return load(*args, **kwargs)
+
+    monkeypatch.setattr(analysis, "get_occupied_interval_columns", _recording)
+    return calls
+
+
+def _generate_intervals(start: datetime, end: datetime, seed: int) -> list[Interval]:
+    """Return random disjoint occupied intervals between ``start`` and ``end``."""
+    rng = random.Random(seed)
+    intervals: list[Interval] = []
+    current = start + timedelta(seconds=rng.randint(0, 3600))
+    while current < end:
+        duration = timedelta(seconds=rng.randint(60, 3 * 3600))
+        intervals.append((current, min(current + duration, end)))
+        current += duration + timedelta(seconds=rng.randint(1, 8 * 3600))
+    return intervals
+
+
+def _insert(db: AreaOccupancyDB, intervals: list[Interval]) -> None:
+    """Add cache rows the way the incremental cache update does."""
+    now = to_db_utc(dt_util.utcnow())
+    with db.get_session() as session:
+        session.add_all(
+            db.OccupiedIntervalsCache(
+                entry_id=TEST_ENTRY_ID,
+                area_name=AREA,
+                start_time=to_db_utc(start),
+                end_time=to_db_utc(end),
+                duration_seconds=(end - start).total_seconds(),
+                calculation_date=now,
+                data_source="motion_sensors",
+            )
+            for start, end in intervals
+        )
+        session.commit()
+    db.occupied_index.mark_changed(AREA, min(start for start, _ in intervals))
+
+
+def _assert_matches_reference(
+    analyzer: PriorAnalyzer, intervals: list[Interval]
+) -> None:
+    """Compare the cache calculation with calculate_time_priors."""
+    expected_priors, expected_points = analyzer.calculate_time_priors(
+        sorted(intervals), PERIOD_START, PERIOD_END
+    )
+    result = analyzer.calculate_time_priors_from_cache(PERIOD_START, PERIOD_END)
+    assert result is not None
+    priors, points = result
+    assert priors == pytest.approx(expected_priors, abs=1e-6)
+    assert points == expected_points
+
+
+def test_full_calculation(db: AreaOccupancyDB, analyzer: PriorAnalyzer) -> None:
+    """A first run reads the whole cache and matches the reference."""
+    intervals = _generate_intervals(
+        PERIOD_START - timedelta(days=1), PERIOD_END, seed=1
+    )
+    db.save_occupied_intervals_cache(AREA, intervals)
+
+    _assert_matches_reference(analyzer, intervals)
+
+
+def test_incremental_run_reuses_settled_hours(
+    db: AreaOccupancyDB, analyzer: PriorAnalyzer, reads: list[datetime | None]
+) -> None:
+    """New intervals at the tail only cause the tail of the cache to be read."""
+    intervals = _generate_intervals(
+        PERIOD_START, PERIOD_END - timedelta(days=3), seed=2
+    )
+    db.save_occupied_intervals_cache(AREA, intervals)
+    _assert_matches_reference(analyzer, intervals)
+
+    tail = _generate_intervals(PERIOD_END - timedelta(days=3), PERIOD_END, seed=3)
+    _insert(db, tail)
+    _assert_matches_reference(analyzer, intervals + tail)
+
+    assert reads[0] is None
+    assert reads[1] is not None
+
+
+@pytest.mark.parametrize("days_before_end", [4, 20, 34])
+def test_backfill_before_settled_hours(
+    db: AreaOccupancyDB,
+    analyzer: PriorAnalyzer,
+    reads: list[datetime | None],
+    days_before_end: int,
+) -> None:
+    """Intervals backfilled before the settled hours force a full recalculation."""
+    intervals = _generate_intervals(PERIOD_START, PERIOD_END, seed=4)
+    db.save_occupied_intervals_cache(AREA, intervals)
+    _assert_matches_reference(analyzer, intervals)
+
+    start = PERIOD_END - timedelta(days=days_before_end, minutes=30)
+    backfill = [(start, start + timedelta(minutes=20))]
+    _insert(db, backfill)
+    _assert_matches_reference(analyzer, intervals + backfill)
+
+    assert reads == [None, None]
+
+
+def test_cache_rebuild(db: AreaOccupancyDB, analyzer: PriorAnalyzer) -> None:
+    """A wholesale rebuild of the cache replaces every settled hour."""
+    db.save_occupied_intervals_cache(
+        AREA, _generate_intervals(PERIOD_START, PERIOD_END, seed=5)
+    )
+    analyzer.calculate_time_priors_from_cache(PERIOD_START, PERIOD_END)
+
+    intervals = _generate_intervals(PERIOD_START, PERIOD_END, seed=6)
+    db.save_occupied_intervals_cache(AREA, intervals)
+    _assert_matches_reference(analyzer, intervals)
+
+
+def test_database_reset(
+    db: AreaOccupancyDB, analyzer: PriorAnalyzer, reads: list[datetime | None]
+) -> None:
+    """Settled hours are dropped when the whole database may have changed."""
+    intervals = _generate_intervals(PERIOD_START, PERIOD_END, seed=7)
+    db.save_occupied_intervals_cache(AREA, intervals)
+    analyzer.calculate_time_priors_from_cache(PERIOD_START, PERIOD_END)
+    analyzer.calculate_time_priors_from_cache(PERIOD_START, PERIOD_END)
+
+    db.occupied_index.invalidate()
+    _assert_matches_reference(analyzer, intervals)
+
+    assert reads == [None, reads[1], None]
+    assert reads[1] is not None
@@ -0,0 +1,163 @@
+"""Cross-area transition statistics against a plain Python recount."""
+
+from __future__ import annotations
+
+from collections import defaultdict
+from datetime import datetime, timedelta
+import random
+
+import pytest
+
+from custom_components.area_occupancy.const import (
+    TRANSITION_MAX_GAP_SECONDS,
+    TRANSITION_MAX_LOOKBACK_SECONDS,
+)
+from custom_components.area_occupancy.db import relationships
+from custom_components.area_occupancy.db.core import AreaOccupancyDB
+from homeassistant.util import dt as dt_util
+
+from .conftest import TEST_ENTRY_ID
+
+AREAS = ("Küche", "Salle à manger", "Living Room", "書斎")
+
+Interval = tuple[str, datetime, datetime]
+
+
+def _generate_intervals(days: int, seed: int) -> list[Interval]:
+    """Return random occupied intervals over the last ``days`` days.
+
+    Most intervals follow the previous one within a few minutes, in any area,
+    so the dataset has transitions, overlaps, long gaps and same-area runs.
+    """
+    rng = random.Random(seed)
+    end_of_data = dt_util.utcnow().replace(tzinfo=None, microsecond=0)
+    current = end_of_data - timedelta(days=days)
+    intervals: list[Interval] = []
+    while current < end_of_data - timedelta(hours=1):
+        area = rng.choice(AREAS)
+        duration = timedelta(seconds=rng.randint(30, 3600))
+        intervals.append((area, current, current + duration))
+        gap = rng.choice((-60, 0, 15, 90, 119, 120, 121, 600, 7200, 100_000))
+        current += duration + timedelta(seconds=gap + rng.randint(0, 30))
+    return intervals
+
+
+def _reference_transitions(
+    intervals: list[Interval],
+) -> dict[tuple[str, str, str], tuple[int, float]]:
+    """Count transitions per (from, to, UTC day) with a Python loop."""
+    ordered = sorted(intervals, key=lambda item: (item[1], item[0], item[2]))
+    gaps: dict[tuple[str, str, str], list[float]] = defaultdict(list)
+    for (prev_area, prev_start, prev_end), (area, start, _) in zip(
+        ordered, ordered[1:], strict=False
+    ):
+        gap = (start - prev_end).total_seconds()
+        if (
+            prev_area != area
+            and gap <= TRANSITION_MAX_GAP_SECONDS
+            and (start - prev_start).total_seconds() <= TRANSITION_MAX_LOOKBACK_SECONDS
+        ):
+            gaps[(prev_area, area, start.date().isoformat())].append(gap)
+    return {
+        key: (len(values), round(sum(values) / len(values), 1))
+        for key, values in gaps.items()
+    }
+
+
+def _insert(db: AreaOccupancyDB, intervals: list[Interval]) -> None:
+    """Write intervals to the occupied intervals cache and mark them dirty."""
+    now = dt_util.utcnow().replace(tzinfo=None)
+    with db.get_session() as session:
+        session.add_all(
+            db.OccupiedIntervalsCache(
+                entry_id=TEST_ENTRY_ID,
+                area_name=area,
+                start_time=start,
+                end_time=end,
+                duration_seconds=(end - start).total_seconds(),
+                calculation_date=now,
+                data_source="motion_sensors",
+            )
+            for area, start, end in intervals
+        )
+        relationships.mark_transitions_dirty(
+            db, session, min(start for _, start, _ in intervals)
+        )
+        session.commit()
+
+
+def _stored_transitions(
+    db: AreaOccupancyDB,
+) -> dict[tuple[str, str, str], tuple[int, float]]:
+    """Return the transition rows of CrossAreaStats."""
+    with db.get_session() as session:
+        rows = session.query(db.CrossAreaStats).filter_by(
+            statistic_type=relationships.TRANSITION_STATISTIC_TYPE
+        )
+        return {
+            (
+                row.involved_areas[0],
+                row.involved_areas[1],
+                row.period_start.date().isoformat(),
+            ): (int(row.statistic_value), row.extra_metadata["mean_gap_seconds"])
+            for row in rows
+        }
+
+
+def test_full_recount_matches_python(db: AreaOccupancyDB) -> None:
+    """A full recount gives the same counts and gaps as the Python loop."""
+    intervals = _generate_intervals(days=14, seed=1)
+    _insert(db, intervals)
+
+    written = relationships.update_transition_stats(db, full=True)
+
+    expected = _reference_transitions(intervals)
+    assert expected
+    assert written == len(expected)
+    assert _stored_transitions(db) == expected
+
+
+def test_incremental_update_matches_full_recount(db: AreaOccupancyDB) -> None:
+    """Updating from the dirty marker gives the same rows as a full recount."""
+    intervals = _generate_intervals(days=14, seed=2)
+    cut = len(intervals) * 2 // 3
+    _insert(db, intervals[:cut])
+    relationships.update_transition_stats(db)
+
+    # Only the days from the first new interval are recounted
+    _insert(db, intervals[cut:])
+    relationships.update_transition_stats(db)
+    assert _stored_transitions(db) == _reference_transitions(intervals)
+
+    # Nothing is dirty anymore
+    assert relationships.update_transition_stats(db) == 0
+
+
+@pytest.mark.parametrize("area_name", AREAS)
+def test_area_transitions_with_non_ascii_names(
+    db: AreaOccupancyDB, area_name: str
+) -> None:
+    """get_area_transitions matches area names stored as escaped JSON."""
+    intervals = _generate_intervals(days=7, seed=3)
+    _insert(db, intervals)
+    relationships.update_transition_stats(db)
+
+    incoming: dict[str, int] = defaultdict(int)
+    outgoing: dict[str, int] = defaultdict(int)
+    for (from_area, to_area, _), (count, _) in _reference_transitions(
+        intervals
+    ).items():
+        if to_area == area_name:
+            incoming[from_area] += count
+        if from_area == area_name:
+            outgoing[to_area] += count
+
+    result = relationships.get_area_transitions(db, area_name, days=30)
+
+    assert incoming
+    assert {key: value["count"] for key, value in result["incoming"].items()} == (
+        incoming
+    )
+    assert {key: value["count"] for key, value in result["outgoing"].items()} == (
+        outgoing
+    )
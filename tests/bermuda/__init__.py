@@ -0,0 +1 @@
+"""Tests for the Bermuda BLE Trilateration integration."""
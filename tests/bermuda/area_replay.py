@@ -0,0 +1,195 @@
+"""Replay of a generated advert stream through the area contest.
+
+A Replay holds a coordinator with real BermudaDevice and BermudaAdvert objects,
+remote scanners spread over a few areas and the devices they hear. Each cycle
+loads the adverts of the stream the way an update cycle gathers them, runs
+calculate_data() on every device, then one of the area contests.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Iterator
+from contextlib import ExitStack, contextmanager
+from dataclasses import dataclass, field
+import random
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from custom_components.bermuda import bermuda_advert, bermuda_device, coordinator as coordinator_module
+from custom_components.bermuda.bermuda_device import BermudaDevice
+from custom_components.bermuda.const import (
+    CONF_ATTENUATION,
+    CONF_DEVICES,
+    CONF_DEVTRACK_TIMEOUT,
+    CONF_MAX_RADIUS,
+    CONF_MAX_VELOCITY,
+    CONF_REF_POWER,
+    CONF_RSSI_OFFSETS,
+    CONF_SMOOTHING_SAMPLES,
+    DEFAULT_ATTENUATION,
+    DEFAULT_DEVTRACK_TIMEOUT,
+    DEFAULT_MAX_RADIUS,
+    DEFAULT_MAX_VELOCITY,
+    DEFAULT_REF_POWER,
+    DEFAULT_SMOOTHING_SAMPLES,
+    UPDATE_INTERVAL,
+)
+from custom_components.bermuda.coordinator import BermudaDataUpdateCoordinator
+
+NB_AREAS = 4
+SCANNERS_PER_AREA = 2
+AREA_REGISTRY = SimpleNamespace(
+    async_get_area={
+        f"area_{i}": SimpleNamespace(name=f"Area {i}", icon=None, floor_id=None) for i in range(NB_AREAS)
+    }.get
+)
+# The start of the stream, well after start-up so no stamp is falsy
+START = 1000.0
+# Mean number of cycles a device stays in range before it leaves for a while
+MEAN_PRESENT_CYCLES = 60
+
+
+@dataclass
+class Cycle:
+    """The adverts received during one update cycle, and when the cycle runs."""
+
+    now: float
+    # address, scanner index, stamp, rssi
+    adverts: list[tuple[str, int, float, int]] = field(default_factory=list)
+    # address, new ref_power, as set by a calibration in the middle of the cycle
+    ref_powers: list[tuple[str, float]] = field(default_factory=list)
+
+
+def address(index: int) -> str:
+    """Return the address of the index-th device, not a resolvable private one."""
+    return f"0A:00:00:{index >> 16 & 255:02X}:{index >> 8 & 255:02X}:{index & 255:02X}"
+
+
+def generate_stream(nb_devices: int, nb_cycles: int, presence: float, seed: int) -> list[Cycle]:
+    """Return the adverts of nb_devices moving between the scanners.
+
+    A device is in range presence of the time, in spells of MEAN_PRESENT_CYCLES
+    cycles on average, and moves to a neighbouring scanner now and then. Nearby
+    scanners hear most of its adverts, the others some of them, with a noisy
+    rssi falling off with the distance. The odd calibration changes a ref_power.
+    """
+    rng = random.Random(seed)
+    nb_scanners = NB_AREAS * SCANNERS_PER_AREA
+    positions = [rng.randrange(nb_scanners) for _ in range(nb_devices)]
+    present = [rng.random() < presence for _ in range(nb_devices)]
+    leave = 1 / MEAN_PRESENT_CYCLES
+    come_back = leave * presence / (1 - presence) if presence < 1 else 1.0
+    stream = []
+    now = START
+    for _ in range(nb_cycles):
+        cycle = Cycle(now)
+        for index in range(nb_devices):
+            if rng.random() < (leave if present[index] else come_back):
+                present[index] = not present[index] or presence == 1
+            if not present[index]:
+                continue
+            if rng.random() < 0.03:
+                positions[index] = (positions[index] + rng.choice((-1, 1))) % nb_scanners
+            for scanner in range(nb_scanners):
+                hops = min(abs(scanner - positions[index]), nb_scanners - abs(scanner - positions[index]))
+                if rng.random() < (0.9 if hops <= 1 else 0.3):
+                    stamp = round(now - rng.random() * UPDATE_INTERVAL, 3)
+                    cycle.adverts.append((address(index), scanner, stamp, round(rng.gauss(-50 - 7 * hops, 4))))
+            if rng.random() < 0.001:
+                cycle.ref_powers.append((address(index), rng.choice((-50.0, -55.0, -60.0))))
+        stream.append(cycle)
+        now += UPDATE_INTERVAL
+    return stream
+
+
+@contextmanager
+def replay_clock() -> Iterator[SimpleNamespace]:
+    """Have Bermuda read the time of the cycle being replayed, and the test areas."""
+    clock = SimpleNamespace(now=START)
+    with ExitStack() as stack:
+        for module in (coordinator_module, bermuda_device, bermuda_advert):
+            stack.enter_context(patch.object(module, "monotonic_time_coarse", lambda: clock.now))
+        stack.enter_context(patch.object(bermuda_device, "ar", SimpleNamespace(async_get=lambda hass: AREA_REGISTRY)))
+        stack.enter_context(patch.object(bermuda_device, "fr", SimpleNamespace(async_get=lambda hass: None)))
+        yield clock
+
+
+def dirty_contest(coordinator: BermudaDataUpdateCoordinator) -> None:
+    """Run the contest of the devices that are dirty or watched."""
+    coordinator._refresh_areas_by_min_distance()  # noqa: SLF001
+
+
+def full_contest(coordinator: BermudaDataUpdateCoordinator) -> None:
+    """Run the contest of every tracked device, as before the dirty set."""
+    for device in coordinator.devices.values():
+        if device.create_sensor:
+            coordinator._refresh_area_by_min_distance(device)  # noqa: SLF001
+
+
+class Replay:
+    """A coordinator fed with the cycles of an advert stream."""
+
+    def __init__(self, tracked: list[str], contest: Callable[[BermudaDataUpdateCoordinator], None]) -> None:
+        """Set up the scanners, tracking the given addresses."""
+        coordinator = self.coordinator = object.__new__(BermudaDataUpdateCoordinator)
+        coordinator.hass = None
+        coordinator.options = {
+            CONF_ATTENUATION: DEFAULT_ATTENUATION,
+            CONF_DEVTRACK_TIMEOUT: DEFAULT_DEVTRACK_TIMEOUT,
+            CONF_MAX_RADIUS: DEFAULT_MAX_RADIUS,
+            CONF_MAX_VELOCITY: DEFAULT_MAX_VELOCITY,
+            CONF_REF_POWER: DEFAULT_REF_POWER,
+            CONF_SMOOTHING_SAMPLES: DEFAULT_SMOOTHING_SAMPLES,
+            CONF_RSSI_OFFSETS: {},
+            CONF_DEVICES: tracked,
+        }
+        coordinator.devices = {}
+        coordinator._area_dirty = {}  # noqa: SLF001
+        coordinator._area_watch = {}  # noqa: SLF001
+        coordinator.area_refresh_stats = {}
+        self.contest = contest
+        self.scanners = []
+        for index in range(NB_AREAS * SCANNERS_PER_AREA):
+            scanner = BermudaDevice(f"0C:00:00:00:00:{index:02X}", coordinator)
+            scanner._is_scanner = True  # noqa: SLF001
+            scanner._is_remote_scanner = True  # noqa: SLF001
+            scanner.name = f"Scanner {index}"
+            scanner.area_id = f"area_{index // SCANNERS_PER_AREA}"
+            scanner.area_name = f"Area {index // SCANNERS_PER_AREA}"
+            coordinator.devices[scanner.address] = scanner
+            self.scanners.append(scanner)
+
+    def run(self, cycle: Cycle) -> None:
+        """Load the adverts of the cycle, calculate the distances and run the contest."""
+        devices = self.coordinator.devices
+        for device_address, scanner_index, stamp, rssi in cycle.adverts:
+            scanner = self.scanners[scanner_index]
+            scanner.stamps[device_address] = stamp
+            if (device := devices.get(device_address.lower())) is None:
+                device = devices[device_address.lower()] = BermudaDevice(device_address, self.coordinator)
+            device.process_advertisement(
+                scanner,
+                SimpleNamespace(
+                    rssi=rssi, tx_power=None, local_name=None, manufacturer_data={}, service_data={}, service_uuids=[]
+                ),
+            )
+        for device in devices.values():
+            device.calculate_data()
+        self.contest(self.coordinator)
+        for device_address, ref_power in cycle.ref_powers:
+            if (device := devices.get(device_address.lower())) is not None:
+                device.set_ref_power(ref_power)
+
+    def areas(self) -> dict[str, tuple]:
+        """Return the area, the winning scanner and the distance of each tracked device."""
+        return {
+            device.address: (
+                device.area_id,
+                device.area_name,
+                device.area_advert.scanner_address if device.area_advert is not None else None,
+                device.area_distance,
+                device.area_rssi,
+            )
+            for device in self.coordinator.devices.values()
+            if device.create_sensor
+        }
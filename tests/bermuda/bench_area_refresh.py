@@ -0,0 +1,76 @@
+"""Per-cycle cost of the area contest against the number of tracked devices.
+
+Not collected by pytest. Run it from the repository root with:
+
+    python -m tests.bermuda.bench_area_refresh [presence]
+
+It replays the same generated advert stream through two coordinators, see
+tests/bermuda/area_replay.py: one runs the contest of every tracked device each
+cycle, as before the dirty set, the other only that of the devices that are
+dirty or watched. Every device is tracked and in range presence of the time,
+0.2 by default. It prints the mean time of the contest per cycle, the loading
+of the adverts and calculate_data() left out, and how many devices took part.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+import sys
+import time
+
+from custom_components.bermuda.coordinator import BermudaDataUpdateCoordinator
+
+from .area_replay import Replay, address, dirty_contest, full_contest, generate_stream, replay_clock
+
+DEVICE_COUNTS = (50, 200, 1000)
+# Long enough for the devices to come and go, the first minute is not counted
+WARMUP_CYCLES = 60
+CYCLES = 300
+
+
+def run(
+    contest: Callable[[BermudaDataUpdateCoordinator], None], nb_devices: int, presence: float
+) -> tuple[float, float, dict]:
+    """Return the mean time of the contest, the devices it evaluated per cycle and the areas."""
+    stream = generate_stream(nb_devices, WARMUP_CYCLES + CYCLES, presence, seed=0)
+    elapsed = 0.0
+    evaluated = 0
+
+    def timed_contest(coordinator: BermudaDataUpdateCoordinator) -> None:
+        nonlocal elapsed, evaluated
+        start = time.perf_counter()
+        contest(coordinator)
+        if counted:
+            elapsed += time.perf_counter() - start
+            if contest is dirty_contest:
+                evaluated += coordinator.area_refresh_stats["evaluated"]
+            else:
+                evaluated += sum(device.create_sensor for device in coordinator.devices.values())
+
+    replay = Replay([address(i) for i in range(nb_devices)], timed_contest)
+    with replay_clock() as clock:
+        for index, cycle in enumerate(stream):
+            counted = index >= WARMUP_CYCLES
+            clock.now = cycle.now
+            replay.run(cycle)
+    return elapsed / CYCLES, evaluated / CYCLES, replay.areas()
+
+
+def main() -> None:
+    """Print the benchmark results."""
+    presence = float(sys.argv[1]) if len(sys.argv) > 1 else 0.2
+    print(f"tracked devices in range {presence:.0%} of the time, mean of {CYCLES} cycles")
+    print("time per cycle (devices evaluated per cycle)")
+    print(f"{'devices':>8} {'full contest':>18} {'dirty set':>18} {'speedup':>8}")
+    for nb_devices in DEVICE_COUNTS:
+        full_s, full_evaluated, full_areas = run(full_contest, nb_devices, presence)
+        dirty_s, dirty_evaluated, dirty_areas = run(dirty_contest, nb_devices, presence)
+        assert dirty_areas == full_areas
+        print(
+            f"{nb_devices:>8} {full_s * 1000:>7.2f} ms ({full_evaluated:>5.0f}) "
+            f"{dirty_s * 1000:>7.2f} ms ({dirty_evaluated:>5.0f}) {full_s / dirty_s:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
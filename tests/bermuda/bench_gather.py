@@ -0,0 +1,159 @@
+"""Per-cycle cost of gathering the adverts of remote scanners.
+
+Not collected by pytest. Run it from the repository root with:
+
+    python -m tests.bermuda.bench_gather [scanners] [addresses]
+
+Each remote scanner is modelled after habluetooth's BaseHaRemoteScanner: a
+service info per address whose AdvertisementData is built on first use, a
+timestamp per address, a discovered_devices_and_advertisement_data property
+that builds a new dict on every access, and a per-address lookup. Every cycle
+a fraction of the addresses receives a new advert; adverts stamped up to 3 s
+before the previous cycle are yielded again, so more adverts are yielded per
+scanner than received per cycle. The benchmark prints the time of one gather
+cycle over all scanners with the former walk of
+discovered_devices_and_advertisement_data and with _iter_new_adverts.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Iterator
+import random
+import sys
+import time
+from types import SimpleNamespace
+from typing import Any
+
+from custom_components.bermuda.coordinator import BermudaDataUpdateCoordinator
+
+CYCLES = 20
+CYCLE_SECONDS = 1.05
+FRACTIONS = (0.01, 0.1, 0.5, 1.0)
+ITER_NEW_ADVERTS = BermudaDataUpdateCoordinator._iter_new_adverts  # noqa: SLF001
+
+
+class ServiceInfo:
+    """Service info of the last advert of an address."""
+
+    __slots__ = ("_advertisement", "device", "rssi")
+
+    def __init__(self, device: SimpleNamespace, rssi: int) -> None:
+        """Store the advert, its AdvertisementData is built on first use."""
+        self.device = device
+        self.rssi = rssi
+        self._advertisement: SimpleNamespace | None = None
+
+    def advertisement(self) -> SimpleNamespace:
+        """Return the AdvertisementData of the advert."""
+        if self._advertisement is None:
+            self._advertisement = SimpleNamespace(
+                local_name=None,
+                manufacturer_data={76: b"\x02\x15"},
+                service_data={},
+                service_uuids=[],
+                tx_power=-59,
+                rssi=self.rssi,
+                platform_data=(),
+            )
+        return self._advertisement
+
+
+class RemoteScanner:
+    """Discovered devices and timestamps of one remote scanner."""
+
+    def __init__(self, addresses: list[str]) -> None:
+        """Start with one advert per address, one second after start-up."""
+        self._previous_service_info = {
+            address: ServiceInfo(SimpleNamespace(address=address), -70) for address in addresses
+        }
+        self.discovered_device_timestamps = dict.fromkeys(addresses, 1.0)
+
+    def receive(self, address: str, stamp: float, rssi: int) -> None:
+        """Record a new advert of an address."""
+        self._previous_service_info[address] = ServiceInfo(self._previous_service_info[address].device, rssi)
+        self.discovered_device_timestamps[address] = stamp
+
+    @property
+    def discovered_devices_and_advertisement_data(self) -> dict[str, tuple[Any, Any]]:
+        """Return a new dict of every device and its advertisement."""
+        return {address: (info.device, info.advertisement()) for address, info in self._previous_service_info.items()}
+
+    def get_discovered_device_advertisement_data(self, address: str) -> tuple[Any, Any] | None:
+        """Return the device and advertisement of one address."""
+        if (info := self._previous_service_info.get(address)) is not None:
+            return info.device, info.advertisement()
+        return None
+
+
+def former_walk(coordinator: Any, ha_scanner: RemoteScanner, scanner_device: Any) -> Iterator[tuple[Any, Any]]:
+    """Yield the adverts the way _async_gather_advert_data did before _iter_new_adverts."""
+    for bledevice, advertisementdata in ha_scanner.discovered_devices_and_advertisement_data.values():
+        if adstamp := scanner_device.async_as_scanner_get_stamp(bledevice.address):
+            if adstamp < coordinator.stamp_last_update_started - 3:
+                continue
+        yield bledevice, advertisementdata
+
+
+def run(
+    gather: Callable[[Any, RemoteScanner, Any], Iterator[tuple[Any, Any]]],
+    nb_scanners: int,
+    nb_addresses: int,
+    fraction: float,
+) -> tuple[float, int]:
+    """Return the mean time of one gather cycle, and the adverts yielded per scanner."""
+    rng = random.Random(0)
+    addresses = [f"AA:BB:CC:{i >> 16 & 255:02X}:{i >> 8 & 255:02X}:{i & 255:02X}" for i in range(nb_addresses)]
+    scanners = [RemoteScanner(addresses) for _ in range(nb_scanners)]
+    devices = [
+        SimpleNamespace(
+            is_remote_scanner=True,
+            stamps=scanner.discovered_device_timestamps,
+            async_as_scanner_get_stamp=scanner.discovered_device_timestamps.get,
+        )
+        for scanner in scanners
+    ]
+    coordinator = SimpleNamespace(stamp_last_update_started=0.0)
+    elapsed = 0.0
+    yielded = 0
+    # Start well after the initial adverts, so they are all old
+    now = 100.0
+    # The first cycle yields every advert and is not counted
+    for cycle in range(CYCLES + 1):
+        now += CYCLE_SECONDS
+        for scanner in scanners:
+            for address in rng.sample(addresses, int(nb_addresses * fraction)):
+                scanner.receive(address, now - rng.random() * CYCLE_SECONDS, rng.randint(-95, -40))
+        start = time.perf_counter()
+        cycle_yielded = 0
+        for scanner, device in zip(scanners, devices, strict=True):
+            for _bledevice, advertisementdata in gather(coordinator, scanner, device):
+                if advertisementdata.rssi == -127:
+                    continue
+                cycle_yielded += 1
+        if cycle:
+            elapsed += time.perf_counter() - start
+            yielded += cycle_yielded
+        # Both paths yield again the adverts stamped up to 3 s before the start
+        # of the previous cycle
+        coordinator.stamp_last_update_started = now
+    return elapsed / CYCLES, yielded // (CYCLES * nb_scanners)
+
+
+def main() -> None:
+    """Print the benchmark results."""
+    nb_scanners = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    nb_addresses = int(sys.argv[2]) if len(sys.argv) > 2 else 1000
+    print(f"{nb_scanners} scanners x {nb_addresses} addresses, mean of {CYCLES} cycles")
+    print(f"{'new adverts':>12} {'yielded':>8} {'former walk':>12} {'stamp walk':>12} {'speedup':>8}")
+    for fraction in FRACTIONS:
+        former_s, former_yielded = run(former_walk, nb_scanners, nb_addresses, fraction)
+        new_s, new_yielded = run(ITER_NEW_ADVERTS, nb_scanners, nb_addresses, fraction)
+        assert former_yielded == new_yielded
+        print(
+            f"{fraction:>12.0%} {new_yielded:>8} {former_s * 1000:>9.2f} ms {new_s * 1000:>9.2f} ms "
+            f"{former_s / new_s:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
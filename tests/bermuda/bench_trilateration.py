@@ -0,0 +1,88 @@
+"""Cost and accuracy of one position engine cycle.
+
+Not collected by pytest. Run it from the repository root with:
+
+    python -m tests.bermuda.bench_trilateration [devices] [scanners]
+
+Devices are placed at random over a 20 x 15 m floor with scanners scattered
+over it, 100 devices and 15 scanners by default, each device heard by 8 of
+them. It prints the time of BermudaPositionEngine.update() with the budget
+lifted, split into gathering the distances and the batch solve, against
+solving the same weighted system one device at a time. Then the position error
+with exact ranges and with 15% log-normal noise on them.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+import random
+import statistics
+import sys
+import time
+
+import numpy as np
+
+from custom_components.bermuda.const import POSITION_MIN_DISTANCE, POSITION_MIN_SCANNERS
+from custom_components.bermuda.trilateration import BermudaPositionEngine
+
+from .test_trilateration import make_device, scattered_scanners, true_distances
+
+HEARD = 8
+REPEAT = 200
+
+
+def per_device_solve(engine: BermudaPositionEngine, distances: np.ndarray) -> np.ndarray:
+    """Solve the weighted system of each device on its own, with lstsq."""
+    xy = np.full((len(distances), 2), np.nan)
+    for index, row in enumerate(distances):
+        valid = ~np.isnan(row)
+        if valid.sum() < POSITION_MIN_SCANNERS:
+            continue
+        sqrt_weights = 1 / np.maximum(row[valid], POSITION_MIN_DISTANCE)
+        design = engine._design[valid] * sqrt_weights[:, None]  # noqa: SLF001
+        rhs = (row[valid] ** 2 - engine._pos_sq[valid]) * sqrt_weights  # noqa: SLF001
+        xy[index] = np.linalg.lstsq(design, rhs, rcond=None)[0][:2]
+    return xy
+
+
+def best_of(func: Callable[..., object], *args: object) -> float:
+    """Return the best time of func(*args) in milliseconds."""
+    best = float("inf")
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        func(*args)
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main() -> None:
+    """Print the benchmark results."""
+    nb_devices = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    nb_scanners = int(sys.argv[2]) if len(sys.argv) > 2 else 15
+    rng = random.Random(0)
+    scanners = scattered_scanners(nb_scanners, seed=0)
+    engine = BermudaPositionEngine(scanners, budget=1.0)
+    truth = [(rng.uniform(0, 20), rng.uniform(0, 15)) for _ in range(nb_devices)]
+    devices = [make_device(true_distances(scanners, position, rng, min(HEARD, nb_scanners))) for position in truth]
+    distances = np.vstack([engine._distance_row(device) for device in devices])  # noqa: SLF001
+
+    batch_xy = engine.solve(distances)[0]
+    single_xy = per_device_solve(engine, distances)
+    assert np.allclose(batch_xy, single_xy, equal_nan=True)
+
+    print(f"{nb_devices} devices x {nb_scanners} scanners, {min(HEARD, nb_scanners)} heard per device")
+    print(f"  update():          {best_of(engine.update, devices):7.2f} ms")
+    print(f"    gather:          {best_of(lambda: [engine._distance_row(d) for d in devices]):7.2f} ms")  # noqa: SLF001
+    print(f"    batch solve:     {best_of(engine.solve, distances):7.2f} ms")
+    print(f"  per-device solve:  {best_of(per_device_solve, engine, distances):7.2f} ms")
+
+    errors = np.hypot(*(batch_xy - np.array(truth)).T)
+    print(f"  exact ranges:      max error {errors.max():.2e} m")
+    noisy = [make_device(true_distances(scanners, position, rng, min(HEARD, nb_scanners), 0.15)) for position in truth]
+    engine.update(noisy)
+    errors = [float(np.hypot(d.position[0] - x, d.position[1] - y)) for d, (x, y) in zip(noisy, truth, strict=True)]
+    print(f"  15% range noise:   median error {statistics.median(errors):.2f} m, max {max(errors):.2f} m")
+
+
+if __name__ == "__main__":
+    main()
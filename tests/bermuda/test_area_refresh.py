@@ -0,0 +1,91 @@
+"""Incremental area contest against the contest of every tracked device."""
+
+from __future__ import annotations
+
+from collections.abc import Iterator
+from types import SimpleNamespace
+
+import pytest
+
+from custom_components.bermuda.const import AREA_MAX_AD_AGE, UPDATE_INTERVAL
+
+from .area_replay import Cycle, Replay, address, dirty_contest, full_contest, generate_stream, replay_clock
+
+NB_DEVICES = 40
+NB_CYCLES = 600
+
+
+@pytest.fixture
+def clock() -> Iterator[SimpleNamespace]:
+    """Replay the stream on its own clock."""
+    with replay_clock() as clock:
+        yield clock
+
+
+@pytest.mark.parametrize(("presence", "seed"), [(0.2, 1), (0.5, 2), (1.0, 3)])
+def test_matches_full_contest(clock: SimpleNamespace, presence: float, seed: int) -> None:
+    """Skipping the devices that are neither dirty nor watched changes no area."""
+    stream = generate_stream(NB_DEVICES, NB_CYCLES, presence, seed)
+    # A quarter of the devices heard are not tracked
+    tracked = [address(i) for i in range(NB_DEVICES) if i % 4]
+    dirty = Replay(tracked, dirty_contest)
+    full = Replay(tracked, full_contest)
+
+    evaluated = 0
+    full_evaluated = 0
+    changes = 0
+    previous: dict[str, tuple] = {}
+    for cycle in stream:
+        clock.now = cycle.now
+        dirty.run(cycle)
+        full.run(cycle)
+        areas = full.areas()
+        assert dirty.areas() == areas, cycle.now
+        evaluated += dirty.coordinator.area_refresh_stats["evaluated"]
+        full_evaluated += len(areas)
+        changes += sum(area[0] != previous.get(device, (None,))[0] for device, area in areas.items())
+        previous = areas
+
+    # The stream moved devices between areas, and in and out of range
+    assert changes > NB_DEVICES
+    # And the dirty set skipped the devices out of range
+    assert evaluated < full_evaluated or presence == 1
+
+
+def test_watch_expires(clock: SimpleNamespace) -> None:
+    """A device leaves the watch list once it lost its area and its adverts aged out."""
+    stream = generate_stream(1, 200, 1.0, seed=4)
+    replay = Replay([address(0)], dirty_contest)
+    coordinator = replay.coordinator
+    device_address = address(0).lower()
+    for cycle in stream[:20]:
+        clock.now = cycle.now
+        replay.run(cycle)
+    assert coordinator.devices[device_address].area_id is not None
+    assert coordinator._area_watch[device_address] >= clock.now  # noqa: SLF001
+
+    # The device goes quiet: the area times out, then the adverts stop competing
+    last_heard = max(stamp for _, _, stamp, _ in stream[19].adverts)
+    cycles_held = 0
+    for cycle in stream[20:]:
+        clock.now = cycle.now
+        cycle.adverts.clear()
+        cycle.ref_powers.clear()
+        replay.run(cycle)
+        if device_address not in coordinator._area_watch:  # noqa: SLF001
+            break
+        cycles_held += 1
+    else:
+        pytest.fail("the device is still watched")
+    assert coordinator.devices[device_address].area_advert is None
+    assert clock.now > last_heard + AREA_MAX_AD_AGE
+    assert cycles_held * UPDATE_INTERVAL > AREA_MAX_AD_AGE
+    clock.now += UPDATE_INTERVAL
+    replay.run(Cycle(clock.now))
+    assert coordinator.area_refresh_stats["evaluated"] == 0
+
+    # Until it is heard again
+    clock.now += UPDATE_INTERVAL
+    replay.run(Cycle(clock.now, [(address(0), 0, clock.now, -50)]))
+    assert coordinator.area_refresh_stats["evaluated"] == 1
+    assert coordinator.devices[device_address].area_id is not None
@@ -0,0 +1,140 @@
+"""Weighted least squares position engine."""
+
+from __future__ import annotations
+
+import itertools
+import random
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from custom_components.bermuda import trilateration
+from custom_components.bermuda.trilateration import BermudaPositionEngine
+
+
+def scattered_scanners(nb: int, seed: int) -> dict[str, tuple[float, float]]:
+    """Return nb scanners scattered over a 20 x 15 m floor."""
+    rng = random.Random(seed)
+    return {f"0c:00:00:00:00:{i:02x}": (rng.uniform(0, 20), rng.uniform(0, 15)) for i in range(nb)}
+
+
+# A 20 x 15 m floor with a scanner in most rooms
+SCANNER_POSITIONS = scattered_scanners(15, seed=0)
+# The same on a grid, where rows and columns of scanners are collinear
+GRID_POSITIONS = {
+    f"0c:00:00:00:01:{i:02x}": (x, y)
+    for i, (x, y) in enumerate((x, y) for x in (1.0, 6.0, 11.0, 15.5, 19.0) for y in (1.0, 7.5, 14.0))
+}
+
+
+def make_device(distances: dict[str, float], stamp: float = 100.0) -> SimpleNamespace:
+    """Return a device with one advert per scanner that hears it."""
+    return SimpleNamespace(
+        adverts={
+            (f"{scanner}_device", scanner): SimpleNamespace(
+                scanner_address=scanner, rssi_distance=distance, stamp=stamp
+            )
+            for scanner, distance in distances.items()
+        },
+        position=None,
+        position_error=None,
+    )
+
+
+def true_distances(
+    scanners: dict[str, tuple[float, float]],
+    position: tuple[float, float],
+    rng: random.Random,
+    heard: int,
+    noise: float = 0.0,
+) -> dict[str, float]:
+    """Return the distances to heard of the scanners, with a log-normal noise."""
+    return {
+        scanner: float(np.hypot(position[0] - x, position[1] - y)) * rng.lognormvariate(0, noise)
+        for scanner, (x, y) in rng.sample(sorted(scanners.items()), heard)
+    }
+
+
+def test_exact_recovery() -> None:
+    """Exact ranges give back the true positions, with no residual."""
+    rng = random.Random(0)
+    engine = BermudaPositionEngine(SCANNER_POSITIONS)
+    truth = [(rng.uniform(0, 20), rng.uniform(0, 15)) for _ in range(50)]
+    devices = [
+        make_device(true_distances(SCANNER_POSITIONS, position, rng, rng.randint(3, len(SCANNER_POSITIONS))))
+        for position in truth
+    ]
+    # A metadevice with an older advert per scanner from a previous source MAC
+    for (scanner, distance), n in zip(true_distances(SCANNER_POSITIONS, truth[0], rng, 4).items(), itertools.count()):
+        devices[0].adverts[(f"old_source_{n}", scanner)] = SimpleNamespace(
+            scanner_address=scanner, rssi_distance=distance + 5.0, stamp=50.0
+        )
+
+    engine.update(devices)
+
+    assert engine.stats["placed"] == len(devices)
+    for device, position in zip(devices, truth, strict=True):
+        assert device.position == pytest.approx(position, abs=1e-6)
+        assert device.position_error == pytest.approx(0.0, abs=1e-6)
+
+
+def test_unplaceable_devices() -> None:
+    """Too few scanners, or only collinear ones, give no position."""
+    scanners = GRID_POSITIONS
+    # Three scanners along the x = 1 wall
+    collinear = [address for address, (x, _) in scanners.items() if x == 1.0]
+    assert len(collinear) == 3
+    engine = BermudaPositionEngine(scanners)
+    placed = make_device({address: 5.0 for address in list(scanners)[::4]})
+    two_scanners = make_device({address: 5.0 for address in list(scanners)[:2]})
+    along_the_wall = make_device(dict.fromkeys(collinear, 5.0))
+    unknown_scanners = make_device({f"0c:00:00:00:02:{i:02x}": 5.0 for i in range(5)})
+    timed_out = make_device({address: None for address in scanners})
+    # Left over from a previous cycle, cleared
+    for device in (two_scanners, along_the_wall, unknown_scanners, timed_out):
+        device.position = (1.0, 1.0)
+        device.position_error = 0.5
+
+    engine.update([placed, two_scanners, along_the_wall, unknown_scanners, timed_out])
+
+    assert placed.position is not None
+    for device in (two_scanners, along_the_wall, unknown_scanners, timed_out):
+        assert device.position is None
+        assert device.position_error is None
+    assert engine.stats["placed"] == 1
+
+    # The same with every scanner on one line
+    line = BermudaPositionEngine({f"0c:00:00:00:03:{i:02x}": (2.0 * i, 3.0) for i in range(6)})
+    assert np.isnan(line.solve(np.array([[1.0, 2.0, 3.0, 4.0, 5.0, 6.0]]))[0]).all()
+
+
+def test_budget_resumes_at_cursor(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Devices left over when the budget runs out are the first ones next cycle."""
+    clock = itertools.count(step=0.001)
+    monkeypatch.setattr(trilateration, "time", SimpleNamespace(perf_counter=lambda: next(clock)))
+    rng = random.Random(1)
+    engine = BermudaPositionEngine(SCANNER_POSITIONS, budget=0.0035)
+    devices = [
+        make_device(true_distances(SCANNER_POSITIONS, (rng.uniform(0, 20), rng.uniform(0, 15)), rng, 6))
+        for _ in range(10)
+    ]
+
+    # The budget is spent after the 4th device
+    for first, evaluated in ((0, [0, 1, 2, 3]), (4, [4, 5, 6, 7]), (8, [8, 9, 0, 1]), (2, [2, 3, 4, 5])):
+        for device in devices:
+            device.position = None
+        engine.update(devices)
+        assert engine.stats["evaluated"] == 4
+        assert engine.stats["placed"] == 4
+        assert [i for i, device in enumerate(devices) if device.position is not None] == sorted(evaluated), first
+
+    # The cursor wraps over a shorter device list
+    engine.update(devices[:3])
+    assert engine.stats["evaluated"] == 3
+
+    # A budget large enough for every device solves them all in one cycle
+    engine.budget = 1.0
+    engine.update(devices)
+    assert engine.stats["evaluated"] == len(devices)
+    assert all(device.position is not None for device in devices)
@@ -0,0 +1,196 @@
+"""Local replay benchmark of the MQTT message dispatch.
+
+Not collected by pytest. Run it from the repository root with:
+
+    python -m tests.blitzortung.bench_mqtt [messages]
+
+No broker is involved: a thread plays paho's network thread and hands strike
+messages to the client as fast as it can, 20000 by default, while the event
+loop dispatches them to an async callback that decodes the strike. It is run
+with the former dispatch, which matched every subscription with a fresh
+matcher and created one task per matching callback, and with the topic trie
+and the message queue, for a growing number of geohash subscriptions. The messages
+are sent in bursts the loop catches up with, then in a single flood. It prints
+the messages dispatched per second and the most messages waiting at once: the
+pending callback tasks for the former dispatch, the queue high-water mark for
+the current one, which drops the oldest past MESSAGE_QUEUE_SIZE.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable, Coroutine
+import json
+import logging
+import random
+import sys
+import time
+from types import SimpleNamespace
+from typing import Any
+
+from homeassistant.util import dt as dt_util
+import paho.mqtt.client as paho
+
+from custom_components.blitzortung import mqtt
+from custom_components.blitzortung.mqtt import MQTT, Message, Subscription
+
+from .test_mqtt import GEOHASH_CHARS, former_match_topic, make_message
+
+SUBSCRIPTION_COUNTS = (4, 16, 64)
+# Below MESSAGE_QUEUE_SIZE, so that nothing is dropped
+BURST_SIZE = 500
+
+
+class FormerDispatch:
+    """Message dispatch as it was before the topic trie and the queue."""
+
+    def __init__(self, hass: SimpleNamespace) -> None:
+        """Start without subscriptions."""
+        self.hass = hass
+        self.subscriptions: list[Subscription] = []
+        self.stats: dict[str, int] = {}
+
+    async def async_subscribe(
+        self, topic: str, msg_callback: Callable[[Message], object], qos: int
+    ) -> None:
+        """Add a subscription."""
+        self.subscriptions.append(Subscription(topic, msg_callback, qos))
+
+    def _mqtt_on_message(self, _mqttc, _userdata, msg) -> None:  # noqa: ANN001
+        """Message received callback."""
+        self.hass.add_job(self._mqtt_handle_message, msg)
+
+    def _mqtt_handle_message(self, msg) -> None:  # noqa: ANN001
+        timestamp = dt_util.utcnow()
+        for subscription in self.subscriptions:
+            if not former_match_topic(subscription.topic, msg.topic):
+                continue
+            payload = msg.payload.decode(subscription.encoding)
+            self.hass.async_create_task(
+                subscription.callback(
+                    Message(
+                        msg.topic,
+                        payload,
+                        msg.qos,
+                        msg.retain,
+                        subscription.topic,
+                        timestamp,
+                    )
+                )
+            )
+
+
+def subscribed_cells(nb: int, seed: int) -> list[str]:
+    """Return nb distinct geohash cells, as topic levels."""
+    rng = random.Random(seed)
+    cells: set[str] = set()
+    while len(cells) < nb:
+        cells.add("/".join(rng.choice(GEOHASH_CHARS) for _ in range(4)))
+    return sorted(cells)
+
+
+async def replay(
+    make_client: Callable[[SimpleNamespace], MQTT | FormerDispatch],
+    nb_subscriptions: int,
+    nb_messages: int,
+    burst_size: int,
+) -> tuple[float, int, int]:
+    """Return the messages dispatched per second, most waiting and dropped."""
+    loop = asyncio.get_running_loop()
+    tasks = [0, 0]  # created, most pending
+
+    def create_task(coro: Coroutine[Any, Any, None]) -> asyncio.Task[None]:
+        tasks[0] += 1
+        tasks[1] = max(tasks[1], tasks[0] - handled[0])
+        return loop.create_task(coro)
+
+    hass = SimpleNamespace(
+        loop=loop,
+        add_job=lambda target, *args: loop.call_soon_threadsafe(target, *args),
+        async_create_task=create_task,
+        async_create_background_task=lambda coro, name: loop.create_task(coro),
+    )
+    client = make_client(hass)
+    handled = [0]
+
+    async def on_strike(message: Message) -> None:
+        json.loads(message.payload)
+        handled[0] += 1
+
+    cells = subscribed_cells(nb_subscriptions, seed=0)
+    for cell in cells:
+        await client.async_subscribe(f"blitzortung/1.1/{cell}/#", on_strike, 0)
+    await client.async_subscribe("$SYS/broker/#", on_strike, 0)
+    rng = random.Random(1)
+    messages = []
+    for n in range(nb_messages):
+        deeper = "/".join(rng.choice(GEOHASH_CHARS) for _ in range(8))
+        payload = {
+            "time": n,
+            "lat": rng.uniform(-60, 60),
+            "lon": rng.uniform(-180, 180),
+        }
+        messages.append(
+            make_message(
+                f"blitzortung/1.1/{rng.choice(cells)}/{deeper}",
+                json.dumps(payload).encode(),
+            )
+        )
+
+    def produce(burst: list[paho.MQTTMessage]) -> None:
+        for msg in burst:
+            client._mqtt_on_message(None, None, msg)  # noqa: SLF001
+
+    if isinstance(client, MQTT):
+        client._consumer = loop.create_task(client._async_consume())  # noqa: SLF001
+    start = time.perf_counter()
+    for first in range(0, nb_messages, burst_size):
+        last = min(first + burst_size, nb_messages)
+        await loop.run_in_executor(None, produce, messages[first:last])
+        while handled[0] + client.stats.get("dropped", 0) < last:
+            await asyncio.sleep(0.0005)
+    elapsed = time.perf_counter() - start
+    if isinstance(client, MQTT):
+        client._consumer.cancel()  # noqa: SLF001
+        return (
+            handled[0] / elapsed,
+            client.stats["queue_high_water"],
+            client.stats["dropped"],
+        )
+    return handled[0] / elapsed, tasks[1], 0
+
+
+def main() -> None:
+    """Print the benchmark results."""
+    nb_messages = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    # The overload warnings would interleave with the results
+    logging.getLogger(mqtt.__name__).setLevel(logging.ERROR)
+    for burst_size, title in (
+        (BURST_SIZE, f"in bursts of {BURST_SIZE}"),
+        (nb_messages, "in a single flood"),
+    ):
+        print(f"{nb_messages} strike messages replayed from a producer thread {title}")
+        print(
+            f"{'subscriptions':>13} {'former msg/s':>13} {'waiting':>8} "
+            f"{'trie msg/s':>11} {'waiting':>8} {'dropped':>8}"
+        )
+        for nb_subscriptions in SUBSCRIPTION_COUNTS:
+            former_rate, former_waiting, _ = asyncio.run(
+                replay(FormerDispatch, nb_subscriptions, nb_messages, burst_size)
+            )
+            rate, waiting, dropped = asyncio.run(
+                replay(
+                    lambda hass: MQTT(hass, "localhost"),
+                    nb_subscriptions,
+                    nb_messages,
+                    burst_size,
+                )
+            )
+            print(
+                f"{nb_subscriptions + 1:>13} {former_rate:>13.0f} {former_waiting:>8} "
+                f"{rate:>11.0f} {waiting:>8} {dropped:>8}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""Throughput benchmark of the strike distance and azimuth.
+
+Not collected by pytest. Run it from the repository root with:
+
+    python -m tests.blitzortung.bench_polar [strikes]
+
+It prints the strikes per second of the former inline computation and of
+PolarProjector in its fast and accurate modes, on random strikes around a
+reference point.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+from functools import partial
+import random
+import sys
+import time
+
+from custom_components.blitzortung.const import POLAR_FAST_MAX_RADIUS
+from custom_components.blitzortung.polar import PolarProjector
+
+from .test_polar import LONDON, equirectangular
+
+
+def bench(
+    compute: Callable[[float, float], tuple[float, float]],
+    strikes: list[tuple[float, float]],
+    repeat: int = 5,
+) -> float:
+    """Return the best throughput of compute over the strikes, in strikes per second."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for latitude, longitude in strikes:
+            compute(latitude, longitude)
+        best = min(best, time.perf_counter() - start)
+    return len(strikes) / best
+
+
+def main() -> None:
+    """Print the benchmark results."""
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    rng = random.Random(0)
+    spread = POLAR_FAST_MAX_RADIUS / 111.2
+    strikes = [
+        (
+            LONDON[0] + rng.uniform(-spread, spread),
+            LONDON[1] + rng.uniform(-spread, spread),
+        )
+        for _ in range(count)
+    ]
+    candidates = {
+        "former inline": partial(equirectangular, LONDON),
+        "fast": PolarProjector(*LONDON, accurate=False),
+        "accurate": PolarProjector(*LONDON, accurate=True),
+    }
+    for name, compute in candidates.items():
+        print(f"{name:>14}: {bench(compute, strikes) / 1e6:.2f} M strikes/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""Tests for the lightning strike events when the location moves."""
+
+from __future__ import annotations
+
+import asyncio
+import random
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+
+from custom_components.blitzortung import geo_location, geohash
+from custom_components.blitzortung.const import (
+    ATTR_GEOHASH,
+    ATTR_LIGHTNING_COUNTER,
+    GRID_GEOHASH_PRECISION,
+)
+from custom_components.blitzortung.geo_location import (
+    SIGNAL_DELETE_ENTITY,
+    BlitzortungEventManager,
+    StrikeGrid,
+)
+from custom_components.blitzortung.polar import PolarProjector
+
+LONDON = (51.5074, -0.1278)
+READING = (51.4543, -0.9781)
+RADIUS = 50
+
+
+def random_strikes(nb: int, seed: int) -> list[dict[str, Any]]:
+    """Return strikes spread over the south of England, one per second."""
+    rng = random.Random(seed)
+    return [
+        {
+            "lat": rng.uniform(50.8, 52.2),
+            "lon": rng.uniform(-2.0, 1.2),
+            "time": (1_700_000_000 + i) * 10**9,
+            "status": 0,
+            "region": 1,
+            "distance": 0,
+        }
+        for i in range(nb)
+    ]
+
+
+def within(origin: tuple[float, float], strike: dict[str, Any]) -> bool:
+    """Return whether a strike is inside the radius around origin."""
+    projector = PolarProjector(*origin, accurate=False)
+    return projector(strike["lat"], strike["lon"])[0] < RADIUS
+
+
+@pytest.fixture
+def removed(monkeypatch: pytest.MonkeyPatch) -> list[str]:
+    """Record the signals sent to delete entities."""
+    signals: list[str] = []
+    monkeypatch.setattr(
+        geo_location,
+        "async_dispatcher_send",
+        lambda hass, signal: signals.append(signal),
+    )
+    return signals
+
+
+def test_retain() -> None:
+    """Retain drops every other strike and keeps the counts consistent."""
+    grid = StrikeGrid(1000)
+    strikes = random_strikes(300, seed=1)
+    for strike in strikes:
+        grid.insert(strike["time"] / 1e9, f"c{strike['region']}", strike)
+    kept = strikes[::3]
+
+    removed = grid.retain(kept)
+
+    assert len(removed) == 200
+    assert len(grid) == 100
+    assert grid.cell_count("c1") == 100
+    assert grid.query(*LONDON, 1000) == kept
+    assert grid.retain(kept) == []
+
+
+@pytest.mark.parametrize("seed", [2, 3, 4])
+def test_location_change_removes_clusters_out_of_radius(
+    removed: list[str], seed: int
+) -> None:
+    """Moving the location removes the clusters which have no strike left inside."""
+    added = []
+    manager = BlitzortungEventManager(
+        SimpleNamespace(config=SimpleNamespace(units=None)),
+        added.extend,
+        1000,
+        3600,
+        cluster_strikes=True,
+    )
+    strikes = [s for s in random_strikes(500, seed) if within(LONDON, s)]
+
+    async def receive() -> None:
+        for strike in strikes:
+            await manager.lightning_cb(dict(strike))
+
+    asyncio.run(receive())
+    manager.location_changed(*READING, RADIUS)
+
+    inside = [s for s in strikes if within(READING, s)]
+    clusters = {
+        cluster._attr_extra_state_attributes[ATTR_GEOHASH]: cluster  # noqa: SLF001
+        for cluster in added
+        if SIGNAL_DELETE_ENTITY.format(cluster._strike_id) not in removed  # noqa: SLF001
+    }
+    assert 0 < len(inside) < len(strikes)
+    assert clusters.keys() == {
+        geohash.encode(s["lat"], s["lon"], GRID_GEOHASH_PRECISION) for s in inside
+    }
+    assert sum(
+        cluster._attr_extra_state_attributes[ATTR_LIGHTNING_COUNTER]  # noqa: SLF001
+        for cluster in clusters.values()
+    ) == len(inside)
@@ -0,0 +1,237 @@
+"""Tests for the MQTT client's topic routing and message queue."""
+
+from __future__ import annotations
+
+import asyncio
+from collections import Counter
+from collections.abc import Callable
+import logging
+import random
+from types import SimpleNamespace
+
+import paho.mqtt.client as paho
+from paho.mqtt.matcher import MQTTMatcher
+import pytest
+
+from custom_components.blitzortung import mqtt
+from custom_components.blitzortung.mqtt import MQTT, Message
+
+FILTERS = (
+    "blitzortung/1.1/u/c/f/#",
+    "blitzortung/1.1/u/c/#",
+    "blitzortung/1.1/u/c/f/#",
+    "blitzortung/1.1/+/c/f/#",
+    "blitzortung/1.1/u/+/g/#",
+    "blitzortung/1.1/u/c/f",
+    "$SYS/broker/#",
+    "+/broker/load",
+    "#",
+    "component/hello",
+)
+GEOHASH_CHARS = "cfgu"
+
+
+def former_match_topic(subscription: str, topic: str) -> bool:
+    """Test if topic matches subscription, as dispatch did before the trie."""
+    matcher = MQTTMatcher()
+    matcher[subscription] = True
+    try:
+        next(matcher.iter_match(topic))
+    except StopIteration:
+        return False
+    else:
+        return True
+
+
+def random_topics(nb: int, seed: int) -> list[str]:
+    """Return strike topics down to various geohash depths, and a few others."""
+    rng = random.Random(seed)
+    topics = []
+    for _ in range(nb):
+        if rng.random() < 0.8:
+            depth = rng.randint(1, 6)
+            cells = "/".join(rng.choice(GEOHASH_CHARS) for _ in range(depth))
+            topics.append(f"blitzortung/1.1/{cells}")
+        else:
+            topics.append(
+                rng.choice(
+                    (
+                        "$SYS/broker/load",
+                        "$SYS/broker/clients/connected",
+                        "component/hello",
+                        "other/broker/load",
+                        "blitzortung/1.0/u/c/f",
+                    )
+                )
+            )
+    return topics
+
+
+def make_message(topic: str, payload: bytes = b"{}") -> paho.MQTTMessage:
+    """Return a message as paho hands it over."""
+    msg = paho.MQTTMessage(topic=topic.encode())
+    msg.payload = payload
+    return msg
+
+
+def new_client() -> MQTT:
+    """Return a client that is not connected."""
+    return MQTT(SimpleNamespace(), "localhost")
+
+
+async def dispatch(client: MQTT, messages: list[paho.MQTTMessage]) -> None:
+    """Queue the messages as the event loop receives them, then dispatch them."""
+    for msg in messages:
+        client._mqtt_enqueue_message(msg)  # noqa: SLF001
+    consumer = asyncio.create_task(client._async_consume())  # noqa: SLF001
+    while not client._queue.empty():  # noqa: SLF001
+        await asyncio.sleep(0)
+    # Let the consumer handle the last message
+    for _ in range(3):
+        await asyncio.sleep(0)
+    consumer.cancel()
+
+
+def test_routing_matches_former_dispatch(caplog: pytest.LogCaptureFixture) -> None:
+    """Each message reaches the subscriptions the former per-filter match found."""
+    client = new_client()
+    received: list[tuple[int, Message]] = []
+
+    def recorder(index: int) -> Callable[[Message], object]:
+        if index % 2:
+
+            async def async_record(message: Message) -> None:
+                received.append((index, message))
+
+            return async_record
+        return lambda message: received.append((index, message))
+
+    encodings = ["utf-8", None, "utf-8", "utf-8", "latin-1"]
+    messages = [
+        make_message(topic, b"%d" % n)
+        for n, topic in enumerate(random_topics(900, seed=1))
+    ]
+    # Not valid utf-8, only the subscriptions without encoding or to latin-1 get it
+    messages.append(make_message("blitzortung/1.1/u/c/f/g", b"\xff900"))
+
+    async def run() -> None:
+        for index, topic in enumerate(FILTERS):
+            await client.async_subscribe(
+                topic, recorder(index), 0, encodings[index % len(encodings)]
+            )
+        await dispatch(client, messages)
+
+    with caplog.at_level(logging.WARNING):
+        asyncio.run(run())
+
+    expected = [
+        (msg.topic, index)
+        for msg in messages
+        for index, subscription in enumerate(client.subscriptions)
+        if former_match_topic(subscription.topic, msg.topic)
+        and not (subscription.encoding == "utf-8" and msg.payload.startswith(b"\xff"))
+    ]
+    assert Counter((message.topic, index) for index, message in received) == Counter(
+        expected
+    )
+    assert client.stats["dispatched"] == len(received) == len(expected)
+    # Dispatched in arrival order
+    order = [
+        int(
+            message.payload.lstrip(b"\xff")
+            if isinstance(message.payload, bytes)
+            else message.payload.lstrip("\xff")
+        )
+        for _, message in received
+    ]
+    assert order == sorted(order)
+    for index, message in received:
+        subscription = client.subscriptions[index]
+        assert message.subscribed_topic == subscription.topic
+        if subscription.encoding is None:
+            assert isinstance(message.payload, bytes)
+        else:
+            assert isinstance(message.payload, str)
+    assert "Can't decode payload" in caplog.text
+
+
+def test_overflow_drops_oldest(
+    monkeypatch: pytest.MonkeyPatch, caplog: pytest.LogCaptureFixture
+) -> None:
+    """A full queue drops its oldest messages, and the counters tell how many."""
+    monkeypatch.setattr(mqtt, "MESSAGE_QUEUE_SIZE", 5)
+    client = new_client()
+    received: list[bytes] = []
+
+    async def run() -> None:
+        await client.async_subscribe(
+            "blitzortung/1.1/#", lambda message: received.append(message.payload), 0
+        )
+        await dispatch(
+            client,
+            [make_message("blitzortung/1.1/u/c", b"%d" % n) for n in range(12)],
+        )
+        assert received == [b"%d" % n for n in range(7, 12)]
+        assert client.stats == {
+            "received": 12,
+            "dispatched": 5,
+            "dropped": 7,
+            "queue_high_water": 5,
+        }
+        assert not client._overloaded  # noqa: SLF001
+
+        # A burst the queue can hold loses nothing
+        await dispatch(
+            client,
+            [make_message("blitzortung/1.1/u/c", b"%d" % n) for n in range(12, 16)],
+        )
+        assert received[5:] == [b"%d" % n for n in range(12, 16)]
+        assert client.stats["dropped"] == 7
+        assert client.stats["dispatched"] == 9
+
+    with caplog.at_level(logging.INFO):
+        asyncio.run(run())
+    # One warning per overload episode, and a note when it is over
+    assert caplog.text.count("queue is full") == 1
+    assert caplog.text.count("queue drained, 7 messages dropped") == 1
+
+
+def test_unsubscribe_during_dispatch() -> None:
+    """A subscription removed by a callback gets no message from then on."""
+    client = new_client()
+    calls: list[str] = []
+    unsubscribe: dict[str, Callable[[], None]] = {}
+
+    def recorder(name: str, *removed: str) -> Callable[[Message], None]:
+        def record(message: Message) -> None:
+            calls.append(name)
+            for other in removed:
+                if other in unsubscribe:
+                    unsubscribe.pop(other)()
+
+        return record
+
+    async def run() -> None:
+        # For a/b the trie yields a/b first, then a/+, then a/#
+        for name, topic, removed in (
+            ("exact", "a/b", ("plus",)),
+            ("first", "a/#", ("first", "second")),
+            ("second", "a/#", ()),
+            ("plus", "a/+", ()),
+            ("other", "a/#", ()),
+        ):
+            unsubscribe[name] = await client.async_subscribe(
+                topic, recorder(name, *removed), 0
+            )
+        await dispatch(client, [make_message("a/b"), make_message("a/b")])
+
+    asyncio.run(run())
+
+    # In the first message, "plus" was removed before its filter was reached,
+    # and "second" by the subscription before it on the same filter
+    assert calls == ["exact", "first", "other", "exact", "other"]
+    assert client.stats["dispatched"] == 5
+    assert [sub.topic for sub in client.subscriptions] == ["a/b", "a/#"]
+    with pytest.raises(KeyError):
+        client._matcher["a/+"]  # noqa: SLF001
+    assert len(client._matcher["a/#"]) == 1  # noqa: SLF001
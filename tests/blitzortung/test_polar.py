@@ -0,0 +1,96 @@
+"""Tests for the distance and azimuth of strikes."""
+
+from __future__ import annotations
+
+import math
+import random
+
+import pytest
+
+from custom_components.blitzortung.const import POLAR_FAST_MAX_RADIUS
+from custom_components.blitzortung.polar import PolarProjector
+
+LONDON = (51.5074, -0.1278)
+PARIS = (48.8566, 2.3522)
+NEW_YORK = (40.7128, -74.0060)
+
+
+def equirectangular(
+    origin: tuple[float, float], latitude: float, longitude: float
+) -> tuple[float, float]:
+    """Return distance and azimuth as computed before PolarProjector."""
+    dy = (latitude - origin[0]) * math.pi / 180
+    dx = (longitude - origin[1]) * math.pi / 180 * math.cos(origin[0] * math.pi / 180)
+    return math.sqrt(dx * dx + dy * dy) * 6371, math.atan2(dx, dy) * 180 / math.pi % 360
+
+
+def azimuth_difference(first: float, second: float) -> float:
+    """Return the angle between two azimuths in degrees."""
+    difference = abs(first - second) % 360
+    return min(difference, 360 - difference)
+
+
+@pytest.mark.parametrize(
+    ("origin", "target", "distance", "azimuth"),
+    [
+        (LONDON, PARIS, 343.6, 148.1),
+        (PARIS, LONDON, 343.6, 330.0),
+        (NEW_YORK, LONDON, 5570.2, 51.2),
+        (LONDON, NEW_YORK, 5570.2, 288.3),
+        ((0.0, 0.0), (0.0, 1.0), 111.2, 90.0),
+        ((0.0, 0.0), (-1.0, 0.0), 111.2, 180.0),
+    ],
+)
+def test_accurate_reference_values(
+    origin: tuple[float, float],
+    target: tuple[float, float],
+    distance: float,
+    azimuth: float,
+) -> None:
+    """The accurate mode gives the great-circle distance and initial bearing."""
+    result = PolarProjector(*origin, accurate=True)(*target)
+
+    assert round(result[0], 1) == distance
+    assert round(result[1], 1) == azimuth
+
+
+def test_same_point() -> None:
+    """A strike at the reference point is at distance 0 in both modes."""
+    for accurate in (False, True):
+        assert PolarProjector(*LONDON, accurate=accurate)(*LONDON)[0] == 0
+
+
+def test_fast_matches_equirectangular() -> None:
+    """The fast mode gives the results of the former computation."""
+    rng = random.Random(0)
+    projector = PolarProjector(*LONDON, accurate=False)
+    for _ in range(1000):
+        latitude = LONDON[0] + rng.uniform(-3, 3)
+        longitude = LONDON[1] + rng.uniform(-5, 5)
+        expected = equirectangular(LONDON, latitude, longitude)
+
+        assert projector(latitude, longitude) == pytest.approx(expected, abs=1e-9)
+
+
+@pytest.mark.parametrize("latitude", [0.0, 30.0, 45.0, 60.0])
+def test_fast_within_radius(latitude: float) -> None:
+    """The fast mode stays close to the accurate one within its radius."""
+    rng = random.Random(latitude)
+    fast = PolarProjector(latitude, 10.0, accurate=False)
+    accurate = PolarProjector(latitude, 10.0, accurate=True)
+    spread = POLAR_FAST_MAX_RADIUS / 111.2
+    compared = 0
+    for _ in range(2000):
+        target_latitude = latitude + rng.uniform(-spread, spread)
+        target_longitude = 10.0 + rng.uniform(-spread, spread) / math.cos(
+            math.radians(latitude)
+        )
+        distance, azimuth = accurate(target_latitude, target_longitude)
+        if not 1 < distance <= POLAR_FAST_MAX_RADIUS:
+            continue
+        fast_distance, fast_azimuth = fast(target_latitude, target_longitude)
+
+        assert fast_distance == pytest.approx(distance, rel=0.02)
+        assert azimuth_difference(fast_azimuth, azimuth) < 3
+        compared += 1
+    assert compared > 1000
@@ -0,0 +1,98 @@
+"""Fixtures for the WashData tests."""
+
+from __future__ import annotations
+
+import asyncio
+import copy
+import random
+from datetime import UTC, datetime, timedelta
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+
+from custom_components.ha_washdata.profile_store import ProfileStore
+
+TEST_ENTRY_ID = "test_entry"
+
+
+class FakeStore:
+    """In-memory Store keeping a copy of every write, like the file on disk."""
+
+    def __init__(self) -> None:
+        """Initialize."""
+        self.saved: dict[str, Any] | None = None
+        self.writes = 0
+
+    async def async_save(self, data: dict[str, Any]) -> None:
+        """Write data now."""
+        self.saved = copy.deepcopy(data)
+        self.writes += 1
+
+    def async_delay_save(self, data_func, delay: float = 0) -> None:
+        """Write data now; the delay does not matter to the tests."""
+        self.saved = copy.deepcopy(data_func())
+        self.writes += 1
+
+
+async def _async_add_executor_job(target, *args):
+    """Run a job in the default executor, like HomeAssistant does."""
+    return await asyncio.get_running_loop().run_in_executor(None, target, *args)
+
+
+def _async_create_background_task(target, name: str) -> asyncio.Task:
+    """Run a background task on the running loop."""
+    return asyncio.get_running_loop().create_task(target, name=name)
+
+
+@pytest.fixture
+def events() -> list[dict[str, Any]]:
+    """Record the reprocess progress events."""
+    return []
+
+
+@pytest.fixture
+def hass(events: list[dict[str, Any]]) -> SimpleNamespace:
+    """Return a minimal hass running jobs on the running loop."""
+    return SimpleNamespace(
+        async_add_executor_job=_async_add_executor_job,
+        async_create_background_task=_async_create_background_task,
+        bus=SimpleNamespace(async_fire=lambda event, data: events.append(data)),
+    )
+
+
+def new_store(
+    hass: SimpleNamespace, data: dict[str, Any] | None = None
+) -> ProfileStore:
+    """Return a ProfileStore on a FakeStore, loaded with data."""
+    store = ProfileStore(hass, TEST_ENTRY_ID)
+    store._store = FakeStore()  # noqa: SLF001
+    if data is not None:
+        store._data = copy.deepcopy(data)  # noqa: SLF001
+    return store
+
+
+def generate_cycles(nb: int, seed: int) -> list[dict[str, Any]]:
+    """Return stored cycles with idle readings around the run, in offset format."""
+    rng = random.Random(seed)
+    start = datetime(2026, 3, 1, 8, tzinfo=UTC)
+    cycles = []
+    for i in range(nb):
+        leading = rng.randint(0, 6)
+        running = rng.randint(15, 60)
+        trailing = rng.randint(0, 6)
+        powers = (
+            [0.0] * leading
+            + [round(rng.uniform(5, 2000), 1) for _ in range(running)]
+            + [0.0] * trailing
+        )
+        cycles.append(
+            {
+                "id": f"cycle_{i}",
+                "start_time": (start + timedelta(hours=6 * i)).isoformat(),
+                "duration": 30.0 * (len(powers) - 1),
+                "status": rng.choice(["completed", "force_stopped", "interrupted"]),
+                "power_data": [[30.0 * j, p] for j, p in enumerate(powers)],
+            }
+        )
+    return cycles
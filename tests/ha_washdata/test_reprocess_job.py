@@ -0,0 +1,172 @@
+"""Tests for the checkpointed background reprocess job."""
+
+from __future__ import annotations
+
+import asyncio
+import copy
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+
+from custom_components.ha_washdata import profile_store
+from custom_components.ha_washdata.profile_store import ProfileStore
+
+from .conftest import generate_cycles, new_store
+
+NB_CYCLES = 200
+CHUNK_CYCLES = 5
+
+
+@pytest.fixture(autouse=True)
+def small_chunks(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Split the job in many chunks so it can be stopped in the middle."""
+    monkeypatch.setattr(profile_store, "REPROCESS_CHUNK_MAX_CYCLES", CHUNK_CYCLES)
+
+
+@pytest.fixture
+def cycles() -> list[dict[str, Any]]:
+    """Return the stored cycles before reprocessing."""
+    return generate_cycles(NB_CYCLES, seed=1)
+
+
+def reprocess_in_one_pass(
+    hass: SimpleNamespace, cycles: list[dict[str, Any]]
+) -> tuple[list[dict[str, Any]], int]:
+    """Reprocess every cycle in place, as before the background job."""
+    reference = copy.deepcopy(cycles)
+    store = new_store(hass)
+    processed = sum(store._reprocess_cycle(cycle) for cycle in reference)  # noqa: SLF001
+    return reference, processed
+
+
+async def wait_for_chunks(events: list[dict[str, Any]], nb: int) -> None:
+    """Let the job run until it reported nb chunks."""
+    while len(events) < nb:
+        await asyncio.sleep(0)
+
+
+def job_task(store: ProfileStore) -> asyncio.Task:
+    """Return the task of the running job."""
+    task = store._reprocess_task  # noqa: SLF001
+    assert task is not None
+    return task
+
+
+async def test_equivalent_to_single_pass(
+    hass: SimpleNamespace, events: list[dict[str, Any]], cycles: list[dict[str, Any]]
+) -> None:
+    """The chunked job stores the same cycles as one pass over all of them."""
+    reference, processed = reprocess_in_one_pass(hass, cycles)
+    store = new_store(hass, {"profiles": {}, "past_cycles": cycles})
+
+    assert store.start_reprocess_job()
+    assert not store.start_reprocess_job()
+    await job_task(store)
+
+    assert reference != cycles
+    assert store._data["past_cycles"] == reference  # noqa: SLF001
+    assert store._store.saved["past_cycles"] == reference  # noqa: SLF001
+    assert "reprocess_job" not in store._store.saved  # noqa: SLF001
+    assert len(events) > NB_CYCLES // CHUNK_CYCLES
+    assert events[-2]["done"] == events[-2]["total"] == NB_CYCLES
+    assert events[-1]["state"] == "completed"
+    assert store._last_reprocess_count == processed  # noqa: SLF001
+
+
+@pytest.mark.parametrize("interruption", ["suspend", "crash"])
+async def test_resume_from_checkpoint(
+    hass: SimpleNamespace,
+    events: list[dict[str, Any]],
+    cycles: list[dict[str, Any]],
+    monkeypatch: pytest.MonkeyPatch,
+    interruption: str,
+) -> None:
+    """A job stopped in the middle resumes from its saved checkpoint."""
+    reference, processed = reprocess_in_one_pass(hass, cycles)
+    store = new_store(hass, {"profiles": {}, "past_cycles": cycles})
+    if interruption == "crash":
+        # Checkpoint after every chunk, then lose the task without a save
+        monkeypatch.setattr(profile_store, "REPROCESS_CHECKPOINT_INTERVAL", 0.0)
+
+    store.start_reprocess_job()
+    await wait_for_chunks(events, 3)
+    if interruption == "suspend":
+        await store.async_suspend_reprocess()
+        assert store.get_reprocess_progress()["state"] == "paused"
+    else:
+        task = job_task(store)
+        task.cancel()
+        await asyncio.wait([task])
+
+    checkpoint = store._store.saved  # noqa: SLF001
+    job = checkpoint["reprocess_job"]
+    assert job["total"] == NB_CYCLES
+    assert 0 < job["done"] < NB_CYCLES
+    assert len(job["pending"]) == NB_CYCLES - job["done"]
+
+    events.clear()
+    resumed = new_store(hass, checkpoint)
+    assert resumed.has_pending_reprocess
+    assert resumed.start_reprocess_job()
+    await job_task(resumed)
+
+    assert events[0]["done"] > job["done"]
+    assert events[-2]["done"] == NB_CYCLES
+    assert resumed._data["past_cycles"] == reference  # noqa: SLF001
+    assert resumed._last_reprocess_count == processed  # noqa: SLF001
+    assert not resumed.has_pending_reprocess
+
+
+async def test_cancel_mid_run(
+    hass: SimpleNamespace, events: list[dict[str, Any]], cycles: list[dict[str, Any]]
+) -> None:
+    """Cancelling keeps the reprocessed cycles and drops the checkpoint."""
+    reference, _ = reprocess_in_one_pass(hass, cycles)
+    store = new_store(hass, {"profiles": {}, "past_cycles": cycles})
+
+    store.start_reprocess_job()
+    await wait_for_chunks(events, 3)
+    assert await store.async_cancel_reprocess()
+
+    done = events[-2]["done"]
+    assert 0 < done < NB_CYCLES
+    assert events[-1]["state"] == "cancelled"
+    assert not store.is_reprocessing
+    assert not store.has_pending_reprocess
+    assert "reprocess_job" not in store._store.saved  # noqa: SLF001
+    stored = store._data["past_cycles"]  # noqa: SLF001
+    assert stored[:done] == reference[:done]
+    assert stored[done:] == cycles[done:]
+    assert not await store.async_cancel_reprocess()
+
+
+async def test_cycles_deleted_during_the_job(
+    hass: SimpleNamespace, events: list[dict[str, Any]], cycles: list[dict[str, Any]]
+) -> None:
+    """Cycles deleted while the job runs are skipped, not restored."""
+    reference, _ = reprocess_in_one_pass(hass, cycles)
+    store = new_store(hass, {"profiles": {}, "past_cycles": cycles})
+
+    store.start_reprocess_job()
+    await wait_for_chunks(events, 3)
+    stored = store._data["past_cycles"]  # noqa: SLF001
+    deleted = {cycle["id"] for cycle in stored[-50::2]}
+    stored[:] = [cycle for cycle in stored if cycle["id"] not in deleted]
+    await job_task(store)
+
+    assert events[-2]["done"] == NB_CYCLES
+    assert store._data["past_cycles"] == [  # noqa: SLF001
+        cycle for cycle in reference if cycle["id"] not in deleted
+    ]
+
+
+def test_budget_setting() -> None:
+    """The chunk budget comes from the option in milliseconds."""
+    store = new_store(SimpleNamespace())
+    store.set_reprocess_budget(500)
+    assert store._reprocess_budget_s == 0.5  # noqa: SLF001
+    store.set_reprocess_budget(0)
+    assert store._reprocess_budget_s == 0.01  # noqa: SLF001
+    store.set_reprocess_budget("invalid")
+    assert store._reprocess_budget_s == 0.01  # noqa: SLF001
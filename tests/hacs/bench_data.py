@@ -0,0 +1,100 @@
+"""Cost of HacsData writes and restore with 5,000 repositories.
+
+Not collected by pytest. Run it from the repository root with:
+
+    python -m tests.hacs.bench_data [repositories]
+
+The stores are kept in memory as the JSON text they would be written as, so
+the timings cover building, diffing, serializing and parsing the data, not the
+file system. It prints the time of:
+- the former write, which rebuilt and compared both full stores;
+- a write after one repository changed, which is journaled;
+- a write with nothing changed;
+- a forced write, which compacts the journal into the full stores;
+- a restore of the full store with a journal of 100 entries to replay.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable
+import statistics
+import sys
+import time
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from custom_components.hacs.base import HacsBase
+from custom_components.hacs.utils.data import JOURNAL_STORE_KEY, HacsData
+from custom_components.hacs.utils.store import async_save_to_store
+
+from .test_data import MemoryDisk, memory_stores, restored, setup_hacs
+
+REPEAT = 20
+
+
+async def former_write(data: HacsData) -> None:
+    """Write the stores as async_write did before the journal."""
+    content: dict[str, dict] = {}
+    experimental: dict[str, list[dict]] = {}
+    for repository in data.hacs.repositories.list_all:
+        if repository.data.category in data.hacs.common.categories:
+            data.async_store_repository_data(repository, content)
+            data.async_store_experimental_repository_data(repository, experimental)
+    await async_save_to_store(data.hacs.hass, "data", {"repositories": experimental})
+    await async_save_to_store(data.hacs.hass, "repositories", content)
+
+
+async def median_ms(func: Callable[[], Awaitable[object]], before: Callable[[], None]) -> float:
+    """Return the median time of func() in milliseconds, calling before() untimed."""
+    times = []
+    for _ in range(REPEAT):
+        before()
+        start = time.perf_counter()
+        await func()
+        times.append(time.perf_counter() - start)
+    return statistics.median(times) * 1000
+
+
+async def run(nb_repositories: int) -> None:
+    """Print the benchmark results."""
+    hacs = HacsBase()
+    hacs.hass = SimpleNamespace()
+    repositories = setup_hacs(hacs, nb_repositories)
+    data = HacsData(hacs)
+    disk = MemoryDisk()
+    changed = iter(range(10**9))
+
+    def change_one() -> None:
+        repositories[next(changed) % nb_repositories].data.downloads += 1
+
+    with memory_stores(disk), patch.object(hacs, "async_dispatch"):
+        await data.async_force_write()
+        size = len(disk["repositories"]) + len(disk["data"])
+        print(f"{nb_repositories} repositories, {size / 2**20:.1f} MiB in the full stores")
+
+        timings = {
+            "former write": await median_ms(lambda: former_write(data), change_one),
+            "journaled write": await median_ms(data.async_write, change_one),
+            "write, no change": await median_ms(data.async_write, lambda: None),
+            "compacting write": await median_ms(data.async_force_write, change_one),
+        }
+        for _ in range(100):
+            change_one()
+            await data.async_write()
+    assert len(data._journal) == 100  # noqa: SLF001
+    assert JOURNAL_STORE_KEY in disk
+    timings["restore and replay"] = await median_ms(lambda: restored(disk), lambda: None)
+
+    for name, timing in timings.items():
+        print(f"  {name:<20} {timing:8.1f} ms")
+
+
+def main() -> None:
+    """Run the benchmark."""
+    nb_repositories = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    asyncio.run(run(nb_repositories))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,23 @@
+"""Fixtures for the HACS tests."""
+
+from __future__ import annotations
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from custom_components.hacs.base import HacsBase
+
+
+async def _async_add_executor_job(target, *args):
+    """Run a job in the default executor, like HomeAssistant does."""
+    return await asyncio.get_running_loop().run_in_executor(None, target, *args)
+
+
+@pytest.fixture
+def hacs() -> HacsBase:
+    """Return a HacsBase with a minimal hass; the test sets the session."""
+    hacs = HacsBase()
+    hacs.hass = SimpleNamespace(async_add_executor_job=_async_add_executor_job)
+    return hacs
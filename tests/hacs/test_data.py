@@ -0,0 +1,268 @@
+"""Journaled repository stores of HacsData."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Iterator
+from contextlib import contextmanager
+from datetime import UTC, datetime
+import json
+from unittest.mock import patch
+
+import pytest
+
+from custom_components.hacs.base import HacsBase
+from custom_components.hacs.repositories.base import HacsManifest, HacsRepository
+from custom_components.hacs.utils import data as data_module, store as store_module
+from custom_components.hacs.utils.data import JOURNAL_STORE_KEY, HacsData
+
+CATEGORIES = ("integration", "plugin", "theme")
+
+
+class MemoryDisk(dict):
+    """Store contents by key, as the JSON text a store would write."""
+
+    def __init__(self) -> None:
+        """Start empty."""
+        super().__init__()
+        self.saves: list[str] = []
+        # Saves of these keys raise OSError, removes of them too
+        self.failing: set[str] = set()
+        # Saves of these keys wait for the event to be set
+        self.held: dict[str, asyncio.Event] = {}
+
+    @property
+    def repository_saves(self) -> list[str]:
+        """Return the saved keys but "hacs".
+
+        The "hacs" store holds sets, which never compare equal to the lists
+        read back, so it is saved on every write.
+        """
+        return [key for key in self.saves if key != "hacs"]
+
+
+class MemoryStore:
+    """The HACSStore calls HacsData makes, on a MemoryDisk."""
+
+    def __init__(self, disk: MemoryDisk, key: str) -> None:
+        """Initialize."""
+        self.disk = disk
+        self.key = key
+
+    async def async_load(self) -> dict | None:
+        """Return the stored data, or None."""
+        if (text := self.disk.get(self.key)) is None:
+            return None
+        return json.loads(text)
+
+    async def async_save(self, data: dict) -> None:
+        """Replace the stored data."""
+        if (event := self.disk.held.get(self.key)) is not None:
+            await event.wait()
+        if self.key in self.disk.failing:
+            raise OSError(f"Cannot write {self.key}")
+        self.disk[self.key] = json.dumps(data, default=sorted)
+        self.disk.saves.append(self.key)
+
+    async def async_remove(self) -> None:
+        """Remove the stored data."""
+        if self.key in self.disk.failing:
+            raise OSError(f"Cannot remove {self.key}")
+        self.disk.pop(self.key, None)
+
+
+@contextmanager
+def memory_stores(disk: MemoryDisk) -> Iterator[None]:
+    """Have the HACS stores read and write disk."""
+    with (
+        patch.object(store_module, "get_store_for_key", lambda _hass, key: MemoryStore(disk, key)),
+        patch.object(data_module, "get_store_for_key", lambda _hass, key: MemoryStore(disk, key)),
+    ):
+        yield
+
+
+def make_repository(hacs: HacsBase, repository_id: int) -> HacsRepository:
+    """Add a repository with the kind of data HACS keeps for each, every 10th downloaded."""
+    repository = HacsRepository(hacs)
+    repository.data.id = str(repository_id)
+    repository.data.full_name = f"owner{repository_id % 700}/repository-{repository_id}"
+    repository.data.category = CATEGORIES[repository_id % len(CATEGORIES)]
+    repository.data.description = f"Custom card number {repository_id} for the dashboard"
+    repository.data.authors = [f"@owner{repository_id % 700}"]
+    repository.data.topics = ["home-assistant", "hacs", f"topic{repository_id % 50}"]
+    repository.data.stargazers_count = repository_id % 997
+    repository.data.downloads = repository_id * 3
+    repository.data.last_updated = "2026-09-01T12:00:00Z"
+    repository.data.etag_repository = f'W/"{repository_id:040x}"'
+    repository.data.new = False
+    if repository_id % 10 == 0:
+        repository.data.installed = True
+        repository.data.installed_version = "1.2.0"
+        repository.data.last_version = "1.3.0"
+        repository.data.published_tags = ["1.3.0", "1.2.0", "1.1.0"]
+        repository.data.releases = True
+        repository.data.last_fetched = datetime(2026, 10, 1, tzinfo=UTC)
+        repository.repository_manifest = HacsManifest.from_dict(
+            {"name": f"Repository {repository_id}", "render_readme": True}
+        )
+    hacs.repositories._repositories.add(repository)  # noqa: SLF001
+    return repository
+
+
+def setup_hacs(hacs: HacsBase, nb_repositories: int) -> list[HacsRepository]:
+    """Set up hacs with nb_repositories repositories, and return them."""
+    hacs.hass.async_create_background_task = lambda coro, _name: (
+        asyncio.get_running_loop().create_task(coro)
+    )
+    hacs.common.categories = set(CATEGORIES)
+    return [make_repository(hacs, repository_id) for repository_id in range(1, nb_repositories + 1)]
+
+
+async def restored(disk: MemoryDisk) -> tuple[HacsData, dict[str, dict]]:
+    """Restore a fresh HacsData from disk, return it and the repositories it read."""
+    hacs = HacsBase()
+    hacs.hass = None
+    data = HacsData(hacs)
+    read: dict[str, dict] = {}
+
+    async def register_unknown_repositories(repositories: dict[str, dict]) -> None:
+        read.update(repositories)
+
+    with (
+        memory_stores(disk),
+        patch.object(data, "register_unknown_repositories", register_unknown_repositories),
+        patch.object(data, "async_restore_repository"),
+    ):
+        assert await data.restore()
+    return data, read
+
+
+async def test_journal_replay(hacs: HacsBase) -> None:
+    """Changed, added and removed repositories are journaled, and replayed on restore."""
+    disk = MemoryDisk()
+    repositories = setup_hacs(hacs, 20)
+    data = HacsData(hacs)
+    with memory_stores(disk):
+        # The first write is a full one
+        await data.async_write()
+        assert JOURNAL_STORE_KEY not in disk
+        full_store = disk["repositories"]
+        assert json.loads(full_store) == data.content
+
+        repositories[0].data.stargazers_count += 1
+        repositories[9].data.installed_version = "1.3.0"
+        hacs.repositories._repositories.remove(repositories[4])  # noqa: SLF001
+        make_repository(hacs, 21)
+        disk.saves.clear()
+        await data.async_write()
+
+        assert disk.repository_saves == [JOURNAL_STORE_KEY]
+        assert disk["repositories"] == full_store
+        journal = json.loads(disk[JOURNAL_STORE_KEY])
+        assert journal == {
+            "1": data.content["1"],
+            "10": data.content["10"],
+            "5": None,
+            "21": data.content["21"],
+        }
+
+        # Nothing changed, nothing written
+        disk.saves.clear()
+        await data.async_write()
+        assert disk.repository_saves == []
+
+    restored_data, read = await restored(disk)
+    assert read == data.content
+    assert "5" not in read
+    assert restored_data._journal == journal  # noqa: SLF001
+
+    # Restored as written, so the next write has nothing to journal
+    restored_data.hacs = hacs
+    disk.saves.clear()
+    with memory_stores(disk):
+        await restored_data.async_write()
+    assert disk.repository_saves == []
+
+
+async def test_compaction(hacs: HacsBase, monkeypatch: pytest.MonkeyPatch) -> None:
+    """A journal past the threshold is compacted into the full stores in the background."""
+    monkeypatch.setattr(data_module, "JOURNAL_COMPACT_MIN_ENTRIES", 3)
+    disk = MemoryDisk()
+    repositories = setup_hacs(hacs, 20)
+    data = HacsData(hacs)
+    with memory_stores(disk):
+        await data.async_write()
+        repositories[0].data.downloads += 1
+        repositories[1].data.downloads += 1
+        await data.async_write()
+        assert data._compact_task is None  # noqa: SLF001
+
+        # A downloaded one, which is also in the "data" store
+        repositories[9].data.downloads += 1
+        disk.saves.clear()
+        await data.async_write()
+        assert disk.repository_saves == [JOURNAL_STORE_KEY]
+        await data._compact_task  # noqa: SLF001
+
+    assert disk.repository_saves == [JOURNAL_STORE_KEY, "repositories", "data"]
+    assert JOURNAL_STORE_KEY not in disk
+    assert json.loads(disk["repositories"]) == data.content
+    assert sum(len(entries) for entries in json.loads(disk["data"])["repositories"].values()) == 20
+    assert data._journal == {}  # noqa: SLF001
+
+
+@pytest.mark.parametrize("failing", ["repositories", "data", JOURNAL_STORE_KEY])
+async def test_interrupted_compaction(hacs: HacsBase, failing: str) -> None:
+    """A compaction stopped at any step restores the latest repositories."""
+    disk = MemoryDisk()
+    repositories = setup_hacs(hacs, 20)
+    data = HacsData(hacs)
+    with memory_stores(disk):
+        await data.async_write()
+        repositories[3].data.description = "Changed"
+        hacs.repositories._repositories.remove(repositories[6])  # noqa: SLF001
+        await data.async_write()
+
+        disk.failing.add(failing)
+        with pytest.raises(OSError):
+            await data.async_force_write()
+
+    assert JOURNAL_STORE_KEY in disk
+    _, read = await restored(disk)
+    assert read == data.content
+    assert read["4"]["description"] == "Changed"
+    assert "7" not in read
+
+
+async def test_write_during_background_compaction(
+    hacs: HacsBase, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """A write waits for a running compaction and journals what it did not write."""
+    monkeypatch.setattr(data_module, "JOURNAL_COMPACT_MIN_ENTRIES", 3)
+    disk = MemoryDisk()
+    repositories = setup_hacs(hacs, 20)
+    data = HacsData(hacs)
+    with memory_stores(disk):
+        await data.async_write()
+        for repository in repositories[:3]:
+            repository.data.downloads += 1
+        disk.held["repositories"] = held = asyncio.Event()
+        await data.async_write()
+        compaction = data._compact_task  # noqa: SLF001
+        await asyncio.sleep(0)
+        compacted = dict(data.content)
+
+        # Changed while the full store is being written
+        repositories[10].data.stargazers_count += 1
+        hacs.repositories._repositories.remove(repositories[11])  # noqa: SLF001
+        write = asyncio.create_task(data.async_write())
+        await asyncio.sleep(0)
+        assert not write.done()
+
+        held.set()
+        await asyncio.gather(compaction, write)
+
+    assert json.loads(disk["repositories"]) == compacted
+    assert json.loads(disk[JOURNAL_STORE_KEY]) == {"11": data.content["11"], "12": None}
+    _, read = await restored(disk)
+    assert read == data.content
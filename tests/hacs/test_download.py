@@ -0,0 +1,92 @@
+"""Streaming downloads of HacsBase.async_download_file_to_path from a local server."""
+
+from __future__ import annotations
+
+import gzip
+import hashlib
+import os
+from pathlib import Path
+
+from aiohttp import ClientSession, web
+from aiohttp.test_utils import TestServer
+import pytest
+
+from custom_components.hacs.base import HacsBase
+from custom_components.hacs.const import DOWNLOAD_WRITE_BUFFER_SIZE
+
+# Spans several write buffers and ends with a partial one
+CONTENT = os.urandom(2 * DOWNLOAD_WRITE_BUFFER_SIZE + 12345)
+CONTENT_SHA256 = hashlib.sha256(CONTENT).hexdigest()
+
+
+async def _file(_request: web.Request) -> web.Response:
+    return web.Response(body=CONTENT)
+
+
+async def _gzip(_request: web.Request) -> web.Response:
+    return web.Response(body=gzip.compress(CONTENT), headers={"Content-Encoding": "gzip"})
+
+
+async def _truncated(request: web.Request) -> web.StreamResponse:
+    response = web.StreamResponse(headers={"Content-Length": str(len(CONTENT))})
+    await response.prepare(request)
+    await response.write(CONTENT[:1000])
+    request.transport.close()
+    return response
+
+
+async def _missing(_request: web.Request) -> web.Response:
+    return web.Response(status=404)
+
+
+async def _download(hacs: HacsBase, path: str, file_path: Path, **kwargs) -> str | None:
+    """Download path from a fresh local server to file_path."""
+    app = web.Application()
+    app.router.add_get("/file.zip", _file)
+    app.router.add_get("/gzip.zip", _gzip)
+    app.router.add_get("/truncated.zip", _truncated)
+    app.router.add_get("/missing.zip", _missing)
+    async with TestServer(app) as server, ClientSession() as session:
+        hacs.session = session
+        result = await hacs.async_download_file_to_path(
+            str(server.make_url(path)), str(file_path), nolog=True, **kwargs
+        )
+        # The response must have been released, whatever the outcome
+        assert not session.connector._acquired
+        return result
+
+
+@pytest.mark.parametrize("sha256", [None, CONTENT_SHA256, CONTENT_SHA256.upper()])
+async def test_download(hacs: HacsBase, tmp_path: Path, sha256: str | None) -> None:
+    """The content is written as is and its digest is returned."""
+    file_path = tmp_path / "file.zip"
+
+    assert await _download(hacs, "/file.zip", file_path, sha256=sha256) == CONTENT_SHA256
+    assert file_path.read_bytes() == CONTENT
+
+
+async def test_download_content_encoding(hacs: HacsBase, tmp_path: Path) -> None:
+    """Content-Length is the encoded size and is not compared with a decoded body."""
+    file_path = tmp_path / "file.zip"
+
+    assert await _download(hacs, "/gzip.zip", file_path) == CONTENT_SHA256
+    assert file_path.read_bytes() == CONTENT
+
+
+@pytest.mark.parametrize(
+    ("path", "sha256"),
+    [
+        ("/file.zip", "00" * 32),
+        ("/truncated.zip", None),
+        ("/missing.zip", None),
+    ],
+    ids=["checksum", "truncated", "status"],
+)
+async def test_download_failure(
+    hacs: HacsBase, tmp_path: Path, path: str, sha256: str | None
+) -> None:
+    """A failed download returns None and leaves no partial file."""
+    file_path = tmp_path / "file.zip"
+
+    assert await _download(hacs, path, file_path, sha256=sha256) is None
+    assert not file_path.exists()
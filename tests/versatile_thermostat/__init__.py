@@ -0,0 +1 @@
+"""Tests for the Versatile Thermostat integration."""
@@ -0,0 +1,44 @@
+# pylint: disable=line-too-long
+"""Benchmark of the capacity calibration from the recorder history and from the CapacityEstimator.
+
+Not collected by pytest. Run it from the repository root with:
+
+    python -m tests.versatile_thermostat.bench_capacity_estimator
+
+It simulates 30 days of heating and prints the time of a calibration from the
+history (without the recorder queries) and from the estimator, and both results.
+"""
+
+import asyncio
+import time
+
+from .capacity_simulation import calibrate_from_estimator, calibrate_from_history, simulate
+
+
+def best_time(function, repeat: int = 5) -> float:
+    """Return the best duration of function() in ms"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main():
+    """Print the benchmark results"""
+    simulation = simulate(0)
+    print(f"{len(simulation.slope_history)} slope states, {len(simulation.power_history)} power states, {simulation.estimator.sample_count} estimator samples")
+    for min_power_threshold in (0.95, 0.8, 0.5):
+        history = asyncio.run(calibrate_from_history(simulation, min_power_threshold))
+        estimator = calibrate_from_estimator(simulation, min_power_threshold)
+        history_ms = best_time(lambda threshold=min_power_threshold: asyncio.run(calibrate_from_history(simulation, threshold)))
+        estimator_ms = best_time(lambda threshold=min_power_threshold: calibrate_from_estimator(simulation, threshold))
+        print(
+            f"threshold {min_power_threshold:.2f}: history {history_ms:.1f} ms capacity {history['capacity']} ({history['samples_used']} samples), "
+            f"estimator {estimator_ms:.1f} ms capacity {estimator['capacity']} ({estimator['samples_used']} samples)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+# pylint: disable=line-too-long
+"""State writes per hour of a simulated VTherm, with and without the StatePublisher.
+
+Not collected by pytest. Run it from the repository root with:
+
+    python -m tests.versatile_thermostat.bench_state_publisher [--hours N] [--baseline REV]
+
+It replays the write requests of the thermostat of publish_simulation.py and
+prints the writes per hour without filtering and through the StatePublisher
+with the default state_publish_params, for a few seeds. With --baseline,
+state_publisher.py is also loaded as it is at the git revision REV and
+replayed on the same requests.
+"""
+
+import argparse
+import subprocess
+import types
+from pathlib import Path
+
+from custom_components.versatile_thermostat import state_publisher
+from custom_components.versatile_thermostat.state_publisher import StatePublisher
+
+from .publish_simulation import COALESCE_SEC, PRECISION, simulate, thermostat_events
+
+COMPONENT = "custom_components/versatile_thermostat"
+SEEDS = range(5)
+
+
+def load_revision(revision: str) -> types.ModuleType:
+    """Return the state_publisher module as it is at a git revision"""
+    source = subprocess.run(
+        ["git", "show", f"{revision}:{COMPONENT}/state_publisher.py"],
+        cwd=Path(__file__).parents[2],
+        capture_output=True,
+        check=True,
+        text=True,
+    ).stdout
+    module = types.ModuleType(f"state_publisher_{revision}")
+    exec(compile(source, f"{revision}:state_publisher.py", "exec"), module.__dict__)  # pylint: disable=exec-used
+    return module
+
+
+def main():
+    """Print the benchmark results"""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--hours", type=float, default=24, help="simulated hours per seed")
+    parser.add_argument("--baseline", help="git revision to compare with")
+    args = parser.parse_args()
+
+    params = {"precision": PRECISION, "coalesce_sec": COALESCE_SEC}
+    baseline = load_revision(args.baseline) if args.baseline else None
+    print(f"state_publish_params: {params}, writes per hour over {args.hours:g} h")
+    for seed in SEEDS:
+        events = thermostat_events(args.hours, seed)
+        line = f"seed {seed}: requested {simulate(StatePublisher, state_publisher, events, None) / args.hours:6.1f}"
+        if baseline:
+            line += f", {args.baseline} {simulate(baseline.StatePublisher, baseline, events, params) / args.hours:6.1f}"
+        line += f", current {simulate(StatePublisher, state_publisher, events, params) / args.hours:6.1f}"
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+# pylint: disable=line-too-long
+"""Replay benchmark of the EMA and the open window detection.
+
+Not collected by pytest. Run it from the repository root with:
+
+    python -m tests.versatile_thermostat.bench_temperature_replay [--events N] [--baseline REV]
+
+It replays generated traces through the algorithms and prints the time per
+reading: a mixed trace (changing temperatures, window openings, irregular
+readings) and a steady one (the same temperature every minute). With
+--baseline, ema.py and open_window_algorithm.py are also loaded as they are
+at the git revision REV and replayed on the same traces, and their results
+are checked to be the same.
+"""
+
+import argparse
+import subprocess
+import time
+import types
+from pathlib import Path
+
+from .replay import generate_trace, new_algorithms, replay, steady_trace
+
+COMPONENT = "custom_components/versatile_thermostat"
+
+
+def load_revision(revision: str) -> tuple[type, type]:
+    """Return the EMA and window classes of ema.py and open_window_algorithm.py at a git revision"""
+    classes = []
+    for module_name, class_name in (("ema", "ExponentialMovingAverage"), ("open_window_algorithm", "WindowOpenDetectionAlgorithm")):
+        source = subprocess.run(
+            ["git", "show", f"{revision}:{COMPONENT}/{module_name}.py"],
+            cwd=Path(__file__).parents[2],
+            capture_output=True,
+            check=True,
+            text=True,
+        ).stdout
+        module = types.ModuleType(f"{module_name}_{revision}")
+        exec(compile(source, f"{revision}:{module_name}.py", "exec"), module.__dict__)  # pylint: disable=exec-used
+        classes.append(getattr(module, class_name))
+    return classes[0], classes[1]
+
+
+def bench(events: list, ema_class=None, window_class=None, repeat: int = 5) -> tuple[float, list]:
+    """Return the best time per event in µs, and the results of the replay"""
+    classes = [cls for cls in (ema_class, window_class) if cls is not None]
+    best = float("inf")
+    results = []
+    for _ in range(repeat):
+        algorithms = new_algorithms(*classes)
+        start = time.perf_counter()
+        results = replay(events, *algorithms)
+        best = min(best, time.perf_counter() - start)
+    return best / len(events) * 1e6, results
+
+
+def main():
+    """Print the benchmark results"""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--events", type=int, default=200_000, help="number of events of the trace")
+    parser.add_argument("--baseline", help="git revision to compare with")
+    args = parser.parse_args()
+
+    baseline_classes = load_revision(args.baseline) if args.baseline else None
+    for trace, events in (("mixed", generate_trace(args.events, seed=0)), ("steady", steady_trace(args.events))):
+        current, results = bench(events)
+        print(f"{trace} trace, current: {current:.2f} µs per event")
+        if baseline_classes:
+            baseline, baseline_results = bench(events, *baseline_classes)
+            print(f"{trace} trace, {args.baseline}: {baseline:.2f} µs per event")
+            print(f"{trace} trace, speedup: {baseline / current:.2f}x, same results: {baseline_results == results}")
+
+
+if __name__ == "__main__":
+    main()
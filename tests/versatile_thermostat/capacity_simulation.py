@@ -0,0 +1,94 @@
+# pylint: disable=line-too-long
+"""30 days of a simulated heating, seen by the capacity calibration and by the CapacityEstimator.
+
+The temperature sensor reports every one to three minutes and each report may
+change the temperature slope sensor. control_heating runs every cycle: it
+records the current slope and power in the CapacityEstimator, like
+PropHandlerTPI does, then the power of the next cycle is set. The recorder
+history only holds the state changes of the slope and power sensors, which
+calculate_capacity_from_slope_sensor matches by sample-and-hold.
+"""
+
+import random
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+from custom_components.versatile_thermostat.auto_tpi_manager import AutoTpiManager
+from custom_components.versatile_thermostat.capacity_estimator import CapacityEstimator
+
+START = datetime(2026, 1, 5, tzinfo=timezone.utc)
+DAYS = 30
+CYCLE_SEC = 300
+# Heating capacity (°/h at full power) and Kext (°/h per ° of indoor/outdoor delta) of the simulated room
+CAPACITY = 2.0
+KEXT = 0.05
+
+
+@dataclass
+class Simulation:
+    """The recorder history and the estimator at the end of the simulated period"""
+
+    slope_history: list = field(default_factory=list)
+    power_history: list = field(default_factory=list)
+    estimator: CapacityEstimator = field(default_factory=lambda: CapacityEstimator("simulation"))
+    end: datetime = START
+
+
+def simulate(seed: int, days: int = DAYS) -> Simulation:
+    """Run the simulation"""
+    rng = random.Random(seed)
+    simulation = Simulation()
+    # As after a calibration at the start, when the history had no heating yet
+    simulation.estimator.seed([], START, START)
+    end = START + timedelta(days=days)
+    now = START
+    next_cycle = START
+    next_temperature = START
+    power = 0.0
+    slope: float | None = None
+    regime_power = 100.0
+    while now < end:
+        if next_cycle <= next_temperature:
+            now = next_cycle
+            delta_t = 12.0 + 6.0 * rng.random()
+            simulation.estimator.add_sample(now, slope, power, delta_t)
+            if rng.random() < 1 / 12:
+                # about one change of regime per hour: heating up, keeping or off
+                regime_power = rng.choice((100.0, 100.0, 90.0, 60.0, 30.0, 0.0))
+            new_power = float(min(100.0, max(0.0, round(regime_power + rng.uniform(-5, 5) if 0 < regime_power < 100 else regime_power))))
+            if new_power != power or not simulation.power_history:
+                simulation.power_history.append(SimpleNamespace(state=str(new_power), last_changed=now))
+            power = new_power
+            next_cycle += timedelta(seconds=CYCLE_SEC)
+        else:
+            now = next_temperature
+            delta_t = 12.0 + 6.0 * rng.random()
+            new_slope = round(CAPACITY * power / 100.0 - KEXT * delta_t + rng.gauss(0, 0.3), 2)
+            if new_slope != slope:
+                simulation.slope_history.append(SimpleNamespace(state=str(new_slope), last_changed=now))
+            slope = new_slope
+            next_temperature += timedelta(seconds=rng.randint(60, 180))
+    simulation.end = now
+    return simulation
+
+
+def new_manager() -> AutoTpiManager:
+    """Return an AutoTpiManager with only what the capacity calibration needs"""
+    manager = AutoTpiManager.__new__(AutoTpiManager)
+    manager._name = "simulation"  # pylint: disable=protected-access
+    return manager
+
+
+async def calibrate_from_history(simulation: Simulation, min_power_threshold: float) -> dict:
+    """Calibrate like the service does without the estimator"""
+    return await new_manager().calculate_capacity_from_slope_sensor(simulation.slope_history, simulation.power_history, min_power_threshold=min_power_threshold)
+
+
+def calibrate_from_estimator(simulation: Simulation, min_power_threshold: float) -> dict | None:
+    """Calibrate like the service does with the estimator, None if it cannot answer"""
+    estimator = simulation.estimator
+    slopes = estimator.get_slopes(min_power_threshold * 100.0, simulation.end - timedelta(days=DAYS))
+    if slopes is None:
+        return None
+    return new_manager()._calculate_capacity_from_slopes(slopes, estimator.period_days, min_power_threshold=min_power_threshold)  # pylint: disable=protected-access
@@ -0,0 +1,105 @@
+# pylint: disable=line-too-long
+"""Simulated state writes of a VTherm, seen by the StatePublisher.
+
+FakeClock stands for time.monotonic and async_call_later in the
+state_publisher module, so the coalescing windows run on simulated time. The
+simulated thermostat controls a switch on a 5 min cycle: its temperature
+sensor reports every minute, the underlying switch reports its power every 15
+sec and each report writes the state, like BaseThermostat does. The mean power
+attribute is the sum of float products, so it wobbles in its last digits
+around a value that changes once per cycle.
+"""
+
+import math
+import random
+from contextlib import contextmanager
+from types import ModuleType, SimpleNamespace
+from unittest.mock import patch
+
+CYCLE_SEC = 300
+PRECISION = 2
+COALESCE_SEC = 30
+HEATER_POWER = 1.55
+
+
+class FakeClock:
+    """The monotonic time and the Home Assistant timers of the state_publisher module"""
+
+    def __init__(self):
+        self.now = 0.0
+        # [deadline, action, cancelled]
+        self.timers: list[list] = []
+
+    def monotonic(self) -> float:
+        """The simulated time"""
+        return self.now
+
+    def async_call_later(self, _hass, delay, action):
+        """Arm a timer, like async_call_later"""
+        timer = [self.now + delay, action, False]
+        self.timers.append(timer)
+
+        def unsub():
+            timer[2] = True
+
+        return unsub
+
+    @property
+    def armed(self) -> list[float]:
+        """The deadlines of the armed timers"""
+        return [deadline for deadline, _, cancelled in self.timers if not cancelled]
+
+    def advance(self, to: float):
+        """Move the time to `to`, running the timers due on the way"""
+        while due := sorted((timer for timer in self.timers if not timer[2] and timer[0] <= to), key=lambda timer: timer[0]):
+            timer = due[0]
+            timer[2] = True
+            self.now = timer[0]
+            timer[1](None)
+        self.now = to
+
+    @contextmanager
+    def patched(self, module: ModuleType):
+        """Have module use this clock"""
+        with patch.object(module, "time", SimpleNamespace(monotonic=self.monotonic)), patch.object(module, "async_call_later", self.async_call_later):
+            yield
+
+
+def thermostat_events(hours: float, seed: int) -> list[tuple[float, dict]]:
+    """Return the (time, changed values) of each state write request of the simulated thermostat"""
+    rng = random.Random(seed)
+    events: list[tuple[float, dict]] = []
+    on_percent = 0.3
+    for cycle_start in range(0, int(hours * 3600), CYCLE_SEC):
+        on_percent = min(1.0, max(0.0, round(on_percent + rng.gauss(0, 0.05), 2)))
+        events.append((cycle_start, {"hvac_action": "heating" if on_percent > 0 else "idle", "on_percent": on_percent, "power_percent": round(on_percent * 100, 1)}))
+        if 0 < on_percent < 1:
+            events.append((cycle_start + on_percent * CYCLE_SEC, {"hvac_action": "idle"}))
+        for second in range(0, CYCLE_SEC, 15):
+            # In kW, from three underlying readings: the last digits change at each report
+            power = sum(on_percent * share * HEATER_POWER * rng.uniform(0.998, 1.002) for share in (0.5, 0.3, 0.2))
+            events.append((cycle_start + second + 0.5, {"mean_cycle_power": power, "last_update_datetime": cycle_start + second}))
+        for second in range(0, CYCLE_SEC, 60):
+            temperature = 19.5 + 0.5 * math.sin((cycle_start + second) / 3600 * math.pi) + rng.gauss(0, 0.05)
+            events.append((cycle_start + second + 0.2, {"current_temperature": round(temperature, 1), "last_temperature_datetime": cycle_start + second}))
+    events.sort(key=lambda event: event[0])
+    return events
+
+
+def simulate(publisher_class: type, module: ModuleType, events: list[tuple[float, dict]], params: dict | None) -> int:
+    """Replay the events through a publisher of publisher_class, defined in module, and return the number of writes"""
+    clock = FakeClock()
+    state = {"state": "heat", "temperature": 19.5, "preset_mode": "comfort", "hvac_action": "idle"}
+    written: list[dict] = []
+
+    def write():
+        written.append(dict(state))
+
+    with clock.patched(module):
+        publisher = publisher_class(None, "simulation", lambda: state, write, params)
+        for timestamp, changes in events:
+            clock.advance(timestamp)
+            state.update(changes)
+            publisher.publish()
+        clock.advance(events[-1][0] + COALESCE_SEC)
+    return len(written)
@@ -0,0 +1,161 @@
+# pylint: disable=line-too-long
+"""Temperature traces replayed through the EMA and the open window detection.
+
+The replay feeds each temperature reading to ExponentialMovingAverage and its
+result to WindowOpenDetectionAlgorithm, like BaseThermostat and
+FeatureWindowManager do, and runs check_age_last_measurement on the cycle
+ticks in between. The reference classes are the plain calculations, without
+the fast paths for repeated readings, and are replayed the same way.
+"""
+
+import math
+import random
+from datetime import datetime, timedelta, timezone
+
+from custom_components.versatile_thermostat.const import DEFAULT_SHORT_EMA_PARAMS
+from custom_components.versatile_thermostat.ema import ExponentialMovingAverage
+from custom_components.versatile_thermostat.open_window_algorithm import (
+    MAX_DURATION_MIN,
+    MAX_SLOPE_VALUE,
+    MIN_NB_POINT,
+    WindowOpenDetectionAlgorithm,
+)
+
+HALFLIFE_SEC = DEFAULT_SHORT_EMA_PARAMS["halflife_sec"]
+PRECISION = DEFAULT_SHORT_EMA_PARAMS["precision"]
+MAX_ALPHA = DEFAULT_SHORT_EMA_PARAMS["max_alpha"]
+OPEN_THRESHOLD = 3
+CLOSE_THRESHOLD = 0
+
+START = datetime(2026, 1, 5, tzinfo=timezone.utc)
+
+# (timestamp, temperature) for a reading, (timestamp, None) for a cycle tick
+Event = tuple[datetime, float | None]
+
+
+class ReferenceEma:
+    """ExponentialMovingAverage.calculate_ema, always computed"""
+
+    def __init__(self):
+        self.ema: float | None = None
+        self.last: datetime | None = None
+
+    def calculate_ema(self, measurement: float, timestamp: datetime) -> float:
+        """Same contract as ExponentialMovingAverage.calculate_ema"""
+        if self.ema is None:
+            self.ema, self.last = measurement, timestamp
+            return self.ema
+        time_decay = (timestamp - self.last).total_seconds()
+        if time_decay < 0:
+            return self.ema
+        alpha = min(1 - math.exp(math.log(0.5) * time_decay / HALFLIFE_SEC), MAX_ALPHA)
+        self.ema = alpha * measurement + (1 - alpha) * self.ema
+        self.last = timestamp
+        return round(self.ema, PRECISION)
+
+
+class ReferenceWindow:
+    """WindowOpenDetectionAlgorithm, always computed"""
+
+    def __init__(self):
+        self.slope: float | None = None
+        self.last: datetime | None = None
+        self.temperature: float | None = None
+        self.nb_point = 0
+
+    def check_age_last_measurement(self, temperature: float, now: datetime) -> float | None:
+        """Same contract as WindowOpenDetectionAlgorithm.check_age_last_measurement"""
+        if self.last is None:
+            return self.add_temp_measurement(temperature, now)
+        if (now - self.last).total_seconds() / 60.0 >= MAX_DURATION_MIN:
+            return self.add_temp_measurement(temperature, now, False)
+        return self.slope
+
+    def add_temp_measurement(self, temperature: float, measure: datetime, store_date: bool = True) -> float | None:
+        """Same contract as WindowOpenDetectionAlgorithm.add_temp_measurement"""
+        if self.last is None or self.temperature is None:
+            self.last, self.temperature = measure, temperature
+            self.nb_point += 1
+            return None
+        delta_t_sec = (measure - self.last).total_seconds()
+        if delta_t_sec <= 0:
+            return self.slope
+        new_slope = (temperature - self.temperature) / (delta_t_sec / 60.0 / 60.0)
+        if abs(new_slope) > MAX_SLOPE_VALUE:
+            return self.slope
+        self.slope = round(new_slope if self.slope is None else 0.2 * self.slope + 0.8 * new_slope, 2)
+        if store_date:
+            self.last = measure
+        self.temperature = temperature
+        self.nb_point += 1
+        return self.slope
+
+    def is_window_open_detected(self) -> bool:
+        """Same contract as WindowOpenDetectionAlgorithm.is_window_open_detected"""
+        return self.nb_point >= MIN_NB_POINT and self.slope is not None and self.slope < -OPEN_THRESHOLD
+
+    def is_window_close_detected(self) -> bool:
+        """Same contract as WindowOpenDetectionAlgorithm.is_window_close_detected"""
+        return self.nb_point >= MIN_NB_POINT and self.slope is not None and self.slope >= CLOSE_THRESHOLD
+
+
+def generate_trace(nb_events: int, seed: int) -> list[Event]:
+    """Return readings of a 0.1° sensor with flat stretches, window openings, duplicated,
+    out of order and missing readings, and cycle ticks"""
+    rng = random.Random(seed)
+    now = START
+    temperature = 19.0
+    events: list[Event] = []
+    while len(events) < nb_events:
+        roll = rng.random()
+        if roll < 0.02:
+            # a window is open for a few minutes
+            for _ in range(rng.randint(3, 10)):
+                now += timedelta(seconds=60)
+                temperature = round(temperature - rng.choice((0.2, 0.3, 0.5)), 1)
+                events.append((now, temperature))
+        elif roll < 0.1:
+            events.append((now + timedelta(seconds=rng.choice((0, -30, 1))), temperature))
+        elif roll < 0.2:
+            now += timedelta(seconds=rng.choice((300, 600)))
+            events.append((now, None))
+        else:
+            now += timedelta(seconds=rng.choice((60, 60, 60, 120, 37, 3600)))
+            if rng.random() < 0.15:
+                temperature = round(temperature + rng.choice((-0.1, 0.1, 0.1)), 1)
+            events.append((now, temperature))
+    return events
+
+
+def steady_trace(nb_events: int) -> list[Event]:
+    """Return the readings of a sensor reporting every minute in a room at a steady temperature"""
+    return [(START + timedelta(seconds=60 * index), 19.1 if index % 50 == 0 else 19.0) for index in range(nb_events)]
+
+
+def new_algorithms(ema_class=ExponentialMovingAverage, window_class=WindowOpenDetectionAlgorithm) -> tuple:
+    """Return the algorithms configured like a VTherm with the default parameters"""
+    return (
+        ema_class("replay", HALFLIFE_SEC, timezone.utc, PRECISION, MAX_ALPHA),
+        window_class(OPEN_THRESHOLD, CLOSE_THRESHOLD),
+    )
+
+
+def reference_algorithms() -> tuple[ReferenceEma, ReferenceWindow]:
+    """Return the reference algorithms"""
+    return ReferenceEma(), ReferenceWindow()
+
+
+def replay(events: list[Event], ema, window) -> list[tuple]:
+    """Replay events, return (ema, slope, open, close) after each one"""
+    results = []
+    ema_temperature = None
+    for timestamp, temperature in events:
+        if temperature is None:
+            if ema_temperature is None:
+                continue
+            slope = window.check_age_last_measurement(ema_temperature, timestamp)
+        else:
+            ema_temperature = ema.calculate_ema(temperature, timestamp)
+            slope = window.add_temp_measurement(ema_temperature, timestamp)
+        results.append((ema_temperature, slope, window.is_window_open_detected(), window.is_window_close_detected()))
+    return results
@@ -0,0 +1,135 @@
+# pylint: disable=line-too-long, protected-access
+"""The Auto TPI learning states of all the thermostats share one store file and one delayed write"""
+
+import asyncio
+import copy
+from types import SimpleNamespace
+
+import pytest
+
+from custom_components.versatile_thermostat import auto_tpi_manager
+from custom_components.versatile_thermostat.auto_tpi_manager import SHARED_STORAGE_KEY, AutoTpiManager, AutoTpiState
+
+NB_THERMOSTATS = 40
+
+
+class FakeStore:
+    """A Store holding its data in memory. A delayed save waits for write_pending()"""
+
+    def __init__(self, data: dict | None = None):
+        self.data = data
+        self.loads = 0
+        self.writes = 0
+        self._pending = None
+
+    async def async_load(self):
+        """Return a copy of the data, like a file read"""
+        self.loads += 1
+        await asyncio.sleep(0)
+        return copy.deepcopy(self.data)
+
+    async def async_save(self, data):
+        """Write the data at once"""
+        self.data = copy.deepcopy(data)
+        self.writes += 1
+
+    def async_delay_save(self, data_func, _delay):
+        """Replace the pending write, as a new save in the delay does"""
+        self._pending = data_func
+
+    async def async_remove(self):
+        """Remove the data"""
+        self.data = None
+
+    def write_pending(self):
+        """Run the pending write, as when the delay is over"""
+        data_func, self._pending = self._pending, None
+        if data_func is not None:
+            self.data = copy.deepcopy(data_func())
+            self.writes += 1
+
+
+@pytest.fixture(name="shared_file")
+def fixture_shared_file(monkeypatch) -> FakeStore:
+    """The shared store file, preloaded with a learning state for each thermostat. The legacy per-thermostat stores are empty"""
+    shared_file = FakeStore({unique_id(n): AutoTpiState(max_capacity_heat=1.0, total_cycles=n).to_dict() for n in range(NB_THERMOSTATS)})
+    monkeypatch.setattr(auto_tpi_manager, "Store", lambda _hass, _version, key: shared_file if key == SHARED_STORAGE_KEY else FakeStore())
+    return shared_file
+
+
+def unique_id(n: int) -> str:
+    """Return the unique_id of the nth thermostat"""
+    return f"vtherm_{n:02d}"
+
+
+def new_hass() -> SimpleNamespace:
+    """Return the parts of hass the managers use"""
+    return SimpleNamespace(data={}, config=SimpleNamespace(units=SimpleNamespace(temperature_unit="°C"), path=lambda path: f"/nonexistent/{path}"))
+
+
+def new_manager(hass: SimpleNamespace, n: int) -> AutoTpiManager:
+    """Return the Auto TPI manager of the nth thermostat"""
+    return AutoTpiManager(hass, None, unique_id(n), f"thermostat {n}", 5)
+
+
+async def test_forty_thermostats_share_one_write(shared_file):
+    """40 thermostats load their state from one file read, and their learning steps are written together"""
+    hass = new_hass()
+    managers = [new_manager(hass, n) for n in range(NB_THERMOSTATS)]
+    store = managers[0]._store
+
+    await asyncio.gather(*(manager.async_load_data() for manager in managers))
+
+    assert shared_file.loads == 1
+    assert store.stats["thermostats"] == NB_THERMOSTATS
+    for n, manager in enumerate(managers):
+        assert manager.state.total_cycles == n
+
+    # Three learning steps of every thermostat within the save delay
+    loading_requests = store.stats["save_requests"]
+    for _ in range(3):
+        for manager in managers:
+            manager.state.total_cycles += 1
+            await manager.async_save_data()
+    assert store.stats["save_requests"] == loading_requests + 3 * NB_THERMOSTATS
+    assert store.stats["writes"] == 0
+
+    shared_file.write_pending()
+    assert shared_file.writes == 1
+    assert store.stats["writes"] == 1
+    assert store.stats["states_written"] == NB_THERMOSTATS
+    assert [shared_file.data[unique_id(n)]["total_cycles"] for n in range(NB_THERMOSTATS)] == [n + 3 for n in range(NB_THERMOSTATS)]
+
+    # Then only 5 thermostats learn: only their states are serialized
+    for manager in managers[:5]:
+        manager.state.total_cycles += 10
+        await manager.async_save_data()
+    shared_file.write_pending()
+    assert store.stats["writes"] == 2
+    assert store.stats["states_written"] == NB_THERMOSTATS + 5
+    assert [shared_file.data[unique_id(n)]["total_cycles"] for n in range(7)] == [13, 14, 15, 16, 17, 8, 9]
+    assert shared_file.loads == 1
+
+
+@pytest.mark.parametrize("flushed", [True, False])
+async def test_reloaded_thermostat_gets_pending_state(shared_file, flushed):
+    """A thermostat reloaded before the delayed write gets the state of its previous manager, and so does the file"""
+    hass = new_hass()
+    previous = new_manager(hass, 0)
+    await previous.async_load_data()
+    previous.state.total_cycles = 99
+    await previous.async_save_data()
+    if flushed:
+        # Removed through PropHandlerTPI.remove()
+        previous.async_flush_data()
+        previous.state.total_cycles = 100
+
+    reloaded = new_manager(hass, 0)
+    await reloaded.async_load_data()
+    assert reloaded.state.total_cycles == 99
+
+    shared_file.write_pending()
+    assert shared_file.data[unique_id(0)]["total_cycles"] == 99
+    assert shared_file.loads == 1
+    # The state was taken at flush or load time, no state is left to serialize
+    assert reloaded._store.stats["states_written"] == 0
@@ -0,0 +1,44 @@
+# pylint: disable=line-too-long
+"""The CapacityEstimator gives the capacity of the calibration from the recorder history"""
+
+import pytest
+
+from custom_components.versatile_thermostat.capacity_estimator import CapacityEstimator
+
+from .capacity_simulation import DAYS, START, calibrate_from_estimator, calibrate_from_history, new_manager, simulate
+
+
+@pytest.mark.parametrize("seed", range(3))
+@pytest.mark.parametrize("min_power_threshold", [0.95, 0.8, 0.5])
+async def test_live_samples_match_history(seed, min_power_threshold):
+    """30 days of samples taken on the control_heating cycles give the capacity of the slope sensor history.
+
+    The estimator sees the slope once per cycle while the history has every state change of the
+    slope sensor, so it holds fewer samples of the same distribution."""
+    simulation = simulate(seed)
+
+    expected = await calibrate_from_history(simulation, min_power_threshold)
+    result = calibrate_from_estimator(simulation, min_power_threshold)
+
+    assert expected["success"] and result["success"]
+    assert result["capacity"] == pytest.approx(expected["capacity"], abs=0.02)
+    assert result["reliability"] == pytest.approx(expected["reliability"], abs=1.0)
+    assert expected["samples_used"] / 4 < result["samples_used"] < expected["samples_used"]
+
+
+@pytest.mark.parametrize("min_power_threshold", [0.95, 0.8, 0.5])
+async def test_seeded_estimator_matches_history(min_power_threshold):
+    """Seeded with the samples matched by a calibration, the estimator gives the same result"""
+    simulation = simulate(0)
+    matched_samples = []
+    expected = await new_manager().calculate_capacity_from_slope_sensor(
+        simulation.slope_history, simulation.power_history, min_power_threshold=min_power_threshold, matched_samples=matched_samples
+    )
+    estimator = CapacityEstimator("seeded")
+    estimator.seed(matched_samples, START, simulation.end)
+
+    slopes = estimator.get_slopes(min_power_threshold * 100.0, START)
+    result = new_manager()._calculate_capacity_from_slopes(slopes, DAYS, min_power_threshold=min_power_threshold)  # pylint: disable=protected-access
+
+    assert result["capacity"] == expected["capacity"]
+    assert result["samples_used"] == expected["samples_used"]
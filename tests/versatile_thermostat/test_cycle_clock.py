@@ -0,0 +1,192 @@
+# pylint: disable=line-too-long, protected-access
+"""The CycleClock runs the callbacks of every thermostat from a single Home Assistant timer"""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from custom_components.versatile_thermostat import cycle_clock
+from custom_components.versatile_thermostat.cycle_clock import CycleClock
+
+START = 1000.0
+
+
+class FakeLoop:
+    """A wall clock and the Home Assistant timers armed with async_call_later"""
+
+    def __init__(self):
+        self.now = START
+        # [deadline, action, cancelled]
+        self.timers: list[list] = []
+
+    def async_call_later(self, _hass, delay, action):
+        """Arm a timer, like async_call_later"""
+        timer = [self.now + delay, action, False]
+        self.timers.append(timer)
+
+        def unsub():
+            timer[2] = True
+
+        return unsub
+
+    @property
+    def armed(self) -> list[float]:
+        """The deadlines of the armed timers"""
+        return [deadline for deadline, _, cancelled in self.timers if not cancelled]
+
+    async def fire(self, at: float | None = None):
+        """Run the armed timer at its deadline, or at the given time"""
+        (timer,) = [timer for timer in self.timers if not timer[2]]
+        timer[2] = True
+        self.now = timer[0] if at is None else at
+        await timer[1](None)
+
+
+@pytest.fixture(name="loop")
+def fixture_loop(monkeypatch) -> FakeLoop:
+    """Patch the time and the timers of the clock"""
+    loop = FakeLoop()
+    monkeypatch.setattr(cycle_clock, "time", SimpleNamespace(time=lambda: loop.now))
+    monkeypatch.setattr(cycle_clock, "async_call_later", loop.async_call_later)
+    return loop
+
+
+def recorder(calls: list, name: str):
+    """Return a callback recording its name"""
+    return lambda _now: calls.append(name)
+
+
+async def test_cancel_then_reschedule_in_same_slot(loop):
+    """A call cancelled then scheduled again in the same slot runs once, on a re-armed timer"""
+    clock = CycleClock(None)
+    calls = []
+
+    cancel = clock.call_later(5.0, recorder(calls, "first"))
+    assert loop.armed == [START + 5]
+    cancel()
+    # Nothing left: the timer is cancelled
+    assert loop.armed == []
+    assert clock.stats["pending"] == 0
+
+    clock.call_later(4.2, recorder(calls, "second"))
+    assert loop.armed == [START + 5]
+    # Cancelled twice, counted once
+    cancel()
+    assert clock.stats["cancelled"] == 1
+
+    # Another cancel and reschedule in a slot still holding a call keeps the timer
+    clock.call_later(4.5, recorder(calls, "third"))()
+    clock.call_later(4.7, recorder(calls, "fourth"))
+    assert len(loop.timers) == 2
+
+    await loop.fire()
+    assert calls == ["second", "fourth"]
+    assert loop.armed == []
+    assert clock.stats == {"scheduled": 4, "cancelled": 2, "wakeups": 1, "callbacks": 2, "max_batch": 2, "pending": 0, "members": 0}
+
+
+async def test_rearm_after_cancelling_earliest_slot(loop):
+    """Cancelling the earliest slot moves the timer to the next one"""
+    clock = CycleClock(None)
+    calls = []
+
+    cancel_early = clock.call_later(3.0, recorder(calls, "early"))
+    clock.call_later(10.0, recorder(calls, "late"))
+    clock.call_later(10.0, recorder(calls, "late too"))
+    assert loop.armed == [START + 3]
+
+    cancel_early()
+    assert loop.armed == [START + 10]
+
+    await loop.fire()
+    assert calls == ["late", "late too"]
+    assert loop.armed == []
+
+    # An earlier call scheduled later moves the timer back
+    clock.call_later(20.0, recorder(calls, "later"))
+    clock.call_later(5.0, recorder(calls, "sooner"))
+    assert loop.armed == [START + 15]
+    await loop.fire()
+    assert loop.armed == [START + 30]
+    await loop.fire()
+    assert calls[2:] == ["sooner", "later"]
+
+
+async def test_due_callbacks_run_in_one_batch(loop, caplog):
+    """The calls due in a wakeup run concurrently, a failing one does not stop the others"""
+    clock = CycleClock(None)
+    calls = []
+    other_started = asyncio.Event()
+
+    async def waiting(_now):
+        # Would never return if the batch was run one call after the other
+        await asyncio.wait_for(other_started.wait(), 1)
+        calls.append("waiting")
+
+    async def other(_now):
+        other_started.set()
+        calls.append("other")
+
+    def failing(_now):
+        raise ValueError("broken heater")
+
+    clock.call_later(2.1, waiting)
+    clock.call_later(2.9, other)
+    clock.call_later(2.5, failing)
+    clock.call_later(2.3, recorder(calls, "sync"))
+    # Rounded up to the same 1 s slot
+    assert loop.armed == [START + 3]
+
+    await loop.fire()
+    assert sorted(calls) == ["other", "sync", "waiting"]
+    assert "broken heater" in caplog.text
+    assert clock.stats["wakeups"] == 1
+    assert clock.stats["callbacks"] == 4
+    assert clock.stats["max_batch"] == 4
+
+    # A late wakeup runs every slot due, early ones as well
+    calls.clear()
+    for delay in (1.0, 2.0, 3.0, 6.0):
+        clock.call_later(delay, recorder(calls, delay))
+    await loop.fire(at=loop.now + 6.5)
+    assert calls == [1.0, 2.0, 3.0, 6.0]
+    assert clock.stats["wakeups"] == 2
+
+    # A timer firing a bit before the boundary of its slot still runs it
+    calls.clear()
+    clock.call_later(2.0, recorder(calls, "boundary"))
+    await loop.fire(at=loop.armed[0] - 0.01)
+    assert calls == ["boundary"]
+    assert loop.armed == []
+
+
+async def test_phases_spread_over_the_cycle(loop):
+    """The ON periods of the schedulers with the same cycle start at evenly spread instants"""
+    clock = CycleClock(None)
+    members = [object() for _ in range(4)]
+    short_members = [object() for _ in range(2)]
+    for member in members:
+        clock.register(member, 600)
+    for member in short_members:
+        clock.register(member, 300)
+
+    for cycle_start in (START, START + 1234.5, START - 77.0):
+        offsets = [clock.phase_offset(member, 600, cycle_start) for member in members]
+        assert all(0 <= offset < 600 for offset in offsets)
+        # The same instants modulo the cycle, whatever the cycle start
+        assert sorted(round((cycle_start + offset - START) % 600, 1) for offset in offsets) == [0.0, 150.0, 300.0, 450.0]
+        short_offsets = [clock.phase_offset(member, 300, cycle_start) for member in short_members]
+        assert sorted(round((cycle_start + offset - START) % 300, 1) for offset in short_offsets) == [0.0, 150.0]
+
+    # The others are spread again without the unregistered one
+    clock.unregister(members[1])
+    offsets = [clock.phase_offset(member, 600, START) for member in members]
+    assert offsets == [0.0, 0.0, 200.0, 400.0]
+    assert clock.stats["members"] == 5
+
+    # Registering again with another cycle moves it
+    clock.register(members[0], 300)
+    assert clock.phase_offset(members[0], 600, START) == 0.0
+    assert sorted(clock.phase_offset(member, 300, START) for member in (*short_members, members[0])) == [0.0, 100.0, 200.0]
+    assert [clock.phase_offset(member, 600, START) for member in members[2:]] == [0.0, 300.0]
@@ -0,0 +1,139 @@
+# pylint: disable=line-too-long
+"""The StatePublisher skips the writes without a visible change, and writes the main changes at once and the others coalesced"""
+
+import pytest
+
+from custom_components.versatile_thermostat import state_publisher
+from custom_components.versatile_thermostat.state_publisher import StatePublisher
+
+from .publish_simulation import COALESCE_SEC, FakeClock, simulate, thermostat_events
+
+
+@pytest.fixture(name="clock")
+def fixture_clock():
+    """Run the publisher on simulated time"""
+    clock = FakeClock()
+    with clock.patched(state_publisher):
+        yield clock
+
+
+class Thermostat:
+    """The state of a thermostat and the writes of its publisher"""
+
+    def __init__(self, params: dict | None):
+        self.state = {"state": "heat", "hvac_action": "idle", "temperature": 19.0, "current_temperature": 18.5, "mean_cycle_power": 0.0049, "last_update_datetime": 0}
+        self.written: list[dict] = []
+        self.publisher = StatePublisher(None, "test", lambda: self.state, lambda: self.written.append(dict(self.state)), params)
+
+    def publish(self, **changes):
+        """Change the state and request a write"""
+        self.state.update(changes)
+        self.publisher.publish()
+
+
+def test_skip_unchanged(clock):
+    """Floats moving less than one unit of precision from the written value and volatile attributes are not written"""
+    thermostat = Thermostat({"precision": 2, "coalesce_sec": 0})
+    thermostat.publish()
+    thermostat.publish(last_update_datetime=1)
+    # Rounded, 0.0049 and 0.0051 would be two values
+    thermostat.publish(mean_cycle_power=0.0051)
+    thermostat.publish(mean_cycle_power=0.0089)
+    assert len(thermostat.written) == 1
+
+    # Compared with the written value, a slow drift is written once it adds up to one unit
+    thermostat.publish(mean_cycle_power=0.0149)
+    assert [written["mean_cycle_power"] for written in thermostat.written] == [0.0049, 0.0149]
+
+    # Exactly one unit, even when the float difference is a hair under it: 0.21 - 0.2 < 0.01
+    thermostat.publish(mean_cycle_power=0.2)
+    thermostat.publish(mean_cycle_power=0.21)
+    thermostat.publish(current_temperature=18.51, mean_cycle_power=0.2)
+    assert [written["mean_cycle_power"] for written in thermostat.written][-3:] == [0.2, 0.21, 0.2]
+
+    # An int and an equal float, a tuple and an equal list, are the same value. None to a number is a change
+    written = len(thermostat.written)
+    thermostat.publish(temperature=19, presets=(1, 2))
+    thermostat.publish(presets=[1, 2])
+    thermostat.publish(temperature=19.0)
+    assert len(thermostat.written) == written + 1
+    thermostat.publish(valve_open_percent=None)
+    thermostat.publish(valve_open_percent=0.0)
+    assert len(thermostat.written) == written + 3
+    assert thermostat.publisher.stats["skipped"] == 5
+    assert clock.armed == []
+
+
+def test_disabled_writes_everything(clock):
+    """Without state_publish_params every write is done, and counted"""
+    thermostat = Thermostat(None)
+    for _ in range(5):
+        thermostat.publish()
+    stats = thermostat.publisher.stats
+    assert len(thermostat.written) == stats["requested_writes"] == stats["written"] == 5
+    assert not stats["enabled"]
+
+
+def test_main_change_written_at_once(clock):
+    """A change of the hvac action, preset or target is written at once, and ends a coalescing window"""
+    thermostat = Thermostat({"precision": 2, "coalesce_sec": COALESCE_SEC})
+    thermostat.publish()
+    clock.advance(1)
+    thermostat.publish(current_temperature=18.6)
+    assert len(thermostat.written) == 1
+    assert clock.armed == [COALESCE_SEC]
+
+    clock.advance(2)
+    thermostat.publish(hvac_action="heating")
+    assert thermostat.written[-1]["hvac_action"] == "heating"
+    assert thermostat.written[-1]["current_temperature"] == 18.6
+    assert clock.armed == []
+
+    # A target moving less than the precision is not a change
+    thermostat.publish(temperature=19.004)
+    thermostat.publish(preset_mode="eco")
+    thermostat.publish(temperature=18.0)
+    assert [(written.get("preset_mode"), written["temperature"]) for written in thermostat.written[1:]] == [(None, 19.0), ("eco", 19.004), ("eco", 18.0)]
+
+
+def test_coalesced(clock):
+    """The other changes make one write at the end of the window, with the latest values"""
+    thermostat = Thermostat({"precision": 2, "coalesce_sec": COALESCE_SEC})
+    thermostat.publish()
+    for timestamp, temperature in ((1, 18.6), (5, 18.7), (10, 18.8)):
+        clock.advance(timestamp)
+        thermostat.publish(current_temperature=temperature)
+    assert len(thermostat.written) == 1
+    assert clock.armed == [COALESCE_SEC]
+
+    clock.advance(COALESCE_SEC)
+    assert [written["current_temperature"] for written in thermostat.written] == [18.5, 18.8]
+
+    # Changed back before the end of the window: nothing to write
+    clock.advance(40)
+    thermostat.publish(current_temperature=18.9)
+    thermostat.publish(current_temperature=18.801)
+    assert thermostat.publisher.stats["coalesced"] == 4
+    clock.advance(100)
+    assert len(thermostat.written) == 2
+
+    # Past the window, written at once
+    thermostat.publish(current_temperature=19.5)
+    assert len(thermostat.written) == 3
+    assert clock.armed == []
+
+    # A removed thermostat cancels its pending write
+    clock.advance(101)
+    thermostat.publish(current_temperature=19.6)
+    thermostat.publisher.cancel()
+    clock.advance(200)
+    assert len(thermostat.written) == 3
+
+
+def test_simulated_hour():
+    """An hour of a thermostat on a 5 min cycle makes a few writes per cycle instead of one per report"""
+    events = thermostat_events(1, seed=0)
+    every_write = simulate(StatePublisher, state_publisher, events, None)
+    filtered = simulate(StatePublisher, state_publisher, events, {"precision": 2, "coalesce_sec": COALESCE_SEC})
+    assert every_write == len(events)
+    assert filtered < every_write / 3
@@ -0,0 +1,42 @@
+# pylint: disable=line-too-long
+"""The EMA and the open window detection give the results of the plain calculations"""
+
+from datetime import timedelta
+
+import pytest
+
+from .replay import START, generate_trace, new_algorithms, reference_algorithms, replay, steady_trace
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_replay_matches_reference(seed):
+    """Every output of a replayed trace is the one of the reference calculation"""
+    events = generate_trace(20_000, seed)
+
+    expected = replay(events, *reference_algorithms())
+    results = replay(events, *new_algorithms())
+
+    assert results == expected
+    # The trace exercises both the fast paths and the window detection
+    assert any(result[2] for result in results)
+    assert sum(1 for result in results if result[1] == 0) > len(results) / 10
+
+
+def test_steady_trace_matches_reference():
+    """A steady sensor, where the fast paths are taken most, gives the reference results"""
+    events = steady_trace(5_000)
+
+    assert replay(events, *new_algorithms()) == replay(events, *reference_algorithms())
+
+
+def test_flat_curve():
+    """A constant temperature keeps the EMA and a zero slope, whatever the reading period"""
+    ema, window = new_algorithms()
+    timestamp = START
+    for step in (0, 60, 60, 37, 3600, 60):
+        timestamp += timedelta(seconds=step)
+        assert ema.calculate_ema(19.0, timestamp) == 19.0
+        window.add_temp_measurement(19.0, timestamp)
+    assert window.last_slope == 0
+    assert not window.is_window_open_detected()
+    assert window.is_window_close_detected()
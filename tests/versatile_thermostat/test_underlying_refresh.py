@@ -0,0 +1,170 @@
+# pylint: disable=line-too-long, protected-access
+"""A burst of underlying state changes makes the thermostat react once"""
+
+import inspect
+from types import SimpleNamespace
+
+import pytest
+
+from custom_components.versatile_thermostat import base_thermostat
+from custom_components.versatile_thermostat.base_thermostat import BaseThermostat
+from custom_components.versatile_thermostat.const import UNDERLYING_CHANGE_COALESCE_SEC
+
+NB_UNDERLYINGS = 12
+
+
+class Timers:
+    """The Home Assistant timers armed with async_call_later"""
+
+    def __init__(self):
+        # [delay, action, cancelled]
+        self.timers: list[list] = []
+
+    def async_call_later(self, _hass, delay, action):
+        """Arm a timer, like async_call_later"""
+        timer = [delay, action, False]
+        self.timers.append(timer)
+
+        def unsub():
+            timer[2] = True
+
+        return unsub
+
+    @property
+    def armed(self) -> list[float]:
+        """The delays of the armed timers"""
+        return [delay for delay, _, cancelled in self.timers if not cancelled]
+
+    async def fire(self):
+        """Run the armed timer"""
+        (timer,) = [timer for timer in self.timers if not timer[2]]
+        timer[2] = True
+        result = timer[1](None)
+        if inspect.isawaitable(result):
+            await result
+
+
+class RefreshThermostat(BaseThermostat):
+    """A thermostat recording the reactions of its underlying refresh"""
+
+    def __init__(self, hvac_action: str, calculated_hvac_action: str):  # pylint: disable=super-init-not-called
+        self.calls: list[str] = []
+        self._name = "refresh"
+        self._hass = SimpleNamespace()
+        self._is_removed = False
+        self._is_used_by_central_boiler = True
+        self._state_manager = SimpleNamespace(requested_state=SimpleNamespace(force_changed=lambda: self.calls.append("force_changed")))
+        self._cancel_underlying_refresh = None
+        self._underlying_refresh_update_states = False
+        self._nb_underlying_events = 0
+        self._nb_coalesced_underlying_events = 0
+        self._cancel_recalculate_later = None
+        self._state_publisher = None
+        self._cycle_scheduler = None
+        self._managers = []
+        self._underlyings = []
+        self._hvac_action = hvac_action
+        self._calculated_hvac_action = calculated_hvac_action
+
+    @property
+    def hvac_action(self):
+        return self._hvac_action
+
+    def calculate_hvac_action(self, _: list | None = None):
+        return self._calculated_hvac_action
+
+    async def update_states(self, force=False):
+        self.calls.append("update_states")
+
+    def update_custom_attributes(self):
+        self.calls.append("update_custom_attributes")
+
+    def async_write_ha_state(self):
+        self.calls.append("async_write_ha_state")
+
+
+@pytest.fixture(name="timers")
+def fixture_timers(monkeypatch) -> Timers:
+    """Patch the timers of base_thermostat"""
+    timers = Timers()
+    monkeypatch.setattr(base_thermostat, "async_call_later", timers.async_call_later)
+    return timers
+
+
+@pytest.fixture(name="boiler_counts")
+def fixture_boiler_counts(monkeypatch) -> list:
+    """Record the recounts of the devices active for the central boiler"""
+    counts = []
+
+    async def calculate_nb_active_devices(_event):
+        counts.append(1)
+
+    api = SimpleNamespace(central_boiler_manager=SimpleNamespace(nb_device_active_for_boiler_entity=SimpleNamespace(calculate_nb_active_devices=calculate_nb_active_devices)))
+    monkeypatch.setattr(base_thermostat.VersatileThermostatAPI, "get_vtherm_api", lambda _hass=None: api)
+    return counts
+
+
+async def test_burst_refreshes_hvac_action_once(timers, boiler_counts):
+    """The hvac_action and the central boiler count are refreshed once for a burst of underlying changes"""
+    thermostat = RefreshThermostat("idle", "heating")
+    for _ in range(NB_UNDERLYINGS):
+        thermostat.request_underlying_refresh()
+
+    assert timers.armed == [UNDERLYING_CHANGE_COALESCE_SEC]
+    assert thermostat.calls == []
+    await timers.fire()
+    assert thermostat.calls == ["update_custom_attributes", "async_write_ha_state"]
+    assert len(boiler_counts) == 1
+    assert thermostat._nb_underlying_events == NB_UNDERLYINGS
+    assert thermostat.nb_coalesced_underlying_events == NB_UNDERLYINGS - 1
+
+    # The next burst opens a new window. No write when the hvac_action did not change
+    thermostat._hvac_action = "heating"
+    thermostat.request_underlying_refresh()
+    thermostat.request_underlying_refresh()
+    assert timers.armed == [UNDERLYING_CHANGE_COALESCE_SEC]
+    await timers.fire()
+    assert thermostat.calls == ["update_custom_attributes", "async_write_ha_state"]
+    assert len(boiler_counts) == 2
+    assert thermostat._nb_underlying_events == NB_UNDERLYINGS + 2
+    assert thermostat.nb_coalesced_underlying_events == NB_UNDERLYINGS
+
+
+async def test_burst_updates_states_once(timers, boiler_counts):
+    """One underlying climate asking for update_states in a burst makes one update_states, which also refreshes the hvac_action"""
+    thermostat = RefreshThermostat("idle", "heating")
+    for index in range(NB_UNDERLYINGS):
+        thermostat.request_underlying_refresh(update_states=index == 3)
+
+    await timers.fire()
+    assert thermostat.calls == ["force_changed", "update_states"]
+    assert len(boiler_counts) == 1
+    assert timers.armed == []
+
+    # Not carried over to the next burst
+    thermostat.calls.clear()
+    thermostat.request_underlying_refresh()
+    await timers.fire()
+    assert thermostat.calls == ["update_custom_attributes", "async_write_ha_state"]
+
+
+async def test_pending_refresh_cancelled_on_removal(timers, boiler_counts):
+    """Removing the thermostat cancels the pending refresh, and a refresh already started does nothing"""
+    thermostat = RefreshThermostat("idle", "heating")
+    thermostat.request_underlying_refresh(update_states=True)
+    thermostat.request_underlying_refresh()
+    assert timers.armed == [UNDERLYING_CHANGE_COALESCE_SEC]
+
+    thermostat.remove_thermostat()
+    assert timers.armed == []
+    assert thermostat._cancel_underlying_refresh is None
+    assert not thermostat._underlying_refresh_update_states
+
+    # Fired as the entity was being removed
+    thermostat.request_underlying_refresh(update_states=True)
+    refresh = timers.timers[-1][1]
+    thermostat._is_removed = True
+    await refresh(None)
+    assert thermostat.calls == []
+    assert boiler_counts == []
+    assert thermostat._cancel_underlying_refresh is None